@@ -0,0 +1,277 @@
+# agents/decision_rules.py - DETERMINISTIC DECISION TABLES
+"""
+Rule-engine fast path for orchestration decisions.
+
+Campaign strategy, per-creator negotiation approach, progress checks and the
+completion decision are answered from data-driven decision tables over a few
+facts (success rate, remaining budget, creator tier, niche). Each table is
+compiled once at import into plain tuple comparisons, so a decision costs
+microseconds. Rows carry a confidence; the orchestrator only escalates to the
+LLM when the matching row is below ``settings.rule_engine_min_confidence``.
+
+Conditions in a row are matched against the facts:
+
+- ``(low, high)`` - numeric range, ``low <= value < high`` (``None`` = unbounded)
+- ``(low, high, "(]")`` - numeric range with explicit bounds: ``[``/``]``
+  inclusive, ``(``/``)`` exclusive (``"()"``, ``"(]"``, ``"[)"``, ``"[]"``)
+- ``{"a", "b"}``  - value is one of the set
+
+The first matching row wins; the table's default applies when none match.
+"""
+import math
+import logging
+from enum import Enum
+from typing import Optional, Dict, Any, List, Tuple
+
+from pydantic import BaseModel
+
+from models.campaign import CampaignData, CampaignOrchestrationState, CreatorMatch, NegotiationStatus
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class DecisionSource(str, Enum):
+    RULES = "rules"
+    LLM = "llm"
+    FALLBACK = "fallback"
+
+
+class Decision(BaseModel):
+    """Outcome of one decision, tagged with where it came from"""
+    result: Dict[str, Any]
+    confidence: float
+    source: DecisionSource = DecisionSource.RULES
+    rule: Optional[str] = None
+
+
+# ================================
+# DECISION TABLES
+# ================================
+
+# Facts: budget, niche
+CAMPAIGN_STRATEGY_TABLE = {
+    "rows": [
+        {"name": "high_budget", "when": {"budget": (10000, None, "()")}, "confidence": 0.9, "result": {
+            "negotiation_approach": "premium", "max_creators_to_contact": 4,
+            "creator_tier_priority": ["macro", "mega", "micro"], "per_creator_max": 0.4, "budget_tier": "high"}},
+        {"name": "medium_budget", "when": {"budget": (5000, 10000, "(]")}, "confidence": 0.9, "result": {
+            "negotiation_approach": "collaborative", "max_creators_to_contact": 3,
+            "creator_tier_priority": ["macro", "micro", "mega"], "per_creator_max": 0.5, "budget_tier": "medium"}},
+        {"name": "standard_budget", "when": {"budget": (None, 5000, "(]")}, "confidence": 0.9, "result": {
+            "negotiation_approach": "collaborative", "max_creators_to_contact": 2,
+            "creator_tier_priority": ["micro", "macro", "mega"], "per_creator_max": 0.5, "budget_tier": "standard"}},
+    ],
+    "default": {"confidence": 0.0, "result": {}},
+}
+
+# Facts: niche - overrides the tier priority; unknown niches lower the strategy confidence
+NICHE_TIER_TABLE = {
+    "rows": [
+        # Tech audiences prefer established creators
+        {"name": "established_niche", "when": {"niche": {"tech", "gaming"}}, "confidence": 0.9,
+         "result": {"creator_tier_priority": ["macro", "micro", "mega"]}},
+        # Beauty works well with micro-influencers
+        {"name": "micro_niche", "when": {"niche": {"beauty", "fashion"}}, "confidence": 0.9,
+         "result": {"creator_tier_priority": ["micro", "macro", "mega"]}},
+        {"name": "benchmarked_niche", "when": {"niche": {"fitness", "food", "lifestyle", "travel"}}, "confidence": 0.85,
+         "result": {}},
+    ],
+    "default": {"confidence": 0.6, "result": {}},
+}
+
+# Facts: tier, availability, budget_remaining_ratio, success_rate, attempts
+NEGOTIATION_TABLE = {
+    "rows": [
+        {"name": "mega_on_tight_budget", "when": {"tier": {"mega_influencer"}, "budget_remaining_ratio": (None, 0.3)},
+         "confidence": 0.85, "result": {"approach": "aggressive", "opening_offer_multiplier": 0.85, "max_offer_multiplier": 1.0}},
+        {"name": "scarce_availability", "when": {"availability": {"busy", "limited"}, "budget_remaining_ratio": (0.3, None)},
+         "confidence": 0.8, "result": {"approach": "premium", "opening_offer_multiplier": 1.1, "max_offer_multiplier": 1.3}},
+        {"name": "struggling_campaign", "when": {"attempts": (2, None), "success_rate": (None, 0.34)},
+         "confidence": 0.8, "result": {"approach": "premium", "opening_offer_multiplier": 1.05, "max_offer_multiplier": 1.25}},
+        {"name": "micro_creator", "when": {"tier": {"micro_influencer"}, "budget_remaining_ratio": (0.2, None)},
+         "confidence": 0.9, "result": {"approach": "collaborative", "opening_offer_multiplier": 1.0, "max_offer_multiplier": 1.15}},
+        {"name": "macro_with_budget", "when": {"tier": {"macro_influencer"}, "budget_remaining_ratio": (0.5, None)},
+         "confidence": 0.85, "result": {"approach": "collaborative", "opening_offer_multiplier": 1.0, "max_offer_multiplier": 1.2}},
+    ],
+    "default": {"confidence": 0.5, "result": {"opening_offer_multiplier": 1.0, "max_offer_multiplier": 1.2}},
+}
+
+# Facts: attempts, successes, success_rate, target_success_rate_gap, budget_remaining_ratio
+PROGRESS_TABLE = {
+    "rows": [
+        {"name": "budget_exhausted", "when": {"budget_remaining_ratio": (None, 0.1)}, "confidence": 0.95,
+         "result": {"action": "stop_early", "reason": "Budget nearly exhausted"}},
+        {"name": "on_target", "when": {"target_success_rate_gap": (0.0, None)}, "confidence": 0.9,
+         "result": {"action": "continue", "reason": "Success rate on target"}},
+        {"name": "too_early", "when": {"attempts": (None, 3)}, "confidence": 0.8,
+         "result": {"action": "continue", "reason": "Too few negotiations to judge"}},
+        {"name": "far_below_target", "when": {"target_success_rate_gap": (None, -0.3)}, "confidence": 0.8,
+         "result": {"action": "adjust_approach", "reason": "Success rate well below target"}},
+    ],
+    "default": {"confidence": 0.5, "result": {"action": "continue", "reason": "Continue with standard approach"}},
+}
+
+# Facts: successes, success_rate, budget_utilization
+COMPLETION_TABLE = {
+    "rows": [
+        # 2+ successful partnerships is usually sufficient
+        {"name": "enough_partnerships", "when": {"successes": (2, None)}, "confidence": 0.95,
+         "result": {"action": "complete", "find_more": False, "reason": "Two or more partnerships secured"}},
+        {"name": "budget_spent", "when": {"budget_utilization": (0.8, None)}, "confidence": 0.9,
+         "result": {"action": "complete", "find_more": False, "reason": "Budget largely allocated"}},
+    ],
+    "default": {"confidence": 0.5, "result": {"action": "complete", "reason": "Standard completion"}},
+}
+
+
+# ================================
+# COMPILED TABLES
+# ================================
+
+# A compiled condition: (fact, low, high, low inclusive, high inclusive, members) - members is None for ranges
+Condition = Tuple[str, float, float, bool, bool, Optional[frozenset]]
+
+
+class DecisionTable:
+    """A decision table compiled to tuples of comparisons"""
+
+    def __init__(self, name: str, table: Dict[str, Any]):
+        self.name = name
+        self._rows: List[Tuple[str, Tuple[Condition, ...], Dict[str, Any], float]] = [
+            (row["name"], self._compile(row["when"]), row["result"], row["confidence"])
+            for row in table["rows"]
+        ]
+        self._default = (table["default"]["result"], table["default"]["confidence"])
+
+    @staticmethod
+    def _compile(when: Dict[str, Any]) -> Tuple[Condition, ...]:
+        conditions = []
+        for fact, spec in when.items():
+            if isinstance(spec, (set, frozenset)):
+                conditions.append((fact, -math.inf, math.inf, True, True, frozenset(spec)))
+            else:
+                low, high, bounds = spec if len(spec) == 3 else (*spec, "[)")
+                if bounds not in ("()", "(]", "[)", "[]"):
+                    raise ValueError(f"Invalid range bounds '{bounds}' for fact '{fact}'")
+                conditions.append((
+                    fact,
+                    -math.inf if low is None else float(low),
+                    math.inf if high is None else float(high),
+                    bounds[0] == "[",
+                    bounds[1] == "]",
+                    None
+                ))
+        return tuple(conditions)
+
+    def decide(self, facts: Dict[str, Any]) -> Decision:
+        """First matching row, or the table default"""
+        for name, conditions, result, confidence in self._rows:
+            for fact, low, high, low_inclusive, high_inclusive, members in conditions:
+                value = facts.get(fact)
+                if members is not None:
+                    if value not in members:
+                        break
+                elif (
+                    value is None
+                    or value < low or (value == low and not low_inclusive)
+                    or value > high or (value == high and not high_inclusive)
+                ):
+                    break
+            else:
+                return Decision(result=dict(result), confidence=confidence, rule=f"{self.name}.{name}")
+
+        result, confidence = self._default
+        return Decision(result=dict(result), confidence=confidence, rule=f"{self.name}.default")
+
+
+class DecisionEngine:
+    """
+    📐 RULE ENGINE FOR ORCHESTRATION DECISIONS
+
+    Builds the facts for each decision from the campaign state and looks them
+    up in the compiled tables. ``is_confident()`` tells the orchestrator whether
+    the rules are enough or the LLM should be consulted.
+    """
+
+    def __init__(self, min_confidence: Optional[float] = None):
+        self.min_confidence = min_confidence if min_confidence is not None else settings.rule_engine_min_confidence
+        self.campaign_strategy_table = DecisionTable("campaign_strategy", CAMPAIGN_STRATEGY_TABLE)
+        self.niche_tier_table = DecisionTable("niche_tier", NICHE_TIER_TABLE)
+        self.negotiation_table = DecisionTable("negotiation", NEGOTIATION_TABLE)
+        self.progress_table = DecisionTable("progress", PROGRESS_TABLE)
+        self.completion_table = DecisionTable("completion", COMPLETION_TABLE)
+
+    def is_confident(self, decision: Decision) -> bool:
+        return decision.confidence >= self.min_confidence
+
+    def campaign_strategy(self, campaign_data: CampaignData) -> Decision:
+        """Overall campaign strategy from budget and niche"""
+        budget = campaign_data.total_budget
+        niche = campaign_data.product_niche.lower()
+
+        budget_decision = self.campaign_strategy_table.decide({"budget": budget})
+        niche_decision = self.niche_tier_table.decide({"niche": niche})
+        base = budget_decision.result
+
+        return Decision(
+            result={
+                "creator_tier_priority": niche_decision.result.get("creator_tier_priority", base["creator_tier_priority"]),
+                "budget_allocation": {
+                    "per_creator_max": base["per_creator_max"],
+                    "reserve": 0.2
+                },
+                "success_criteria": {
+                    "min_creators": 1,
+                    "target_success_rate": 0.6
+                },
+                "risk_mitigation": "diversify_across_tiers",
+                "negotiation_approach": base["negotiation_approach"],
+                "max_creators_to_contact": base["max_creators_to_contact"],
+                "strategy_source": "enhanced_default",
+                "budget_tier": base["budget_tier"]
+            },
+            confidence=min(budget_decision.confidence, niche_decision.confidence),
+            rule=f"{budget_decision.rule}+{niche_decision.rule}"
+        )
+
+    def negotiation_strategy(
+        self,
+        creator_match: CreatorMatch,
+        state: CampaignOrchestrationState,
+        overall_strategy: Dict[str, Any]
+    ) -> Decision:
+        """Negotiation approach for one creator"""
+        facts = _progress_facts(state)
+        facts["tier"] = creator_match.creator.tier.value
+        facts["availability"] = creator_match.creator.availability.value
+
+        decision = self.negotiation_table.decide(facts)
+        decision.result.setdefault("approach", overall_strategy.get("negotiation_approach", "collaborative"))
+        return decision
+
+    def progress(self, state: CampaignOrchestrationState, strategy: Dict[str, Any]) -> Decision:
+        """Continue, stop early or adjust the approach"""
+        facts = _progress_facts(state)
+        target = strategy.get("success_criteria", {}).get("target_success_rate", 0.6)
+        facts["target_success_rate_gap"] = facts["success_rate"] - target
+        return self.progress_table.decide(facts)
+
+    def completion(self, state: CampaignOrchestrationState) -> Decision:
+        """Complete the campaign or look for more creators"""
+        facts = _progress_facts(state)
+        facts["budget_utilization"] = 1.0 - facts["budget_remaining_ratio"]
+        return self.completion_table.decide(facts)
+
+
+def _progress_facts(state: CampaignOrchestrationState) -> Dict[str, Any]:
+    attempts = len(state.negotiations)
+    successes = len([n for n in state.negotiations if n.status == NegotiationStatus.SUCCESS])
+    budget = state.campaign_data.total_budget or 1.0
+
+    return {
+        "attempts": attempts,
+        "successes": successes,
+        "success_rate": successes / attempts if attempts else 0.0,
+        "budget_remaining_ratio": max(budget - state.total_cost, 0.0) / budget
+    }
@@ -1,7 +1,8 @@
 # agents/discovery.py
 import json
+import asyncio
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, AsyncIterator
 from pathlib import Path
 
 from models.campaign import CampaignData,Creator, CreatorMatch
@@ -18,9 +19,13 @@ class InfluencerDiscoveryAgent:
     using vector similarity matching and market pricing analysis
     """
     
-    def __init__(self):
-        self.embedding_service = EmbeddingService()
-        self.pricing_service = PricingService()
+    def __init__(
+        self,
+        embedding_service: Optional[EmbeddingService] = None,
+        pricing_service: Optional[PricingService] = None
+    ):
+        self.embedding_service = embedding_service or EmbeddingService()
+        self.pricing_service = pricing_service or PricingService()
         self.creators_data = self._load_creators_data()
     
     def _load_creators_data(self) -> List[Creator]:
@@ -140,47 +145,9 @@ class InfluencerDiscoveryAgent:
             campaign_embedding = await self.embedding_service.generate_embedding(campaign_text)
             
             matches = []
-            
             for creator in self.creators_data:
-                # Generate creator embedding
-                creator_text = self._create_creator_text(creator)
-                creator_embedding = await self.embedding_service.generate_embedding(creator_text)
-                
-                # Calculate similarity
-                similarity_score = self.embedding_service.calculate_similarity(
-                    campaign_embedding, creator_embedding
-                )
-                
-                # Check rate compatibility
-                rate_compatible, estimated_rate = self._check_rate_compatibility(
-                    creator, campaign_data
-                )
-                
-                # Check availability and other factors
-                availability_score = self._calculate_availability_score(creator)
-                niche_match = self._calculate_niche_match(creator, campaign_data)
-                
-                # Combined score
-                combined_score = (
-                    similarity_score * 0.4 +
-                    niche_match * 0.3 +
-                    availability_score * 0.2 +
-                    (1.0 if rate_compatible else 0.3) * 0.1
-                )
-                
-                # Generate match reasons
-                match_reasons = self._generate_match_reasons(
-                    creator, campaign_data, similarity_score, rate_compatible, niche_match
-                )
-                
-                if combined_score >= settings.similarity_threshold:
-                    match = CreatorMatch(
-                        creator=creator,
-                        similarity_score=combined_score,
-                        rate_compatible=rate_compatible,
-                        match_reasons=match_reasons,
-                        estimated_rate=estimated_rate
-                    )
+                match = await self._score_creator(creator, campaign_data, campaign_embedding)
+                if match:
                     matches.append(match)
             
             # Sort by similarity score and return top matches
@@ -195,8 +162,113 @@ class InfluencerDiscoveryAgent:
             
         except Exception as e:
             logger.error(f"❌ Error in find_matches: {e}")
-            # Return mock matches for demo    
-
+            # Return mock matches for demo
+            return self._get_mock_matches()[:max_results]
+    
+    async def stream_matches(
+        self,
+        campaign_data: CampaignData,
+        max_results: int = 3,
+        shard_size: Optional[int] = None,
+        early_yield_score: Optional[float] = None
+    ) -> AsyncIterator[CreatorMatch]:
+        """
+        Stream ranked candidates while discovery is still running.
+        
+        The catalogue is scored shard by shard. Candidates at or above
+        ``early_yield_score`` are yielded as soon as their shard is scored so the
+        orchestrator can start negotiating with them (at most ``max_results``).
+        Every shard is still scored: once discovery is done, the catalogue's
+        overall top ``max_results`` that were not yielded early follow
+        best-first, so a stronger creator in a later shard is never crowded out
+        by early candidates (the stream can then yield more than
+        ``max_results``).
+        """
+        shard_size = shard_size or settings.discovery_shard_size
+        early_yield_score = early_yield_score if early_yield_score is not None else settings.discovery_early_yield_score
+        
+        campaign_text = self._create_campaign_text(campaign_data)
+        campaign_embedding = await self.embedding_service.generate_embedding(campaign_text)
+        
+        early_yields = 0
+        matches: List[CreatorMatch] = []
+        yielded_ids = set()
+        
+        for start in range(0, len(self.creators_data), shard_size):
+            shard = self.creators_data[start:start + shard_size]
+            
+            shard_matches = []
+            for creator in shard:
+                match = await self._score_creator(creator, campaign_data, campaign_embedding)
+                if match:
+                    shard_matches.append(match)
+            shard_matches.sort(key=lambda x: x.similarity_score, reverse=True)
+            matches.extend(shard_matches)
+            
+            for match in shard_matches:
+                if match.similarity_score < early_yield_score or early_yields >= max_results:
+                    break
+                logger.info(f"⚡ Early candidate: {match}")
+                early_yields += 1
+                yielded_ids.add(match.creator.id)
+                yield match
+            
+            # Let negotiations on already-yielded candidates make progress
+            await asyncio.sleep(0)
+        
+        matches.sort(key=lambda x: x.similarity_score, reverse=True)
+        for match in matches[:max_results]:
+            if match.creator.id not in yielded_ids:
+                yield match
+    
+    async def _score_creator(
+        self,
+        creator: Creator,
+        campaign_data: CampaignData,
+        campaign_embedding
+    ) -> Optional[CreatorMatch]:
+        """Score one creator against the campaign; None if below the similarity threshold"""
+        # Generate creator embedding
+        creator_text = self._create_creator_text(creator)
+        creator_embedding = await self.embedding_service.generate_embedding(creator_text)
+        
+        # Calculate similarity
+        similarity_score = self.embedding_service.calculate_similarity(
+            campaign_embedding, creator_embedding
+        )
+        
+        # Check rate compatibility
+        rate_compatible, estimated_rate = self._check_rate_compatibility(
+            creator, campaign_data
+        )
+        
+        # Check availability and other factors
+        availability_score = self._calculate_availability_score(creator)
+        niche_match = self._calculate_niche_match(creator, campaign_data)
+        
+        # Combined score
+        combined_score = (
+            similarity_score * 0.4 +
+            niche_match * 0.3 +
+            availability_score * 0.2 +
+            (1.0 if rate_compatible else 0.3) * 0.1
+        )
+        
+        if combined_score < settings.similarity_threshold:
+            return None
+        
+        # Generate match reasons
+        match_reasons = self._generate_match_reasons(
+            creator, campaign_data, similarity_score, rate_compatible, niche_match
+        )
+        
+        return CreatorMatch(
+            creator=creator,
+            similarity_score=combined_score,
+            rate_compatible=rate_compatible,
+            match_reasons=match_reasons,
+            estimated_rate=estimated_rate
+        )
 
     async def discover_influencers(self, product_niche: str, total_budget: float) -> List[Dict[str, Any]]:
         """
@@ -305,7 +377,7 @@ class InfluencerDiscoveryAgent:
         Niche: {creator.niche}
         Specialties: {specialties_text}
         Languages: {languages_text}
-        Collaboration Style: {creator.preferred_collaboration_style}
+        Collaboration Style: {getattr(creator, "preferred_collaboration_style", "")}
         Location: {creator.location}
         Followers: {creator.followers}
         Engagement: {creator.engagement_rate}%
@@ -345,7 +417,7 @@ class InfluencerDiscoveryAgent:
             return 1.0
         elif creator.niche.lower() in campaign_data.product_description.lower():
             return 0.7
-        elif campaign_data.product_niche.lower() in creator.preferred_collaboration_style.lower():
+        elif campaign_data.product_niche.lower() in getattr(creator, "preferred_collaboration_style", "").lower():
             return 0.5
         else:
             return 0.3
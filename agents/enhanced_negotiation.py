@@ -1,9 +1,14 @@
 # agents/enhanced_negotiation.py - CORRECTED VERSION
+import re
 import logging
 import json
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 
+from config.settings import settings
+from services.conversation_store import ConversationRecord, get_conversation_store
+
 logger = logging.getLogger(__name__)
 
 class EnhancedNegotiationAgent:
@@ -41,12 +46,16 @@ class EnhancedNegotiationAgent:
             transcript = conversation_data.get("transcript", [])
             elevenlabs_analysis = conversation_data.get("analysis", {})
             
+            # Counters built while the call ran - only turns they have not seen are read
+            transcript_state = get_live_negotiation_tracker().get(conversation_data.get("conversation_id", ""))
+            
             # Perform enhanced analysis
             analysis_result = await self.analyzer.analyze_negotiation_conversation(
                 transcript,
                 elevenlabs_analysis,
                 creator_profile,
-                pricing_strategy
+                pricing_strategy,
+                transcript_state=transcript_state
             )
             
             # Validate the analysis result
@@ -80,6 +89,191 @@ class EnhancedNegotiationAgent:
         }
 
 
+class KeywordMatcher:
+    """
+    🔤 KEYWORD MATCHER
+    
+    All keyword categories compiled into one regex, run once over the
+    lower-cased turn. Plain keywords are merged into a character trie
+    (``\b(?:d(?:eal|ollars?)|...)\b``) so the engine follows one branch per
+    letter instead of trying every keyword; the longest keyword wins.
+    Keywords match whole words only, so "no" no longer fires inside "know";
+    keywords starting or ending with a symbol ("$") are not bounded on that
+    side.
+    """
+    
+    def __init__(self, keywords: Dict[str, List[str]]):
+        self._categories_of: Dict[str, List[str]] = {}
+        for category, words in keywords.items():
+            for word in words:
+                self._categories_of.setdefault(word.lower(), []).append(category)
+        
+        words = [keyword for keyword in self._categories_of if re.fullmatch(r"\w(.*\w)?", keyword)]
+        alternatives = [self._bounded(keyword) for keyword in self._categories_of if keyword not in words]
+        if words:
+            alternatives.append(r"\b" + self._trie_pattern(words) + r"\b")
+        self._pattern = re.compile("|".join(alternatives))
+    
+    @staticmethod
+    def _bounded(keyword: str) -> str:
+        pattern = re.escape(keyword)
+        if re.match(r"\w", keyword):
+            pattern = r"(?<!\w)" + pattern
+        if re.match(r"\w", keyword[-1]):
+            pattern += r"(?!\w)"
+        return pattern
+    
+    @classmethod
+    def _trie_pattern(cls, words: List[str]) -> str:
+        trie: Dict[str, Any] = {}
+        for word in words:
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        return cls._node_pattern(trie)
+    
+    @classmethod
+    def _node_pattern(cls, node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + cls._node_pattern(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # A keyword ends here; longer ones are tried first (greedy)
+            pattern = (pattern if len(branches) > 1 else "(?:" + pattern + ")") + "?"
+        return pattern
+    
+    def match(self, text: str) -> Dict[str, int]:
+        """Number of distinct keywords found in ``text``, by category"""
+        hits: Dict[str, int] = {}
+        for word in set(self._pattern.findall(text.lower())):
+            for category in self._categories_of[word]:
+                hits[category] = hits.get(category, 0) + 1
+        return hits
+
+
+class MoneyTokenizer:
+    """
+    💵 MONEY TOKENIZER
+    
+    One precompiled regex finds money amounts in a single pass per turn:
+    currency symbols/words ("$1,500", "1500 dollars", "USD 2k"), k/m and
+    magnitude suffixes ("5k", "1.2m", "3 grand", "a grand"), spelled-out
+    numbers ("five thousand", "twelve hundred") and ranges ("$1,000-1,500",
+    "5 to 7k"). Amounts without a currency marker are kept only when every end
+    looks like a rate (``BARE_RATE_RANGE``), as "2 videos" or "50k followers"
+    are not, and when they are not a year ("in 2024") or part of a phone
+    number ("555-1234") - write "$2000" or "2,000" for such amounts.
+    """
+    
+    BARE_RATE_RANGE = (500, 10000)
+    BARE_YEAR_RANGE = (1900, 2100)
+    
+    _UNITS = {
+        "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+        "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13,
+        "fourteen": 14, "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18,
+        "nineteen": 19, "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50, "sixty": 60,
+        "seventy": 70, "eighty": 80, "ninety": 90
+    }
+    _MAGNITUDES = {"hundred": 100, "thousand": 1000, "grand": 1000, "k": 1000, "million": 1000000, "m": 1000000}
+    
+    _WORD = r"(?:" + "|".join(sorted(_UNITS, key=len, reverse=True)) + r"|hundred|thousand|million)"
+    _NUMBER = (
+        r"(?:\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?"
+        r"|(?:an?\s+(?=hundred|thousand|million))?" + _WORD + r"(?:(?:\s+|-)(?:and\s+)?" + _WORD + r")*"
+        r"|an?(?=\s+grand\b))"
+    )
+    _SUFFIX = r"(?:\s?(?:thousand|million|grand)|k|m)(?![a-z0-9])"
+    _PREFIX = r"(?:[$€£]|usd\s?|us\$)"
+    _POSTFIX = r"(?:\s?(?:dollars?|usd|bucks|euros?))"
+    # The leading lookahead lets the scan skip characters no amount can start with
+    _PATTERN = re.compile(
+        r"(?=[$€£u\d" + "".join(sorted({word[0] for word in _UNITS} | set("ahtm"))) + r"])"
+        r"(?<![\w.,])(?P<prefix>" + _PREFIX + r")?(?P<low>" + _NUMBER + r")(?P<low_suffix>" + _SUFFIX + r")?"
+        r"(?:\s*(?:-|–|to)\s*(?P<range_prefix>" + _PREFIX + r")?(?P<high>" + _NUMBER + r")(?P<high_suffix>" + _SUFFIX + r")?)?"
+        r"(?P<postfix>" + _POSTFIX + r")?(?![\w])"
+    )
+    # Phone numbers ("555-1234", "(555) 123-4567", "555.123.4567")
+    _PHONE = re.compile(r"(?<![\w$€£.,-])(?:\+?\d{1,2}[\s.-])?(?:\(\d{3}\)\s?|\d{3}[\s.-])?\d{3}[.-]\d{4}(?![\w-]|[.,]\d)")
+    
+    def amounts(self, text: str) -> List[Dict[str, Any]]:
+        """Money amounts in ``text``, in order: ``amount`` (upper end of a range), ``low``, ``high``, ``explicit``"""
+        found = []
+        text = text.lower()
+        phones = [phone.span() for phone in self._PHONE.finditer(text)]
+        for match in self._PATTERN.finditer(text):
+            prefix, low_token, low_suffix, range_prefix, high_token, high_suffix, postfix = match.groups()
+            low = self._number(low_token) * (self._MAGNITUDES[low_suffix.strip()] if low_suffix else 1)
+            high = low
+            if high_token:
+                high = self._number(high_token)
+                high_scale = self._MAGNITUDES[high_suffix.strip()] if high_suffix else 1
+                # "5-7k": the suffix on the upper bound applies to both
+                if not low_suffix and low <= high:
+                    low *= high_scale
+                low, high = sorted((low, high * high_scale))
+            
+            explicit = bool(prefix or range_prefix or postfix)
+            if not explicit and not self._plausible_bare_amount(
+                match, low, high, [(low_token, low_suffix), (high_token, high_suffix)], phones
+            ):
+                continue
+            
+            found.append({"amount": high, "low": low, "high": high, "explicit": explicit, "text": match.group(0).strip()})
+        return found
+    
+    def scan(self, transcript: List[Dict[str, Any]], start: int = 0) -> List[Dict[str, Any]]:
+        """Every amount in the transcript with its ``turn`` index (counted from ``start``) and ``role``"""
+        found = []
+        for index, entry in enumerate(transcript, start):
+            text = entry.get("text") or entry.get("message") or ""
+            for amount in self.amounts(text):
+                amount.update(turn=index, role=entry.get("role", "unknown"))
+                found.append(amount)
+        return found
+    
+    def _plausible_bare_amount(
+        self,
+        match: "re.Match[str]",
+        low: float,
+        high: float,
+        tokens: List[Tuple[Optional[str], Optional[str]]],
+        phones: List[Tuple[int, int]]
+    ) -> bool:
+        """Whether an amount with no currency marker reads as a rate"""
+        rate_low, rate_high = self.BARE_RATE_RANGE
+        if not (rate_low <= low <= rate_high and rate_low <= high <= rate_high):
+            return False
+        
+        year_low, year_high = self.BARE_YEAR_RANGE
+        for token, suffix in tokens:
+            if token and not suffix and re.fullmatch(r"\d{4}", token) and year_low <= int(token) <= year_high:
+                return False
+        
+        start, end = match.span()
+        return not any(start < phone_end and phone_start < end for phone_start, phone_end in phones)
+    
+    @classmethod
+    def _number(cls, token: str) -> float:
+        if token[0].isdigit():
+            return float(token.replace(",", ""))
+        
+        total, current = 0, 0
+        for word in re.split(r"[\s-]+", token):
+            if word in cls._UNITS:
+                current += cls._UNITS[word]
+            elif word in ("a", "an"):
+                current += 1
+            elif word == "hundred":
+                current = (current or 1) * 100
+            elif word in ("thousand", "million"):
+                total += (current or 1) * cls._MAGNITUDES[word]
+                current = 0
+        return float(total + current)
+
+
 class ConversationAnalyzer:
     """
     🔍 ENHANCED CONVERSATION ANALYZER
@@ -92,22 +286,30 @@ class ConversationAnalyzer:
             "acceptance": ["yes", "agree", "deal", "accept", "sounds good", "perfect", "let's do it"],
             "rejection": ["no", "can't", "unable", "not interested", "pass", "decline"],
             "negotiation": ["counter", "instead", "how about", "what if", "maybe", "consider"],
-            "pricing": ["$", "dollar", "price", "rate", "cost", "budget", "pay", "fee"],
+            "pricing": [
+                "$", "€", "£", "usd", "dollar", "dollars", "bucks", "euro", "euros",
+                "price", "rate", "rates", "cost", "budget", "pay", "fee", "fees"
+            ],
             "positive": ["great", "awesome", "love", "perfect", "excellent", "fantastic"],
             "negative": ["unfortunately", "sorry", "can't", "won't", "issue", "problem"]
         }
+        self.keyword_matcher = KeywordMatcher(self.keywords)
+        self.money_tokenizer = MoneyTokenizer()
     
     async def analyze_negotiation_conversation(
         self,
         transcript: List[Dict[str, Any]],
         elevenlabs_analysis: Dict[str, Any],
         creator_profile: Dict[str, Any],
-        pricing_strategy: Dict[str, Any]
+        pricing_strategy: Dict[str, Any],
+        transcript_state: Optional["TranscriptState"] = None
     ) -> Dict[str, Any]:
         """
         🎯 COMPREHENSIVE CONVERSATION ANALYSIS
         
-        Combines transcript analysis with ElevenLabs analysis for better results
+        Combines transcript analysis with ElevenLabs analysis for better results.
+        ``transcript_state`` (live counters for this call) is brought up to date
+        with the remaining turns instead of re-analyzing the transcript.
         """
         
         # Start with base analysis structure
@@ -127,8 +329,8 @@ class ConversationAnalyzer:
                 analysis.update(self._extract_elevenlabs_analysis(elevenlabs_analysis))
             
             # 2. Perform transcript analysis
-            if transcript:
-                transcript_analysis = self._analyze_transcript(transcript)
+            if transcript or transcript_state is not None:
+                transcript_analysis = self._analyze_transcript(transcript, transcript_state)
                 analysis.update(transcript_analysis)
             
             # 3. Apply pricing logic
@@ -181,66 +383,21 @@ class ConversationAnalyzer:
         logger.info("📡 Extracted ElevenLabs analysis data")
         return extracted
     
-    def _analyze_transcript(self, transcript: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def new_transcript_state(self) -> "TranscriptState":
+        """Empty running counters using this analyzer's keywords"""
+        return TranscriptState(self)
+    
+    def _analyze_transcript(
+        self,
+        transcript: List[Dict[str, Any]],
+        state: Optional["TranscriptState"] = None
+    ) -> Dict[str, Any]:
         """Analyze conversation transcript for negotiation indicators"""
         
-        analysis = {
-            "key_points": [],
-            "pricing_mentions": [],
-            "sentiment_indicators": []
-        }
-        
-        acceptance_count = 0
-        rejection_count = 0
-        pricing_mentions = []
-        
-        for entry in transcript:
-            text = entry.get("text", "").lower()
-            role = entry.get("role", "unknown")
-            
-            # Count acceptance/rejection indicators
-            for keyword in self.keywords["acceptance"]:
-                if keyword in text:
-                    acceptance_count += 1
-                    analysis["key_points"].append(f"Acceptance: '{entry.get('text', '')[:50]}...'")
-            
-            for keyword in self.keywords["rejection"]:
-                if keyword in text:
-                    rejection_count += 1
-                    analysis["key_points"].append(f"Rejection: '{entry.get('text', '')[:50]}...'")
-            
-            # Extract pricing mentions
-            if any(keyword in text for keyword in self.keywords["pricing"]):
-                pricing_mentions.append(text)
-                analysis["pricing_mentions"].append(entry.get("text", ""))
-            
-            # Sentiment analysis
-            positive_count = sum(1 for keyword in self.keywords["positive"] if keyword in text)
-            negative_count = sum(1 for keyword in self.keywords["negative"] if keyword in text)
-            
-            if positive_count > negative_count:
-                analysis["sentiment_indicators"].append("positive")
-            elif negative_count > positive_count:
-                analysis["sentiment_indicators"].append("negative")
-        
-        # Determine outcome based on transcript analysis
-        if acceptance_count > rejection_count:
-            analysis["transcript_outcome"] = "accepted"
-        elif rejection_count > acceptance_count:
-            analysis["transcript_outcome"] = "rejected"
-        else:
-            analysis["transcript_outcome"] = "unclear"
-        
-        # Determine overall sentiment
-        positive_sentiment = analysis["sentiment_indicators"].count("positive")
-        negative_sentiment = analysis["sentiment_indicators"].count("negative")
-        
-        if positive_sentiment > negative_sentiment:
-            analysis["transcript_sentiment"] = "positive"
-        elif negative_sentiment > positive_sentiment:
-            analysis["transcript_sentiment"] = "negative"
-        else:
-            analysis["transcript_sentiment"] = "neutral"
+        # Only turns the counters have not seen yet
+        state = state if state is not None else self.new_transcript_state()
+        state.update(transcript[state.turns_seen:])
+        analysis = state.to_analysis()
         
         logger.info(f"📝 Transcript analysis: {analysis['transcript_outcome']} sentiment: {analysis['transcript_sentiment']}")
         return analysis
@@ -259,14 +416,10 @@ class ConversationAnalyzer:
         agreed_rate = current_analysis.get("agreed_rate")
         
         if not agreed_rate:
-            # Look for pricing in transcript mentions
-            pricing_mentions = current_analysis.get("pricing_mentions", [])
-            
-            if pricing_mentions:
-                # Try to extract numbers from pricing mentions
-                extracted_rate = self._extract_rate_from_text(pricing_mentions)
-                if extracted_rate:
-                    agreed_rate = extracted_rate
+            # Latest price mentioned in the transcript
+            latest_price = current_analysis.get("latest_price")
+            if latest_price:
+                agreed_rate = latest_price["rate"]
         
         # If still no rate, use pricing strategy defaults
         if not agreed_rate:
@@ -294,36 +447,6 @@ class ConversationAnalyzer:
         logger.info(f"💰 Pricing analysis: ${pricing_analysis['agreed_rate']}")
         return pricing_analysis
     
-    def _extract_rate_from_text(self, pricing_mentions: List[str]) -> Optional[float]:
-        """Extract numerical rate from pricing text mentions"""
-        
-        import re
-        
-        for mention in pricing_mentions:
-            # Look for dollar amounts
-            dollar_matches = re.findall(r'\$(\d+(?:,\d{3})*(?:\.\d{2})?)', mention)
-            if dollar_matches:
-                try:
-                    # Take the last mentioned amount (likely the agreed rate)
-                    amount_str = dollar_matches[-1].replace(',', '')
-                    return float(amount_str)
-                except ValueError:
-                    continue
-            
-            # Look for plain numbers in context of pricing
-            number_matches = re.findall(r'\b(\d+(?:,\d{3})*(?:\.\d{2})?)\b', mention)
-            if number_matches:
-                try:
-                    # Take numbers that look like rates (500-10000 range)
-                    for num_str in number_matches:
-                        num = float(num_str.replace(',', ''))
-                        if 500 <= num <= 10000:
-                            return num
-                except ValueError:
-                    continue
-        
-        return None
-    
     def _determine_final_outcome(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Determine final negotiation outcome and contract readiness"""
         
@@ -389,6 +512,183 @@ class ConversationAnalyzer:
         return final
 
 
+class TranscriptState:
+    """
+    📝 RUNNING TRANSCRIPT ANALYSIS
+    
+    The counters behind ``ConversationAnalyzer._analyze_transcript``, kept per
+    conversation and updated in O(new turns), so a call can be analyzed while
+    its transcript grows and the outcome is known as soon as it ends.
+    """
+    
+    def __init__(self, analyzer: ConversationAnalyzer):
+        self.analyzer = analyzer
+        self.turns_seen = 0
+        self.acceptance_count = 0
+        self.rejection_count = 0
+        self.key_points: List[str] = []
+        self.pricing_mentions: List[str] = []
+        self.sentiment_indicators: List[str] = []
+        self.price_mentions: List[Dict[str, Any]] = []
+        self.latest_price: Optional[Dict[str, Any]] = None
+        self.updated_at: Optional[datetime] = None
+    
+    def update(self, turns: List[Dict[str, Any]]) -> "TranscriptState":
+        """Fold new turns (in order, following the ones already seen) into the counters"""
+        for entry in turns:
+            self._add_turn(self.turns_seen, entry)
+            self.turns_seen += 1
+        if turns:
+            self.updated_at = datetime.now()
+        return self
+    
+    def _add_turn(self, index: int, entry: Dict[str, Any]) -> None:
+        raw_text = entry.get("text") or entry.get("message") or ""
+        role = entry.get("role", "unknown")
+        hits = self.analyzer.keyword_matcher.match(raw_text)
+        
+        # Count acceptance/rejection indicators (one per distinct keyword)
+        acceptance_hits = hits.get("acceptance", 0)
+        if acceptance_hits:
+            self.acceptance_count += acceptance_hits
+            self.key_points.extend([f"Acceptance: '{raw_text[:50]}...'"] * acceptance_hits)
+        
+        rejection_hits = hits.get("rejection", 0)
+        if rejection_hits:
+            self.rejection_count += rejection_hits
+            self.key_points.extend([f"Rejection: '{raw_text[:50]}...'"] * rejection_hits)
+        
+        # Money amounts in pricing talk (currency markers are pricing keywords);
+        # the last one is the latest price
+        if "pricing" in hits:
+            self.pricing_mentions.append(raw_text)
+            amounts = self.analyzer.money_tokenizer.amounts(raw_text)
+            for amount in amounts:
+                amount.update(turn=index, role=role)
+                self.price_mentions.append(amount)
+            if amounts:
+                self.latest_price = {"rate": amounts[-1]["amount"], "turn": index, "role": role}
+        
+        # Sentiment analysis
+        positive_count = hits.get("positive", 0)
+        negative_count = hits.get("negative", 0)
+        
+        if positive_count > negative_count:
+            self.sentiment_indicators.append("positive")
+        elif negative_count > positive_count:
+            self.sentiment_indicators.append("negative")
+    
+    @property
+    def outcome(self) -> str:
+        if self.acceptance_count > self.rejection_count:
+            return "accepted"
+        if self.rejection_count > self.acceptance_count:
+            return "rejected"
+        return "unclear"
+    
+    @property
+    def sentiment(self) -> str:
+        positive_sentiment = self.sentiment_indicators.count("positive")
+        negative_sentiment = len(self.sentiment_indicators) - positive_sentiment
+        if positive_sentiment > negative_sentiment:
+            return "positive"
+        if negative_sentiment > positive_sentiment:
+            return "negative"
+        return "neutral"
+    
+    def to_analysis(self) -> Dict[str, Any]:
+        """Same fields ``_analyze_transcript`` has always returned, plus ``price_mentions`` and ``latest_price``"""
+        return {
+            "key_points": list(self.key_points),
+            "pricing_mentions": list(self.pricing_mentions),
+            "sentiment_indicators": list(self.sentiment_indicators),
+            "transcript_outcome": self.outcome,
+            "transcript_sentiment": self.sentiment,
+            "price_mentions": list(self.price_mentions),
+            "latest_price": self.latest_price
+        }
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Compact live view for monitoring"""
+        return {
+            "turns": self.turns_seen,
+            "acceptance_signals": self.acceptance_count,
+            "rejection_signals": self.rejection_count,
+            "outcome": self.outcome,
+            "sentiment": self.sentiment,
+            "latest_price": self.latest_price,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+        }
+
+
+class LiveNegotiationTracker:
+    """
+    📡 LIVE NEGOTIATION STATE
+    
+    Subscribed to the conversation store: every transcript turn the voice
+    layer receives (status polls, post-call webhook) is folded into a
+    ``TranscriptState`` for its conversation. LRU-bounded like the store.
+    """
+    
+    def __init__(self, analyzer: Optional[ConversationAnalyzer] = None, max_entries: Optional[int] = None):
+        self.analyzer = analyzer or ConversationAnalyzer()
+        self.max_entries = max_entries or settings.conversation_store_max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+    
+    def on_turns(self, record: ConversationRecord, start: int, new_turns: List[Dict[str, Any]]) -> None:
+        """Conversation store listener"""
+        entry = self._entries.get(record.conversation_id)
+        if entry is None:
+            entry = {"state": self.analyzer.new_transcript_state(), "started_at": datetime.now()}
+            self._entries[record.conversation_id] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(record.conversation_id)
+        
+        entry["status"] = record.status
+        state: TranscriptState = entry["state"]
+        
+        # The final analysis may already have read some of these turns; an entry
+        # created late (lazily, or after eviction) catches up from the transcript
+        if state.turns_seen < start:
+            transcript = record.data.get("transcript") or []
+            state.update(transcript[state.turns_seen:start + len(new_turns)])
+        else:
+            state.update(new_turns[state.turns_seen - start:])
+    
+    def get(self, conversation_id: str) -> Optional[TranscriptState]:
+        entry = self._entries.get(conversation_id)
+        return entry["state"] if entry else None
+    
+    def discard(self, conversation_id: str) -> None:
+        self._entries.pop(conversation_id, None)
+    
+    def snapshot(self, conversation_id: Optional[str] = None) -> Dict[str, Any]:
+        """Live negotiation state per conversation (or just ``conversation_id``'s)"""
+        ids = [conversation_id] if conversation_id else list(self._entries)
+        return {
+            cid: {
+                "status": self._entries[cid]["status"],
+                "started_at": self._entries[cid]["started_at"].isoformat(),
+                **self._entries[cid]["state"].snapshot()
+            }
+            for cid in ids if cid in self._entries
+        }
+
+
+_live_tracker: Optional[LiveNegotiationTracker] = None
+
+
+def get_live_negotiation_tracker() -> LiveNegotiationTracker:
+    """Process-wide tracker, subscribed to the default conversation store on first use"""
+    global _live_tracker
+    if _live_tracker is None:
+        _live_tracker = LiveNegotiationTracker()
+        get_conversation_store().add_turn_listener(_live_tracker.on_turns)
+    return _live_tracker
+
+
 class NegotiationResultValidator:
     """
     ✅ NEGOTIATION RESULT VALIDATOR
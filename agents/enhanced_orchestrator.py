@@ -3,25 +3,21 @@ import json
 import asyncio
 import logging
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable
 
 from models.campaign import (
-    CampaignOrchestrationState, CampaignData,
-    NegotiationState, NegotiationStatus
+    CampaignOrchestrationState, CampaignData, Creator, CreatorMatch,
+    NegotiationState, NegotiationStatus, OrchestrationPhase
 )
 from agents.discovery import InfluencerDiscoveryAgent
-from services.database import DatabaseService  # ← ADD DATABASE IMPORT
-from config.settings import settings
+from services.database import DatabaseService, UnitOfWork  # ← ADD DATABASE IMPORT
+from services.checkpoint_store import CheckpointStore, create_checkpoint_store
+from services.llm_gateway import LLMGateway
 
 logger = logging.getLogger(__name__)
 
-# Import Groq for AI intelligence
-try:
-    from groq import Groq
-    GROQ_AVAILABLE = True
-except ImportError:
-    GROQ_AVAILABLE = False
-    logger.warning("⚠️ Groq not available - using default orchestration")
+# (task_id, state) - called with the live state after every checkpoint
+StateListener = Callable[[str, CampaignOrchestrationState], None]
 
 class EnhancedCampaignOrchestrator:
     """
@@ -35,11 +31,31 @@ class EnhancedCampaignOrchestrator:
     ✅ No legacy code retention
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        discovery_agent: Optional[InfluencerDiscoveryAgent] = None,
+        database_service: Optional[DatabaseService] = None,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        llm_gateway: Optional[LLMGateway] = None,
+        state_listener: Optional[StateListener] = None
+    ):
         """Initialize orchestrator with minimal required components"""
-        self.discovery_agent = InfluencerDiscoveryAgent()
-        self.groq_client = self._initialize_groq_client()
-        self.database_service = None  # ← ADD: Will be injected from main.py
+        self.discovery_agent = discovery_agent or InfluencerDiscoveryAgent()
+        self.llm_gateway = llm_gateway or LLMGateway()
+        self.database_service = database_service  # Shared instance from the service container
+        self.checkpoint_store = checkpoint_store or create_checkpoint_store()
+        self.state_listener = state_listener  # e.g. the web process's monitoring map
+        self.max_creators = 5  # discovery candidates streamed into negotiations
+        self._phase_writes: Dict[str, UnitOfWork] = {}  # campaign id -> the running phase's unit of work
+        
+        # Phase → (log line, handler, next phase)
+        self._phase_table = {
+            OrchestrationPhase.INITIALIZING: ("💾 Phase 0: Database", self._initialize_phase, OrchestrationPhase.STRATEGY),
+            OrchestrationPhase.STRATEGY: ("🧠 Phase 1: AI Strategy", self._run_strategy_phase, OrchestrationPhase.NEGOTIATIONS),
+            OrchestrationPhase.NEGOTIATIONS: ("🔍📞 Phases 2-3: Discovery → Negotiations (pipelined)", self._run_negotiations_phase, OrchestrationPhase.CONTRACTS),
+            OrchestrationPhase.CONTRACTS: ("📝 Phase 4: Contracts", self._run_contracts_phase, OrchestrationPhase.FINALIZING),
+            OrchestrationPhase.FINALIZING: ("🏁 Phase 5: Completion", self._run_completion_phase, OrchestrationPhase.COMPLETED),
+        }
         
         logger.info("🧠 Enhanced Campaign Orchestrator initialized")
 
@@ -51,8 +67,6 @@ class EnhancedCampaignOrchestrator:
         """
         🎯 WEBHOOK-COMPATIBLE METHOD - MISSING COMPLETE IMPLEMENTATION
         """
-        logger.info(f"🎯 Starting enhanced campaign orchestration: {task_id}")
-        
         try:
             # *** PROBLEM: Missing database initialization logic ***
             if self.database_service:
@@ -64,11 +78,8 @@ class EnhancedCampaignOrchestrator:
                     logger.error(f"❌ Database initialization failed: {e}")
                     orchestration_state.database_enabled = False
             
-            # *** PROBLEM: This calls the wrong method signature ***
-            return await self.orchestrate_enhanced_campaign(
-                orchestration_state.campaign_data,  # ✅ Extract campaign_data
-                task_id
-            )
+            # Run the phases on the caller's state (resumes from a checkpoint if one exists)
+            return await self._run_phases(orchestration_state, task_id)
             
         except Exception as e:
             logger.error(f"❌ Enhanced orchestration failed: {e}")
@@ -87,15 +98,6 @@ class EnhancedCampaignOrchestrator:
             
             return orchestration_state
         
-    def _initialize_groq_client(self) -> Optional[Groq]:
-        """Initialize Groq client with proper error handling"""
-        if GROQ_AVAILABLE and hasattr(settings, 'groq_api_key') and settings.groq_api_key:
-            try:
-                return Groq(api_key=settings.groq_api_key)
-            except Exception as e:
-                logger.warning(f"⚠️ Groq initialization failed: {e}")
-        return None
-    
     async def orchestrate_enhanced_campaign(
         self,
         campaign_data: CampaignData,
@@ -107,37 +109,38 @@ class EnhancedCampaignOrchestrator:
         Uses only actual model fields, no over-engineering
         """
         
-        logger.info(f"🎯 Starting enhanced campaign orchestration: {task_id}")
-        
         # Initialize state with ONLY fields that exist in the model
         state = CampaignOrchestrationState(
             campaign_id=campaign_data.id,
             campaign_data=campaign_data
         )
         
+        return await self._run_phases(state, task_id)
+    
+    async def _run_phases(
+        self,
+        state: CampaignOrchestrationState,
+        task_id: str
+    ) -> CampaignOrchestrationState:
+        """
+        Drive the phase state machine, checkpointing after every phase so a
+        retried job resumes where the previous worker stopped
+        """
+        checkpoint = await self._load_checkpoint(task_id)
+        if checkpoint:
+            logger.info(f"♻️ Resuming campaign {checkpoint.campaign_id} from phase '{checkpoint.phase.value}'")
+            state = checkpoint
+        
+        logger.info(f"🎯 Starting enhanced campaign orchestration: {task_id}")
+        
         try:
-            # *** ADD: Database initialization if available ***
-            await self._initialize_database_if_available(state)
-            
-            # Phase 1: Discovery (with database storage)
-            logger.info("🔍 Phase 1: Discovery")
-            await self._run_discovery_phase(state)
-            
-            # Phase 2: AI Strategy Generation (with database storage)
-            logger.info("🧠 Phase 2: AI Strategy")
-            await self._run_strategy_phase(state)
-            
-            # Phase 3: Negotiations (with database storage)
-            logger.info("📞 Phase 3: Negotiations")
-            await self._run_negotiations_phase(state)
-            
-            # Phase 4: Contracts (with database storage)
-            logger.info("📝 Phase 4: Contracts")
-            await self._run_contracts_phase(state)
-            
-            # Phase 5: Completion (with database storage)
-            logger.info("🏁 Phase 5: Completion")
-            await self._run_completion_phase(state)
+            while state.phase != OrchestrationPhase.COMPLETED:
+                description, handler, next_phase = self._phase_table[state.phase]
+                logger.info(description)
+                await self._run_phase(handler, state, task_id)
+                
+                state.phase = next_phase
+                await self._checkpoint(task_id, state)
             
             logger.info(f"✅ Campaign orchestration completed: {task_id}")
             return state
@@ -150,9 +153,67 @@ class EnhancedCampaignOrchestrator:
             # *** ADD: Mark as failed in database ***
             await self._mark_campaign_failed_in_db(state, str(e))
             
+            # Phase is left unchanged so a retry resumes the failed phase
+            await self._checkpoint(task_id, state)
             return state
     
+    async def _run_phase(self, handler, state: CampaignOrchestrationState, task_id: str):
+        """Run one phase with all of its database writes batched into one unit of work"""
+        if not (state.database_enabled and self.database_service):
+            await handler(state, task_id)
+            return
+        
+        uow = self.database_service.unit_of_work()
+        self._phase_writes[state.campaign_id] = uow
+        try:
+            await handler(state, task_id)
+        finally:
+            self._phase_writes.pop(state.campaign_id, None)
+        
+        # Creators, negotiations and contracts staged here are also on the state, so
+        # if this write fails the final sync stores them
+        await self._flush_writes(uow)
+    
+    def _writes(self, state: CampaignOrchestrationState) -> Optional[UnitOfWork]:
+        """The running phase's unit of work (None when the database is disabled)"""
+        if state.database_enabled and self.database_service:
+            return self._phase_writes.get(state.campaign_id)
+        return None
+    
+    async def _flush_writes(self, uow: Optional[UnitOfWork]):
+        """Flush point - database errors are logged, never fatal to the campaign"""
+        if uow is None:
+            return
+        try:
+            await uow.flush()
+        except Exception as e:
+            logger.error(f"❌ Failed to write phase results to database: {e}")
+    
+    async def _load_checkpoint(self, task_id: str) -> Optional[CampaignOrchestrationState]:
+        """Load the last checkpoint for this task, if any"""
+        try:
+            return await self.checkpoint_store.load(task_id)
+        except Exception as e:
+            logger.error(f"❌ Failed to load checkpoint for {task_id}: {e}")
+            return None
+    
+    async def _checkpoint(self, task_id: str, state: CampaignOrchestrationState):
+        """Persist the state so a restarted worker can resume from here"""
+        state.checkpoint_version += 1
+        try:
+            await self.checkpoint_store.save(task_id, state)
+        except Exception as e:
+            # A missed checkpoint only costs repeated work on resume - keep going
+            logger.error(f"❌ Checkpoint failed for {task_id}: {e}")
+        
+        if self.state_listener:
+            self.state_listener(task_id, state)
+    
     # *** ADD: Minimal database integration methods ***
+    async def _initialize_phase(self, state: CampaignOrchestrationState, task_id: str):
+        """💾 Create the campaign record (only runs once per task)"""
+        await self._initialize_database_if_available(state)
+    
     async def _initialize_database_if_available(self, state: CampaignOrchestrationState):
         """Initialize database if available - simple and clean"""
         if self.database_service:
@@ -167,91 +228,68 @@ class EnhancedCampaignOrchestrator:
         else:
             state.database_enabled = False
     
-    async def _store_creators_in_db(self, state: CampaignOrchestrationState):
-        """Store discovered creators - simple implementation"""
-        if state.database_enabled and self.database_service:
-            for influencer_match in state.discovered_influencers:
-                try:
-                    await self.database_service.create_or_update_creator(influencer_match.creator)
-                    logger.info(f"✅ Creator stored: {influencer_match.creator.name}")
-                except Exception as e:
-                    logger.error(f"❌ Failed to store creator: {e}")
+    def _store_creator_in_db(self, state: CampaignOrchestrationState, creator: Creator):
+        """Stage a discovered creator for the phase's database write"""
+        uow = self._writes(state)
+        if uow:
+            uow.upsert_creator(creator)
     
-    async def _store_negotiation_in_db(self, state: CampaignOrchestrationState, negotiation: NegotiationState):
-        """Store negotiation result - simple implementation"""
-        if state.database_enabled and self.database_service:
-            try:
-                negotiation_data = {
-                    "status": negotiation.status,
-                    "initial_rate": getattr(negotiation, 'initial_rate', None),
-                    "final_rate": negotiation.final_rate,
-                    "negotiated_terms": negotiation.negotiated_terms,
-                    "call_status": getattr(negotiation, 'call_status', 'completed'),
-                    "email_status": getattr(negotiation, 'email_status', 'sent'),
-                    "last_contact_date": negotiation.completed_at or datetime.now()
-                }
-                
-                db_negotiation = await self.database_service.create_negotiation(
-                    state.campaign_id,
-                    negotiation.creator_id,
-                    negotiation_data
-                )
-                logger.info(f"✅ Negotiation stored: {db_negotiation.id}")
-                
-            except Exception as e:
-                logger.error(f"❌ Failed to store negotiation: {e}")
+    def _store_negotiation_in_db(self, state: CampaignOrchestrationState, negotiation: NegotiationState):
+        """Stage a negotiation result for the phase's database write"""
+        uow = self._writes(state)
+        if uow:
+            uow.add_negotiation(state.campaign_id, negotiation.creator_id, {
+                "status": negotiation.status,
+                "initial_rate": negotiation.initial_offer,
+                "final_rate": negotiation.final_rate,
+                "negotiated_terms": negotiation.negotiated_terms,
+                "call_status": negotiation.call_status,
+                "email_status": negotiation.email_status,
+                "call_duration_seconds": negotiation.call_duration_seconds,
+                "call_recording_url": negotiation.call_recording_url,
+                "call_transcript": negotiation.call_transcript,
+                "last_contact_date": negotiation.completed_at or datetime.now()
+            })
     
-    async def _store_contract_in_db(self, state: CampaignOrchestrationState, contract: Dict[str, Any]):
-        """Store contract - simple implementation"""
-        if state.database_enabled and self.database_service:
-            try:
-                db_contract = await self.database_service.create_contract({
-                    "id": contract["contract_id"],
-                    "campaign_id": contract["campaign_id"],
-                    "creator_id": contract["creator_id"],
-                    "compensation_amount": contract["compensation"],
-                    "deliverables": contract["terms"].get("deliverables", []),
-                    "timeline": {"duration": contract["terms"].get("timeline", "")},
-                    "usage_rights": {"period": contract["terms"].get("usage_rights", "")},
-                    "status": contract["status"],
-                    "contract_text": f"Contract for {contract['creator_id']}"
-                })
-                logger.info(f"✅ Contract stored: {db_contract.id}")
-                
-            except Exception as e:
-                logger.error(f"❌ Failed to store contract: {e}")
+    def _store_contract_in_db(self, state: CampaignOrchestrationState, contract: Dict[str, Any]):
+        """Stage a contract for the phase's database write"""
+        uow = self._writes(state)
+        if uow:
+            uow.add_contract({
+                "id": contract["contract_id"],
+                "campaign_id": contract["campaign_id"],
+                "creator_id": contract["creator_id"],
+                "compensation_amount": contract["compensation"],
+                "deliverables": contract["terms"].get("deliverables", []),
+                "timeline": {"duration": contract["terms"].get("timeline", "")},
+                "usage_rights": {"period": contract["terms"].get("usage_rights", "")},
+                "status": contract["status"],
+                "contract_text": f"Contract for {contract['creator_id']}"
+            })
     
-    async def _update_campaign_totals_in_db(self, state: CampaignOrchestrationState):
-        """Update campaign totals - simple implementation"""
-        if state.database_enabled and self.database_service:
-            try:
-                await self.database_service.update_campaign(
-                    state.campaign_id,
-                    {
-                        "influencer_count": state.successful_negotiations,
-                        "total_cost": state.total_cost
-                    }
-                )
-                logger.info(f"✅ Campaign totals updated: {state.successful_negotiations} influencers, ${state.total_cost}")
-                
-            except Exception as e:
-                logger.error(f"❌ Failed to update campaign totals: {e}")
+    def _update_campaign_totals_in_db(self, state: CampaignOrchestrationState):
+        """Stage campaign totals - repeated updates in a phase collapse into one UPDATE"""
+        uow = self._writes(state)
+        if uow:
+            uow.update_campaign(
+                state.campaign_id,
+                {
+                    "influencer_count": state.successful_negotiations,
+                    "total_cost": state.total_cost
+                }
+            )
     
-    async def _mark_campaign_completed_in_db(self, state: CampaignOrchestrationState):
-        """Mark campaign as completed - simple implementation"""
-        if state.database_enabled and self.database_service:
-            try:
-                await self.database_service.update_campaign(
-                    state.campaign_id,
-                    {
-                        "status": "completed",
-                        "completed_at": state.completed_at
-                    }
-                )
-                logger.info("✅ Campaign marked as completed in database")
-                
-            except Exception as e:
-                logger.error(f"❌ Failed to mark campaign completed: {e}")
+    def _mark_campaign_completed_in_db(self, state: CampaignOrchestrationState):
+        """Stage the campaign's completion"""
+        uow = self._writes(state)
+        if uow:
+            uow.update_campaign(
+                state.campaign_id,
+                {
+                    "status": "completed",
+                    "completed_at": state.completed_at
+                }
+            )
     
     async def _mark_campaign_failed_in_db(self, state: CampaignOrchestrationState, error_message: str):
         """Mark campaign as failed - simple implementation"""
@@ -270,27 +308,46 @@ class EnhancedCampaignOrchestrator:
                 logger.error(f"❌ Failed to mark campaign failed: {e}")
     
     # *** UPDATED: Existing methods with database integration ***
-    async def _run_discovery_phase(self, state: CampaignOrchestrationState):
-        """🔍 Run discovery phase - simple and clean WITH DATABASE"""
-        state.current_stage = "discovery"
-        
-        # Use discovery agent to find influencers
-        discovered = await self.discovery_agent.discover_influencers(
-            niche=state.campaign_data.product_niche,
-            budget=state.campaign_data.total_budget
-        )
+    async def _run_discovery_phase(
+        self,
+        state: CampaignOrchestrationState,
+        task_id: str,
+        candidates: Optional[asyncio.Queue] = None
+    ):
+        """🔍 Stream discovery results - each match is handed to negotiations as soon as it is found"""
+        known_ids = {match.creator.id for match in state.discovered_influencers}
         
-        state.discovered_influencers = discovered
-        logger.info(f"🔍 Discovered {len(discovered)} influencers")
+        try:
+            # Resumed run: creators discovered before the restart go first
+            if candidates is not None:
+                for match in state.discovered_influencers:
+                    await candidates.put(match)
+            
+            async for match in self.discovery_agent.stream_matches(
+                state.campaign_data,
+                max_results=self.max_creators
+            ):
+                if match.creator.id in known_ids:
+                    continue
+                known_ids.add(match.creator.id)
+                state.discovered_influencers.append(match)
+                
+                if candidates is not None:
+                    await candidates.put(match)
+                
+                # *** ADD: Store creator in database ***
+                self._store_creator_in_db(state, match.creator)
+        finally:
+            if candidates is not None:
+                await candidates.put(None)  # End of stream
         
-        # *** ADD: Store creators in database ***
-        await self._store_creators_in_db(state)
+        logger.info(f"🔍 Discovered {len(state.discovered_influencers)} influencers")
     
-    async def _run_strategy_phase(self, state: CampaignOrchestrationState):
+    async def _run_strategy_phase(self, state: CampaignOrchestrationState, task_id: str):
         """🧠 Generate AI strategy - clean implementation WITH DATABASE"""
         state.current_stage = "strategy"
         
-        if self.groq_client:
+        if self.llm_gateway.ai_enabled:
             try:
                 strategy = await self._generate_ai_strategy(state)
                 state.ai_strategy = strategy
@@ -302,15 +359,9 @@ class EnhancedCampaignOrchestrator:
             state.ai_strategy = "Default strategy - Groq not available"
         
         # *** ADD: Store strategy in database ***
-        if state.database_enabled and self.database_service:
-            try:
-                await self.database_service.update_campaign(
-                    state.campaign_id,
-                    {"ai_strategy": state.ai_strategy}
-                )
-                logger.info("✅ AI strategy stored in database")
-            except Exception as e:
-                logger.error(f"❌ Failed to store strategy: {e}")
+        uow = self._writes(state)
+        if uow:
+            uow.update_campaign(state.campaign_id, {"ai_strategy": state.ai_strategy})
     
     async def _generate_ai_strategy(self, state: CampaignOrchestrationState) -> str:
         """Generate AI strategy using Groq - simple and focused"""
@@ -329,73 +380,129 @@ class EnhancedCampaignOrchestrator:
         Keep response under 150 words.
         """
         
-        response = self.groq_client.chat.completions.create(
+        return await self.llm_gateway.complete(
+            prompt,
             model="llama3-8b-8192",
-            messages=[{"role": "user", "content": prompt}],
             max_tokens=200,
             temperature=0.7
         )
-        
-        return response.choices[0].message.content
     
-    async def _run_negotiations_phase(self, state: CampaignOrchestrationState):
-        """📞 Run negotiations phase - clean and simple WITH DATABASE"""
+    async def _run_negotiations_phase(self, state: CampaignOrchestrationState, task_id: str):
+        """📞 Run negotiations pipelined with discovery and per-creator contracts WITH DATABASE"""
         state.current_stage = "negotiations"
         
+        candidates: asyncio.Queue = asyncio.Queue()
+        contract_tasks: List[asyncio.Task] = []
+        already_negotiated = set(state.negotiated_creator_ids)
+        
+        discovery_task = asyncio.create_task(self._run_discovery_phase(state, task_id, candidates))
+        
+        try:
+            position = 0
+            while True:
+                influencer_match = await candidates.get()
+                if influencer_match is None:
+                    break
+                
+                position += 1
+                negotiation = await self._negotiate_with_match(
+                    state, task_id, influencer_match, position, already_negotiated
+                )
+                
+                # Contract generation starts now, not after the whole phase
+                if negotiation and negotiation.status == NegotiationStatus.SUCCESS:
+                    contract_tasks.append(asyncio.create_task(self._generate_contract(state, negotiation)))
+        finally:
+            if not discovery_task.done():
+                discovery_task.cancel()
+            await asyncio.gather(discovery_task, return_exceptions=True)
+            await asyncio.gather(*contract_tasks, return_exceptions=True)
+        
+        # Surface discovery failures so the phase is retried from its checkpoint
+        if not discovery_task.cancelled() and discovery_task.exception():
+            raise discovery_task.exception()
+        
         if not state.discovered_influencers:
             logger.warning("⚠️ No influencers discovered for negotiations")
-            return
+    
+    async def _negotiate_with_match(
+        self,
+        state: CampaignOrchestrationState,
+        task_id: str,
+        influencer_match: CreatorMatch,
+        position: int,
+        already_negotiated: set
+    ) -> Optional[NegotiationState]:
+        """Negotiate with one streamed candidate; None if it was handled before a restart"""
+        creator = influencer_match.creator
         
-        # Process each influencer with simple logic
-        for i, influencer_match in enumerate(state.discovered_influencers):
-            creator = influencer_match.creator
-            logger.info(f"📞 Processing creator {i+1}: {creator.name}")
-            
-            # Create negotiation record
-            negotiation = NegotiationState(
-                creator_id=creator.id,
-                campaign_id=state.campaign_id
-            )
+        # Resumed run: skip creators whose result is already checkpointed
+        if creator.id in already_negotiated:
+            logger.info(f"⏭️ Skipping {creator.name} - already negotiated before restart")
+            return None
+        
+        # Create negotiation record
+        negotiation = NegotiationState(
+            creator_id=creator.id,
+            campaign_id=state.campaign_id
+        )
+        
+        # Resumed run: a call was started but never recorded - don't contact twice
+        if creator.id in state.in_flight_creator_ids:
+            logger.warning(f"⚠️ Negotiation with {creator.name} was interrupted - not repeating")
+            negotiation.status = NegotiationStatus.FAILED
+            negotiation.failure_reason = "Interrupted by worker restart - call not repeated"
+            negotiation.completed_at = datetime.now()
+            state.negotiations.append(negotiation)
+            state.failed_negotiations += 1
+            state.in_flight_creator_ids.remove(creator.id)
+            await self._checkpoint(task_id, state)
+            return None
+        
+        logger.info(f"📞 Processing creator {position}: {creator.name}")
+        state.current_influencer = creator.name
+        state.in_flight_creator_ids.append(creator.id)
+        await self._checkpoint(task_id, state)
+        
+        try:
+            # Simple negotiation simulation
+            success = await self._simulate_negotiation(creator, state.campaign_data)
             
-            try:
-                # Simple negotiation simulation
-                success = await self._simulate_negotiation(creator, state.campaign_data)
-                
-                if success:
-                    negotiation.status = NegotiationStatus.SUCCESS
-                    negotiation.final_rate = influencer_match.estimated_rate
-                    negotiation.negotiated_terms = {
-                        "deliverables": ["1 Instagram post", "3 Stories"],
-                        "timeline": "2 weeks",
-                        "usage_rights": "1 year"
-                    }
-                    state.successful_negotiations += 1
-                    state.total_cost += negotiation.final_rate
-                    logger.info(f"✅ Successful negotiation: {creator.name} - ${negotiation.final_rate}")
-                else:
-                    negotiation.status = NegotiationStatus.FAILED
-                    negotiation.failure_reason = "Rate disagreement"
-                    state.failed_negotiations += 1
-                    logger.info(f"❌ Failed negotiation: {creator.name}")
-                
-                negotiation.completed_at = datetime.now()
-                state.negotiations.append(negotiation)
-                
-                # *** ADD: Store negotiation in database ***
-                await self._store_negotiation_in_db(state, negotiation)
-                
-                # *** ADD: Update campaign totals ***
-                await self._update_campaign_totals_in_db(state)
-                
-            except Exception as e:
-                logger.error(f"❌ Negotiation error for {creator.name}: {e}")
+            if success:
+                negotiation.status = NegotiationStatus.SUCCESS
+                negotiation.final_rate = influencer_match.estimated_rate
+                negotiation.negotiated_terms = {
+                    "deliverables": ["1 Instagram post", "3 Stories"],
+                    "timeline": "2 weeks",
+                    "usage_rights": "1 year"
+                }
+                state.successful_negotiations += 1
+                state.total_cost += negotiation.final_rate
+                logger.info(f"✅ Successful negotiation: {creator.name} - ${negotiation.final_rate}")
+            else:
                 negotiation.status = NegotiationStatus.FAILED
-                negotiation.failure_reason = str(e)
-                negotiation.completed_at = datetime.now()
-                state.negotiations.append(negotiation)
-                
-                # Store failed negotiation too
-                await self._store_negotiation_in_db(state, negotiation)
+                negotiation.failure_reason = "Rate disagreement"
+                state.failed_negotiations += 1
+                logger.info(f"❌ Failed negotiation: {creator.name}")
+            
+        except Exception as e:
+            logger.error(f"❌ Negotiation error for {creator.name}: {e}")
+            negotiation.status = NegotiationStatus.FAILED
+            negotiation.failure_reason = str(e)
+            state.failed_negotiations += 1
+        
+        negotiation.completed_at = datetime.now()
+        state.negotiations.append(negotiation)
+        state.in_flight_creator_ids.remove(creator.id)
+        await self._checkpoint(task_id, state)
+        
+        # *** ADD: Store negotiation in database ***
+        self._store_negotiation_in_db(state, negotiation)
+        
+        # *** ADD: Update campaign totals ***
+        self._update_campaign_totals_in_db(state)
+        
+        return negotiation
     
     async def _simulate_negotiation(self, creator, campaign_data) -> bool:
         """Simple negotiation simulation - clean logic"""
@@ -404,8 +511,8 @@ class EnhancedCampaignOrchestrator:
             return True
         return False
     
-    async def _run_contracts_phase(self, state: CampaignOrchestrationState):
-        """📝 Generate contracts - simple and clean WITH DATABASE"""
+    async def _run_contracts_phase(self, state: CampaignOrchestrationState, task_id: str):
+        """📝 Generate any contracts not already started during negotiations WITH DATABASE"""
         state.current_stage = "contracts"
         
         successful_negotiations = [
@@ -417,29 +524,36 @@ class EnhancedCampaignOrchestrator:
             logger.warning("⚠️ No successful negotiations - skipping contracts")
             return
         
-        # Generate simple contracts
         for negotiation in successful_negotiations:
-            try:
-                contract = self._create_contract(negotiation, state.campaign_data)
-                state.contracts.append(contract)
-                
-                # Update negotiation with contract info
-                negotiation.negotiated_terms["contract_generated"] = True
-                negotiation.negotiated_terms["contract_id"] = contract["contract_id"]
-                
-                logger.info(f"📝 Contract generated: {contract['contract_id']}")
-                
-                # *** ADD: Store contract in database ***
-                await self._store_contract_in_db(state, contract)
-                
-            except Exception as e:
-                logger.error(f"❌ Contract generation failed: {e}")
+            await self._generate_contract(state, negotiation)
         
         logger.info(f"📝 Generated {len(state.contracts)} contracts")
     
+    async def _generate_contract(self, state: CampaignOrchestrationState, negotiation: NegotiationState):
+        """📝 Generate and store one creator's contract (idempotent across restarts)"""
+        if negotiation.negotiated_terms.get("contract_generated"):
+            return
+        
+        try:
+            contract = self._create_contract(negotiation, state.campaign_data)
+            state.contracts.append(contract)
+            
+            # Update negotiation with contract info
+            negotiation.negotiated_terms["contract_generated"] = True
+            negotiation.negotiated_terms["contract_id"] = contract["contract_id"]
+            
+            logger.info(f"📝 Contract generated: {contract['contract_id']}")
+            
+            # *** ADD: Store contract in database ***
+            self._store_contract_in_db(state, contract)
+            
+        except Exception as e:
+            logger.error(f"❌ Contract generation failed: {e}")
+    
     def _create_contract(self, negotiation: NegotiationState, campaign_data: CampaignData) -> Dict[str, Any]:
         """Create simple contract - no over-engineering"""
-        contract_id = f"contract_{negotiation.creator_id}_{int(datetime.now().timestamp())}"
+        # Same id on every retry of the campaign, so a re-run never stores a second contract
+        contract_id = f"contract_{negotiation.creator_id}_{negotiation.campaign_id}"
         
         return {
             "contract_id": contract_id,
@@ -451,7 +565,7 @@ class EnhancedCampaignOrchestrator:
             "created_at": datetime.now().isoformat()
         }
     
-    async def _run_completion_phase(self, state: CampaignOrchestrationState):
+    async def _run_completion_phase(self, state: CampaignOrchestrationState, task_id: str):
         """🏁 Complete campaign - simple and clean WITH DATABASE"""
         state.current_stage = "completed"
         state.completed_at = datetime.now()
@@ -463,7 +577,7 @@ class EnhancedCampaignOrchestrator:
         logger.info(f"📊 Results: {state.successful_negotiations} successful, {len(state.contracts)} contracts")
         
         # *** ADD: Mark campaign as completed in database ***
-        await self._mark_campaign_completed_in_db(state)
+        self._mark_campaign_completed_in_db(state)
         
         # *** ADD: Final database sync ***
         if state.database_enabled and self.database_service:
@@ -19,9 +19,13 @@ class NegotiationAgent:
     Legacy version for backward compatibility
     """
     
-    def __init__(self):
-        self.voice_service = VoiceService()
-        self.pricing_service = PricingService()
+    def __init__(
+        self,
+        voice_service: Optional[VoiceService] = None,
+        pricing_service: Optional[PricingService] = None
+    ):
+        self.voice_service = voice_service or VoiceService()
+        self.pricing_service = pricing_service or PricingService()
         self.negotiation_scripts = self._load_negotiation_scripts()
     
     def _load_negotiation_scripts(self) -> Dict[str, Any]:
@@ -1,14 +1,20 @@
-import json
 import asyncio
 import logging
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+from pydantic import ValidationError
 
-from models.campaign import CampaignOrchestrationState, CampaignData,NegotiationState, NegotiationStatus
+from models.campaign import (
+    CampaignOrchestrationState, CampaignData, CreatorMatch, NegotiationState, NegotiationStatus, OrchestrationPhase,
+    AICampaignStrategy, AINegotiationStrategy, AIProgressDecision, AICompletionDecision, AICampaignInsights
+)
 from agents.discovery import InfluencerDiscoveryAgent
 from agents.negotiation import NegotiationAgent
 from agents.contracts import ContractAgent
-from services.database import DatabaseService
+from agents.decision_rules import DecisionEngine, Decision, DecisionSource
+from services.database import DatabaseService, UnitOfWork
+from services.checkpoint_store import CheckpointStore, create_checkpoint_store
+from services.llm_gateway import LLMGateway, parse_json_items
 
 from config.settings import settings
 
@@ -16,14 +22,6 @@ from config.settings import settings
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Import Groq for AI intelligence
-try:
-    from groq import Groq
-    GROQ_AVAILABLE = True
-except ImportError:
-    GROQ_AVAILABLE = False
-    logger.warning("⚠️  Groq is not available - using simple orchestration")
-
 class CampaignOrchestrator:
     """
     🧠 INTELLIGENT CAMPAIGN ORCHESTRATOR WITH FULL DATABASE INTEGRATION
@@ -31,57 +29,37 @@ class CampaignOrchestrator:
     Campaign → Discovery → Negotiation → Contracts → Database Sync (at every step)
     """
     
-    def __init__(self):
-        # Initialize all agents
-        self.discovery_agent = InfluencerDiscoveryAgent()
-        self.negotiation_agent = NegotiationAgent()
-        self.contract_agent = ContractAgent()
-        self.database_service = DatabaseService()
-        
-        # Initialize Groq AI client
-        self.groq_client = None
-        self._initialize_groq()
-    
-    def _initialize_groq(self):
-        """🧠 Initialize Groq LLM client for intelligent orchestration"""
-        if not GROQ_AVAILABLE:
-            logger.warning("⚠️  Groq not available - using simple orchestration")
-            return
-        
-        # ✅ FIX: Use settings object instead of os.getenv()
-        groq_api_key = settings.groq_api_key
-        
-        if groq_api_key:
-            try:
-                self.groq_client = Groq(api_key=groq_api_key)
-                
-                # ✅ ENHANCED: Test the API key with a simple request
-                test_response = self.groq_client.chat.completions.create(
-                    model="llama3-8b-8192",
-                    messages=[{"role": "user", "content": "Hello"}],
-                    max_tokens=10
-                )
-                
-                logger.info("✅ Groq LLM initialized and tested successfully")
-                
-            except Exception as e:
-                logger.error(f"❌ Groq initialization/test failed: {e}")
-                
-                # ✅ ENHANCED: Provide specific error guidance
-                if "401" in str(e) or "Unauthorized" in str(e):
-                    logger.error("🔑 Groq API key is invalid or expired")
-                    logger.error("💡 Get a new key from: https://console.groq.com/keys")
-                    logger.error("📝 Update your .env file: GROQ_API_KEY=gsk_your_new_key_here")
-                elif "quota" in str(e).lower() or "limit" in str(e).lower():
-                    logger.error("📊 Groq API quota exceeded or rate limited")
-                else:
-                    logger.error(f"🔧 Groq API error: {str(e)}")
-                
-                self.groq_client = None
-                logger.info("📋 Continuing with simple orchestration (no AI strategy)")
-        else:
-            logger.warning("⚠️  GROQ_API_KEY not found in settings - using simple orchestration")
-        
+    def __init__(
+        self,
+        discovery_agent: Optional[InfluencerDiscoveryAgent] = None,
+        negotiation_agent: Optional[NegotiationAgent] = None,
+        contract_agent: Optional[ContractAgent] = None,
+        database_service: Optional[DatabaseService] = None,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        llm_gateway: Optional[LLMGateway] = None,
+        decision_engine: Optional[DecisionEngine] = None
+    ):
+        # Initialize all agents (shared instances come from services/container.py)
+        self.discovery_agent = discovery_agent or InfluencerDiscoveryAgent()
+        self.negotiation_agent = negotiation_agent or NegotiationAgent()
+        self.contract_agent = contract_agent or ContractAgent()
+        self.database_service = database_service or DatabaseService()
+        self.checkpoint_store = checkpoint_store or create_checkpoint_store()
+        self.llm_gateway = llm_gateway or LLMGateway()
+        self.decision_engine = decision_engine or DecisionEngine()
+        self._phase_writes: Dict[str, UnitOfWork] = {}  # campaign id -> the running phase's unit of work
+        
+        # Phase → (handler, next phase)
+        self._phase_table = {
+            OrchestrationPhase.INITIALIZING: (self._initialize_phase, OrchestrationPhase.STRATEGY),
+            OrchestrationPhase.STRATEGY: (self._strategy_phase, OrchestrationPhase.NEGOTIATIONS),
+            OrchestrationPhase.NEGOTIATIONS: (self._negotiations_phase, OrchestrationPhase.COMPLETION_DECISION),
+            OrchestrationPhase.COMPLETION_DECISION: (self._completion_decision_phase, OrchestrationPhase.CONTRACTS),
+            OrchestrationPhase.CONTRACTS: (self._contracts_phase, OrchestrationPhase.DATABASE_SYNC),
+            OrchestrationPhase.DATABASE_SYNC: (self._database_sync_phase, OrchestrationPhase.FINALIZING),
+            OrchestrationPhase.FINALIZING: (self._finalize_phase, OrchestrationPhase.COMPLETED),
+        }
+
     async def orchestrate_campaign(
         self,
         orchestration_state: CampaignOrchestrationState,
@@ -89,91 +67,29 @@ class CampaignOrchestrator:
     ) -> CampaignOrchestrationState:
         """
         🚀 MAIN ORCHESTRATION WORKFLOW WITH DATABASE INTEGRATION
-        Coordinates the entire campaign from start to finish with AI intelligence
+        Runs the campaign as a phase state machine. The state is checkpointed after
+        every phase and every creator negotiation, so a restarted worker resumes
+        from the last checkpoint instead of repeating discovery and paid calls.
         """
+        checkpoint = await self._load_checkpoint(task_id)
+        if checkpoint:
+            logger.info(f"♻️ Resuming campaign {checkpoint.campaign_id} from phase '{checkpoint.phase.value}'")
+            orchestration_state = checkpoint
+        
         try:
             logger.info(f"🚀 Starting campaign orchestration for {orchestration_state.campaign_id}")
             
-            # *** STEP 0: Initialize database and create campaign record ***
-            await self._initialize_database_and_create_campaign(orchestration_state)
-            
-            # Update state tracking
-            orchestration_state.current_stage = "initializing"
-            await self._update_active_campaign_state(task_id, orchestration_state)
-            
-            # 🧠 PHASE 0: AI STRATEGIC PLANNING (if Groq available)
-            if self.groq_client:
-                strategy = await self._generate_ai_strategy(orchestration_state.campaign_data)
-                logger.info(f"🎯 AI Strategy Generated: {strategy.get('negotiation_approach', 'collaborative')}")
+            while orchestration_state.phase != OrchestrationPhase.COMPLETED:
+                handler, next_phase = self._phase_table[orchestration_state.phase]
+                await self._run_phase(handler, orchestration_state, task_id)
                 
-                # *** Store strategy in database ***
-                await self._store_strategy_in_database(orchestration_state, strategy)
-            else:
-                strategy = self._get_default_strategy()
-                logger.info("📋 Using default strategy (Groq not available)")
-            
-            # PHASE 1: DISCOVERY (with immediate database storage)
-            logger.info("🔍 Phase 1: Creator Discovery")
-            orchestration_state.current_stage = "discovery"
-            await self._update_active_campaign_state(task_id, orchestration_state)
-            
-            await self._run_discovery_phase_with_db(orchestration_state, strategy)
-            
-            # PHASE 2: NEGOTIATIONS (with real-time database updates)
-            logger.info("📞 Phase 2: AI-Guided Negotiations")
-            orchestration_state.current_stage = "negotiations"
-            await self._update_active_campaign_state(task_id, orchestration_state)
-            
-            await self._run_negotiation_phase_with_db(orchestration_state, task_id, strategy)
-            
-            # 🧠 PHASE 3: AI COMPLETION DECISION (if Groq available)
-            if self.groq_client and orchestration_state.successful_negotiations > 0:
-                completion_decision = await self._make_ai_completion_decision(orchestration_state)
-                logger.info(f"🧠 AI Completion Decision: {completion_decision.get('action', 'complete')}")
-                
-                if completion_decision.get("action") == "continue" and completion_decision.get("find_more"):
-                    await self._find_additional_creators(orchestration_state, completion_decision)
-            
-            # PHASE 4: CONTRACT GENERATION (with immediate database storage)
-            logger.info("📝 Phase 4: Contract Generation")
-            orchestration_state.current_stage = "contracts"
-            await self._update_active_campaign_state(task_id, orchestration_state)
-            
-            await self._run_contract_phase_with_db(orchestration_state)
-            
-            # PHASE 5: FINAL DATABASE SYNC AND ANALYTICS
-            logger.info("💾 Phase 5: Final Database Sync & Analytics")
-            orchestration_state.current_stage = "database_sync"
-            await self._update_active_campaign_state(task_id, orchestration_state)
-            
-            await self._final_database_sync_and_analytics(orchestration_state)
-            
-            # PHASE 6: COMPLETION
-            orchestration_state.current_stage = "completed"
-            orchestration_state.completed_at = datetime.now()
-            await self._update_active_campaign_state(task_id, orchestration_state)
-            
-            # *** Update campaign completion in database ***
-            await self._mark_campaign_completed_in_db(orchestration_state)
-            
-            # Generate final summary
-            summary = {
-                "successful_partnerships": orchestration_state.successful_negotiations,
-                "total_cost": orchestration_state.total_cost,
-                "creators_contacted": len(orchestration_state.negotiations)
-            }
-            logger.info(f"🎉 Campaign orchestration completed!")
-            logger.info(f"📊 Final Results: {summary}")
-            
-            # AI-generated insights (if available)
-            if self.groq_client:
-                ai_insights = await self._generate_ai_campaign_summary(orchestration_state)
-                logger.info(f"🧠 AI Insights: {ai_insights}")
+                orchestration_state.phase = next_phase
+                await self._checkpoint(task_id, orchestration_state)
             
             return orchestration_state
             
         except Exception as e:
-            logger.error(f"❌ Campaign orchestration failed: {str(e)}")
+            logger.error(f"❌ Campaign orchestration failed in phase '{orchestration_state.phase.value}': {str(e)}")
             orchestration_state.current_stage = "failed"
             orchestration_state.completed_at = datetime.now()
             
@@ -182,10 +98,146 @@ class CampaignOrchestrator:
                 await self._mark_campaign_failed_in_db(orchestration_state, str(e))
             except:
                 pass  # Don't fail twice
-                
-            await self._update_active_campaign_state(task_id, orchestration_state)
+            
+            # Phase is left unchanged so a retry resumes the failed phase
+            await self._checkpoint(task_id, orchestration_state)
+            raise
+    
+    # ================================
+    # STATE MACHINE PHASES
+    # ================================
+    
+    async def _initialize_phase(self, state: CampaignOrchestrationState, task_id: str):
+        """*** STEP 0: Initialize database and create campaign record ***"""
+        state.current_stage = "initializing"
+        await self._update_active_campaign_state(task_id, state)
+        
+        await self._initialize_database_and_create_campaign(state)
+    
+    async def _strategy_phase(self, state: CampaignOrchestrationState, task_id: str):
+        """🧠 PHASE 0: STRATEGIC PLANNING (rules first, AI when the rules are unsure and Groq is available)"""
+        decision = self.decision_engine.campaign_strategy(state.campaign_data)
+        
+        if self.llm_gateway.ai_enabled and not self.decision_engine.is_confident(decision):
+            strategy = await self._generate_ai_strategy(state.campaign_data)
+            logger.info(f"🎯 AI Strategy Generated: {strategy.get('negotiation_approach', 'collaborative')}")
+            
+            # *** Store strategy in database ***
+            self._store_strategy_in_database(state, strategy)
+        else:
+            strategy = self._tag_decision(decision)
+            logger.info(f"📐 Rule-based strategy ({decision.rule}): {strategy['negotiation_approach']} approach")
+        
+        # Kept on the state so a resumed run does not regenerate it
+        state.strategy_data = strategy
+    
+    async def _negotiations_phase(self, state: CampaignOrchestrationState, task_id: str):
+        """PHASES 1-2: DISCOVERY streaming into AI-guided NEGOTIATIONS (with real-time database updates)"""
+        logger.info("🔍📞 Phases 1-2: Creator Discovery → AI-Guided Negotiations (pipelined)")
+        state.current_stage = "negotiations"
+        await self._update_active_campaign_state(task_id, state)
+        
+        await self._run_negotiation_phase_with_db(state, task_id, state.strategy_data)
+    
+    async def _completion_decision_phase(self, state: CampaignOrchestrationState, task_id: str):
+        """🧠 PHASE 3: COMPLETION DECISION (rules first, AI when the rules are unsure)"""
+        if state.successful_negotiations > 0:
+            completion_decision = await self._decide(
+                self.decision_engine.completion(state),
+                lambda: self._make_ai_completion_decision(state)
+            )
+            logger.info(f"🧠 Completion Decision ({completion_decision['decision_source']}): {completion_decision.get('action', 'complete')}")
+            
+            if completion_decision.get("action") == "continue" and completion_decision.get("find_more"):
+                await self._find_additional_creators(state, completion_decision)
+    
+    async def _contracts_phase(self, state: CampaignOrchestrationState, task_id: str):
+        """PHASE 4: CONTRACT GENERATION (with immediate database storage)"""
+        logger.info("📝 Phase 4: Contract Generation")
+        state.current_stage = "contracts"
+        await self._update_active_campaign_state(task_id, state)
+        
+        await self._run_contract_phase_with_db(state)
+    
+    async def _database_sync_phase(self, state: CampaignOrchestrationState, task_id: str):
+        """PHASE 5: FINAL DATABASE SYNC AND ANALYTICS"""
+        logger.info("💾 Phase 5: Final Database Sync & Analytics")
+        state.current_stage = "database_sync"
+        await self._update_active_campaign_state(task_id, state)
+        
+        await self._final_database_sync_and_analytics(state)
+    
+    async def _finalize_phase(self, state: CampaignOrchestrationState, task_id: str):
+        """PHASE 6: COMPLETION"""
+        state.current_stage = "completed"
+        state.completed_at = datetime.now()
+        await self._update_active_campaign_state(task_id, state)
+        
+        # *** Update campaign completion in database ***
+        self._mark_campaign_completed_in_db(state)
+        
+        # Generate final summary
+        summary = {
+            "successful_partnerships": state.successful_negotiations,
+            "total_cost": state.total_cost,
+            "creators_contacted": len(state.negotiations)
+        }
+        logger.info(f"🎉 Campaign orchestration completed!")
+        logger.info(f"📊 Final Results: {summary}")
+        
+        # AI-generated insights (if available)
+        if self.llm_gateway.ai_enabled:
+            ai_insights = await self._generate_ai_campaign_summary(state)
+            logger.info(f"🧠 AI Insights: {ai_insights}")
+    
+    async def _run_phase(self, handler, state: CampaignOrchestrationState, task_id: str):
+        """
+        Run one phase with all of its database writes (creators, negotiations,
+        totals, contracts) batched into one unit of work, flushed when the
+        phase ends. If the flush fails the phase fails, so the job is retried
+        from the phase's checkpoint; negotiations and contracts already in the
+        checkpointed state are written by the final sync.
+        """
+        uow = self.database_service.unit_of_work()
+        self._phase_writes[state.campaign_id] = uow
+        try:
+            await handler(state, task_id)
+        finally:
+            self._phase_writes.pop(state.campaign_id, None)
+        
+        try:
+            await uow.flush()
+        except Exception as e:
+            logger.error(f"❌ Failed to write phase results to database: {e}")
             raise
     
+    def _writes(self, state: CampaignOrchestrationState) -> Optional[UnitOfWork]:
+        """The running phase's unit of work"""
+        return self._phase_writes.get(state.campaign_id)
+    
+    # ================================
+    # CHECKPOINTING
+    # ================================
+    
+    async def _load_checkpoint(self, task_id: str) -> Optional[CampaignOrchestrationState]:
+        """Load the last checkpoint for this task, if any"""
+        try:
+            return await self.checkpoint_store.load(task_id)
+        except Exception as e:
+            logger.error(f"❌ Failed to load checkpoint for {task_id}: {e}")
+            return None
+    
+    async def _checkpoint(self, task_id: str, state: CampaignOrchestrationState):
+        """Persist the state so a restarted worker can resume from here"""
+        state.checkpoint_version += 1
+        try:
+            await self.checkpoint_store.save(task_id, state)
+        except Exception as e:
+            # A missed checkpoint only costs repeated work on resume - keep going
+            logger.error(f"❌ Checkpoint failed for {task_id}: {e}")
+        
+        await self._update_active_campaign_state(task_id, state)
+    
     # ================================
     # NEW DATABASE INTEGRATION METHODS
     # ================================
@@ -210,44 +262,56 @@ class CampaignOrchestrator:
             # Continue without database - don't fail the entire workflow
             state.database_enabled = False
     
-    async def _store_strategy_in_database(self, state: CampaignOrchestrationState, strategy: Dict[str, Any]):
-        """Store AI strategy in database"""
-        try:
-            await self.database_service.update_campaign(
-                state.campaign_id,
-                {"ai_strategy": strategy}
-            )
-            logger.info("🧠 AI strategy stored in database")
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to store strategy: {e}")
+    def _store_strategy_in_database(self, state: CampaignOrchestrationState, strategy: Dict[str, Any]):
+        """Stage the AI strategy for the phase's database write"""
+        uow = self._writes(state)
+        if uow:
+            uow.update_campaign(state.campaign_id, {"ai_strategy": strategy})
     
-    async def _run_discovery_phase_with_db(self, state: CampaignOrchestrationState, strategy: Dict[str, Any]):
-        """🔍 Run discovery phase with immediate database storage"""
+    async def _run_discovery_phase_with_db(
+        self,
+        state: CampaignOrchestrationState,
+        strategy: Dict[str, Any],
+        candidates: Optional[asyncio.Queue] = None
+    ):
+        """
+        🔍 Run discovery with immediate database storage.
+        
+        Matches are streamed from the discovery agent; when ``candidates`` is
+        given, each one is handed to the negotiation consumer as soon as it is
+        found instead of after the whole catalogue is ranked.
+        """
         logger.info("🔍 Starting influencer discovery phase...")
         
         # Use strategy to determine how many creators to find
         max_creators = strategy.get("max_creators_to_contact", 3)
+        known_ids = {match.creator.id for match in state.discovered_influencers}
         
-        # Find top matching influencers
-        discovered_influencers = await self.discovery_agent.find_matches(
-            state.campaign_data,
-            max_results=max_creators
-        )
-        
-        state.discovered_influencers = discovered_influencers
-        
-        # *** IMMEDIATELY store discovered creators in database ***
-        logger.info("💾 Storing discovered creators in database...")
-        for i, match in enumerate(discovered_influencers):
-            try:
-                await self.database_service.create_or_update_creator(match.creator)
-                logger.info(f"✅ Creator {i+1} stored: {match.creator.name}")
-            except Exception as e:
-                logger.error(f"❌ Failed to store creator {match.creator.name}: {e}")
-        
-        logger.info(f"✅ Discovery complete: Found {len(discovered_influencers)} matching influencers")
-        for i, match in enumerate(discovered_influencers):
+        try:
+            # Resumed run: creators discovered before the restart go first
+            if candidates is not None:
+                for match in state.discovered_influencers:
+                    await candidates.put(match)
+            
+            async for match in self.discovery_agent.stream_matches(state.campaign_data, max_results=max_creators):
+                if match.creator.id in known_ids:
+                    continue
+                known_ids.add(match.creator.id)
+                state.discovered_influencers.append(match)
+                
+                if candidates is not None:
+                    await candidates.put(match)
+                
+                # *** Stage discovered creator for the phase's database write ***
+                uow = self._writes(state)
+                if uow:
+                    uow.upsert_creator(match.creator)
+        finally:
+            if candidates is not None:
+                await candidates.put(None)  # End of stream
+        
+        logger.info(f"✅ Discovery complete: Found {len(state.discovered_influencers)} matching influencers")
+        for i, match in enumerate(state.discovered_influencers):
             logger.info(f"  {i+1}. {match.creator.name} - {match.similarity_score:.2f} similarity, ${match.estimated_rate:,}")
     
     async def _run_negotiation_phase_with_db(
@@ -256,72 +320,186 @@ class CampaignOrchestrator:
         task_id: str,
         strategy: Dict[str, Any]
     ):
-        """📞 Run negotiation phase with real-time database updates"""
-        logger.info("📞 Starting negotiation phase...")
+        """
+        📞 Run negotiations pipelined with discovery and contract generation.
         
-        # Get creators to negotiate with based on strategy
-        creators_to_contact = state.discovered_influencers[:strategy.get("max_creators_to_contact", 3)]
+        Discovery runs as a producer feeding a queue; this coroutine negotiates
+        with each candidate as it arrives and starts that creator's contract as
+        soon as the negotiation succeeds.
+        """
+        logger.info("📞 Starting negotiation phase (pipelined with discovery)...")
         
-        for i, influencer_match in enumerate(creators_to_contact):
-            logger.info(f"📞 Negotiating with {influencer_match.creator.name} ({i+1}/{len(creators_to_contact)})")
-            
-            # Update current influencer in state
-            state.current_influencer = influencer_match.creator.name
-            state.estimated_completion_minutes = (len(creators_to_contact) - i) * 1.5
-            await self._update_active_campaign_state(task_id, state)
-            
-            # 🧠 AI decides negotiation approach for this specific creator
-            if self.groq_client and len(state.negotiations) > 0:
-                negotiation_strategy = await self._get_ai_negotiation_strategy(
+        max_creators = strategy.get("max_creators_to_contact", 3)
+        wave_size = max(settings.llm_batch_wave_size, 1) if settings.llm_batch_decisions else 1
+        candidates: asyncio.Queue = asyncio.Queue()
+        contract_tasks: List[asyncio.Task] = []
+        already_negotiated = set(state.negotiated_creator_ids)
+        
+        discovery_task = asyncio.create_task(
+            self._run_discovery_phase_with_db(state, strategy, candidates)
+        )
+        
+        try:
+            position = 0
+            stream_done = False
+            while not stream_done:
+                # A wave is every candidate already discovered (up to the wave size)
+                wave, stream_done = await self._next_wave(candidates, wave_size)
+                if not wave:
+                    break
+                
+                # 🧠 One LLM call covers the whole wave when batching is on
+                wave_strategies = await self._get_wave_negotiation_strategies(
+                    state, strategy, wave, already_negotiated
+                ) if wave_size > 1 else {}
+                
+                for influencer_match in wave:
+                    position += 1
+                    negotiation_result = await self._negotiate_with_match(
+                        state, task_id, strategy, influencer_match, position, max_creators, already_negotiated,
+                        negotiation_strategy=wave_strategies.get(influencer_match.creator.id)
+                    )
+                    if negotiation_result is None:
+                        continue
+                    
+                    # Contract generation starts now, not after the whole phase
+                    if negotiation_result.status == NegotiationStatus.SUCCESS:
+                        contract_tasks.append(asyncio.create_task(
+                            self._generate_contract_with_db(state, negotiation_result)
+                        ))
+                    
+                    # Brief pause between calls for demo effect
+                    await asyncio.sleep(3)
+                
+                # 🧠 Progress check once per wave (rules first, AI when the rules are unsure)
+                if len(state.negotiations) >= 2:
+                    continue_decision = await self._decide(
+                        self.decision_engine.progress(state, strategy),
+                        lambda: self._analyze_progress_with_ai(state, strategy)
+                    )
+                    
+                    if continue_decision.get("action") == "stop_early":
+                        logger.info(f"🧠 Decision ({continue_decision['decision_source']}): Stop early - {continue_decision.get('reason')}")
+                        break
+                    elif continue_decision.get("action") == "adjust_approach":
+                        logger.info(f"🧠 Decision ({continue_decision['decision_source']}): Adjust approach - {continue_decision.get('reason')}")
+                        # AI adjustments would be applied to remaining negotiations
+        finally:
+            if not discovery_task.done():
+                discovery_task.cancel()
+            await asyncio.gather(discovery_task, return_exceptions=True)
+            await asyncio.gather(*contract_tasks, return_exceptions=True)
+        
+        # Surface discovery failures so the phase is retried from its checkpoint
+        if not discovery_task.cancelled() and discovery_task.exception():
+            raise discovery_task.exception()
+        
+        logger.info(f"📞 Negotiation phase complete: {state.successful_negotiations}/{len(state.negotiations)} successful")
+    
+    @staticmethod
+    async def _next_wave(candidates: asyncio.Queue, wave_size: int) -> Tuple[List[CreatorMatch], bool]:
+        """Wait for the next candidate, then take whatever else is already queued; True once the stream has ended"""
+        first = await candidates.get()
+        if first is None:
+            return [], True
+        
+        wave = [first]
+        while len(wave) < wave_size:
+            try:
+                match = candidates.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if match is None:
+                return wave, True
+            wave.append(match)
+        
+        return wave, False
+    
+    async def _negotiate_with_match(
+        self,
+        state: CampaignOrchestrationState,
+        task_id: str,
+        strategy: Dict[str, Any],
+        influencer_match: CreatorMatch,
+        position: int,
+        max_creators: int,
+        already_negotiated: set,
+        negotiation_strategy: Optional[Dict[str, Any]] = None
+    ) -> Optional[NegotiationState]:
+        """Negotiate with one streamed candidate; None if it was handled before a restart"""
+        creator_id = influencer_match.creator.id
+        
+        # Resumed run: skip creators whose result is already checkpointed
+        if creator_id in already_negotiated:
+            logger.info(f"⏭️ Skipping {influencer_match.creator.name} - already negotiated before restart")
+            return None
+        
+        # Resumed run: a call was started but its result never recorded - don't dial twice
+        if creator_id in state.in_flight_creator_ids:
+            logger.warning(f"⚠️ Call to {influencer_match.creator.name} was interrupted - not re-dialing")
+            state.add_negotiation_result(NegotiationState(
+                creator_id=creator_id,
+                campaign_id=state.campaign_id,
+                status=NegotiationStatus.FAILED,
+                failure_reason="Interrupted by worker restart - call not repeated",
+                completed_at=datetime.now()
+            ))
+            state.in_flight_creator_ids.remove(creator_id)
+            await self._checkpoint(task_id, state)
+            return None
+        
+        logger.info(f"📞 Negotiating with {influencer_match.creator.name} ({position}/{max_creators})")
+        
+        # Update current influencer in state
+        state.current_influencer = influencer_match.creator.name
+        state.estimated_completion_minutes = int(max(max_creators - position + 1, 1) * 1.5)
+        await self._update_active_campaign_state(task_id, state)
+        
+        # 🧠 Negotiation approach for this specific creator (unless the wave already decided it)
+        if negotiation_strategy is None:
+            negotiation_strategy = await self._decide(
+                self.decision_engine.negotiation_strategy(influencer_match, state, strategy),
+                lambda: self._get_ai_negotiation_strategy(
                     influencer_match, state.campaign_data, state.negotiations, strategy
-                )
-            else:
-                negotiation_strategy = {"approach": strategy.get("negotiation_approach", "collaborative")}
-            
-            # Run negotiation with AI guidance
-            negotiation_result = await self.negotiation_agent.negotiate(
-                influencer_match,
-                state.campaign_data,
-                ai_strategy=negotiation_strategy
+                ),
+                escalate=len(state.negotiations) > 0
             )
-            
-            # Add result to state
-            state.add_negotiation_result(negotiation_result)
-            
-            # *** IMMEDIATELY store negotiation in database ***
-            await self._store_negotiation_in_db(state, negotiation_result)
-            
-            # *** Update campaign totals in database immediately ***
-            await self._update_campaign_totals_in_db(state)
-            
-            # Log result
-            if negotiation_result.status == NegotiationStatus.SUCCESS:
-                logger.info(f"✅ Successful negotiation: ${negotiation_result.final_rate:,}")
-            else:
-                logger.info(f"❌ Failed negotiation: {negotiation_result.failure_reason}")
-            
-            # 🧠 AI analyzes progress and decides whether to continue
-            if len(state.negotiations) >= 2 and self.groq_client:
-                continue_decision = await self._analyze_progress_with_ai(state, strategy)
-                
-                if continue_decision.get("action") == "stop_early":
-                    logger.info(f"🧠 AI Decision: Stop early - {continue_decision.get('reason')}")
-                    break
-                elif continue_decision.get("action") == "adjust_approach":
-                    logger.info(f"🧠 AI Decision: Adjust approach - {continue_decision.get('reason')}")
-                    # AI adjustments would be applied to remaining negotiations
-            
-            # Brief pause between calls for demo effect
-            await asyncio.sleep(3)
         
-        logger.info(f"📞 Negotiation phase complete: {state.successful_negotiations}/{len(creators_to_contact)} successful")
+        # Mark the call as in flight before dialing so a crash mid-call is not retried
+        state.in_flight_creator_ids.append(creator_id)
+        await self._checkpoint(task_id, state)
+        
+        # Run negotiation with AI guidance
+        negotiation_result = await self.negotiation_agent.negotiate(
+            influencer_match,
+            state.campaign_data,
+            ai_strategy=negotiation_strategy
+        )
+        
+        # Add result to state
+        state.add_negotiation_result(negotiation_result)
+        state.in_flight_creator_ids.remove(creator_id)
+        await self._checkpoint(task_id, state)
+        
+        # *** Stage negotiation and campaign totals (written when the phase ends) ***
+        self._store_negotiation_in_db(state, negotiation_result)
+        self._update_campaign_totals_in_db(state)
+        
+        # Log result
+        if negotiation_result.status == NegotiationStatus.SUCCESS:
+            logger.info(f"✅ Successful negotiation: ${negotiation_result.final_rate:,}")
+        else:
+            logger.info(f"❌ Failed negotiation: {negotiation_result.failure_reason}")
+        
+        return negotiation_result
     
-    async def _store_negotiation_in_db(self, state: CampaignOrchestrationState, negotiation_result):
-        """Store individual negotiation in database immediately"""
-        try:
-            negotiation_data = {
+    def _store_negotiation_in_db(self, state: CampaignOrchestrationState, negotiation_result):
+        """Stage an individual negotiation for the phase's database write"""
+        uow = self._writes(state)
+        if uow:
+            uow.add_negotiation(state.campaign_id, negotiation_result.creator_id, {
                 "status": negotiation_result.status,
-                "initial_rate": negotiation_result.initial_rate,
+                "initial_rate": negotiation_result.initial_offer,
                 "final_rate": negotiation_result.final_rate,
                 "call_status": negotiation_result.call_status,
                 "email_status": negotiation_result.email_status,
@@ -330,33 +508,16 @@ class CampaignOrchestrator:
                 "last_contact_date": negotiation_result.last_contact_date,
                 "call_recording_url": getattr(negotiation_result, 'call_recording_url', None),
                 "call_transcript": getattr(negotiation_result, 'call_transcript', None)
-            }
-            
-            negotiation_record = await self.database_service.create_negotiation(
-                state.campaign_id,
-                negotiation_result.creator_id,
-                negotiation_data
-            )
-            
-            logger.info(f"✅ Negotiation stored in database: ID {negotiation_record.id}")
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to store negotiation for {negotiation_result.creator_id}: {e}")
+            })
     
-    async def _update_campaign_totals_in_db(self, state: CampaignOrchestrationState):
-        """Update campaign totals in database in real-time"""
-        try:
-            updates = {
+    def _update_campaign_totals_in_db(self, state: CampaignOrchestrationState):
+        """Stage campaign totals - repeated updates in a phase collapse into one UPDATE"""
+        uow = self._writes(state)
+        if uow:
+            uow.update_campaign(state.campaign_id, {
                 "influencer_count": state.successful_negotiations,
-                "total_cost": state.total_cost,
-                "updated_at": datetime.now()
-            }
-            
-            await self.database_service.update_campaign(state.campaign_id, updates)
-            logger.info(f"💾 Campaign totals updated: {state.successful_negotiations} influencers, ${state.total_cost:,}")
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to update campaign totals: {e}")
+                "total_cost": state.total_cost
+            })
     
     async def _run_contract_phase_with_db(self, state: CampaignOrchestrationState):
         """📝 Generate contracts with immediate database storage"""
@@ -368,32 +529,54 @@ class CampaignOrchestrator:
         ]
         
         for negotiation in successful_negotiations:
-            try:
-                # Generate contract
-                contract_data = await self.contract_agent.generate_contract(
-                    negotiation,
-                    state.campaign_data
-                )
-                
-                # *** IMMEDIATELY store contract in database ***
-                contract_record = await self._store_contract_in_db(state, negotiation, contract_data)
-                
-                # Store contract reference in negotiation
-                negotiation.negotiated_terms["contract_generated"] = True
-                negotiation.negotiated_terms["contract_id"] = contract_record.id
-                
-                logger.info(f"📝 Contract generated and stored: {contract_record.id}")
-                
-            except Exception as e:
-                logger.error(f"❌ Contract generation failed for {negotiation.creator_id}: {str(e)}")
+            await self._generate_contract_with_db(state, negotiation)
         
         logger.info(f"📝 Contract phase complete: {len(successful_negotiations)} contracts generated")
     
-    async def _store_contract_in_db(self, state: CampaignOrchestrationState, negotiation, contract_data):
-        """Store contract in database"""
+    async def _generate_contract_with_db(self, state: CampaignOrchestrationState, negotiation: NegotiationState):
+        """📝 Generate and store one creator's contract (idempotent across restarts)"""
+        if negotiation.negotiated_terms.get("contract_generated"):
+            return
+        
         try:
-            contract_record = await self.database_service.create_contract({
-                "id": f"contract_{negotiation.creator_id}_{state.campaign_id}",
+            # Generate contract
+            contract_data = await self.contract_agent.generate_contract(
+                negotiation,
+                state.campaign_data
+            )
+            
+            # *** Stage contract (written when the phase ends) ***
+            contract_id = self._store_contract_in_db(state, negotiation, contract_data)
+            
+            # Kept on the state so the final sync can store it if the phase's write fails
+            state.contracts.append({
+                "id": contract_id,
+                "creator_id": negotiation.creator_id,
+                "compensation_amount": negotiation.final_rate,
+                "deliverables": contract_data.get("deliverables", []),
+                "timeline": contract_data.get("timeline", {}),
+                "usage_rights": contract_data.get("usage_rights", {}),
+                "status": "draft",
+                "contract_text": contract_data.get("contract_text", ""),
+                "payment_status": "pending"
+            })
+            
+            # Store contract reference in negotiation
+            negotiation.negotiated_terms["contract_generated"] = True
+            negotiation.negotiated_terms["contract_id"] = contract_id
+            
+            logger.info(f"📝 Contract generated: {contract_id}")
+            
+        except Exception as e:
+            logger.error(f"❌ Contract generation failed for {negotiation.creator_id}: {str(e)}")
+    
+    def _store_contract_in_db(self, state: CampaignOrchestrationState, negotiation, contract_data) -> str:
+        """Stage a contract and its payment record; returns the contract id"""
+        contract_id = f"contract_{negotiation.creator_id}_{state.campaign_id}"
+        uow = self._writes(state)
+        if uow:
+            uow.add_contract({
+                "id": contract_id,
                 "campaign_id": state.campaign_id,
                 "creator_id": negotiation.creator_id,
                 "compensation_amount": negotiation.final_rate,
@@ -405,20 +588,14 @@ class CampaignOrchestrator:
             })
             
             # Also create payment record
-            payment_record = await self.database_service.create_payment({
-                "contract_id": contract_record.id,
+            uow.add_payment({
+                "contract_id": contract_id,
                 "amount": negotiation.final_rate,
                 "status": "pending",
                 "payment_method": "bank_transfer",
                 "due_date": datetime.now()
             })
-            
-            logger.info(f"✅ Contract and payment record created: {contract_record.id}")
-            return contract_record
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to store contract: {e}")
-            raise
+        return contract_id
     
     async def _final_database_sync_and_analytics(self, state: CampaignOrchestrationState):
         """Final comprehensive database sync and analytics generation"""
@@ -438,20 +615,14 @@ class CampaignOrchestrator:
         except Exception as e:
             logger.error(f"❌ Final database sync failed: {e}")
     
-    async def _mark_campaign_completed_in_db(self, state: CampaignOrchestrationState):
-        """Mark campaign as completed in database"""
-        try:
-            await self.database_service.update_campaign(
-                state.campaign_id,
-                {
-                    "status": "completed",
-                    "completed_at": state.completed_at
-                }
-            )
-            logger.info("✅ Campaign marked as completed in database")
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to mark campaign completed: {e}")
+    def _mark_campaign_completed_in_db(self, state: CampaignOrchestrationState):
+        """Stage the campaign's completion (written when the final phase ends)"""
+        uow = self._writes(state)
+        if uow:
+            uow.update_campaign(state.campaign_id, {
+                "status": "completed",
+                "completed_at": state.completed_at
+            })
     
     async def _mark_campaign_failed_in_db(self, state: CampaignOrchestrationState, error_message: str):
         """Mark campaign as failed in database"""
@@ -477,7 +648,7 @@ class CampaignOrchestrator:
         """🧠 Generate AI-powered campaign strategy using Groq"""
         
         # ✅ ENHANCED: Graceful fallback if Groq is not available
-        if not self.groq_client:
+        if not self.llm_gateway.ai_enabled:
             logger.info("📋 Groq not available - using enhanced default strategy")
             return self._get_enhanced_default_strategy(campaign_data)
         
@@ -506,165 +677,53 @@ class CampaignOrchestrator:
         """
         
         try:
-            response = self.groq_client.chat.completions.create(
+            # Streamed and validated as it arrives - returns once the required fields are in
+            ai_strategy = await self.llm_gateway.complete_json(
+                prompt,
+                AICampaignStrategy,
                 model="llama3-70b-8192",
-                messages=[{"role": "user", "content": prompt}],
                 temperature=0.3,
                 max_tokens=800
             )
             
-            strategy_text = response.choices[0].message.content
+            strategy = ai_strategy.model_dump()
+            strategy["decision_source"] = DecisionSource.LLM.value
+            logger.info("🧠 AI strategy generated successfully")
+            return strategy
             
-            # Try to parse JSON
-            try:
-                strategy = json.loads(strategy_text)
-                # Validate strategy has required fields
-                required_fields = ["creator_tier_priority", "budget_allocation", "negotiation_approach"]
-                if all(field in strategy for field in required_fields):
-                    logger.info("🧠 AI strategy generated successfully")
-                    return strategy
-                else:
-                    logger.warning("AI strategy missing required fields, using enhanced default")
-                    return self._get_enhanced_default_strategy(campaign_data)
-            except json.JSONDecodeError:
-                logger.warning("AI strategy JSON parsing failed, using enhanced default")
-                return self._get_enhanced_default_strategy(campaign_data)
+        except ValueError as e:
+            logger.warning(f"AI strategy invalid, using enhanced default: {e}")
+            return self._get_enhanced_default_strategy(campaign_data)
             
         except Exception as e:
             logger.error(f"AI strategy generation failed: {e}")
             
-            # ✅ ENHANCED: Handle specific API errors
-            if "401" in str(e) or "Unauthorized" in str(e):
-                logger.error("🔑 Groq API key invalid - disabling AI features for this session")
-                self.groq_client = None
-            
             return self._get_enhanced_default_strategy(campaign_data)    
         
     def _get_enhanced_default_strategy(self, campaign_data: CampaignData) -> Dict[str, Any]:
-        """📋 Enhanced default strategy based on campaign data"""
-        
-        # ✅ ENHANCED: Smart defaults based on campaign characteristics
-        budget = campaign_data.total_budget
-        niche = campaign_data.product_niche.lower()
-        
-        # Determine approach based on budget and niche
-        if budget > 10000:
-            approach = "premium"
-            max_creators = 4
-            tier_priority = ["macro", "mega", "micro"]
-        elif budget > 5000:
-            approach = "collaborative"
-            max_creators = 3
-            tier_priority = ["macro", "micro", "mega"]
-        else:
-            approach = "collaborative"
-            max_creators = 2
-            tier_priority = ["micro", "macro", "mega"]
-        
-        # Niche-specific adjustments
-        if niche in ["tech", "gaming"]:
-            tier_priority = ["macro", "micro", "mega"]  # Tech audiences prefer established creators
-        elif niche in ["beauty", "fashion"]:
-            tier_priority = ["micro", "macro", "mega"]  # Beauty works well with micro-influencers
-        
-        strategy = {
-            "creator_tier_priority": tier_priority,
-            "budget_allocation": {
-                "per_creator_max": 0.4 if budget > 10000 else 0.5,
-                "reserve": 0.2
-            },
-            "success_criteria": {
-                "min_creators": 1,
-                "target_success_rate": 0.6
-            },
-            "risk_mitigation": "diversify_across_tiers",
-            "negotiation_approach": approach,
-            "max_creators_to_contact": max_creators,
-            "strategy_source": "enhanced_default",
-            "budget_tier": "high" if budget > 10000 else "medium" if budget > 5000 else "standard"
-        }
+        """📋 Enhanced default strategy based on campaign data (budget and niche decision tables)"""
+        decision = self.decision_engine.campaign_strategy(campaign_data)
+        strategy = self._tag_decision(decision)
         
-        logger.info(f"📋 Enhanced default strategy: {approach} approach for {niche} niche")
+        logger.info(f"📋 Enhanced default strategy: {strategy['negotiation_approach']} approach for {campaign_data.product_niche.lower()} niche")
         return strategy
     
-    async def _run_discovery_phase(self, state: CampaignOrchestrationState, strategy: Dict[str, Any]):
-        """🔍 Run the influencer discovery phase"""
-        logger.info("🔍 Starting influencer discovery phase...")
-        
-        # Use strategy to determine how many creators to find
-        max_creators = strategy.get("max_creators_to_contact", 3)
-        
-        # Find top matching influencers
-        discovered_influencers = await self.discovery_agent.find_matches(
-            state.campaign_data,
-            max_results=max_creators
-        )
-        
-        state.discovered_influencers = discovered_influencers
-        
-        logger.info(f"✅ Discovery complete: Found {len(discovered_influencers)} matching influencers")
-        for i, match in enumerate(discovered_influencers):
-            logger.info(f"  {i+1}. {match.creator.name} - {match.similarity_score:.2f} similarity, ${match.estimated_rate:,}")
+    # ================================
+    # RULE ENGINE / LLM ESCALATION
+    # ================================
     
-    async def _run_negotiation_phase(
-        self,
-        state: CampaignOrchestrationState,
-        task_id: str,
-        strategy: Dict[str, Any]
-    ):
-        """📞 Run AI-guided negotiation phase"""
-        logger.info("📞 Starting negotiation phase...")
-        
-        # Get creators to negotiate with based on strategy
-        creators_to_contact = state.discovered_influencers[:strategy.get("max_creators_to_contact", 3)]
-        
-        for i, influencer_match in enumerate(creators_to_contact):
-            logger.info(f"📞 Negotiating with {influencer_match.creator.name} ({i+1}/{len(creators_to_contact)})")
-            
-            # Update current influencer in state
-            state.current_influencer = influencer_match.creator.name
-            state.estimated_completion_minutes = (len(creators_to_contact) - i) * 1.5
-            await self._update_active_campaign_state(task_id, state)
-            
-            # 🧠 AI decides negotiation approach for this specific creator
-            if self.groq_client and len(state.negotiations) > 0:
-                negotiation_strategy = await self._get_ai_negotiation_strategy(
-                    influencer_match, state.campaign_data, state.negotiations, strategy
-                )
-            else:
-                negotiation_strategy = {"approach": strategy.get("negotiation_approach", "collaborative")}
-            
-            # Run negotiation with AI guidance
-            negotiation_result = await self.negotiation_agent.negotiate(
-                influencer_match,
-                state.campaign_data,
-                ai_strategy=negotiation_strategy
-            )
-            
-            # Add result to state
-            state.add_negotiation_result(negotiation_result)
-            
-            # Log result
-            if negotiation_result.status == NegotiationStatus.SUCCESS:
-                logger.info(f"✅ Successful negotiation: ${negotiation_result.final_rate:,}")
-            else:
-                logger.info(f"❌ Failed negotiation: {negotiation_result.failure_reason}")
-            
-            # 🧠 AI analyzes progress and decides whether to continue
-            if len(state.negotiations) >= 2 and self.groq_client:
-                continue_decision = await self._analyze_progress_with_ai(state, strategy)
-                
-                if continue_decision.get("action") == "stop_early":
-                    logger.info(f"🧠 AI Decision: Stop early - {continue_decision.get('reason')}")
-                    break
-                elif continue_decision.get("action") == "adjust_approach":
-                    logger.info(f"🧠 AI Decision: Adjust approach - {continue_decision.get('reason')}")
-                    # AI adjustments would be applied to remaining negotiations
-            
-            # Brief pause between calls for demo effect
-            await asyncio.sleep(3)
-        
-        logger.info(f"📞 Negotiation phase complete: {state.successful_negotiations}/{len(creators_to_contact)} successful")
+    @staticmethod
+    def _tag_decision(decision: Decision) -> Dict[str, Any]:
+        return {**decision.result, "decision_source": decision.source.value}
+    
+    async def _decide(self, decision: Decision, ask_llm, escalate: bool = True) -> Dict[str, Any]:
+        """Use the rule decision unless it is low-confidence and the LLM is available"""
+        if self.decision_engine.is_confident(decision) or not escalate or not self.llm_gateway.ai_enabled:
+            return self._tag_decision(decision)
+        
+        logger.info(f"🧠 Escalating {decision.rule} to LLM (rule confidence {decision.confidence:.2f})")
+        result = await ask_llm()
+        return {"decision_source": DecisionSource.LLM.value, **result}
     
     async def _get_ai_negotiation_strategy(
         self, 
@@ -707,15 +766,14 @@ class CampaignOrchestrator:
         """
         
         try:
-            response = self.groq_client.chat.completions.create(
+            ai_strategy = await self.llm_gateway.complete_json(
+                prompt,
+                AINegotiationStrategy,
                 model="llama3-8b-8192",  # Faster model for quick decisions
-                messages=[{"role": "user", "content": prompt}],
                 temperature=0.2,
                 max_tokens=300
             )
-            
-            strategy_text = response.choices[0].message.content
-            strategy = json.loads(strategy_text)
+            strategy = ai_strategy.model_dump()
             
             logger.info(f"🧠 AI Negotiation Strategy: {strategy.get('approach', 'collaborative')} approach")
             return strategy
@@ -725,9 +783,117 @@ class CampaignOrchestrator:
             return {
                 "approach": overall_strategy.get("negotiation_approach", "collaborative"), 
                 "opening_offer_multiplier": 1.0,
-                "max_offer_multiplier": 1.2
+                "max_offer_multiplier": 1.2,
+                "decision_source": DecisionSource.FALLBACK.value
             }
     
+    async def _get_wave_negotiation_strategies(
+        self,
+        state: CampaignOrchestrationState,
+        overall_strategy: Dict[str, Any],
+        wave: List[CreatorMatch],
+        already_negotiated: set
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        🧠 Get negotiation strategies for a whole wave of creators in one LLM call.
+        
+        Returns creator_id → strategy. Each item is validated against
+        ``AINegotiationStrategy`` like the per-creator path; creators missing from
+        the response, or whose item fails validation, get the default strategy.
+        An empty dict means every creator takes the per-creator path.
+        """
+        strategies: Dict[str, Dict[str, Any]] = {}
+        pending = []
+        for match in wave:
+            if match.creator.id in already_negotiated or match.creator.id in state.in_flight_creator_ids:
+                continue
+            
+            # Creators the rules are sure about never reach the LLM
+            decision = self.decision_engine.negotiation_strategy(match, state, overall_strategy)
+            if self.decision_engine.is_confident(decision):
+                strategies[match.creator.id] = self._tag_decision(decision)
+            else:
+                pending.append(match)
+        
+        if len(pending) < 2 or not self.llm_gateway.ai_enabled:
+            return strategies
+        
+        # The first wave is batched too - its prompt simply shows no progress yet        
+        previous_results = state.negotiations
+        successes = len([r for r in previous_results if r.status == NegotiationStatus.SUCCESS])
+        failures = len([r for r in previous_results if r.status == NegotiationStatus.FAILED])
+        total_spent = sum(r.final_rate or 0 for r in previous_results)
+        
+        creator_lines = "\n".join(
+            f"        - creator_id: {m.creator.id} | {m.creator.name} | {m.creator.platform} | "
+            f"{m.creator.followers:,} followers | {m.creator.engagement_rate}% engagement | "
+            f"typical rate ${m.creator.typical_rate:,} | availability {m.creator.availability}"
+            for m in pending
+        )
+        
+        prompt = f"""
+        Based on campaign progress, recommend a negotiation strategy for EACH of these creators:
+        
+{creator_lines}
+        
+        Campaign Progress:
+        - Previous successes: {successes}
+        - Previous failures: {failures}
+        - Budget remaining: ${state.campaign_data.total_budget - total_spent:,}
+        - Overall approach: {overall_strategy.get('negotiation_approach', 'collaborative')}
+        
+        Respond with a JSON array containing one object per creator, in the same order:
+        1. creator_id: the creator_id given above
+        2. approach: "aggressive", "collaborative", or "premium"
+        3. opening_offer_multiplier: 0.8-1.2 (vs typical rate)
+        4. key_selling_points: ["point1", "point2"]
+        5. max_offer_multiplier: 0.9-1.3
+        6. confidence_level: 0.0-1.0
+        
+        Respond only with the JSON array.
+        """
+        
+        fallback = {
+            "approach": overall_strategy.get("negotiation_approach", "collaborative"),
+            "opening_offer_multiplier": 1.0,
+            "max_offer_multiplier": 1.2,
+            "decision_source": DecisionSource.FALLBACK.value
+        }
+        
+        try:
+            strategies_text = await self.llm_gateway.complete(
+                prompt,
+                model="llama3-8b-8192",
+                temperature=0.2,
+                max_tokens=min(150 * len(pending) + 100, 1500)
+            )
+            items = parse_json_items(strategies_text)
+        except Exception as e:
+            logger.error(f"AI wave negotiation strategy failed: {e}")
+            items = []
+        
+        # Match by creator_id, falling back to position for items that omit it
+        wave_ids = {m.creator.id for m in pending}
+        by_id: Dict[str, Dict[str, Any]] = {}
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                continue
+            try:
+                item_strategy = AINegotiationStrategy.model_validate(item)
+            except ValidationError as e:
+                logger.warning(f"⚠️ Ignoring invalid wave strategy item {index}: {e.error_count()} errors")
+                continue
+            creator_id = item.get("creator_id")
+            if creator_id not in wave_ids and index < len(pending):
+                creator_id = pending[index].creator.id
+            by_id.setdefault(creator_id, {**item_strategy.model_dump(), "decision_source": DecisionSource.LLM.value})
+        
+        for match in pending:
+            strategies[match.creator.id] = by_id.get(match.creator.id, dict(fallback))
+        
+        logger.info(f"🧠 AI wave strategy: {len(by_id)}/{len(pending)} creators from one LLM call, {len(wave) - len(pending)} from rules")
+        return strategies
+    
     async def _analyze_progress_with_ai(self, state: CampaignOrchestrationState, strategy: Dict[str, Any]) -> Dict[str, Any]:
         """🧠 AI analyzes campaign progress and recommends next steps"""
         
@@ -761,19 +927,18 @@ class CampaignOrchestrator:
         """
         
         try:
-            response = self.groq_client.chat.completions.create(
+            decision = await self.llm_gateway.complete_json(
+                prompt,
+                AIProgressDecision,
                 model="llama3-8b-8192",
-                messages=[{"role": "user", "content": prompt}],
                 temperature=0.2,
                 max_tokens=200
             )
-            
-            decision_text = response.choices[0].message.content
-            return json.loads(decision_text)
+            return decision.model_dump()
             
         except Exception as e:
             logger.error(f"AI progress analysis failed: {e}")
-            return {"action": "continue", "reason": "Continue with standard approach"}
+            return {"action": "continue", "reason": "Continue with standard approach", "decision_source": DecisionSource.FALLBACK.value}
     
     async def _make_ai_completion_decision(self, state: CampaignOrchestrationState) -> Dict[str, Any]:
         """🧠 AI decides if campaign is complete or needs more work"""
@@ -804,19 +969,18 @@ class CampaignOrchestrator:
         """
         
         try:
-            response = self.groq_client.chat.completions.create(
+            decision = await self.llm_gateway.complete_json(
+                prompt,
+                AICompletionDecision,
                 model="llama3-8b-8192",
-                messages=[{"role": "user", "content": prompt}],
                 temperature=0.2,
                 max_tokens=200
             )
-            
-            decision_text = response.choices[0].message.content
-            return json.loads(decision_text)
+            return decision.model_dump()
             
         except Exception as e:
             logger.error(f"AI completion decision failed: {e}")
-            return {"action": "complete", "reason": "Standard completion"}
+            return {"action": "complete", "reason": "Standard completion", "decision_source": DecisionSource.FALLBACK.value}
     
     async def _find_additional_creators(self, state: CampaignOrchestrationState, decision: Dict[str, Any]):
         """🔍 Find additional creators based on AI recommendation"""
@@ -826,46 +990,6 @@ class CampaignOrchestrator:
         # For now, we'll log the decision but complete the campaign
         logger.info("📋 Additional creator search would be implemented here")
     
-    async def _run_contract_phase(self, state: CampaignOrchestrationState):
-        """📝 Generate contracts for successful negotiations"""
-        logger.info("📝 Starting contract generation phase...")
-        
-        successful_negotiations = [
-            neg for neg in state.negotiations 
-            if neg.status == NegotiationStatus.SUCCESS
-        ]
-        
-        for negotiation in successful_negotiations:
-            try:
-                contract = await self.contract_agent.generate_contract(
-                    negotiation,
-                    state.campaign_data
-                )
-                
-                # Store contract reference in negotiation
-                negotiation.negotiated_terms["contract_generated"] = True
-                negotiation.negotiated_terms["contract_id"] = contract.get("contract_id")
-                
-                logger.info(f"📝 Contract generated for {negotiation.creator_id}: {contract.get('contract_id')}")
-                
-            except Exception as e:
-                logger.error(f"❌ Contract generation failed for {negotiation.creator_id}: {str(e)}")
-        
-        logger.info(f"📝 Contract phase complete: {len(successful_negotiations)} contracts generated")
-    
-    async def _sync_to_database(self, state: CampaignOrchestrationState):
-        """💾 Sync all results to database"""
-        logger.info("💾 Syncing results to database...")
-        
-        try:
-            # Sync campaign results
-            await self.database_service.sync_campaign_results(state)
-            logger.info("✅ Database sync completed successfully")
-            
-        except Exception as e:
-            logger.error(f"❌ Database sync failed: {str(e)}")
-            # Don't fail the entire orchestration for DB sync issues
-    
     async def _generate_ai_campaign_summary(self, state: CampaignOrchestrationState) -> Dict[str, Any]:
         """🧠 Generate AI-powered campaign summary and insights"""
         
@@ -892,15 +1016,14 @@ class CampaignOrchestrator:
         """
         
         try:
-            response = self.groq_client.chat.completions.create(
+            insights = await self.llm_gateway.complete_json(
+                prompt,
+                AICampaignInsights,
                 model="llama3-70b-8192",
-                messages=[{"role": "user", "content": prompt}],
                 temperature=0.3,
                 max_tokens=400
             )
-            
-            insights_text = response.choices[0].message.content
-            return json.loads(insights_text)
+            return insights.model_dump()
             
         except Exception as e:
             logger.error(f"AI summary generation failed: {e}")
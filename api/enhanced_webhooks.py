@@ -2,20 +2,23 @@
 """
 Enhanced webhooks with database integration
 """
+import json
 import uuid
 import asyncio
 import logging
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import JSONResponse
 
 # Your existing imports
 from models.campaign import CampaignWebhook, CampaignData, CampaignOrchestrationState
-from agents.enhanced_orchestrator import EnhancedCampaignOrchestrator
-from services.enhanced_voice import EnhancedVoiceService
 
-# *** ADD DATABASE IMPORT ***
-from services.database import DatabaseService
+# Shared orchestrator, voice, database and job queue instances
+from services.container import get_container
+from services.conversation_events import (
+    get_conversation_registry, verify_elevenlabs_signature, POST_CALL_TRANSCRIPTION, CALL_INITIATION_FAILURE
+)
+from services.conversation_store import get_conversation_store
 
 from config.settings import settings
 
@@ -23,16 +26,8 @@ logger = logging.getLogger(__name__)
 
 enhanced_webhook_router = APIRouter()
 
-# Initialize enhanced services
-enhanced_orchestrator = EnhancedCampaignOrchestrator()
-enhanced_voice_service = EnhancedVoiceService()
-database_service = DatabaseService()  # *** ADD DATABASE SERVICE ***
-
 @enhanced_webhook_router.post("/enhanced-campaign")
-async def create_enhanced_campaign_with_db(
-    campaign_webhook: CampaignWebhook,
-    background_tasks: BackgroundTasks
-):
+async def create_enhanced_campaign_with_db(campaign_webhook: CampaignWebhook):
     """
     🎯 ENHANCED CAMPAIGN CREATION WITH DATABASE INTEGRATION
     
@@ -42,6 +37,9 @@ async def create_enhanced_campaign_with_db(
     - Real-time progress tracking
     - Advanced analytics
     """
+    services = get_container()
+    database_service = services.database_service
+    
     try:
         # Generate unique task ID
         task_id = str(uuid.uuid4())
@@ -93,29 +91,25 @@ async def create_enhanced_campaign_with_db(
         from main import active_campaigns
         active_campaigns[task_id] = orchestration_state
         
-        # *** STEP 3: Inject database service into orchestrator ***
-        if database_enabled and hasattr(enhanced_orchestrator, 'database_service'):
-            enhanced_orchestrator.database_service = database_service
-            logger.info("✅ Database service injected into enhanced orchestrator")
-        
-        # 🔥 START ENHANCED WORKFLOW WITH DATABASE
-        background_tasks.add_task(
-            enhanced_orchestrator.orchestrate_enhanced_campaign,  # ✅ CORRECT METHOD NAME
-            orchestration_state,  # ✅ Pass campaign_data, not orchestration_state
-            task_id
+        # *** STEP 3: Enqueue for a worker (survives restarts, scales separately) ***
+        await services.job_queue.enqueue(
+            job_id=task_id,
+            campaign_id=campaign_data.id,
+            payload=orchestration_state.model_dump(mode="json")
         )
         
         return JSONResponse(
             status_code=202,
             content={
-                "message": "🎯 Enhanced AI campaign workflow started WITH DATABASE",
+                "message": "🎯 Enhanced AI campaign workflow queued WITH DATABASE",
                 "task_id": task_id,
                 "campaign_id": campaign_data.id,
                 "brand_name": campaign_data.brand_name,
                 "product_name": campaign_data.product_name,
                 "estimated_duration_minutes": 8,
                 "monitor_url": f"/api/monitor/enhanced-campaign/{task_id}",
-                "status": "started",
+                "job_status_url": f"/api/monitor/jobs/{task_id}",
+                "status": "queued",
                 "database_enabled": database_enabled,
                 "enhancements": [
                     "ElevenLabs dynamic variables integration",
@@ -164,8 +158,59 @@ async def create_enhanced_campaign_with_db(
             detail=f"Enhanced campaign creation failed: {str(e)}"
         )
 
+@enhanced_webhook_router.post("/elevenlabs/post-call")
+async def elevenlabs_post_call_webhook(request: Request):
+    """
+    📬 ELEVENLABS POST-CALL WEBHOOK
+    
+    Verifies the ElevenLabs-Signature HMAC (WEBHOOK_SECRET) and wakes whoever is
+    waiting on the conversation, so completion is detected without polling.
+    Only transcription events complete a conversation; initiation failures
+    complete it as "failed" and other event types (audio) are ignored, so they
+    can never replace the stored transcript.
+    """
+    payload = await request.body()
+    
+    if not verify_elevenlabs_signature(payload, request.headers.get("ElevenLabs-Signature")):
+        logger.warning("⚠️ Rejected post-call webhook with invalid signature")
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+    
+    try:
+        event = json.loads(payload)
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+    
+    if not isinstance(event, dict) or not isinstance(event.get("data"), dict):
+        raise HTTPException(status_code=400, detail="Webhook payload must be a JSON object with a data object")
+    
+    event_type = event.get("type", "unknown")
+    conversation_data = event["data"]
+    conversation_id = conversation_data.get("conversation_id")
+    if not conversation_id:
+        raise HTTPException(status_code=400, detail="Missing conversation_id")
+    
+    if event_type == POST_CALL_TRANSCRIPTION:
+        # Transcription events are only sent for finished conversations
+        conversation_data.setdefault("status", "done")
+    elif event_type == CALL_INITIATION_FAILURE:
+        conversation_data = {**conversation_data, "status": "failed"}
+    else:
+        logger.info(f"📬 Ignoring post-call webhook ({event_type}) for {conversation_id}")
+        return {"status": "ignored", "conversation_id": conversation_id, "resolved": False}
+    
+    get_conversation_store().put(conversation_id, dict(conversation_data))
+    resolved = get_conversation_registry().resolve(conversation_id, conversation_data)
+    
+    logger.info(f"📬 Post-call webhook ({event_type}) for {conversation_id}")
+    
+    return {
+        "status": "received",
+        "conversation_id": conversation_id,
+        "resolved": resolved
+    }
+
 @enhanced_webhook_router.post("/test-enhanced-campaign")
-async def create_test_enhanced_campaign(background_tasks: BackgroundTasks):
+async def create_test_enhanced_campaign():
     """
     🧪 Create enhanced test campaign WITH DATABASE
     """
@@ -182,13 +227,17 @@ async def create_test_enhanced_campaign(background_tasks: BackgroundTasks):
     
     logger.info("🧪 Enhanced test campaign created with database integration")
     
-    return await create_enhanced_campaign_with_db(test_campaign, background_tasks)
+    return await create_enhanced_campaign_with_db(test_campaign)
 
 @enhanced_webhook_router.post("/test-enhanced-call")
 async def test_enhanced_elevenlabs_call():
     """
     🧪 Test enhanced ElevenLabs call with database logging
     """
+    services = get_container()
+    database_service = services.database_service
+    enhanced_voice_service = services.enhanced_voice_service
+    
     try:
         # Enhanced test creator profile
         enhanced_test_creator = {
@@ -289,6 +338,10 @@ async def test_enhanced_elevenlabs_setup():
     """
     🧪 Test enhanced ElevenLabs setup with database validation
     """
+    services = get_container()
+    database_service = services.database_service
+    enhanced_voice_service = services.enhanced_voice_service
+    
     try:
         # Test enhanced voice service
         result = await enhanced_voice_service.test_credentials()
@@ -352,6 +405,10 @@ async def test_enhanced_elevenlabs_setup():
 @enhanced_webhook_router.get("/system-status")
 async def enhanced_system_status():
     """📊 Enhanced system status with database metrics"""
+    services = get_container()
+    database_service = services.database_service
+    enhanced_voice_service = services.enhanced_voice_service
+    
     
     # Check database status and get metrics
     database_metrics = {}
@@ -425,6 +482,9 @@ async def enhanced_system_status():
 @enhanced_webhook_router.get("/analytics/campaigns")
 async def get_campaign_analytics():
     """📊 Get campaign analytics from database"""
+    services = get_container()
+    database_service = services.database_service
+    
     try:
         if not database_service:
             raise HTTPException(status_code=500, detail="Database service not available")
@@ -481,6 +541,9 @@ async def get_campaign_analytics():
 @enhanced_webhook_router.get("/analytics/creators")
 async def get_creator_analytics():
     """📊 Get creator performance analytics from database"""
+    services = get_container()
+    database_service = services.database_service
+    
     try:
         if not database_service:
             raise HTTPException(status_code=500, detail="Database service not available")
@@ -542,6 +605,9 @@ async def get_creator_analytics():
 @enhanced_webhook_router.get("/database/health")
 async def database_health_check():
     """🏥 Comprehensive database health check"""
+    services = get_container()
+    database_service = services.database_service
+    
     try:
         if not database_service:
             return {
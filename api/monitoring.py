@@ -14,16 +14,14 @@ async def monitor_campaign_progress(task_id: str) -> Dict[str, Any]:
     🔍 Real-time campaign progress monitoring
     Returns detailed progress information for live demo tracking
     """
-    from main import active_campaigns
+    state = await _get_campaign_state(task_id)
     
-    if task_id not in active_campaigns:
+    if state is None:
         raise HTTPException(
             status_code=404,
             detail=f"Campaign with task_id {task_id} not found. Check if the campaign was started correctly."
         )
     
-    state = active_campaigns[task_id]
-    
     # Calculate progress percentage based on current stage
     progress_percentage = _calculate_progress_percentage(state)
     
@@ -115,13 +113,11 @@ async def list_active_campaigns() -> Dict[str, Any]:
 @monitoring_router.get("/campaign/{task_id}/summary")
 async def get_campaign_summary(task_id: str) -> Dict[str, Any]:
     """📊 Get detailed campaign summary and results"""
-    from main import active_campaigns
+    state = await _get_campaign_state(task_id)
     
-    if task_id not in active_campaigns:
+    if state is None:
         raise HTTPException(404, "Campaign not found")
     
-    state = active_campaigns[task_id]
-    
     # Get detailed summary using the model method
     summary = state.get_campaign_summary()
     
@@ -159,19 +155,79 @@ async def get_campaign_summary(task_id: str) -> Dict[str, Any]:
         "performance_metrics": _calculate_performance_metrics(state)
     }
 
+@monitoring_router.get("/jobs/{task_id}")
+async def get_job_status(task_id: str) -> Dict[str, Any]:
+    """📦 Durable job status (works for jobs run by separate worker processes)"""
+    from services.container import get_container
+    
+    job = await get_container().job_queue.get_job(task_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {task_id} not found")
+    
+    return {
+        "task_id": job.id,
+        "campaign_id": job.campaign_id,
+        "status": job.status.value,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "worker_id": job.worker_id,
+        "result": job.result,
+        "error": job.error,
+        "timing": {
+            "enqueued_at": job.enqueued_at.isoformat(),
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "heartbeat_at": job.heartbeat_at.isoformat() if job.heartbeat_at else None,
+            "completed_at": job.completed_at.isoformat() if job.completed_at else None
+        }
+    }
+
+@monitoring_router.get("/negotiations/live")
+async def get_live_negotiations() -> Dict[str, Any]:
+    """📡 Live negotiation state (outcome signals, sentiment, latest price) of recent calls"""
+    from agents.enhanced_negotiation import get_live_negotiation_tracker
+    
+    negotiations = get_live_negotiation_tracker().snapshot()
+    return {
+        "count": len(negotiations),
+        "negotiations": negotiations,
+        "timestamp": datetime.now().isoformat()
+    }
+
+@monitoring_router.get("/negotiations/live/{conversation_id}")
+async def get_live_negotiation(conversation_id: str) -> Dict[str, Any]:
+    """📡 Live negotiation state of one call"""
+    from agents.enhanced_negotiation import get_live_negotiation_tracker
+    
+    negotiation = get_live_negotiation_tracker().snapshot(conversation_id)
+    if not negotiation:
+        raise HTTPException(status_code=404, detail=f"No live transcript for conversation {conversation_id}")
+    
+    return {"conversation_id": conversation_id, **negotiation[conversation_id]}
+
 @monitoring_router.get("/health")
 async def monitoring_health():
     """🏥 Health check for monitoring service"""
     from main import active_campaigns
+    from services.container import get_container
+    from services.status_poller import get_call_duration_stats
+    from services.circuit_breaker import get_circuit_stats
     
     return {
         "service": "Campaign Monitoring API",
         "status": "healthy",
         "active_campaigns": len(active_campaigns),
+        "llm_gateway": get_container().llm_gateway.get_stats(),
+        "status_poller": get_container().enhanced_voice_service.status_poller.get_stats(),
+        "call_durations": get_call_duration_stats().get_stats(),
+        "conversation_store": get_container().enhanced_voice_service.conversation_store.get_stats(),
+        "circuits": get_circuit_stats(),
         "endpoints": [
             "/api/monitor/campaign/{task_id}",
             "/api/monitor/campaigns", 
-            "/api/monitor/campaign/{task_id}/summary"
+            "/api/monitor/campaign/{task_id}/summary",
+            "/api/monitor/jobs/{task_id}",
+            "/api/monitor/negotiations/live",
+            "/api/monitor/negotiations/live/{conversation_id}"
         ],
         "capabilities": [
             "Real-time progress tracking",
@@ -183,6 +239,21 @@ async def monitoring_health():
 
 # Helper functions for monitoring logic
 
+async def _get_campaign_state(task_id: str):
+    """In-memory state if this process is running the campaign, else the latest checkpoint"""
+    from main import active_campaigns
+    
+    if task_id in active_campaigns:
+        return active_campaigns[task_id]
+    
+    # Campaign may be running on a separate worker - read its checkpoint
+    try:
+        from services.container import get_container
+        return await get_container().checkpoint_store.load(task_id)
+    except Exception as e:
+        logger.error(f"❌ Failed to load checkpoint for {task_id}: {e}")
+        return None
+
 def _calculate_progress_percentage(state) -> float:
     """Calculate overall progress percentage"""
     if state.current_stage == "webhook_received":
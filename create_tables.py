@@ -7,6 +7,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from config.database import DatabaseConfig
+from services.transcript_store import migrate_legacy_transcripts
 
 async def create_tables():
     """Create all database tables"""
@@ -14,6 +15,10 @@ async def create_tables():
     try:
         await db_config.create_tables()
         print("✅ All database tables created successfully!")
+        
+        # Inline call transcripts -> compressed, deduplicated transcript_blobs
+        stats = await migrate_legacy_transcripts(db_config)
+        print(f"✅ Transcripts migrated: {stats['rows']} rows")
     except Exception as e:
         print(f"❌ Error creating tables: {e}")
     finally:
@@ -0,0 +1,397 @@
+# elevenlabs_simulator.py - LOCAL ELEVENLABS API SIMULATOR
+"""
+Local simulator of the ElevenLabs conversational AI endpoints used by the
+voice services, for load testing the voice pipeline without real calls:
+
+    POST /v1/convai/twilio/outbound-call
+    GET  /v1/convai/conversations/{conversation_id}
+    GET  /v1/user
+
+Simulated calls go initiated → in-progress → done (or failed) over a sampled
+call duration; the transcript is revealed turn by turn while the call runs and
+the analysis payload appears when it ends. Response latency, 5xx errors and
+429 rate limiting are injected from configurable distributions. Scripted
+scenarios (transcripts + analysis) can be loaded from a JSON file.
+
+Serve it and point the services at it:
+
+    python elevenlabs_simulator.py --port 8100 --duration 30 90 --error-rate 0.02
+    ELEVENLABS_BASE_URL=http://localhost:8100 python main.py
+
+or benchmark the voice pipeline against an in-process simulator:
+
+    python elevenlabs_simulator.py --benchmark 2000 --duration 5 15
+"""
+import sys
+import json
+import time
+import uuid
+import random
+import asyncio
+import hashlib
+import logging
+import argparse
+from typing import Optional, Dict, Any, List, Tuple
+
+from aiohttp import web
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+
+# ================================
+# CONFIGURATION
+# ================================
+
+class SimulatedScenario(BaseModel):
+    """One scripted conversation: turns are (role, text) pairs"""
+    name: str
+    weight: float = 1.0
+    turns: List[Tuple[str, str]]
+    analysis: Dict[str, Any]
+
+
+DEFAULT_SCENARIOS = [
+    SimulatedScenario(
+        name="accepted",
+        weight=0.6,
+        turns=[
+            ("agent", "Hi {name}! I'm calling about a sponsored collaboration with our brand."),
+            ("user", "Sure, I'm interested. What's the offer?"),
+            ("agent", "We can offer ${offer} for one dedicated video and two stories."),
+            ("user", "That sounds fair. I accept, let's do it!"),
+            ("agent", "Great, I'll send the contract over today.")
+        ],
+        analysis={"outcome": "accepted", "sentiment": "positive", "call_successful": "success"}
+    ),
+    SimulatedScenario(
+        name="countered",
+        weight=0.25,
+        turns=[
+            ("agent", "Hi {name}! We'd love to work with you on our upcoming campaign."),
+            ("user", "Thanks! What budget do you have in mind?"),
+            ("agent", "We were thinking ${offer} for a dedicated video."),
+            ("user", "My usual rate is ${counter}, could you meet me there?"),
+            ("agent", "We can do ${counter}. Deal."),
+            ("user", "Perfect, deal.")
+        ],
+        analysis={"outcome": "accepted", "sentiment": "neutral", "call_successful": "success"}
+    ),
+    SimulatedScenario(
+        name="declined",
+        weight=0.15,
+        turns=[
+            ("agent", "Hi {name}! I'm reaching out about a paid partnership."),
+            ("user", "Thanks, but I'm fully booked this quarter."),
+            ("agent", "Understood - could we revisit next quarter?"),
+            ("user", "No, sorry, I can't take it on.")
+        ],
+        analysis={"outcome": "declined", "sentiment": "negative", "call_successful": "failure"}
+    )
+]
+
+
+class SimulatorConfig(BaseModel):
+    """Latency, failure and call-duration knobs for the simulator"""
+    latency_ms: float = 40.0  # median response latency
+    latency_sigma: float = 0.5  # lognormal spread of the latency
+    error_rate: float = 0.0  # share of requests answered with a 5xx
+    rate_limit_rate: float = 0.0  # share of requests answered with a 429
+    retry_after_seconds: int = 1
+    call_duration_min: float = 30.0
+    call_duration_max: float = 120.0
+    call_failure_rate: float = 0.05  # calls that end "failed" (no answer, dropped line)
+    ring_seconds: float = 3.0  # "initiated" before the call is in progress
+    scenarios: List[SimulatedScenario] = DEFAULT_SCENARIOS
+
+
+class SimulatedCall:
+    """Server-side state of one outbound call"""
+
+    def __init__(self, conversation_id: str, to_number: str, dynamic_variables: Dict[str, Any], config: SimulatorConfig):
+        self.conversation_id = conversation_id
+        self.to_number = to_number
+        self.started_at = time.monotonic()
+        self.duration = random.uniform(config.call_duration_min, config.call_duration_max)
+        self.ring_seconds = min(config.ring_seconds, self.duration)
+        self.fails = random.random() < config.call_failure_rate
+        self.scenario = random.choices(config.scenarios, weights=[s.weight for s in config.scenarios])[0]
+
+        offer = int(float(dynamic_variables.get("initialOffer", 1000)))
+        max_offer = int(float(dynamic_variables.get("maxBudget", offer * 1.3)))
+        self.agreed_price = max_offer if self.scenario.name == "countered" else offer
+        values = {
+            "name": dynamic_variables.get("influencerName", "there"),
+            "offer": f"{offer:,}",
+            "counter": f"{max_offer:,}"
+        }
+        self.turns = [(role, text.format(**values)) for role, text in self.scenario.turns]
+
+    def status(self, now: float) -> str:
+        elapsed = now - self.started_at
+        if elapsed < self.ring_seconds:
+            return "initiated"
+        if elapsed < self.duration:
+            return "in-progress"
+        return "failed" if self.fails else "done"
+
+    def payload(self, now: float) -> Dict[str, Any]:
+        status = self.status(now)
+        elapsed = min(now - self.started_at, self.duration)
+        ended = status in ("done", "failed")
+
+        # Turns are revealed evenly across the talking time
+        talk_time = max(self.duration - self.ring_seconds, 1e-6)
+        if self.fails:
+            visible = 0
+        elif ended:
+            visible = len(self.turns)
+        else:
+            visible = int(len(self.turns) * max(elapsed - self.ring_seconds, 0) / talk_time)
+
+        transcript = [
+            {
+                "role": role,
+                "message": text,
+                "text": text,  # the analyzers read "text"
+                "time_in_call_secs": round(self.ring_seconds + talk_time * index / len(self.turns), 1)
+            }
+            for index, (role, text) in enumerate(self.turns[:visible])
+        ]
+
+        payload = {
+            "agent_id": "simulated_agent",
+            "conversation_id": self.conversation_id,
+            "status": status,
+            "transcript": transcript,
+            "metadata": {
+                "start_time_unix_secs": int(time.time() - elapsed),
+                "call_duration_secs": round(elapsed, 1),
+                "to_number": self.to_number
+            }
+        }
+
+        if status == "done":
+            payload["analysis"] = {
+                **self.scenario.analysis,
+                "agreed_price": self.agreed_price if self.scenario.analysis.get("outcome") == "accepted" else None,
+                "transcript_summary": f"Simulated '{self.scenario.name}' negotiation"
+            }
+        elif status == "failed":
+            payload["error"] = "Call not answered"
+
+        return payload
+
+
+# ================================
+# SIMULATOR SERVER
+# ================================
+
+class ElevenLabsSimulator:
+    """
+    🧪 ELEVENLABS API SIMULATOR
+
+    ``build_app()`` returns the aiohttp application; ``stats`` counts requests
+    and injected failures.
+    """
+
+    def __init__(self, config: Optional[SimulatorConfig] = None):
+        self.config = config or SimulatorConfig()
+        self.calls: Dict[str, SimulatedCall] = {}
+        self.stats = {
+            "requests": 0,
+            "calls_started": 0,
+            "status_requests": 0,
+            "not_modified": 0,
+            "errors_injected": 0,
+            "rate_limited": 0
+        }
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/v1/convai/twilio/outbound-call", self.outbound_call)
+        app.router.add_get("/v1/convai/conversations/{conversation_id}", self.get_conversation)
+        app.router.add_get("/v1/user", self.get_user)
+        app.router.add_get("/simulator/stats", self.get_stats)
+        return app
+
+    async def _simulate_network(self) -> Optional[web.Response]:
+        """Sleep for a sampled latency; maybe return an injected failure"""
+        self.stats["requests"] += 1
+        await asyncio.sleep(random.lognormvariate(0, self.config.latency_sigma) * self.config.latency_ms / 1000)
+
+        roll = random.random()
+        if roll < self.config.rate_limit_rate:
+            self.stats["rate_limited"] += 1
+            return web.json_response(
+                {"detail": {"status": "too_many_concurrent_requests"}},
+                status=429,
+                headers={"Retry-After": str(self.config.retry_after_seconds)}
+            )
+        if roll < self.config.rate_limit_rate + self.config.error_rate:
+            self.stats["errors_injected"] += 1
+            return web.json_response({"detail": {"status": "internal_error"}}, status=random.choice([500, 502, 503]))
+        return None
+
+    async def outbound_call(self, request: web.Request) -> web.Response:
+        failure = await self._simulate_network()
+        if failure is not None:
+            return failure
+
+        body = await request.json()
+        if not body.get("agent_id") or not body.get("to_number"):
+            return web.json_response({"detail": "agent_id and to_number are required"}, status=422)
+
+        conversation_id = f"sim_conv_{uuid.uuid4().hex[:16]}"
+        dynamic_variables = body.get("conversation_initiation_client_data", {}).get("dynamic_variables", {})
+        self.calls[conversation_id] = SimulatedCall(conversation_id, body["to_number"], dynamic_variables, self.config)
+        self.stats["calls_started"] += 1
+
+        return web.json_response({
+            "success": True,
+            "message": "Success",
+            "conversation_id": conversation_id,
+            "callSid": f"CA{uuid.uuid4().hex}"
+        })
+
+    async def get_conversation(self, request: web.Request) -> web.Response:
+        failure = await self._simulate_network()
+        if failure is not None:
+            return failure
+
+        self.stats["status_requests"] += 1
+        call = self.calls.get(request.match_info["conversation_id"])
+        if call is None:
+            return web.json_response({"detail": "Conversation not found"}, status=404)
+
+        body = json.dumps(call.payload(time.monotonic()))
+        etag = f'"{hashlib.md5(body.encode("utf-8")).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            self.stats["not_modified"] += 1
+            return web.Response(status=304, headers={"ETag": etag})
+
+        return web.Response(text=body, content_type="application/json", headers={"ETag": etag})
+
+    async def get_user(self, request: web.Request) -> web.Response:
+        failure = await self._simulate_network()
+        if failure is not None:
+            return failure
+        return web.json_response({"subscription": {"tier": "simulated"}, "is_new_user": False})
+
+    async def get_stats(self, request: web.Request) -> web.Response:
+        return web.json_response({**self.stats, "calls": len(self.calls)})
+
+
+# ================================
+# BENCHMARK
+# ================================
+
+async def run_benchmark(config: SimulatorConfig, calls: int, port: int) -> Dict[str, Any]:
+    """Drive ``calls`` concurrent negotiations through EnhancedVoiceService against an in-process simulator"""
+    from config.settings import settings
+
+    simulator = ElevenLabsSimulator(config)
+    runner = web.AppRunner(simulator.build_app())
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+
+    settings.elevenlabs_base_url = f"http://127.0.0.1:{port}"
+    settings.elevenlabs_api_key = settings.elevenlabs_api_key or "simulated_key"
+    settings.elevenlabs_agent_id = settings.elevenlabs_agent_id or "simulated_agent"
+    settings.elevenlabs_phone_number_id = settings.elevenlabs_phone_number_id or "simulated_phone"
+    settings.conversation_webhooks_enabled = False  # the simulator does not send webhooks
+
+    from services.enhanced_voice import EnhancedVoiceService
+    from services.http_client import close_http_clients
+
+    voice_service = EnhancedVoiceService()
+    max_wait = int(config.call_duration_max * 2 + 60)
+    outcomes: Dict[str, int] = {}
+    completion_lags: List[float] = []
+
+    async def negotiate(index: int) -> None:
+        call = await voice_service.initiate_negotiation_call(
+            f"+1555{index:07d}",
+            {"name": f"Creator {index}", "followers": random.randint(10_000, 2_000_000)},
+            {"brand_name": "Simulated Brand"},
+            {"initial_offer": 1000, "max_offer": 1400}
+        )
+        if call.get("status") != "success":
+            outcomes["initiation_failed"] = outcomes.get("initiation_failed", 0) + 1
+            return
+
+        result = await voice_service.wait_for_conversation_completion_with_analysis(
+            call["conversation_id"], max_wait_seconds=max_wait, creator_tier=call.get("creator_tier")
+        )
+        outcomes[result["status"]] = outcomes.get(result["status"], 0) + 1
+
+        simulated = simulator.calls.get(call["conversation_id"])
+        if simulated is not None and result["status"] in ("completed", "failed"):
+            completion_lags.append(time.monotonic() - simulated.started_at - simulated.duration)
+
+    started = time.monotonic()
+    try:
+        await asyncio.gather(*(negotiate(i) for i in range(calls)))
+    finally:
+        elapsed = time.monotonic() - started
+        await voice_service.status_poller.close()
+        await close_http_clients()
+        await runner.cleanup()
+
+    completion_lags.sort()
+    return {
+        "calls": calls,
+        "elapsed_seconds": round(elapsed, 2),
+        "outcomes": outcomes,
+        "detection_lag_p50": round(completion_lags[len(completion_lags) // 2], 3) if completion_lags else None,
+        "detection_lag_p95": round(completion_lags[int(len(completion_lags) * 0.95)], 3) if completion_lags else None,
+        "status_requests_per_call": round(simulator.stats["status_requests"] / max(calls, 1), 2),
+        "simulator": simulator.stats,
+        "poller": voice_service.status_poller.get_stats()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local ElevenLabs API simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=40.0, help="Median response latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Lognormal latency spread")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 5xx")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of requests answered with a 429")
+    parser.add_argument("--duration", type=float, nargs=2, metavar=("MIN", "MAX"), default=[30.0, 120.0], help="Call duration range in seconds")
+    parser.add_argument("--call-failure-rate", type=float, default=0.05)
+    parser.add_argument("--scenarios", help="JSON file with a list of scenarios (name, weight, turns, analysis)")
+    parser.add_argument("--benchmark", type=int, metavar="CALLS", help="Run CALLS concurrent negotiations against an in-process simulator and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    config = SimulatorConfig(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        call_duration_min=args.duration[0],
+        call_duration_max=args.duration[1],
+        call_failure_rate=args.call_failure_rate
+    )
+    if args.scenarios:
+        with open(args.scenarios) as f:
+            config.scenarios = [SimulatedScenario.model_validate(item) for item in json.load(f)]
+
+    if args.benchmark:
+        logging.getLogger().setLevel(logging.CRITICAL)  # per-call logs (including simulated failures) would dominate the run
+        result = asyncio.run(run_benchmark(config, args.benchmark, args.port))
+        print(json.dumps(result, indent=2))
+        return
+
+    logger.info(f"🧪 ElevenLabs simulator on http://{args.host}:{args.port} (set ELEVENLABS_BASE_URL to use it)")
+    web.run_app(ElevenLabsSimulator(config).build_app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,6 +11,11 @@ CREATE INDEX IF NOT EXISTS idx_negotiations_creator ON negotiations(creator_id);
 CREATE INDEX IF NOT EXISTS idx_contracts_campaign ON contracts(campaign_id);
 CREATE INDEX IF NOT EXISTS idx_outreach_logs_campaign ON outreach_logs(campaign_id);
 
+-- Natural keys: a retried write skips rows that are already stored
+CREATE UNIQUE INDEX IF NOT EXISTS uq_negotiations_campaign_creator ON negotiations(campaign_id, creator_id);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_payments_contract ON payments(contract_id);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_outreach_logs_campaign_creator_type ON outreach_logs(campaign_id, creator_id, contact_type);
+
 -- Create functions for updated timestamps
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
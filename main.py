@@ -3,6 +3,7 @@ import asyncio
 import logging
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 from typing import Dict
 
@@ -14,6 +15,10 @@ from services.enhanced_voice import EnhancedVoiceService
 
 # *** ADD DATABASE IMPORTS ***
 from services.database import DatabaseService
+from services.container import init_container, get_container, close_container
+from services.status_poller import get_call_duration_stats
+from agents.enhanced_negotiation import get_live_negotiation_tracker
+from models.campaign import CreatorTier
 from config.settings import settings
 
 # Set up logging
@@ -28,6 +33,7 @@ active_campaigns: Dict[str, any] = {}
 orchestrator: EnhancedCampaignOrchestrator = None
 voice_service: EnhancedVoiceService = None
 database_service: DatabaseService = None  # *** ADD DATABASE SERVICE ***
+campaign_worker = None  # Embedded job worker (disable with RUN_EMBEDDED_WORKER=false)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -37,7 +43,7 @@ async def lifespan(app: FastAPI):
     Proper initialization and cleanup of all services including database
     """
     
-    global orchestrator, voice_service, database_service
+    global orchestrator, voice_service, database_service, campaign_worker
     
     # ================================
     # STARTUP SEQUENCE
@@ -45,45 +51,72 @@ async def lifespan(app: FastAPI):
     logger.info("🚀 Starting InfluencerFlow AI Platform with Database...")
     
     try:
+        # *** STEP 0: Build shared services once for this process ***
+        services = init_container(state_listener=active_campaigns.__setitem__)
+        
         # *** STEP 1: Initialize Database First ***
         logger.info("💾 Initializing PostgreSQL database...")
-        database_service = DatabaseService()
-        await database_service.initialize()
-        logger.info("✅ Database initialized successfully")
+        database_service = services.database_service
         
         # Test database connection
         try:
+            await database_service.initialize()
+            logger.info("✅ Database initialized successfully")
+            
             async with database_service.get_session() as session:
                 result = await session.execute("SELECT version()")
                 db_version = result.scalar()
                 logger.info(f"✅ Database connected: {db_version[:50]}...")
+            
+            # Seed status-poll scheduling with historical call durations
+            # (agent ids are not stored per call - history counts towards the configured agent)
+            durations = await database_service.get_recent_call_durations()
+            seeded = get_call_duration_stats().seed(
+                (settings.elevenlabs_agent_id, CreatorTier.for_followers(row["followers"]).value, row["call_duration_seconds"])
+                for row in durations
+            )
+            logger.info(f"📈 Poll scheduling seeded with {seeded} historical call durations")
         except Exception as e:
             logger.error(f"⚠️ Database connection test failed: {e}")
             logger.info("📋 Continuing with limited database functionality")
         
         # *** STEP 2: Initialize Voice Service ***
         logger.info("📞 Initializing Enhanced Voice Service...")
-        voice_service = EnhancedVoiceService()
+        voice_service = services.enhanced_voice_service
         
         # Test voice service connectivity
         voice_test = await voice_service.test_credentials()
         logger.info(f"📞 Voice service status: {voice_test.get('status', 'unknown')}")
         
+        # Analyze transcript turns live as polls and webhooks deliver them
+        get_live_negotiation_tracker()
+        
         # *** STEP 3: Initialize Enhanced Orchestrator ***
         logger.info("🧠 Initializing Enhanced Campaign Orchestrator...")
-        orchestrator = EnhancedCampaignOrchestrator()
+        orchestrator = services.enhanced_orchestrator  # Already wired to the shared database service
         
-        # Inject database service into orchestrator if it has database support
-        if hasattr(orchestrator, 'database_service'):
-            orchestrator.database_service = database_service
-            logger.info("✅ Database service injected into orchestrator")
+        # Validate Groq credentials in the background - startup does not wait on the LLM API
+        services.llm_gateway.start_health_refresh()
         
-        # *** STEP 4: Startup Summary ***
+        # *** STEP 4: Start Embedded Job Worker ***
+        if settings.run_embedded_worker:
+            from worker import CampaignWorker
+            
+            campaign_worker = CampaignWorker(
+                job_queue=services.job_queue,
+                orchestrator=orchestrator,
+                state_listener=active_campaigns.__setitem__
+            )
+            campaign_worker.start()
+            logger.info("✅ Embedded campaign worker started")
+        
+        # *** STEP 5: Startup Summary ***
         logger.info("🎉 Platform initialization completed!")
         logger.info("🔧 Active services:")
         logger.info(f"   • Database: {'✅ Connected' if database_service else '❌ Failed'}")
         logger.info(f"   • Voice Service: {'✅ Ready' if voice_service else '❌ Failed'}")
         logger.info(f"   • Orchestrator: {'✅ Ready' if orchestrator else '❌ Failed'}")
+        logger.info(f"   • Job Worker: {'✅ Embedded' if campaign_worker else '➖ External (python worker.py)'}")
         
         yield
         
@@ -99,6 +132,14 @@ async def lifespan(app: FastAPI):
         # ================================
         logger.info("🛑 Shutting down platform...")
         
+        # Stop the embedded worker - unfinished jobs are reclaimed after their lease expires
+        if campaign_worker:
+            try:
+                await campaign_worker.stop()
+                logger.info("✅ Embedded campaign worker stopped")
+            except Exception as e:
+                logger.error(f"❌ Error stopping campaign worker: {e}")
+        
         # Stop any active monitoring
         if orchestrator and hasattr(orchestrator, 'conversation_monitor'):
             try:
@@ -107,10 +148,10 @@ async def lifespan(app: FastAPI):
             except Exception as e:
                 logger.error(f"❌ Error stopping conversation monitor: {e}")
         
-        # Close database connections
+        # Close shared services (database pool included)
         if database_service:
             try:
-                await database_service.close()
+                await close_container()
                 logger.info("✅ Database connections closed")
             except Exception as e:
                 logger.error(f"❌ Database cleanup error: {e}")
@@ -344,6 +385,9 @@ async def health_check():
                 "type": "elevenlabs"
             }
         
+        # Check LLM credentials (cached probe, refreshed in the background)
+        health_status["services"]["llm"] = await get_container().llm_gateway.check_health()
+        
         # Check orchestrator
         if orchestrator:
             health_status["services"]["orchestrator"] = {
@@ -393,12 +437,12 @@ async def http_exception_handler(request, exc):
         except:
             pass  # Don't fail on error logging
     
-    return {
+    return JSONResponse(status_code=exc.status_code, content={
         "error": exc.detail,
         "status_code": exc.status_code,
         "type": "http_error",
         "timestamp": "2024-12-14T10:00:00Z"
-    }
+    })
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
@@ -413,12 +457,12 @@ async def general_exception_handler(request, exc):
         except:
             pass  # Don't fail on error logging
     
-    return {
+    return JSONResponse(status_code=500, content={
         "error": "Internal server error",
         "message": str(exc),
         "type": "server_error",
         "timestamp": "2024-12-14T10:00:00Z"
-    }
+    })
 
 if __name__ == "__main__":
     import uvicorn
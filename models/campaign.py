@@ -1,6 +1,6 @@
 # models/campaign.py - FIXED VERSION
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
 from enum import Enum
 
@@ -50,6 +50,16 @@ class CreatorTier(str, Enum):
     MICRO = "micro_influencer"      # < 100K followers
     MACRO = "macro_influencer"      # 100K - 1M followers  
     MEGA = "mega_influencer"        # > 1M followers
+    
+    @classmethod
+    def for_followers(cls, followers: int) -> "CreatorTier":
+        """Tier for a follower count"""
+        if followers < 100_000:
+            return cls.MICRO
+        elif followers < 1_000_000:
+            return cls.MACRO
+        else:
+            return cls.MEGA
 
 class Platform(str, Enum):
     YOUTUBE = "YouTube"
@@ -83,12 +93,7 @@ class Creator(BaseModel):
     @property
     def tier(self) -> CreatorTier:
         """Determine creator tier based on followers"""
-        if self.followers < 100_000:
-            return CreatorTier.MICRO
-        elif self.followers < 1_000_000:
-            return CreatorTier.MACRO
-        else:
-            return CreatorTier.MEGA
+        return CreatorTier.for_followers(self.followers)
     
     @property
     def estimated_cpm(self) -> float:
@@ -187,6 +192,18 @@ class NegotiationState(BaseModel):
 # ORCHESTRATION STATE MODEL
 # ================================
 
+class OrchestrationPhase(str, Enum):
+    """Orchestration state machine phases - persisted in checkpoints"""
+    INITIALIZING = "initializing"
+    STRATEGY = "strategy"
+    DISCOVERY = "discovery"  # legacy: checkpoints from before discovery was pipelined resume at NEGOTIATIONS
+    NEGOTIATIONS = "negotiations"
+    COMPLETION_DECISION = "completion_decision"
+    CONTRACTS = "contracts"
+    DATABASE_SYNC = "database_sync"
+    FINALIZING = "finalizing"
+    COMPLETED = "completed"
+
 class CampaignOrchestrationState(BaseModel):
     """Overall campaign orchestration state - CORRECT VERSION with exact required fields"""
     campaign_id: str
@@ -214,6 +231,24 @@ class CampaignOrchestrationState(BaseModel):
     
     # AI strategy field (the one that was missing)
     ai_strategy: Optional[str] = None
+    strategy_data: Dict[str, Any] = Field(default_factory=dict)
+    
+    # Checkpoint / resume tracking
+    phase: OrchestrationPhase = OrchestrationPhase.INITIALIZING
+    in_flight_creator_ids: List[str] = Field(default_factory=list)  # calls started but not yet recorded
+    checkpoint_version: int = 0
+    
+    @field_validator("phase")
+    @classmethod
+    def _resume_legacy_phase(cls, phase: OrchestrationPhase) -> OrchestrationPhase:
+        """Discovery now runs inside the negotiations phase"""
+        if phase == OrchestrationPhase.DISCOVERY:
+            return OrchestrationPhase.NEGOTIATIONS
+        return phase
+    
+    # Database references
+    database_campaign_id: Optional[str] = None
+    final_analytics: Optional[Dict[str, Any]] = None
     
     # Contract storage
     contracts: List[Dict[str, Any]] = Field(default_factory=list)
@@ -233,6 +268,11 @@ class CampaignOrchestrationState(BaseModel):
         else:
             self.failed_negotiations += 1
     
+    @property
+    def negotiated_creator_ids(self) -> List[str]:
+        """Creators that already have a recorded negotiation result"""
+        return [negotiation.creator_id for negotiation in self.negotiations]
+    
     def get_progress_summary(self) -> Dict[str, Any]:
         """Get current progress summary for monitoring"""
         total_negotiations = len(self.negotiations)
@@ -240,6 +280,7 @@ class CampaignOrchestrationState(BaseModel):
         return {
             "campaign_id": self.campaign_id,
             "current_stage": self.current_stage,
+            "phase": self.phase.value,
             "current_influencer": self.current_influencer,
             "discovered_count": len(self.discovered_influencers),
             "total_negotiations": total_negotiations,
@@ -307,6 +348,86 @@ class ContractData(BaseModel):
     legal_review_status: str = "pending"
     amendments: List[Dict[str, Any]] = Field(default_factory=list)
 
+# ================================
+# JOB QUEUE MODELS
+# ================================
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class CampaignJobData(BaseModel):
+    """Durable campaign orchestration job pulled by workers"""
+    id: str  # task_id returned to the API caller
+    campaign_id: str
+    payload: Dict[str, Any] = Field(default_factory=dict)  # serialized CampaignOrchestrationState
+
+    status: JobStatus = JobStatus.QUEUED
+    attempts: int = 0
+    max_attempts: int = 3
+    worker_id: Optional[str] = None
+
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    # Timestamps
+    enqueued_at: datetime = Field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    heartbeat_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    @property
+    def can_retry(self) -> bool:
+        """Check if the job has attempts left"""
+        return self.attempts < self.max_attempts
+
+# ================================
+# AI RESPONSE SCHEMAS
+# ================================
+# A streamed LLM response is used as soon as its object closes (or every field has arrived)
+
+class AICampaignStrategy(BaseModel):
+    """Campaign strategy returned by the LLM"""
+    creator_tier_priority: List[str]
+    budget_allocation: Dict[str, Any]
+    negotiation_approach: Literal["aggressive", "collaborative", "premium"]
+    max_creators_to_contact: int = Field(ge=1, le=10)
+    success_criteria: Dict[str, Any] = Field(default_factory=lambda: {"min_creators": 1, "target_success_rate": 0.6})
+    risk_mitigation: Any = "diversify_across_tiers"
+
+class AINegotiationStrategy(BaseModel):
+    """Per-creator negotiation strategy returned by the LLM"""
+    approach: Literal["aggressive", "collaborative", "premium"]
+    opening_offer_multiplier: float = Field(ge=0.8, le=1.2)  # vs typical rate - the range the prompts ask for
+    max_offer_multiplier: float = Field(ge=0.9, le=1.3)
+    key_selling_points: List[str] = Field(default_factory=list)
+    confidence_level: Optional[float] = Field(default=None, ge=0.0, le=1.0)
+
+class AIProgressDecision(BaseModel):
+    """Mid-campaign progress decision returned by the LLM"""
+    action: Literal["continue", "stop_early", "adjust_approach"]
+    reason: str
+    confidence: Optional[float] = None
+    recommended_changes: List[Any] = Field(default_factory=list)
+
+class AICompletionDecision(BaseModel):
+    """Campaign completion decision returned by the LLM"""
+    action: Literal["complete", "continue"]
+    reason: str
+    find_more: bool = False
+    satisfaction_score: Optional[float] = None
+
+class AICampaignInsights(BaseModel):
+    """End-of-campaign insights returned by the LLM"""
+    performance_grade: Literal["A", "B", "C", "D", "F"]
+    roi_outlook: Literal["Excellent", "Good", "Fair", "Poor"]
+    key_successes: List[str] = Field(default_factory=list)
+    improvement_areas: List[str] = Field(default_factory=list)
+    recommendations: List[str] = Field(default_factory=list)
+    next_steps: List[str] = Field(default_factory=list)
+
 # ================================
 # VALIDATION MODELS
 # ================================
@@ -1,6 +1,6 @@
 """SQLAlchemy database models"""
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, JSON, ForeignKey, Boolean, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, JSON, ForeignKey, Boolean, Enum, LargeBinary, UniqueConstraint
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from config.database import Base
 import enum
@@ -83,6 +83,7 @@ class Creator(Base):
 class Negotiation(Base):
     """Negotiation database model"""
     __tablename__ = "negotiations"
+    __table_args__ = (UniqueConstraint("campaign_id", "creator_id", name="uq_negotiations_campaign_creator"),)
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     campaign_id = Column(String, ForeignKey("campaigns.id"), nullable=False)
@@ -99,7 +100,8 @@ class Negotiation(Base):
     email_status = Column(String)
     call_duration_seconds = Column(Integer, default=0)
     call_recording_url = Column(Text)
-    call_transcript = Column(Text)
+    call_transcript = deferred(Column(Text))  # legacy inline transcript - new rows use call_transcript_ref
+    call_transcript_ref = Column(String(64), ForeignKey("transcript_blobs.sha256"), index=True)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -141,6 +143,7 @@ class Contract(Base):
 class Payment(Base):
     """Payment database model"""
     __tablename__ = "payments"
+    __table_args__ = (UniqueConstraint("contract_id", name="uq_payments_contract"),)
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     contract_id = Column(String, ForeignKey("contracts.id"), nullable=False)
@@ -165,6 +168,9 @@ class Payment(Base):
 class OutreachLog(Base):
     """Outreach log database model"""
     __tablename__ = "outreach_logs"
+    __table_args__ = (
+        UniqueConstraint("campaign_id", "creator_id", "contact_type", name="uq_outreach_logs_campaign_creator_type"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     campaign_id = Column(String, ForeignKey("campaigns.id"), nullable=False)
@@ -175,7 +181,8 @@ class OutreachLog(Base):
     status = Column(String)
     duration_minutes = Column(Integer)
     recording_url = Column(Text)
-    transcript = Column(Text)
+    transcript = deferred(Column(Text))  # legacy inline transcript - new rows use transcript_ref
+    transcript_ref = Column(String(64), ForeignKey("transcript_blobs.sha256"), index=True)
     sentiment = Column(String)
     notes = Column(Text)
     
@@ -183,4 +190,72 @@ class OutreachLog(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
-    campaign = relationship("Campaign", back_populates="outreach_logs")
\ No newline at end of file
+    campaign = relationship("Campaign", back_populates="outreach_logs")
+
+class TranscriptBlob(Base):
+    """Compressed call transcript, stored once per distinct content (see services/transcript_store.py)"""
+    __tablename__ = "transcript_blobs"
+    
+    sha256 = Column(String(64), primary_key=True)  # of the UTF-8 transcript text
+    codec = Column(String, nullable=False)  # zstd or zlib
+    data = Column(LargeBinary, nullable=False)
+    raw_size = Column(Integer, nullable=False)
+    stored_size = Column(Integer, nullable=False)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class CampaignJob(Base):
+    """Durable campaign job queue model (claimed with SELECT ... FOR UPDATE SKIP LOCKED)"""
+    __tablename__ = "campaign_jobs"
+    
+    id = Column(String, primary_key=True)
+    campaign_id = Column(String, nullable=False, index=True)
+    payload = Column(JSON, nullable=False)
+    
+    # Queue state
+    status = Column(String, default="queued", nullable=False, index=True)  # queued, running, completed, failed
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    worker_id = Column(String)
+    
+    # Outcome
+    result = Column(JSON)
+    error = Column(Text)
+    
+    # Timestamps
+    enqueued_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    started_at = Column(DateTime(timezone=True))
+    heartbeat_at = Column(DateTime(timezone=True))
+    completed_at = Column(DateTime(timezone=True))
+
+class OrchestrationCheckpoint(Base):
+    """Latest orchestration state per task, used to resume after a worker restart"""
+    __tablename__ = "orchestration_checkpoints"
+    
+    task_id = Column(String, primary_key=True)
+    campaign_id = Column(String, nullable=False, index=True)
+    phase = Column(String, nullable=False)
+    version = Column(Integer, default=0, nullable=False)
+    state = Column(JSON, nullable=False)  # serialized CampaignOrchestrationState
+    
+    # Timestamps
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class NegotiationAnalysis(Base):
+    """Latest transcript analysis per negotiation, written by reanalyze_negotiations.py"""
+    __tablename__ = "negotiation_analyses"
+    
+    negotiation_id = Column(Integer, ForeignKey("negotiations.id"), primary_key=True)
+    run_id = Column(String, nullable=False, index=True)  # re-analysis run that wrote this row
+    
+    # Analysis outcome
+    negotiation_outcome = Column(String)
+    agreed_rate = Column(Float)
+    conversation_sentiment = Column(String)
+    confidence_score = Column(Float)
+    contract_ready = Column(Boolean)
+    analysis = Column(JSON)  # full validated analysis
+    
+    # Timestamps
+    analyzed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
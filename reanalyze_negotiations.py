@@ -0,0 +1,296 @@
+# reanalyze_negotiations.py - BULK RE-ANALYSIS OF STORED CALL TRANSCRIPTS
+"""
+Re-run ``EnhancedNegotiationAgent.analyze_conversation_outcome`` over stored
+negotiation transcripts (``transcript_blobs`` via ``call_transcript_ref``, or
+legacy inline ``call_transcript``), e.g. after retuning keywords or pricing
+logic:
+
+    python reanalyze_negotiations.py --run-id keywords-v2 --workers 8
+
+- transcripts are streamed from Postgres with a server-side cursor
+  (``yield_per``), one batch at a time, in ``negotiations.id`` order
+- batches are decompressed and analyzed in a process pool; at most ``2 x workers`` batches are
+  in flight, so memory stays flat however many rows there are
+- results are written to ``negotiation_analyses`` with one bulk
+  ``INSERT ... ON CONFLICT DO UPDATE`` per batch, in id order
+
+Because batches commit in order, the highest ``negotiation_id`` written by a
+run is its resume point: re-running with the same ``--run-id`` continues
+where an interrupted run stopped (``--restart`` starts over). Negotiations
+themselves are never modified.
+"""
+import ast
+import json
+import time
+import asyncio
+import logging
+import argparse
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Deque
+
+from sqlalchemy import select, func, or_
+from sqlalchemy.dialects.postgresql import insert
+
+from config.database import DatabaseConfig
+from models.database_models import Negotiation, NegotiationAnalysis, TranscriptBlob
+from services.transcript_store import decompress_transcript
+
+logger = logging.getLogger(__name__)
+
+
+# ================================
+# TRANSCRIPT PARSING
+# ================================
+
+def parse_stored_transcript(call_transcript: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Turn a stored ``call_transcript`` back into ``[{"role", "text"}]`` turns.
+
+    Older rows hold JSON, the ``str()`` of the provider's turn list, or plain
+    "role: text" lines; anything else becomes a single turn.
+    """
+    if not call_transcript or not call_transcript.strip():
+        return []
+
+    text = call_transcript.strip()
+    if text[0] in "[{":
+        for parse in (json.loads, ast.literal_eval):
+            try:
+                turns = parse(text)
+            except (ValueError, SyntaxError):
+                continue
+            if isinstance(turns, dict):
+                turns = turns.get("transcript", [])
+            if isinstance(turns, list):
+                return [turn if isinstance(turn, dict) else {"role": "unknown", "text": str(turn)} for turn in turns]
+
+    turns = []
+    for line in text.splitlines():
+        role, separator, message = line.partition(":")
+        if separator and role.strip().lower() in ("agent", "user", "creator", "assistant"):
+            turns.append({"role": role.strip().lower(), "text": message.strip()})
+        elif turns:
+            turns[-1]["text"] += " " + line.strip()
+        elif line.strip():
+            turns.append({"role": "unknown", "text": line.strip()})
+    return turns
+
+
+# ================================
+# PROCESS POOL SIDE
+# ================================
+
+_agent = None
+
+
+def _init_worker() -> None:
+    """Per-process setup: one agent, quiet per-call logging"""
+    global _agent
+    from agents.enhanced_negotiation import EnhancedNegotiationAgent
+
+    logging.getLogger("agents").setLevel(logging.WARNING)
+    _agent = EnhancedNegotiationAgent()
+
+
+def _analyze_batch(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Analyze one batch of negotiation rows (runs in a pool process)"""
+    return asyncio.run(_analyze_rows(rows))
+
+
+async def _analyze_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    results = []
+    for row in rows:
+        initial_rate = row["initial_rate"] or 1000
+        terms = row["negotiated_terms"] or {}
+        pricing_strategy = {
+            "initial_offer": initial_rate,
+            "max_offer": terms.get("max_offer") or max(initial_rate, row["final_rate"] or 0)
+        }
+
+        call_transcript = row["call_transcript"]
+        if call_transcript is None and row["data"] is not None:
+            call_transcript = decompress_transcript(row["codec"], row["data"])
+
+        analysis = await _agent.analyze_conversation_outcome(
+            {"transcript": parse_stored_transcript(call_transcript), "analysis": terms.get("analysis", {})},
+            {"id": row["creator_id"]},
+            pricing_strategy
+        )
+        analysis = json.loads(json.dumps(analysis, default=str))
+
+        results.append({
+            "negotiation_id": row["id"],
+            "negotiation_outcome": analysis.get("negotiation_outcome"),
+            "agreed_rate": analysis.get("agreed_rate"),
+            "conversation_sentiment": analysis.get("conversation_sentiment"),
+            "confidence_score": analysis.get("confidence_score"),
+            "contract_ready": analysis.get("contract_ready"),
+            "analysis": analysis
+        })
+    return results
+
+
+# ================================
+# RE-ANALYSIS JOB
+# ================================
+
+class NegotiationReanalyzer:
+    """
+    🔁 BULK NEGOTIATION RE-ANALYSIS
+
+    Streams, analyzes and upserts in a pipeline: while the pool analyzes the
+    next batches, finished ones are written back in order.
+    """
+
+    def __init__(
+        self,
+        run_id: str,
+        db_config: Optional[DatabaseConfig] = None,
+        workers: int = 4,
+        batch_size: int = 500,
+        since: Optional[datetime] = None
+    ):
+        self.run_id = run_id
+        self.db_config = db_config or DatabaseConfig()
+        self.workers = workers
+        self.batch_size = batch_size
+        self.since = since
+
+        self.stats = {"analyzed": 0, "batches": 0}
+
+    async def resume_point(self) -> int:
+        """Highest negotiation id this run has already written (0 if none)"""
+        async with self.db_config.async_engine.connect() as conn:
+            result = await conn.execute(
+                select(func.max(NegotiationAnalysis.negotiation_id))
+                .where(NegotiationAnalysis.run_id == self.run_id)
+            )
+            return result.scalar() or 0
+
+    def _filters(self, after_id: int) -> list:
+        filters = [
+            Negotiation.id > after_id,
+            or_(Negotiation.call_transcript_ref.isnot(None), Negotiation.call_transcript.isnot(None))
+        ]
+        if self.since is not None:
+            filters.append(Negotiation.created_at >= self.since)
+        return filters
+
+    async def run(self, restart: bool = False) -> Dict[str, Any]:
+        await self.db_config.create_tables()
+
+        after_id = 0 if restart else await self.resume_point()
+        if after_id:
+            logger.info(f"⏩ Resuming run '{self.run_id}' after negotiation {after_id}")
+
+        async with self.db_config.async_engine.connect() as conn:
+            total = (await conn.execute(
+                select(func.count()).select_from(Negotiation).where(*self._filters(after_id))
+            )).scalar()
+        logger.info(f"🔁 Re-analyzing {total} negotiations with {self.workers} processes (run '{self.run_id}')")
+
+        started = time.monotonic()
+        loop = asyncio.get_running_loop()
+        pending: Deque[asyncio.Future] = deque()
+
+        # Spawned (not forked) workers do not inherit the parent's event loop and DB sockets
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker
+        ) as pool:
+            async with self.db_config.async_engine.connect() as conn:
+                # Server-side cursor: rows arrive batch by batch instead of all at once
+                stream = await conn.stream(
+                    select(
+                        Negotiation.id,
+                        Negotiation.creator_id,
+                        Negotiation.call_transcript,
+                        Negotiation.initial_rate,
+                        Negotiation.final_rate,
+                        Negotiation.negotiated_terms,
+                        TranscriptBlob.codec,
+                        TranscriptBlob.data
+                    )
+                    .outerjoin(TranscriptBlob, TranscriptBlob.sha256 == Negotiation.call_transcript_ref)
+                    .where(*self._filters(after_id))
+                    .order_by(Negotiation.id)
+                    .execution_options(yield_per=self.batch_size)
+                )
+
+                async for partition in stream.partitions():
+                    rows = [dict(row._mapping) for row in partition]
+                    pending.append(loop.run_in_executor(pool, _analyze_batch, rows))
+
+                    # Back-pressure: keep the pool busy without buffering the table
+                    while len(pending) >= self.workers * 2:
+                        await self._write(await pending.popleft(), total, started)
+
+            while pending:
+                await self._write(await pending.popleft(), total, started)
+
+        elapsed = time.monotonic() - started
+        logger.info(f"✅ Run '{self.run_id}' finished: {self.stats['analyzed']} negotiations in {elapsed:.1f}s")
+        return {**self.stats, "run_id": self.run_id, "elapsed_seconds": round(elapsed, 1)}
+
+    async def _write(self, results: List[Dict[str, Any]], total: int, started: float) -> None:
+        """Bulk upsert one analyzed batch and report progress"""
+        if results:
+            statement = insert(NegotiationAnalysis).values([{**result, "run_id": self.run_id} for result in results])
+            statement = statement.on_conflict_do_update(
+                index_elements=[NegotiationAnalysis.negotiation_id],
+                set_={
+                    column: statement.excluded[column]
+                    for column in (
+                        "run_id", "negotiation_outcome", "agreed_rate", "conversation_sentiment",
+                        "confidence_score", "contract_ready", "analysis"
+                    )
+                } | {"analyzed_at": func.now()}
+            )
+            async with self.db_config.async_engine.begin() as conn:
+                await conn.execute(statement)
+
+        self.stats["analyzed"] += len(results)
+        self.stats["batches"] += 1
+
+        elapsed = time.monotonic() - started
+        rate = self.stats["analyzed"] / elapsed if elapsed > 0 else 0.0
+        remaining = max(total - self.stats["analyzed"], 0)
+        eta = f"{remaining / rate:.0f}s" if rate > 0 else "?"
+        logger.info(
+            f"📈 {self.stats['analyzed']}/{total} negotiations "
+            f"({rate:.0f}/s, ETA {eta}, last id {results[-1]['negotiation_id'] if results else '-'})"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-analyze stored negotiation call transcripts")
+    parser.add_argument("--run-id", default=None, help="Name of this run; re-use it to resume (default: timestamp)")
+    parser.add_argument("--workers", type=int, default=4, help="Analysis processes")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows per cursor fetch, analysis batch and upsert")
+    parser.add_argument("--since", type=datetime.fromisoformat, default=None, help="Only negotiations created on/after this ISO date")
+    parser.add_argument("--restart", action="store_true", help="Ignore this run's progress and start from the first row")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    async def run() -> None:
+        reanalyzer = NegotiationReanalyzer(
+            args.run_id or datetime.now().strftime("reanalysis-%Y%m%d-%H%M%S"),
+            workers=args.workers,
+            batch_size=args.batch_size,
+            since=args.since
+        )
+        try:
+            await reanalyzer.run(restart=args.restart)
+        finally:
+            await reanalyzer.db_config.close()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
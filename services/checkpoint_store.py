@@ -0,0 +1,134 @@
+# services/checkpoint_store.py - ORCHESTRATION CHECKPOINTS
+"""
+Checkpoint storage for campaign orchestration.
+
+Orchestrators save the full ``CampaignOrchestrationState`` after every phase
+transition and every creator negotiation. When a job is retried (for example
+after a worker restart) the orchestrator loads the checkpoint for the task and
+resumes from the recorded phase instead of starting over.
+"""
+import os
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+
+from models.campaign import CampaignOrchestrationState
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointStore(ABC):
+    """Common interface for checkpoint backends"""
+
+    @abstractmethod
+    async def save(self, task_id: str, state: CampaignOrchestrationState) -> None:
+        """Persist the latest state for a task"""
+
+    @abstractmethod
+    async def load(self, task_id: str) -> Optional[CampaignOrchestrationState]:
+        """Load the latest state for a task, if any"""
+
+    @abstractmethod
+    async def delete(self, task_id: str) -> None:
+        """Remove a task's checkpoint"""
+
+
+class LocalFileCheckpointStore(CheckpointStore):
+    """One JSON file per task, replaced atomically on every save"""
+
+    def __init__(self, checkpoint_dir: Optional[str] = None):
+        self.checkpoint_dir = Path(checkpoint_dir or settings.checkpoint_dir)
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, task_id: str) -> Path:
+        return self.checkpoint_dir / f"{task_id}.json"
+
+    def _save_sync(self, task_id: str, data: str) -> None:
+        path = self._path(task_id)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _load_sync(self, task_id: str) -> Optional[CampaignOrchestrationState]:
+        try:
+            with open(self._path(task_id), "r") as f:
+                return CampaignOrchestrationState.model_validate_json(f.read())
+        except FileNotFoundError:
+            return None
+
+    async def save(self, task_id: str, state: CampaignOrchestrationState) -> None:
+        # Serialize on the event loop so the snapshot is consistent with the live state
+        await asyncio.to_thread(self._save_sync, task_id, state.model_dump_json())
+
+    async def load(self, task_id: str) -> Optional[CampaignOrchestrationState]:
+        return await asyncio.to_thread(self._load_sync, task_id)
+
+    async def delete(self, task_id: str) -> None:
+        try:
+            await asyncio.to_thread(os.remove, self._path(task_id))
+        except FileNotFoundError:
+            pass
+
+
+class PostgresCheckpointStore(CheckpointStore):
+    """Checkpoints in the ``orchestration_checkpoints`` table (one row per task)"""
+
+    def __init__(self, db_config=None):
+        from config.database import DatabaseConfig
+
+        self.db_config = db_config or DatabaseConfig()
+        self._tables_ready = False
+
+    async def _ensure_tables(self) -> None:
+        if not self._tables_ready:
+            await self.db_config.create_tables()
+            self._tables_ready = True
+
+    async def save(self, task_id: str, state: CampaignOrchestrationState) -> None:
+        from models.database_models import OrchestrationCheckpoint
+        await self._ensure_tables()
+
+        async with self.db_config.AsyncSessionLocal() as session:
+            await session.merge(OrchestrationCheckpoint(
+                task_id=task_id,
+                campaign_id=state.campaign_id,
+                phase=state.phase.value,
+                version=state.checkpoint_version,
+                state=state.model_dump(mode="json")
+            ))
+            await session.commit()
+
+    async def load(self, task_id: str) -> Optional[CampaignOrchestrationState]:
+        from models.database_models import OrchestrationCheckpoint
+        await self._ensure_tables()
+
+        async with self.db_config.AsyncSessionLocal() as session:
+            record = await session.get(OrchestrationCheckpoint, task_id)
+            return CampaignOrchestrationState.model_validate(record.state) if record else None
+
+    async def delete(self, task_id: str) -> None:
+        from sqlalchemy import delete
+        from models.database_models import OrchestrationCheckpoint
+        await self._ensure_tables()
+
+        async with self.db_config.AsyncSessionLocal() as session:
+            await session.execute(delete(OrchestrationCheckpoint).where(OrchestrationCheckpoint.task_id == task_id))
+            await session.commit()
+
+
+def create_checkpoint_store(backend: Optional[str] = None, db_config=None, **kwargs) -> CheckpointStore:
+    """Create the checkpoint store configured by ``settings.checkpoint_backend``"""
+    backend = (backend or settings.checkpoint_backend).lower()
+
+    if backend == "postgres":
+        return PostgresCheckpointStore(db_config=db_config, **kwargs)
+    if backend == "local":
+        return LocalFileCheckpointStore(**kwargs)
+
+    raise ValueError(f"Unknown checkpoint backend: {backend}")
@@ -0,0 +1,203 @@
+# services/circuit_breaker.py - CIRCUIT BREAKERS, BACKOFF AND HEDGING
+"""
+Resilience helpers for calls to external APIs.
+
+- ``CircuitBreaker``: closed → open after ``circuit_failure_threshold``
+  consecutive failures; while open, calls fail fast for
+  ``circuit_recovery_seconds``; then half-open lets a probe through and its
+  outcome closes or re-opens the circuit. A probe that never reports back
+  (cancelled) gives its slot back via ``release()``, and a probe slot held
+  longer than ``recovery_seconds`` is handed to the next caller. Breakers are shared per endpoint
+  (``get_circuit_breaker``), so one campaign discovering that the provider is
+  down spares every other campaign the wait.
+- ``backoff_delay``: exponential backoff with full jitter, honouring a
+  ``Retry-After`` hint.
+- ``hedged``: for idempotent reads, start a second request when the first is
+  slower than ``delay`` and take whichever answers first.
+"""
+import time
+import random
+import asyncio
+import logging
+from enum import Enum
+from typing import Optional, Dict, Any, Callable, Awaitable, TypeVar
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open - retry in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    🔌 CIRCUIT BREAKER
+
+    Use ``allow()`` before a call and ``record_success()`` /
+    ``record_failure()`` after it (``release()`` if it was cancelled), or wrap
+    the call with ``call()``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: Optional[int] = None,
+        recovery_seconds: Optional[float] = None,
+        half_open_max_calls: Optional[int] = None
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold or settings.circuit_failure_threshold
+        self.recovery_seconds = recovery_seconds or settings.circuit_recovery_seconds
+        self.half_open_max_calls = half_open_max_calls or settings.circuit_half_open_max_calls
+
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._half_open_calls = 0
+        self._probe_started_at = 0.0
+
+        self.stats = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a probe through"""
+        if self.state != CircuitState.OPEN:
+            return 0.0
+        return max(self.opened_at + self.recovery_seconds - time.monotonic(), 0.0)
+
+    def allow(self) -> bool:
+        """Whether a call may go out now"""
+        if self.state == CircuitState.OPEN:
+            if self.retry_after() > 0:
+                self.stats["rejected"] += 1
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self._half_open_calls = 0
+            logger.info(f"🔌 Circuit '{self.name}' half-open - probing")
+
+        if self.state == CircuitState.HALF_OPEN:
+            if self._half_open_calls >= self.half_open_max_calls:
+                # Probes that never reported back must not hold the circuit half-open forever
+                if time.monotonic() - self._probe_started_at < self.recovery_seconds:
+                    self.stats["rejected"] += 1
+                    return False
+                self._half_open_calls = 0
+            self._half_open_calls += 1
+            self._probe_started_at = time.monotonic()
+
+        return True
+
+    def release(self) -> None:
+        """Give back the slot of an allowed call that ended without an outcome (cancelled)"""
+        if self.state == CircuitState.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def record_success(self) -> None:
+        self.stats["successes"] += 1
+        self.consecutive_failures = 0
+        if self.state != CircuitState.CLOSED:
+            logger.info(f"✅ Circuit '{self.name}' closed")
+        self.state = CircuitState.CLOSED
+
+    def record_failure(self) -> None:
+        self.stats["failures"] += 1
+        self.consecutive_failures += 1
+        if self.state == CircuitState.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != CircuitState.OPEN:
+                self.stats["opened"] += 1
+                logger.warning(
+                    f"⚠️ Circuit '{self.name}' open after {self.consecutive_failures} failures - "
+                    f"failing fast for {self.recovery_seconds:.0f}s"
+                )
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` through the breaker; any exception counts as a failure"""
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_after())
+        try:
+            result = await fn()
+        except Exception:
+            self.record_failure()
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.record_success()
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "state": self.state.value,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_after": round(self.retry_after(), 1)
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Process-wide breaker for an endpoint (created on first use)"""
+    if name not in _breakers:
+        _breakers[name] = CircuitBreaker(name)
+    return _breakers[name]
+
+
+def get_circuit_stats() -> Dict[str, Any]:
+    return {name: breaker.get_stats() for name, breaker in _breakers.items()}
+
+
+def backoff_delay(
+    attempt: int,
+    base_seconds: Optional[float] = None,
+    max_seconds: Optional[float] = None,
+    retry_after: Optional[float] = None
+) -> float:
+    """Full-jitter exponential backoff for retry ``attempt`` (0-based), never shorter than ``retry_after``"""
+    base_seconds = base_seconds or settings.retry_backoff_base_seconds
+    max_seconds = max_seconds or settings.retry_backoff_max_seconds
+    delay = random.uniform(0, min(max_seconds, base_seconds * (2 ** attempt)))
+    return max(delay, retry_after or 0.0)
+
+
+async def hedged(fn: Callable[[], Awaitable[T]], delay: float) -> T:
+    """
+    Run ``fn``; if it has not finished after ``delay`` seconds, start a second
+    attempt and return whichever finishes first (the other is cancelled).
+    Only for idempotent requests. ``delay <= 0`` disables hedging.
+    """
+    if delay <= 0:
+        return await fn()
+
+    pending = {asyncio.ensure_future(fn())}
+    try:
+        done, pending = await asyncio.wait(pending, timeout=delay)
+        if done:
+            return done.pop().result()
+
+        pending.add(asyncio.ensure_future(fn()))
+        while True:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            succeeded = [task for task in done if task.exception() is None]
+            if succeeded or not pending:
+                return (succeeded or list(done))[0].result()
+    finally:
+        for task in pending:
+            task.cancel()
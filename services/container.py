@@ -0,0 +1,129 @@
+# services/container.py - SHARED SERVICE CONTAINER
+"""
+Process-wide service container.
+
+Routers, agents and the embedded worker all pull their dependencies from one
+``ServiceContainer`` so each process holds a single database engine pool, a
+single embedding model and one instance of every external-API client.
+
+Usage:
+    services = init_container()      # once, in the FastAPI lifespan / worker startup
+    services = get_container()       # anywhere else
+    await close_container()          # on shutdown
+"""
+import logging
+from typing import Optional
+
+from config.database import DatabaseConfig
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceContainer:
+    """
+    🧰 SHARED SERVICES
+
+    Built once per process. Agents receive these instances through their
+    constructors instead of creating their own.
+    """
+
+    def __init__(self, state_listener=None):
+        from services.database import DatabaseService
+        from services.embeddings import EmbeddingService
+        from services.pricing import PricingService
+        from services.enhanced_voice import EnhancedVoiceService
+        from services.voice import VoiceService
+        from services.job_queue import create_job_queue
+        from services.checkpoint_store import create_checkpoint_store
+        from services.llm_gateway import LLMGateway
+        from services.http_client import get_http_client
+        from config.settings import settings
+        from agents.discovery import InfluencerDiscoveryAgent
+        from agents.enhanced_orchestrator import EnhancedCampaignOrchestrator
+
+        # One engine pool for the whole process
+        self.db_config = DatabaseConfig()
+        self.database_service = DatabaseService(db_config=self.db_config)
+
+        # One embedding model and pricing table
+        self.embedding_service = EmbeddingService()
+        self.pricing_service = PricingService()
+
+        # External API clients (one keep-alive pool per API host)
+        self.elevenlabs_http = get_http_client(settings.elevenlabs_base_url)
+        self.enhanced_voice_service = EnhancedVoiceService(http_client=self.elevenlabs_http)
+        self.voice_service = VoiceService(http_client=self.elevenlabs_http)  # legacy orchestrators
+        self.llm_gateway = LLMGateway()
+
+        # Durable state
+        self.job_queue = create_job_queue(db_config=self.db_config)
+        self.checkpoint_store = create_checkpoint_store(db_config=self.db_config)
+
+        # Agents wired to the shared services
+        self.discovery_agent = InfluencerDiscoveryAgent(
+            embedding_service=self.embedding_service,
+            pricing_service=self.pricing_service
+        )
+        self.enhanced_orchestrator = EnhancedCampaignOrchestrator(
+            discovery_agent=self.discovery_agent,
+            database_service=self.database_service,
+            checkpoint_store=self.checkpoint_store,
+            llm_gateway=self.llm_gateway,
+            state_listener=state_listener
+        )
+
+        logger.info("🧰 Service container initialized")
+
+    def create_campaign_orchestrator(self):
+        """Build a legacy ``CampaignOrchestrator`` on the shared services"""
+        from agents.orchestrator import CampaignOrchestrator
+        from agents.negotiation import NegotiationAgent
+
+        return CampaignOrchestrator(
+            discovery_agent=self.discovery_agent,
+            negotiation_agent=NegotiationAgent(
+                voice_service=self.voice_service,
+                pricing_service=self.pricing_service
+            ),
+            database_service=self.database_service,
+            checkpoint_store=self.checkpoint_store,
+            llm_gateway=self.llm_gateway
+        )
+
+    async def close(self) -> None:
+        """Release pooled connections"""
+        from services.http_client import close_http_clients
+
+        await self.llm_gateway.close()
+        await self.enhanced_voice_service.status_poller.close()
+        await self.voice_service.status_poller.close()
+        await close_http_clients()
+        await self.db_config.close()
+        logger.info("🔐 Service container closed")
+
+
+_container: Optional[ServiceContainer] = None
+
+
+def init_container(state_listener=None) -> ServiceContainer:
+    """
+    Create the process-wide container (idempotent); ``state_listener``
+    receives the orchestrator's campaign states (web process monitoring)
+    """
+    global _container
+    if _container is None:
+        _container = ServiceContainer(state_listener)
+    return _container
+
+
+def get_container() -> ServiceContainer:
+    """Get the process-wide container, creating it on first use"""
+    return init_container()
+
+
+async def close_container() -> None:
+    """Close and drop the process-wide container"""
+    global _container
+    if _container is not None:
+        await _container.close()
+        _container = None
@@ -0,0 +1,148 @@
+# services/conversation_events.py - WEBHOOK-DRIVEN CONVERSATION COMPLETION
+"""
+Conversation completion registry.
+
+ElevenLabs sends a signed post-call webhook when a conversation ends. The
+webhook endpoint verifies the HMAC signature and resolves the conversation's
+future here, so anyone waiting on that conversation wakes up immediately.
+Status polling is kept only as a slow safety net
+(``conversation_safety_poll_seconds``) for missed webhooks and for workers
+running in a different process from the webhook endpoint.
+"""
+import hmac
+import time
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Post-call webhook event types (``event["type"]``)
+POST_CALL_TRANSCRIPTION = "post_call_transcription"  # transcript + analysis of a finished call
+CALL_INITIATION_FAILURE = "call_initiation_failure"  # the call never connected
+# Anything else (e.g. ``post_call_audio``) carries no transcript and is acknowledged but ignored
+
+
+class ConversationCompletionRegistry:
+    """
+    📬 CONVERSATION COMPLETION REGISTRY
+
+    One future per conversation id. Waiters hold a reference to their
+    conversation (``watch()`` / ``release()``) and its entry is dropped when
+    the last one releases it. A webhook that arrives before anyone is waiting
+    is kept so a later wait returns at once; only such unwatched entries count
+    against ``max_entries``, so live waiters are never evicted.
+    """
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._futures: Dict[str, asyncio.Future] = {}
+        self._watchers: Dict[str, int] = {}
+        self._unwatched: "OrderedDict[str, None]" = OrderedDict()  # oldest first
+
+    def future(self, conversation_id: str) -> asyncio.Future:
+        """The conversation's completion future (created on first use)"""
+        future = self._futures.get(conversation_id)
+        if future is None or future.get_loop() is not asyncio.get_running_loop():
+            future = asyncio.get_running_loop().create_future()
+            self._futures[conversation_id] = future
+            if not self._watchers.get(conversation_id):
+                self._unwatched[conversation_id] = None
+                while len(self._unwatched) > self.max_entries:
+                    evicted, _ = self._unwatched.popitem(last=False)
+                    self._futures.pop(evicted, None)
+        return future
+
+    def watch(self, conversation_id: str) -> asyncio.Future:
+        """The conversation's future, kept until ``release()`` is called as often as this"""
+        self._watchers[conversation_id] = self._watchers.get(conversation_id, 0) + 1
+        self._unwatched.pop(conversation_id, None)
+        return self.future(conversation_id)
+
+    def release(self, conversation_id: str) -> None:
+        """Drop a waiter's reference; the conversation is forgotten once nobody watches it"""
+        watchers = self._watchers.get(conversation_id, 0) - 1
+        if watchers > 0:
+            self._watchers[conversation_id] = watchers
+            return
+        self._watchers.pop(conversation_id, None)
+        self._unwatched.pop(conversation_id, None)
+        self._futures.pop(conversation_id, None)
+
+    async def wait(self, conversation_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """Conversation data from the webhook, or None if nothing arrived within ``timeout``"""
+        future = self.watch(conversation_id)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self.release(conversation_id)
+
+    def resolve(self, conversation_id: str, conversation_data: Dict[str, Any]) -> bool:
+        """Wake waiters for a finished conversation; False if it was already resolved"""
+        future = self.future(conversation_id)
+        if future.done():
+            return False
+        future.set_result(conversation_data)
+        logger.info(f"📬 Conversation {conversation_id} completed via webhook")
+        return True
+
+    @property
+    def pending(self) -> int:
+        return len([f for f in self._futures.values() if not f.done()])
+
+
+def verify_elevenlabs_signature(
+    payload: bytes,
+    signature_header: Optional[str],
+    secret: Optional[str] = None,
+    tolerance_seconds: Optional[int] = None
+) -> bool:
+    """
+    Verify an ``ElevenLabs-Signature`` header (``t=<timestamp>,v0=<hex hmac>``).
+
+    The HMAC-SHA256 is computed over ``"<timestamp>.<raw body>"`` with the
+    webhook secret; stale timestamps are rejected to prevent replays.
+    """
+    secret = secret or settings.webhook_secret
+    tolerance_seconds = tolerance_seconds if tolerance_seconds is not None else settings.webhook_tolerance_seconds
+    if not signature_header or not secret:
+        return False
+
+    parts = dict(
+        item.split("=", 1) for item in signature_header.split(",") if "=" in item
+    )
+    timestamp, signature = parts.get("t"), parts.get("v0")
+    if not timestamp or not signature or not timestamp.isdigit():
+        return False
+
+    if abs(time.time() - int(timestamp)) > tolerance_seconds:
+        return False
+
+    expected = hmac.new(
+        secret.encode("utf-8"),
+        f"{timestamp}.".encode("utf-8") + payload,
+        hashlib.sha256
+    ).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+_registry: Optional[ConversationCompletionRegistry] = None
+
+
+def get_conversation_registry() -> ConversationCompletionRegistry:
+    """Process-wide registry shared by the webhook endpoint and the voice services"""
+    global _registry
+    if _registry is None:
+        _registry = ConversationCompletionRegistry()
+    return _registry
+
+
+def safety_poll_interval(default_seconds: float) -> float:
+    """Poll interval to use: the slow safety net when webhooks are on, else the caller's default"""
+    return settings.conversation_safety_poll_seconds if settings.conversation_webhooks_enabled else default_seconds
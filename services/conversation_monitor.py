@@ -4,6 +4,10 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, Callable
 from enum import Enum
 
+from config.settings import settings
+from services.status_poller import ConversationStatusPoller
+from services.timer_wheel import TimerWheel
+
 logger = logging.getLogger(__name__)
 
 class ConversationStatus(str, Enum):
@@ -15,6 +19,10 @@ class ConversationStatus(str, Enum):
     TIMEOUT = "timeout"
     ERROR = "error"
 
+class MonitorCapacityError(Exception):
+    """No monitor slot became free within the admission timeout"""
+
+
 class ConversationMonitor:
     """
     🔄 CORRECTED CONVERSATION MONITOR
@@ -24,16 +32,37 @@ class ConversationMonitor:
     2. Better error handling for failed/ended calls
     3. Improved callback management
     4. Automatic cleanup and resource management
+    
+    Bounded: at most ``max_active`` conversations are monitored at once and
+    ``start_monitoring`` waits for a free slot (back-pressure). Per-monitor
+    deadlines live on one timer wheel; polling is multiplexed by the shared
+    poller, so the monitor's task count does not grow with load.
     """
     
-    def __init__(self, voice_service):
+    def __init__(self, voice_service, max_active: Optional[int] = None):
         self.voice_service = voice_service
         self.active_monitors = {}
         
-        # Configuration
-        self.poll_interval_seconds = 15
+        # Configuration - completion normally arrives via the post-call webhook;
+        # the shared poller (one heap-scheduled loop for all conversations) is the safety net
         self.max_wait_minutes = 8
         self.timeout_buffer_seconds = 30
+        self.max_active = max_active or settings.conversation_monitor_max_active
+        self.admission_timeout_seconds = settings.conversation_monitor_admission_timeout_seconds
+        
+        self.poller = ConversationStatusPoller(voice_service.get_conversation_status, self._is_terminal)
+        self.timers = TimerWheel(tick_seconds=1.0)
+        self._slots = asyncio.Semaphore(self.max_active)
+        self._callback_tasks = set()
+        
+        self.metrics = {
+            "admitted": 0,
+            "rejected": 0,
+            "waiting_admission": 0,
+            "completed": 0,
+            "failed": 0,
+            "timeouts": 0
+        }
         
         # Status mapping from ElevenLabs to our states
         self.status_mapping = {
@@ -51,122 +80,158 @@ class ConversationMonitor:
         self,
         conversation_id: str,
         completion_callback: Optional[Callable] = None,
-        error_callback: Optional[Callable] = None
+        error_callback: Optional[Callable] = None,
+        creator_tier: Optional[str] = None
     ) -> None:
         """
         🚀 Start monitoring conversation with proper state handling
+        
+        No task per conversation: the poller resolves a future and the
+        callbacks run once it is done. ``creator_tier`` selects the learned
+        call-duration window polls are concentrated in. Waits up to
+        ``admission_timeout_seconds`` for a free slot, then raises
+        ``MonitorCapacityError``.
         """
         
         if conversation_id in self.active_monitors:
             logger.warning(f"⚠️ Conversation {conversation_id} already being monitored")
             return
         
+        self.metrics["waiting_admission"] += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.admission_timeout_seconds)
+        except asyncio.TimeoutError:
+            self.metrics["rejected"] += 1
+            raise MonitorCapacityError(
+                f"{self.max_active} conversations already monitored - {conversation_id} not admitted"
+            )
+        finally:
+            self.metrics["waiting_admission"] -= 1
+        
+        if conversation_id in self.active_monitors:
+            # Admitted twice while waiting for a slot
+            self._slots.release()
+            return
+        
         logger.info(f"🔄 Starting conversation monitoring: {conversation_id}")
+        self.metrics["admitted"] += 1
         
-        # Create monitoring task
-        monitor_task = asyncio.create_task(
-            self._monitor_conversation_loop(
-                conversation_id,
-                completion_callback,
-                error_callback
-            )
-        )
+        duration_key = (getattr(self.voice_service, "agent_id", None), creator_tier)
+        future = self.poller.track(conversation_id, timeout=None, duration_key=duration_key)
         
         self.active_monitors[conversation_id] = {
-            "task": monitor_task,
+            "future": future,
+            "duration_key": duration_key,
             "start_time": datetime.now(),
             "completion_callback": completion_callback,
-            "error_callback": error_callback
+            "error_callback": error_callback,
+            "deadline_timer": self.timers.schedule(
+                self.max_wait_minutes * 60,
+                lambda: self._on_deadline(conversation_id)
+            ),
+            "finishing": False
         }
+        
+        future.add_done_callback(
+            lambda done: self._dispatch_result(conversation_id, done)
+        )
+    
+    def _dispatch_result(self, conversation_id: str, future: asyncio.Future) -> None:
+        """Run the monitor's callbacks for a finished conversation"""
+        monitor_info = self.active_monitors.get(conversation_id)
+        if future.cancelled() or monitor_info is None or monitor_info["future"] is not future:
+            return
+        self._spawn_handler(conversation_id, future.result(), monitor_info)
     
-    async def _monitor_conversation_loop(
+    def _on_deadline(self, conversation_id: str) -> None:
+        """Timer wheel callback - the conversation ran past ``max_wait_minutes``"""
+        monitor_info = self.active_monitors.get(conversation_id)
+        if monitor_info is not None:
+            self._spawn_handler(conversation_id, None, monitor_info)
+    
+    def _spawn_handler(
         self,
         conversation_id: str,
-        completion_callback: Optional[Callable] = None,
-        error_callback: Optional[Callable] = None
+        status_data: Optional[Dict[str, Any]],
+        monitor_info: Dict[str, Any]
+    ) -> None:
+        if monitor_info["finishing"]:
+            return
+        monitor_info["finishing"] = True
+        
+        task = asyncio.get_running_loop().create_task(
+            self._handle_result(conversation_id, status_data, monitor_info)
+        )
+        self._callback_tasks.add(task)
+        task.add_done_callback(self._callback_tasks.discard)
+    
+    async def _handle_result(
+        self,
+        conversation_id: str,
+        status_data: Optional[Dict[str, Any]],
+        monitor_info: Dict[str, Any]
     ) -> None:
         """
-        🔄 Main monitoring loop with corrected state handling
+        🔄 Completion / failure / timeout handling with corrected state handling
         """
-        
-        start_time = datetime.now()
-        max_wait_seconds = self.max_wait_minutes * 60
+        completion_callback = monitor_info["completion_callback"]
+        error_callback = monitor_info["error_callback"]
         
         try:
-            while (datetime.now() - start_time).total_seconds() < max_wait_seconds:
-                
-                # Get conversation status
-                status_data = await self.voice_service.get_conversation_status(conversation_id)
-                
-                if not status_data:
-                    logger.warning(f"⚠️ No status data for {conversation_id}, continuing...")
-                    await asyncio.sleep(self.poll_interval_seconds)
-                    continue
-                
-                # Extract and normalize status
-                raw_status = status_data.get("status", "unknown")
-                normalized_status = status_data.get("normalized_status") or self._normalize_status(raw_status)
-                
-                logger.info(f"📊 Conversation {conversation_id} status: {normalized_status}")
-                
-                # Handle completed conversations
-                if normalized_status == ConversationStatus.COMPLETED:
-                    logger.info(f"✅ Conversation completed: {conversation_id}")
-                    
-                    if completion_callback:
-                        try:
-                            await self._safe_callback(
-                                completion_callback,
-                                conversation_id,
-                                status_data
-                            )
-                        except Exception as e:
-                            logger.error(f"❌ Completion callback error: {e}")
-                    
-                    self._cleanup_monitor(conversation_id)
-                    return
-                
-                # Handle failed conversations
-                elif normalized_status in [ConversationStatus.FAILED, ConversationStatus.ERROR]:
-                    error_msg = status_data.get("error", f"Conversation failed with status: {raw_status}")
-                    logger.error(f"❌ Conversation failed: {conversation_id} - {error_msg}")
-                    
-                    if error_callback:
-                        try:
-                            await self._safe_callback(
-                                error_callback,
-                                conversation_id,
-                                error_msg
-                            )
-                        except Exception as e:
-                            logger.error(f"❌ Error callback error: {e}")
-                    
-                    self._cleanup_monitor(conversation_id)
-                    return
-                
-                # Continue monitoring for in-progress conversations
-                elif normalized_status == ConversationStatus.IN_PROGRESS:
-                    await asyncio.sleep(self.poll_interval_seconds)
-                    continue
+            # Timeout reached
+            if status_data is None:
+                self.metrics["timeouts"] += 1
+                timeout_msg = f"Conversation timeout after {self.max_wait_minutes} minutes"
+                logger.warning(f"⏰ {timeout_msg}: {conversation_id}")
                 
-                # Handle unknown status
-                else:
-                    logger.warning(f"⚠️ Unknown status for {conversation_id}: {normalized_status}")
-                    await asyncio.sleep(self.poll_interval_seconds)
-                    continue
+                if error_callback:
+                    try:
+                        await self._safe_callback(error_callback, conversation_id, timeout_msg)
+                    except Exception as e:
+                        logger.error(f"❌ Timeout callback error: {e}")
+                return
             
-            # Timeout reached
-            timeout_msg = f"Conversation timeout after {self.max_wait_minutes} minutes"
-            logger.warning(f"⏰ {timeout_msg}: {conversation_id}")
+            raw_status = status_data.get("status", "unknown")
+            normalized_status = self._status_of(status_data)
             
-            if error_callback:
-                try:
-                    await self._safe_callback(error_callback, conversation_id, timeout_msg)
-                except Exception as e:
-                    logger.error(f"❌ Timeout callback error: {e}")
+            logger.info(f"📊 Conversation {conversation_id} status: {normalized_status}")
             
-            self._cleanup_monitor(conversation_id)
+            # Handle completed conversations
+            if normalized_status == ConversationStatus.COMPLETED:
+                logger.info(f"✅ Conversation completed: {conversation_id}")
+                self.metrics["completed"] += 1
+                self.poller.duration_stats.record_call(
+                    *monitor_info["duration_key"],
+                    status_data,
+                    (datetime.now() - monitor_info["start_time"]).total_seconds()
+                )
+                
+                if completion_callback:
+                    try:
+                        await self._safe_callback(
+                            completion_callback,
+                            conversation_id,
+                            status_data
+                        )
+                    except Exception as e:
+                        logger.error(f"❌ Completion callback error: {e}")
             
+            # Handle failed conversations
+            else:
+                self.metrics["failed"] += 1
+                error_msg = status_data.get("error", f"Conversation failed with status: {raw_status}")
+                logger.error(f"❌ Conversation failed: {conversation_id} - {error_msg}")
+                
+                if error_callback:
+                    try:
+                        await self._safe_callback(
+                            error_callback,
+                            conversation_id,
+                            error_msg
+                        )
+                    except Exception as e:
+                        logger.error(f"❌ Error callback error: {e}")
+        
         except Exception as e:
             error_msg = f"Monitoring error: {str(e)}"
             logger.error(f"❌ {error_msg} for {conversation_id}")
@@ -176,8 +241,18 @@ class ConversationMonitor:
                     await self._safe_callback(error_callback, conversation_id, error_msg)
                 except Exception as e:
                     logger.error(f"❌ Exception callback error: {e}")
-            
-            self._cleanup_monitor(conversation_id)
+        
+        finally:
+            self._cleanup_monitor(conversation_id, monitor_info)
+    
+    def _status_of(self, status_data: Dict[str, Any]) -> str:
+        """Normalized status, from the voice service or the raw ElevenLabs status"""
+        return status_data.get("normalized_status") or self._normalize_status(status_data.get("status", "unknown"))
+    
+    def _is_terminal(self, status_data: Dict[str, Any]) -> bool:
+        return self._status_of(status_data) in [
+            ConversationStatus.COMPLETED, ConversationStatus.FAILED, ConversationStatus.ERROR
+        ]
     
     def _normalize_status(self, raw_status: str) -> ConversationStatus:
         """Normalize status from various sources"""
@@ -193,17 +268,18 @@ class ConversationMonitor:
         except Exception as e:
             logger.error(f"❌ Callback execution failed: {e}")
     
-    def _cleanup_monitor(self, conversation_id: str) -> None:
-        """Clean up monitoring resources"""
-        if conversation_id in self.active_monitors:
-            monitor_info = self.active_monitors[conversation_id]
-            
-            # Cancel the task if it's still running
-            task = monitor_info["task"]
-            if not task.done():
-                task.cancel()
+    def _cleanup_monitor(self, conversation_id: str, monitor_info: Optional[Dict[str, Any]] = None) -> None:
+        """Clean up monitoring resources (only ``monitor_info``'s, if given - the id may have been re-monitored)"""
+        current = self.active_monitors.get(conversation_id)
+        if current is not None and (monitor_info is None or current is monitor_info):
+            monitor_info = current
             
             del self.active_monitors[conversation_id]
+            
+            # The last watcher of the id stops polling and cancels its pending future
+            self.poller.untrack(conversation_id)
+            self.timers.cancel(monitor_info["deadline_timer"])
+            self._slots.release()
             logger.info(f"🧹 Cleaned up monitor for {conversation_id}")
     
     def stop_monitoring(self, conversation_id: str) -> None:
@@ -218,10 +294,38 @@ class ConversationMonitor:
             self._cleanup_monitor(conversation_id)
         logger.info("🛑 Stopped all conversation monitoring")
     
+    async def shutdown(self, timeout: float = 10.0) -> None:
+        """
+        🛑 Stop monitoring, give running callbacks ``timeout`` seconds to finish,
+        then cancel them and stop the poller and timer wheel
+        """
+        self.stop_all_monitoring()
+        
+        if self._callback_tasks:
+            _, pending = await asyncio.wait(set(self._callback_tasks), timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        await self.timers.close()
+        await self.poller.close()
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Resource accounting: slots, pending callbacks, timers and poll latency"""
+        return {
+            **self.metrics,
+            "active_monitors": len(self.active_monitors),
+            "max_active": self.max_active,
+            "callbacks_pending": len(self._callback_tasks),
+            "deadline_timers": len(self.timers),
+            "poller": self.poller.get_stats()
+        }
+    
     def get_monitoring_status(self) -> Dict[str, Any]:
         """Get status of all active monitoring"""
         status = {
             "active_monitors": len(self.active_monitors),
+            "metrics": self.get_metrics(),
             "conversations": {}
         }
         
@@ -234,7 +338,7 @@ class ConversationMonitor:
             status["conversations"][conversation_id] = {
                 "duration_seconds": duration,
                 "start_time": start_time.isoformat(),
-                "task_status": "running" if not monitor_info["task"].done() else "completed"
+                "task_status": "running" if not monitor_info["future"].done() else "completed"
             }
         
         return status
@@ -0,0 +1,203 @@
+# services/conversation_store.py - CONVERSATION PAYLOAD CACHE
+"""
+Cache of ElevenLabs conversation payloads by ``conversation_id``.
+
+Every status poll used to download the whole conversation, including the
+growing transcript, and completed conversations were downloaded again for
+analysis and contracts. ``ConversationStore`` keeps the latest payload per
+conversation:
+
+- in-progress entries are revalidated with ``If-None-Match`` /
+  ``If-Modified-Since`` when the API sent an ``ETag`` / ``Last-Modified``, so
+  an unchanged conversation costs a ``304`` instead of the full body
+- terminal entries (done/failed) never change and are served from memory
+- the post-call webhook payload is stored as a terminal entry, so fetching a
+  finished conversation usually needs no request at all
+
+Callers can attach derived values (e.g. a normalized status) to the record;
+``status_changed`` tells them when the raw status moved and they must be
+recomputed.
+
+Transcript turns are surfaced incrementally: listeners registered with
+``add_turn_listener`` receive only the turns each stored payload added (and
+status changes), so live analysis never rescans the whole transcript.
+"""
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Callable
+
+from config.settings import settings
+from services.http_client import HTTPClient, get_http_client
+
+logger = logging.getLogger(__name__)
+
+# ElevenLabs statuses after which a conversation payload no longer changes
+TERMINAL_STATUSES = frozenset({"done", "completed", "ended", "failed", "error", "timeout"})
+
+# listener(record, index of the first new turn, new turns)
+TurnListener = Callable[["ConversationRecord", int, List[Dict[str, Any]]], None]
+
+
+class ConversationFetchError(Exception):
+    """The conversations API answered with an error status"""
+
+    def __init__(self, status_code: int, text: str):
+        super().__init__(f"API Error {status_code}")
+        self.status_code = status_code
+        self.text = text
+
+
+class ConversationRecord:
+    """Latest known payload of one conversation"""
+    __slots__ = ("conversation_id", "data", "status", "etag", "last_modified", "fetched_at", "status_changed", "normalized_status", "turns_delivered")
+
+    def __init__(self, conversation_id: str, data: Dict[str, Any], etag: Optional[str] = None, last_modified: Optional[str] = None):
+        self.conversation_id = conversation_id
+        self.data = data
+        self.status = str(data.get("status", "unknown")).lower()
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = datetime.now()
+        self.status_changed = True
+        self.normalized_status: Optional[str] = None
+        self.turns_delivered = 0
+
+    @property
+    def terminal(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def replace(self, data: Dict[str, Any], etag: Optional[str], last_modified: Optional[str]) -> None:
+        status = str(data.get("status", "unknown")).lower()
+        self.status_changed = status != self.status
+        if self.status_changed:
+            self.normalized_status = None
+        self.data = data
+        self.status = status
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = datetime.now()
+
+
+class ConversationStore:
+    """
+    🗂️ CONVERSATION STORE
+
+    LRU-bounded (``conversation_store_max_entries``); in-flight entries are
+    revalidated on every ``fetch``, terminal ones are immutable.
+    """
+
+    def __init__(self, http_client: HTTPClient, api_key: Optional[str] = None, max_entries: Optional[int] = None):
+        self.http = http_client
+        self.api_key = api_key or settings.elevenlabs_api_key
+        self.max_entries = max_entries or settings.conversation_store_max_entries
+        self._records: "OrderedDict[str, ConversationRecord]" = OrderedDict()
+        self._turn_listeners: List[TurnListener] = []
+
+        self.stats = {
+            "hits": 0,
+            "not_modified": 0,
+            "downloads": 0
+        }
+
+    def get(self, conversation_id: str) -> Optional[ConversationRecord]:
+        """Cached record without any request"""
+        record = self._records.get(conversation_id)
+        if record is not None:
+            self._records.move_to_end(conversation_id)
+        return record
+
+    async def fetch(self, conversation_id: str, read_timeout: Optional[float] = None) -> ConversationRecord:
+        """Current record: from memory if terminal, else a (conditional) API request"""
+        record = self.get(conversation_id)
+        if record is not None and record.terminal:
+            record.status_changed = False
+            self.stats["hits"] += 1
+            return record
+
+        headers = {"Xi-Api-Key": self.api_key}
+        if record is not None:
+            if record.etag:
+                headers["If-None-Match"] = record.etag
+            if record.last_modified:
+                headers["If-Modified-Since"] = record.last_modified
+
+        response = await self.http.get(
+            f"/v1/convai/conversations/{conversation_id}",
+            headers=headers,
+            read_timeout=read_timeout
+        )
+
+        if response.status_code == 304 and record is not None:
+            record.status_changed = False
+            record.fetched_at = datetime.now()
+            self.stats["not_modified"] += 1
+            return record
+
+        if response.status_code != 200:
+            raise ConversationFetchError(response.status_code, response.text)
+
+        self.stats["downloads"] += 1
+        return self._store(
+            conversation_id,
+            response.json(),
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified")
+        )
+
+    def put(self, conversation_id: str, data: Dict[str, Any]) -> ConversationRecord:
+        """Store a payload received out of band (the post-call webhook)"""
+        return self._store(conversation_id, data, None, None)
+
+    def add_turn_listener(self, listener: TurnListener) -> None:
+        """Call ``listener`` with the new transcript turns of every stored payload"""
+        self._turn_listeners.append(listener)
+
+    def remove_turn_listener(self, listener: TurnListener) -> None:
+        if listener in self._turn_listeners:
+            self._turn_listeners.remove(listener)
+
+    def discard(self, conversation_id: str) -> None:
+        self._records.pop(conversation_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "entries": len(self._records)}
+
+    def _store(self, conversation_id: str, data: Dict[str, Any], etag: Optional[str], last_modified: Optional[str]) -> ConversationRecord:
+        record = self._records.get(conversation_id)
+        if record is None:
+            record = ConversationRecord(conversation_id, data, etag, last_modified)
+            self._records[conversation_id] = record
+            while len(self._records) > self.max_entries:
+                self._records.popitem(last=False)
+        else:
+            record.replace(data, etag, last_modified)
+            self._records.move_to_end(conversation_id)
+
+        self._deliver_turns(record)
+        return record
+
+    def _deliver_turns(self, record: ConversationRecord) -> None:
+        transcript = record.data.get("transcript") or []
+        start = record.turns_delivered
+        new_turns = transcript[start:]
+        record.turns_delivered = max(start, len(transcript))
+
+        if not self._turn_listeners or (not new_turns and not record.status_changed):
+            return
+        for listener in self._turn_listeners:
+            try:
+                listener(record, start, new_turns)
+            except Exception as e:
+                logger.error(f"❌ Transcript listener failed for {record.conversation_id}: {e}")
+
+
+_stores: Dict[str, ConversationStore] = {}
+
+
+def get_conversation_store(base_url: Optional[str] = None) -> ConversationStore:
+    """Process-wide store for an ElevenLabs base URL, shared by the voice services and the webhook"""
+    key = (base_url or settings.elevenlabs_base_url).rstrip("/")
+    if key not in _stores:
+        _stores[key] = ConversationStore(get_http_client(key))
+    return _stores[key]
@@ -3,27 +3,249 @@ Real PostgreSQL database service for InfluencerFlow AI Platform.
 This completely replaces the previous mock implementation.
 """
 import logging
-from typing import List, Optional, Dict, Any
+from enum import Enum
+from typing import List, Optional, Dict, Any, Set
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, delete
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import selectinload
 
 from config.database import DatabaseConfig
 from models.database_models import Campaign, Creator, Negotiation, Contract, Payment, OutreachLog
 from models.campaign import CampaignOrchestrationState, CampaignData, Creator as CampaignCreator
 from database_repository import CampaignRepository, CreatorRepository, NegotiationRepository
+from services.transcript_store import TranscriptStore, ensure_reference_columns
 
 logger = logging.getLogger(__name__)
 
+_CREATOR_FIELDS = (
+    "id", "name", "platform", "followers", "niche", "typical_rate", "engagement_rate", "average_views",
+    "availability", "location", "phone_number", "languages", "specialties"
+)
+
+
+def _column_values(model, values: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Keep only ``model``'s columns and convert API enums to what the columns
+    store (``NegotiationStatus.SUCCESS`` -> ``NegotiationStatusEnum.SUCCESS``,
+    ``Availability.GOOD`` -> ``"good"``)
+    """
+    columns = model.__table__.c
+    row = {}
+    for key, value in values.items():
+        if key not in columns:
+            continue
+        enum_class = getattr(columns[key].type, "enum_class", None)
+        if enum_class is not None and value is not None and not isinstance(value, enum_class):
+            value = enum_class(getattr(value, "value", value))
+        elif enum_class is None and isinstance(value, Enum):
+            value = value.value
+        row[key] = value
+    return row
+
+
+def _without(row: Dict[str, Any], key: str) -> Dict[str, Any]:
+    return {column: value for column, value in row.items() if column != key}
+
+
+class UnitOfWork:
+    """
+    🧾 UNIT OF WORK
+
+    Collects writes in memory and applies them on ``flush()`` in one session
+    and one transaction: creators as a single upsert, negotiations, contracts,
+    payments and outreach logs as bulk inserts, and one UPDATE per campaign
+    however many times its totals changed. Staging never touches the
+    database, so concurrent tasks of an orchestration phase can share a unit
+    of work and no connection is held while calls are in progress.
+
+    Used as ``async with database_service.unit_of_work() as uow`` it flushes
+    on a clean exit and drops its staged writes if the block raises. A flush
+    whose transaction fails keeps its writes staged, so it can be retried.
+    """
+
+    def __init__(self, database_service: "DatabaseService"):
+        self.database_service = database_service
+
+        self._creators: Dict[str, Dict[str, Any]] = {}
+        self._negotiations: List[Dict[str, Any]] = []
+        self._contracts: List[Dict[str, Any]] = []
+        self._payments: List[Dict[str, Any]] = []
+        self._outreach_logs: List[Dict[str, Any]] = []
+        self._campaign_updates: Dict[str, Dict[str, Any]] = {}
+
+        self.flushes = 0
+        self.rows_written = 0
+
+    async def __aenter__(self) -> "UnitOfWork":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.flush()
+        else:
+            self.discard()
+
+    @property
+    def pending(self) -> int:
+        """Staged writes not flushed yet"""
+        return (
+            len(self._creators) + len(self._negotiations) + len(self._contracts)
+            + len(self._payments) + len(self._outreach_logs) + len(self._campaign_updates)
+        )
+
+    # ================================
+    # STAGING
+    # ================================
+
+    def upsert_creator(self, creator_data: CampaignCreator) -> None:
+        """Insert or update a creator (the latest staged version wins)"""
+        self._creators[creator_data.id] = _column_values(
+            Creator, {field: getattr(creator_data, field) for field in _CREATOR_FIELDS}
+        )
+
+    def add_negotiation(self, campaign_id: str, creator_id: str, negotiation_data: Dict[str, Any]) -> None:
+        """``negotiation_data`` holds ``Negotiation`` columns; a ``call_transcript`` is stored as a blob"""
+        row = _column_values(Negotiation, {**negotiation_data, "campaign_id": campaign_id, "creator_id": creator_id})
+        row.pop("call_transcript_ref", None)
+        row["call_transcript"] = row.pop("call_transcript", None)
+        self._negotiations.append(row)
+
+    def add_contract(self, contract_data: Dict[str, Any]) -> None:
+        """Insert a contract (skipped if a contract with that id already exists)"""
+        self._contracts.append(_column_values(Contract, contract_data))
+
+    def add_payment(self, payment_data: Dict[str, Any]) -> None:
+        self._payments.append(_column_values(Payment, payment_data))
+
+    def add_outreach_log(self, log_data: Dict[str, Any]) -> None:
+        """``log_data`` holds ``OutreachLog`` columns; a ``transcript`` is stored as a blob"""
+        row = _column_values(OutreachLog, log_data)
+        row.pop("transcript_ref", None)
+        row["transcript"] = row.pop("transcript", None)
+        self._outreach_logs.append(row)
+
+    def update_campaign(self, campaign_id: str, updates: Dict[str, Any]) -> None:
+        """Merged with earlier staged updates of the same campaign - only the final values are written"""
+        self._campaign_updates.setdefault(campaign_id, {}).update(_column_values(Campaign, updates))
+
+    def discard(self) -> None:
+        self._creators = {}
+        self._negotiations, self._contracts, self._payments, self._outreach_logs = [], [], [], []
+        self._campaign_updates = {}
+
+    def _restage(self, creators, negotiations, contracts, payments, outreach_logs, campaign_updates) -> None:
+        """Put the writes of a failed flush back ahead of anything staged since"""
+        self._creators = {**creators, **self._creators}
+        self._negotiations = negotiations + self._negotiations
+        self._contracts = contracts + self._contracts
+        self._payments = payments + self._payments
+        self._outreach_logs = outreach_logs + self._outreach_logs
+        for campaign_id, updates in self._campaign_updates.items():
+            campaign_updates[campaign_id] = {**campaign_updates.get(campaign_id, {}), **updates}
+        self._campaign_updates = campaign_updates
+
+    # ================================
+    # FLUSH
+    # ================================
+
+    async def flush(self) -> int:
+        """Write everything staged so far in one transaction; returns the number of staged writes applied"""
+        # Take the staged writes first, so tasks staging during the flush go into the next one
+        staged = (
+            self._creators, self._negotiations, self._contracts, self._payments, self._outreach_logs,
+            self._campaign_updates
+        )
+        self.discard()
+
+        count = sum(len(writes) for writes in staged)
+        if not count:
+            return 0
+
+        try:
+            await self._write(*staged)
+        except Exception:
+            self._restage(*staged)
+            raise
+
+        creators, negotiations, contracts, _, outreach_logs, campaign_updates = staged
+        self.flushes += 1
+        self.rows_written += count
+        logger.info(
+            f"💾 Unit of work flushed: {len(creators)} creators, {len(negotiations)} negotiations, "
+            f"{len(contracts)} contracts, {len(outreach_logs)} outreach logs, {len(campaign_updates)} campaign updates"
+        )
+        return count
+
+    async def _write(self, creators, negotiations, contracts, payments, outreach_logs, campaign_updates) -> None:
+        """One transaction for a flush; the staged rows are left unchanged so a failed flush can be retried"""
+        creators = list(creators.values())
+        transcript_store = self.database_service.transcript_store
+        async with self.database_service.get_session() as session:
+            async with session.begin():
+                # Parents before children: creators, then rows referencing them
+                if creators:
+                    statement = insert(Creator).values(creators)
+                    await session.execute(statement.on_conflict_do_update(
+                        index_elements=[Creator.id],
+                        set_={field: statement.excluded[field] for field in _CREATOR_FIELDS if field != "id"}
+                    ))
+
+                # A negotiation and its outreach log share one blob
+                transcript_refs = await transcript_store.put_many(
+                    session,
+                    [row["call_transcript"] for row in negotiations] + [row["transcript"] for row in outreach_logs]
+                )
+                negotiations = [
+                    {**_without(row, "call_transcript"), "call_transcript_ref": transcript_refs.get(row["call_transcript"])}
+                    for row in negotiations
+                ]
+                outreach_logs = [
+                    {**_without(row, "transcript"), "transcript_ref": transcript_refs.get(row["transcript"])}
+                    for row in outreach_logs
+                ]
+
+                # Rows already written by a flush whose commit succeeded but was reported failed are skipped
+                if negotiations:
+                    await session.execute(
+                        insert(Negotiation).on_conflict_do_nothing(
+                            index_elements=[Negotiation.campaign_id, Negotiation.creator_id]
+                        ),
+                        negotiations
+                    )
+                if contracts:
+                    await session.execute(
+                        insert(Contract).on_conflict_do_nothing(index_elements=[Contract.id]), contracts
+                    )
+                if payments:
+                    await session.execute(
+                        insert(Payment).on_conflict_do_nothing(index_elements=[Payment.contract_id]), payments
+                    )
+                if outreach_logs:
+                    await session.execute(
+                        insert(OutreachLog).on_conflict_do_nothing(
+                            index_elements=[OutreachLog.campaign_id, OutreachLog.creator_id, OutreachLog.contact_type]
+                        ),
+                        outreach_logs
+                    )
+
+                for campaign_id, updates in campaign_updates.items():
+                    await session.execute(
+                        update(Campaign).where(Campaign.id == campaign_id).values({"updated_at": datetime.now(), **updates})
+                    )
+
+
 class DatabaseService:
     """
     Complete database service with real PostgreSQL operations.
     This replaces the mock implementation entirely - no legacy code.
     """
     
-    def __init__(self):
-        self.db_config = DatabaseConfig()
+    def __init__(self, db_config: Optional[DatabaseConfig] = None):
+        # Reuse the process-wide engine pool when one is provided (see services/container.py)
+        self.db_config = db_config or DatabaseConfig()
+        self.transcript_store = TranscriptStore()
         self._initialized = False
         logger.info("🗄️ Database service initialized with PostgreSQL")
     
@@ -31,13 +253,19 @@ class DatabaseService:
         """Initialize database tables if not already done"""
         if not self._initialized:
             await self.db_config.create_tables()
+            # create_all does not add columns to existing tables
+            await ensure_reference_columns(self.db_config)
             self._initialized = True
             logger.info("✅ Database tables initialized")
     
-    async def get_session(self) -> AsyncSession:
-        """Get async database session"""
+    def get_session(self) -> AsyncSession:
+        """New async session - use as ``async with database_service.get_session() as session``"""
         return self.db_config.AsyncSessionLocal()
     
+    def unit_of_work(self) -> UnitOfWork:
+        """Batch writes into one transaction - see ``UnitOfWork``"""
+        return UnitOfWork(self)
+    
     # ================================
     # CAMPAIGN OPERATIONS
     # ================================
@@ -175,6 +403,28 @@ class DatabaseService:
                 for creator in creators
             ]
     
+    async def get_recent_call_durations(self, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Recent completed-call durations with the creator's follower count (seeds poll scheduling)"""
+        await self.initialize()
+        
+        async with self.get_session() as session:
+            result = await session.execute(
+                select(Creator.followers, Negotiation.call_duration_seconds)
+                .join(Negotiation, Negotiation.creator_id == Creator.id)
+                .where(Negotiation.call_duration_seconds > 0)
+                .order_by(Negotiation.created_at.desc())
+                .limit(limit)
+            )
+            return [
+                {"followers": followers, "call_duration_seconds": duration}
+                for followers, duration in result.all()
+            ]
+    
+    async def get_transcript(self, transcript_ref: Optional[str]) -> Optional[str]:
+        """Full transcript text for a ``call_transcript_ref`` / ``transcript_ref``"""
+        async with self.get_session() as session:
+            return await self.transcript_store.get(session, transcript_ref)
+    
     # ================================
     # ORCHESTRATION SYNC (Main Method)
     # ================================
@@ -183,26 +433,31 @@ class DatabaseService:
         """
         Sync campaign orchestration results to database.
         This is the main method called by the orchestrator.
+        
+        Everything is written by one unit of work - one transaction - and rows
+        the orchestrator already stored during its phases are not inserted again.
         """
         await self.initialize()
         
         try:
             logger.info(f"💾 Syncing campaign {orchestration_state.campaign_id} to database")
+            stored = await self._stored_rows(orchestration_state.campaign_id)
             
-            # Update campaign record
-            await self._update_campaign_from_state(orchestration_state)
-            
-            # Sync discovered creators
-            await self._sync_discovered_creators(orchestration_state)
-            
-            # Sync negotiations
-            await self._sync_negotiations(orchestration_state)
-            
-            # Sync contracts
-            await self._sync_contracts(orchestration_state)
-            
-            # Create outreach logs
-            await self._create_outreach_logs(orchestration_state)
+            async with self.unit_of_work() as uow:
+                # Update campaign record
+                self._update_campaign_from_state(orchestration_state, uow)
+                
+                # Sync discovered creators
+                self._sync_discovered_creators(orchestration_state, uow)
+                
+                # Sync negotiations
+                self._sync_negotiations(orchestration_state, uow, stored["negotiations"])
+                
+                # Sync contracts
+                self._sync_contracts(orchestration_state, uow, stored["contracts"])
+                
+                # Create outreach logs
+                self._create_outreach_logs(orchestration_state, uow, stored["outreach_logs"])
             
             logger.info("✅ Database sync completed")
             
@@ -212,7 +467,25 @@ class DatabaseService:
             await self._fallback_logging(orchestration_state)
             raise
     
-    async def _update_campaign_from_state(self, state: CampaignOrchestrationState):
+    async def _stored_rows(self, campaign_id: str) -> Dict[str, Set[str]]:
+        """Creators with a stored negotiation / outreach log and stored contract ids for a campaign"""
+        async with self.get_session() as session:
+            negotiations = await session.execute(
+                select(Negotiation.creator_id).where(Negotiation.campaign_id == campaign_id)
+            )
+            contracts = await session.execute(
+                select(Contract.id).where(Contract.campaign_id == campaign_id)
+            )
+            outreach_logs = await session.execute(
+                select(OutreachLog.creator_id).where(OutreachLog.campaign_id == campaign_id)
+            )
+            return {
+                "negotiations": set(negotiations.scalars().all()),
+                "contracts": set(contracts.scalars().all()),
+                "outreach_logs": set(outreach_logs.scalars().all())
+            }
+    
+    def _update_campaign_from_state(self, state: CampaignOrchestrationState, uow: UnitOfWork):
         """Update campaign with orchestration results"""
         updates = {
             "status": "completed" if state.completed_at else "active",
@@ -224,88 +497,93 @@ class DatabaseService:
         if state.completed_at:
             updates["completed_at"] = state.completed_at
         
-        await self.update_campaign(state.campaign_id, updates)
+        uow.update_campaign(state.campaign_id, updates)
     
-    async def _sync_discovered_creators(self, state: CampaignOrchestrationState):
+    def _sync_discovered_creators(self, state: CampaignOrchestrationState, uow: UnitOfWork):
         """Sync discovered creators to database"""
-        for creator in state.discovered_influencers:
-            await self.create_or_update_creator(creator)
+        for match in state.discovered_influencers:
+            uow.upsert_creator(getattr(match, "creator", match))
     
-    async def _sync_negotiations(self, state: CampaignOrchestrationState):
+    def _sync_negotiations(self, state: CampaignOrchestrationState, uow: UnitOfWork, stored: Set[str]):
         """Sync negotiations to database"""
-        async with self.get_session() as session:
-            for negotiation in state.negotiations:
-                db_negotiation = Negotiation(
-                    campaign_id=state.campaign_id,
-                    creator_id=negotiation.creator_id,
-                    status=negotiation.status,
-                    initial_rate=negotiation.initial_rate,
-                    final_rate=negotiation.final_rate,
-                    negotiated_terms=negotiation.negotiated_terms,
-                    call_status=negotiation.call_status,
-                    email_status=negotiation.email_status,
-                    call_duration_seconds=negotiation.call_duration_seconds,
-                    call_recording_url=negotiation.call_recording_url,
-                    call_transcript=negotiation.call_transcript,
-                    last_contact_date=negotiation.last_contact_date
-                )
-                session.add(db_negotiation)
-            
-            await session.commit()
-            logger.info(f"📞 Synced {len(state.negotiations)} negotiations")
+        negotiations = [negotiation for negotiation in state.negotiations if negotiation.creator_id not in stored]
+        for negotiation in negotiations:
+            # Stored once as a compressed blob - the outreach log references the same one
+            uow.add_negotiation(state.campaign_id, negotiation.creator_id, {
+                "status": negotiation.status,
+                "initial_rate": negotiation.initial_offer,
+                "final_rate": negotiation.final_rate,
+                "negotiated_terms": negotiation.negotiated_terms,
+                "call_status": negotiation.call_status,
+                "email_status": negotiation.email_status,
+                "call_duration_seconds": negotiation.call_duration_seconds,
+                "call_recording_url": negotiation.call_recording_url,
+                "call_transcript": negotiation.call_transcript,
+                "last_contact_date": negotiation.last_contact_date
+            })
+        
+        logger.info(f"📞 Synced {len(negotiations)} negotiations")
     
-    async def _sync_contracts(self, state: CampaignOrchestrationState):
+    def _sync_contracts(self, state: CampaignOrchestrationState, uow: UnitOfWork, stored: Set[str]):
         """Sync contracts to database"""
-        async with self.get_session() as session:
-            for contract in state.contracts:
-                db_contract = Contract(
-                    id=contract.contract_id,
-                    campaign_id=contract.campaign_id,
-                    creator_id=contract.creator_id,
-                    compensation_amount=contract.compensation_amount,
-                    deliverables=contract.deliverables,
-                    timeline=contract.timeline,
-                    usage_rights=contract.usage_rights,
-                    status=contract.status,
-                    contract_text=contract.contract_text,
-                    legal_review_status=contract.legal_review_status,
-                    amendments=contract.amendments
-                )
-                session.add(db_contract)
-                
-                # Create payment record if contract is signed
-                if contract.status.value == "signed":
-                    payment = Payment(
-                        contract_id=contract.contract_id,
-                        amount=contract.compensation_amount,
-                        status="pending",
-                        payment_method="bank_transfer",
-                        due_date=datetime.now()
-                    )
-                    session.add(payment)
+        synced = 0
+        for contract in state.contracts:
+            contract_data = self._contract_data(state.campaign_id, contract)
+            if contract_data["id"] in stored:
+                continue
+            uow.add_contract(contract_data)
+            synced += 1
             
-            await session.commit()
-            logger.info(f"📝 Synced {len(state.contracts)} contracts")
+            # Create payment record if contract is signed (or was created with one)
+            status = getattr(contract_data["status"], "value", contract_data["status"])
+            if status == "signed" or (isinstance(contract, dict) and contract.get("payment_status") == "pending"):
+                uow.add_payment({
+                    "contract_id": contract_data["id"],
+                    "amount": contract_data["compensation_amount"],
+                    "status": "pending",
+                    "payment_method": "bank_transfer",
+                    "due_date": datetime.now()
+                })
+        
+        logger.info(f"📝 Synced {synced} contracts")
+    
+    @staticmethod
+    def _contract_data(campaign_id: str, contract) -> Dict[str, Any]:
+        """``Contract`` columns from an orchestrator contract dict or a contract model"""
+        if not isinstance(contract, dict):
+            contract = {**contract.__dict__, "id": contract.contract_id}
+        terms = contract.get("terms") or {}
+        return {
+            "id": contract.get("id") or contract.get("contract_id"),
+            "campaign_id": contract.get("campaign_id") or campaign_id,
+            "creator_id": contract["creator_id"],
+            "compensation_amount": contract.get("compensation_amount", contract.get("compensation")),
+            "deliverables": contract.get("deliverables", terms.get("deliverables")),
+            "timeline": contract.get("timeline", terms.get("timeline")),
+            "usage_rights": contract.get("usage_rights", terms.get("usage_rights")),
+            "status": contract.get("status", "draft"),
+            "contract_text": contract.get("contract_text"),
+            "legal_review_status": contract.get("legal_review_status", "pending"),
+            "amendments": contract.get("amendments")
+        }
     
-    async def _create_outreach_logs(self, state: CampaignOrchestrationState):
+    def _create_outreach_logs(self, state: CampaignOrchestrationState, uow: UnitOfWork, stored: Set[str]):
         """Create outreach logs from negotiations"""
-        async with self.get_session() as session:
-            for negotiation in state.negotiations:
-                log = OutreachLog(
-                    campaign_id=state.campaign_id,
-                    creator_id=negotiation.creator_id,
-                    contact_type="call",
-                    status=negotiation.call_status.value,
-                    duration_minutes=negotiation.call_duration_seconds // 60,
-                    recording_url=negotiation.call_recording_url,
-                    transcript=negotiation.call_transcript,
-                    sentiment="positive" if negotiation.status.value == "success" else "neutral",
-                    notes=f"Negotiation {negotiation.status.value}"
-                )
-                session.add(log)
-            
-            await session.commit()
-            logger.info(f"📊 Created {len(state.negotiations)} outreach logs")
+        negotiations = [negotiation for negotiation in state.negotiations if negotiation.creator_id not in stored]
+        for negotiation in negotiations:
+            uow.add_outreach_log({
+                "campaign_id": state.campaign_id,
+                "creator_id": negotiation.creator_id,
+                "contact_type": "call",
+                "status": negotiation.call_status,
+                "duration_minutes": negotiation.call_duration_seconds // 60,
+                "recording_url": negotiation.call_recording_url,
+                "transcript": negotiation.call_transcript,
+                "sentiment": "positive" if negotiation.status.value == "success" else "neutral",
+                "notes": f"Negotiation {negotiation.status.value}"
+            })
+        
+        logger.info(f"📊 Created {len(negotiations)} outreach logs")
     
     async def _fallback_logging(self, state: CampaignOrchestrationState):
         """Fallback logging if database operations fail"""
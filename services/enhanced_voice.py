@@ -1,13 +1,17 @@
 # services/enhanced_voice.py - COMPLETE FINAL WORKING VERSION
 import asyncio
 import logging
-import requests
 import random
 import json
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 
 from config.settings import settings
+from services.http_client import HTTPClient, get_http_client
+from services.conversation_store import ConversationStore, ConversationFetchError, get_conversation_store
+from services.status_poller import ConversationStatusPoller
+from services.circuit_breaker import get_circuit_breaker, backoff_delay, hedged
+from models.campaign import CreatorTier
 
 logger = logging.getLogger(__name__)
 
@@ -18,17 +22,34 @@ class EnhancedVoiceService:
     All methods properly implemented and working
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        http_client: Optional[HTTPClient] = None,
+        conversation_store: Optional[ConversationStore] = None
+    ):
         self.api_key = settings.elevenlabs_api_key
         self.agent_id = settings.elevenlabs_agent_id
         self.phone_number_id = settings.elevenlabs_phone_number_id
-        self.base_url = "https://api.elevenlabs.io"
+        self.base_url = settings.elevenlabs_base_url
+        
+        # Persistent keep-alive pool (HTTP_POOL_LIMIT_PER_HOST connections) shared across services
+        self.http = http_client or get_http_client(self.base_url)
+        
+        # Conversation payloads cached by id (conditional requests, terminal entries immutable)
+        self.conversation_store = conversation_store or get_conversation_store(self.base_url)
+        
+        # Multiplexed status polling for every conversation this service waits on
+        self.status_poller = ConversationStatusPoller(self.get_conversation_status, self._is_terminal_status)
         
         # Optimized timeouts based on ElevenLabs documentation
         self.request_timeout = 30
         self.status_check_timeout = 15
         self.retry_attempts = 3
-        self.retry_delay = 2
+        self.retry_delay = 2  # backoff base; doubles per attempt with full jitter
+        
+        # Shared per endpoint across every campaign in the process
+        self.call_circuit = get_circuit_breaker("elevenlabs.outbound_call")
+        self.status_circuit = get_circuit_breaker("elevenlabs.conversations")
         
         self.use_mock = not all([self.api_key, self.agent_id, self.phone_number_id])
         
@@ -48,10 +69,10 @@ class EnhancedVoiceService:
         
         try:
             # Test API connectivity with simple request
-            response = requests.get(
-                f"{self.base_url}/v1/user",
+            response = await self.http.get(
+                "/v1/user",
                 headers={"Xi-Api-Key": self.api_key},
-                timeout=self.status_check_timeout
+                read_timeout=self.status_check_timeout
             )
             
             if response.status_code == 200:
@@ -113,8 +134,20 @@ class EnhancedVoiceService:
         if self.use_mock:
             return await self._mock_enhanced_call(creator_phone, creator_profile, campaign_data)
         
-        # Retry logic for network issues
+        # Retry logic for network issues - jittered exponential backoff behind a
+        # circuit shared by every campaign in the process
         for attempt in range(self.retry_attempts):
+            if not self.call_circuit.allow():
+                retry_after = self.call_circuit.retry_after()
+                logger.warning(f"⚠️ ElevenLabs outbound calls unavailable - circuit open for {retry_after:.0f}s")
+                return {
+                    "status": "failed",
+                    "error": "ElevenLabs API unavailable (circuit open)",
+                    "circuit_open": True,
+                    "retry_after": retry_after,
+                    "phone_number": creator_phone
+                }
+            
             try:
                 logger.info(f"📱 Initiating ElevenLabs call (attempt {attempt + 1})")
                 
@@ -136,22 +169,37 @@ class EnhancedVoiceService:
                     if not conversation_id:
                         raise ValueError("Missing conversation_id in API response")
                     
+                    self.call_circuit.record_success()
                     logger.info(f"✅ Call initiated successfully: {conversation_id}")
+                    response["creator_tier"] = creator_profile.get("tier") or CreatorTier.for_followers(creator_profile.get("followers", 0)).value
                     return response
                 
-                elif attempt < self.retry_attempts - 1:
-                    logger.warning(f"⚠️ Call failed, retrying in {self.retry_delay}s...")
-                    await asyncio.sleep(self.retry_delay)
+                if not self._is_provider_failure(response):
+                    # Rejected request (bad number, auth) - the API is up and a retry won't help
+                    self.call_circuit.record_success()
+                    logger.error(f"❌ Call rejected: {response.get('error')}")
+                    return response
+                
+                self.call_circuit.record_failure()
+                if attempt < self.retry_attempts - 1:
+                    delay = backoff_delay(attempt, self.retry_delay, retry_after=response.get("retry_after"))
+                    logger.warning(f"⚠️ Call failed, retrying in {delay:.1f}s...")
+                    await asyncio.sleep(delay)
                     continue
                 else:
                     logger.error(f"❌ All retry attempts failed: {response}")
                     return response
+            
+            except asyncio.CancelledError:
+                self.call_circuit.release()
+                raise
                     
             except Exception as e:
                 logger.error(f"❌ Call exception (attempt {attempt + 1}): {e}")
+                self.call_circuit.record_failure()
                 
                 if attempt < self.retry_attempts - 1:
-                    await asyncio.sleep(self.retry_delay)
+                    await asyncio.sleep(backoff_delay(attempt, self.retry_delay))
                     continue
                 else:
                     # Return error response for contract generation handling
@@ -187,18 +235,12 @@ class EnhancedVoiceService:
                 }
             }
             
-            # Make request using asyncio for timeout handling
-            loop = asyncio.get_event_loop()
-            
-            def make_request():
-                return requests.post(
-                    f"{self.base_url}/v1/convai/twilio/outbound-call",
-                    headers={"Xi-Api-Key": self.api_key},
-                    json=payload,
-                    timeout=self.request_timeout
-                )
-            
-            response = await loop.run_in_executor(None, make_request)
+            response = await self.http.post(
+                "/v1/convai/twilio/outbound-call",
+                headers={"Xi-Api-Key": self.api_key},
+                json=payload,
+                read_timeout=self.request_timeout
+            )
             
             # Proper response validation
             if response.status_code == 200:
@@ -231,13 +273,15 @@ class EnhancedVoiceService:
                     }
             else:
                 logger.error(f"❌ API error {response.status_code}: {response.text}")
+                retry_after = response.headers.get("Retry-After", "")
                 return {
                     "status": "failed",
                     "error": f"API Error {response.status_code}: {response.text}",
-                    "status_code": response.status_code
+                    "status_code": response.status_code,
+                    "retry_after": float(retry_after) if retry_after.isdigit() else None
                 }
                 
-        except requests.exceptions.Timeout:
+        except asyncio.TimeoutError:
             return {
                 "status": "failed",
                 "error": "Request timeout - ElevenLabs API not responding"
@@ -248,6 +292,12 @@ class EnhancedVoiceService:
                 "error": f"Request failed: {str(e)}"
             }
     
+    @staticmethod
+    def _is_provider_failure(response: Dict[str, Any]) -> bool:
+        """Timeouts, connection errors, 5xx and 429 - worth a retry and counted by the circuit"""
+        status_code = response.get("status_code")
+        return status_code is None or status_code >= 500 or status_code == 429
+    
     async def get_conversation_status(self, conversation_id: str) -> Optional[Dict[str, Any]]:
         """
         📡 GET CONVERSATION STATUS
@@ -256,49 +306,58 @@ class EnhancedVoiceService:
         if self.use_mock or conversation_id.startswith("mock_"):
             return await self._mock_status_check(conversation_id)
         
+        if not self.status_circuit.allow():
+            # Provider down: skip this poll rather than fail the conversation
+            return None
+        
         try:
-            loop = asyncio.get_event_loop()
+            # Cached payload; unchanged in-progress calls cost a 304, finished ones no request.
+            # Slow reads are hedged with a second request (STATUS_HEDGE_DELAY_SECONDS)
+            record = await hedged(
+                lambda: self.conversation_store.fetch(conversation_id, read_timeout=self.status_check_timeout),
+                delay=settings.status_hedge_delay_seconds
+            )
+            self.status_circuit.record_success()
             
-            def make_status_request():
-                return requests.get(
-                    f"{self.base_url}/v1/convai/conversations/{conversation_id}",
-                    headers={"Xi-Api-Key": self.api_key},
-                    timeout=self.status_check_timeout
-                )
+            # Map ElevenLabs status to our expected states (only when it changed)
+            if record.normalized_status is None:
+                record.normalized_status = self._normalize_conversation_status(record.status)
             
-            response = await loop.run_in_executor(None, make_status_request)
+            result = dict(record.data)
             
-            if response.status_code == 200:
-                result = response.json()
-                
-                # Add monitoring metadata
-                result["monitoring_metadata"] = {
-                    "fetched_at": datetime.now().isoformat(),
-                    "service": "elevenlabs_api"
-                }
-                
-                # Map ElevenLabs status to our expected states
-                status = result.get("status", "unknown")
-                result["normalized_status"] = self._normalize_conversation_status(status)
-                
-                return result
-            else:
-                logger.error(f"❌ Status check failed {response.status_code}: {response.text}")
-                return {
-                    "status": "error",
-                    "normalized_status": "failed",
-                    "error": f"API Error {response.status_code}",
-                    "conversation_id": conversation_id
-                }
-                
-        except Exception as e:
-            logger.error(f"❌ Status check exception: {e}")
+            # Add monitoring metadata
+            result["monitoring_metadata"] = {
+                "fetched_at": record.fetched_at.isoformat(),
+                "service": "elevenlabs_api"
+            }
+            result["normalized_status"] = record.normalized_status
+            
+            return result
+            
+        except ConversationFetchError as e:
+            logger.error(f"❌ Status check failed {e.status_code}: {e.text}")
+            if e.status_code >= 500 or e.status_code == 429:
+                # Provider trouble says nothing about the call itself - poll again later
+                self.status_circuit.record_failure()
+                return None
+            
+            self.status_circuit.record_success()
             return {
                 "status": "error",
-                "normalized_status": "failed", 
-                "error": str(e),
+                "normalized_status": "failed",
+                "error": f"API Error {e.status_code}",
                 "conversation_id": conversation_id
             }
+        
+        except asyncio.CancelledError:
+            self.status_circuit.release()
+            raise
+                
+        except Exception as e:
+            # Timeout or connection error - poll again later
+            logger.error(f"❌ Status check exception: {e}")
+            self.status_circuit.record_failure()
+            return None
     
     def _normalize_conversation_status(self, elevenlabs_status: str) -> str:
         """Map ElevenLabs status to standard states"""
@@ -317,69 +376,71 @@ class EnhancedVoiceService:
     async def wait_for_conversation_completion_with_analysis(
         self,
         conversation_id: str,
-        max_wait_seconds: int = 300
+        max_wait_seconds: int = 300,
+        creator_tier: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         🔄 WAIT FOR CONVERSATION COMPLETION WITH ANALYSIS
+        
+        Polls are concentrated where calls for this agent and ``creator_tier``
+        usually end.
         """
         
         if self.use_mock or conversation_id.startswith("mock_"):
             return await self._mock_conversation_completion(conversation_id)
         
-        start_time = datetime.now()
-        poll_interval = 10  # Poll every 10 seconds
-        
         logger.info(f"🔄 Waiting for conversation completion: {conversation_id}")
         
-        while (datetime.now() - start_time).total_seconds() < max_wait_seconds:
-            try:
-                status_data = await self.get_conversation_status(conversation_id)
-                
-                if not status_data:
-                    logger.warning("⚠️ No status data received, continuing to poll...")
-                    await asyncio.sleep(poll_interval)
-                    continue
-                
-                normalized_status = status_data.get("normalized_status", "unknown")
-                
-                if normalized_status == "completed":
-                    logger.info("✅ Conversation completed successfully")
-                    
-                    # Extract analysis data
-                    analysis_data = self._extract_analysis_data(status_data)
-                    
-                    return {
-                        "status": "completed",
-                        "conversation_data": status_data,
-                        "analysis_data": analysis_data,
-                        "completion_time": datetime.now().isoformat()
-                    }
-                
-                elif normalized_status == "failed":
-                    logger.error("❌ Conversation failed")
-                    return {
-                        "status": "failed",
-                        "conversation_data": status_data,
-                        "error": status_data.get("error", "Conversation failed"),
-                        "failure_time": datetime.now().isoformat()
-                    }
-                
-                # Still in progress, continue polling
-                logger.info(f"📞 Conversation in progress: {normalized_status}")
-                await asyncio.sleep(poll_interval)
-                
-            except Exception as e:
-                logger.error(f"❌ Error during conversation monitoring: {e}")
-                await asyncio.sleep(poll_interval)
+        # Shared poller: one heap-scheduled loop for every in-flight call, resolved early by the webhook
+        duration_key = (self.agent_id, creator_tier)
+        started_at = asyncio.get_running_loop().time()
+        status_data = await self.status_poller.wait(conversation_id, timeout=max_wait_seconds, duration_key=duration_key)
+        
+        if status_data is None:
+            logger.warning(f"⏰ Conversation timeout after {max_wait_seconds}s")
+            return {
+                "status": "timeout",
+                "error": f"Conversation did not complete within {max_wait_seconds} seconds",
+                "conversation_id": conversation_id
+            }
+        
+        # Webhook payloads arrive without our normalized status
+        status_data.setdefault(
+            "normalized_status",
+            self._normalize_conversation_status(status_data.get("status", "done"))
+        )
         
-        # Timeout reached
-        logger.warning(f"⏰ Conversation timeout after {max_wait_seconds}s")
+        if status_data["normalized_status"] == "completed":
+            logger.info("✅ Conversation completed successfully")
+            self.status_poller.duration_stats.record_call(
+                *duration_key, status_data, asyncio.get_running_loop().time() - started_at
+            )
+            
+            # Extract analysis data
+            analysis_data = self._extract_analysis_data(status_data)
+            
+            return {
+                "status": "completed",
+                "conversation_data": status_data,
+                "analysis_data": analysis_data,
+                "completion_time": datetime.now().isoformat()
+            }
+        
+        logger.error("❌ Conversation failed")
         return {
-            "status": "timeout",
-            "error": f"Conversation did not complete within {max_wait_seconds} seconds",
-            "conversation_id": conversation_id
+            "status": "failed",
+            "conversation_data": status_data,
+            "error": status_data.get("error", "Conversation failed"),
+            "failure_time": datetime.now().isoformat()
         }
     
+    def _is_terminal_status(self, status_data: Dict[str, Any]) -> bool:
+        """Completed or failed - the poller stops tracking the conversation"""
+        normalized_status = status_data.get("normalized_status") or self._normalize_conversation_status(
+            status_data.get("status", "unknown")
+        )
+        return normalized_status in ("completed", "failed")
+    
     def _extract_analysis_data(self, conversation_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract structured analysis from conversation data"""
         
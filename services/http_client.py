@@ -0,0 +1,122 @@
+# services/http_client.py - SHARED ASYNC HTTP TRANSPORT
+"""
+Pooled async HTTP client for external APIs.
+
+One ``HTTPClient`` per base URL is shared by every service in the process
+(see ``get_http_client``), so calls reuse keep-alive connections from a single
+aiohttp connection pool instead of opening a new TCP/TLS connection per request
+or blocking the event loop with ``requests``.
+
+aiohttp speaks HTTP/1.1 only; keep-alive pooling gives most of the connection
+reuse HTTP/2 would. Point ``ELEVENLABS_BASE_URL`` at a local stub server to
+exercise the voice services without the real API.
+"""
+import asyncio
+import json
+import logging
+from typing import Optional, Dict, Any
+
+import aiohttp
+from multidict import CIMultiDict
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPResponse:
+    """Fully-read response (status, headers and body) detached from the connection"""
+
+    def __init__(self, status_code: int, text: str, headers: Dict[str, str]):
+        self.status_code = status_code
+        self.text = text
+        self.headers = CIMultiDict(headers)  # case-insensitive, like the wire format
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+class HTTPClient:
+    """
+    🌐 POOLED ASYNC HTTP CLIENT
+
+    The aiohttp session is created lazily on first use inside the running event
+    loop (and recreated if the loop changes), so constructing services stays
+    synchronous and cheap.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        limit: Optional[int] = None,
+        limit_per_host: Optional[int] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        keepalive_seconds: Optional[float] = None
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.limit = limit or settings.http_pool_limit
+        self.limit_per_host = limit_per_host if limit_per_host is not None else settings.http_pool_limit_per_host
+        self.connect_timeout = connect_timeout or settings.http_connect_timeout_seconds
+        self.read_timeout = read_timeout or settings.http_read_timeout_seconds
+        self.keepalive_seconds = keepalive_seconds or settings.http_keepalive_seconds
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_seconds,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                # sock_connect rather than connect: waiting for a pooled connection is not a connect failure
+                timeout=aiohttp.ClientTimeout(
+                    sock_connect=self.connect_timeout,
+                    sock_read=self.read_timeout
+                )
+            )
+            self._loop = loop
+        return self._session
+
+    async def request(self, method: str, path: str, read_timeout: Optional[float] = None, **kwargs) -> HTTPResponse:
+        """Send a request to ``base_url + path`` and read the whole body"""
+        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        if read_timeout is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=read_timeout)
+        async with self._get_session().request(method, url, **kwargs) as response:
+            return HTTPResponse(response.status, await response.text(), response.headers)
+
+    async def get(self, path: str, **kwargs) -> HTTPResponse:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> HTTPResponse:
+        return await self.request("POST", path, **kwargs)
+
+    async def close(self) -> None:
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+_clients: Dict[str, HTTPClient] = {}
+
+
+def get_http_client(base_url: str, **kwargs) -> HTTPClient:
+    """Process-wide client for a base URL (created on first request)"""
+    key = base_url.rstrip("/")
+    if key not in _clients:
+        _clients[key] = HTTPClient(key, **kwargs)
+    return _clients[key]
+
+
+async def close_http_clients() -> None:
+    """Close every shared client's connection pool"""
+    for client in list(_clients.values()):
+        await client.close()
+    _clients.clear()
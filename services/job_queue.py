@@ -0,0 +1,480 @@
+# services/job_queue.py - DURABLE CAMPAIGN JOB QUEUE
+"""
+Durable job queue for campaign orchestration.
+
+The API only enqueues jobs; workers (``python worker.py`` or the embedded
+worker started by ``main.py``) claim them, heartbeat while running and
+release them when done. Running jobs whose heartbeat is older than
+``settings.job_lease_seconds`` are reclaimed by the next worker, so a crashed
+or redeployed worker does not lose work.
+
+Backends:
+- ``LocalFileJobQueue``: one JSON file per job, claimed with atomic renames
+- ``PostgresJobQueue``: ``campaign_jobs`` table claimed with ``FOR UPDATE SKIP LOCKED``
+"""
+import os
+import uuid
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from models.campaign import CampaignJobData, JobStatus
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class JobLeaseLost(Exception):
+    """Raised when a worker no longer owns the job it is running"""
+
+
+class JobQueue(ABC):
+    """Common interface for campaign job queue backends"""
+
+    def __init__(self, lease_seconds: Optional[int] = None, max_attempts: Optional[int] = None):
+        self.lease_seconds = lease_seconds or settings.job_lease_seconds
+        self.max_attempts = max_attempts or settings.job_max_attempts
+
+    @abstractmethod
+    async def enqueue(self, job_id: str, campaign_id: str, payload: Dict[str, Any]) -> CampaignJobData:
+        """Add a new job to the queue"""
+
+    @abstractmethod
+    async def claim(self, worker_id: str) -> Optional[CampaignJobData]:
+        """Claim the oldest queued (or lease-expired) job for this worker"""
+
+    @abstractmethod
+    async def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """Extend the lease on a running job. Returns False if the lease was lost."""
+
+    @abstractmethod
+    async def complete(self, job_id: str, worker_id: str, result: Optional[Dict[str, Any]] = None) -> None:
+        """Mark a job as completed"""
+
+    @abstractmethod
+    async def fail(self, job_id: str, worker_id: str, error: str, retry: bool = True) -> None:
+        """Mark a job as failed, re-queueing it if it has attempts left"""
+
+    @abstractmethod
+    async def get_job(self, job_id: str) -> Optional[CampaignJobData]:
+        """Get a job by ID regardless of its status"""
+
+    async def close(self) -> None:
+        """Release backend resources"""
+
+
+# ================================
+# LOCAL FILE BACKEND
+# ================================
+
+class LocalFileJobQueue(JobQueue):
+    """
+    File-based queue for single-host deployments and development.
+
+    Each job lives in ``<status>/<job_id>.json``. Claiming renames the file
+    from ``queued/`` to a private ``running/<job_id>.<token>.claim`` file with
+    ``os.rename``, which is atomic on the same filesystem, so only one worker
+    can win a job. The claimed record (owner, fresh heartbeat) is written
+    there and only then renamed to ``running/<job_id>.json``, so the reclaimer
+    never sees a running job without its new lease. Heartbeats touch the
+    running file's mtime and finishing moves it to a private file first, so
+    neither can recreate a job the reclaimer has already moved away.
+    """
+
+    def __init__(self, queue_dir: Optional[str] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.queue_dir = Path(queue_dir or settings.job_queue_dir)
+        self._dirs = {status: self.queue_dir / status.value for status in JobStatus}
+        for directory in self._dirs.values():
+            directory.mkdir(parents=True, exist_ok=True)
+        logger.info(f"📦 Local job queue ready at {self.queue_dir}")
+
+    def _path(self, status: JobStatus, job_id: str) -> Path:
+        return self._dirs[status] / f"{job_id}.json"
+
+    def _read(self, path: Path) -> Optional[CampaignJobData]:
+        try:
+            with open(path, "r") as f:
+                return CampaignJobData.model_validate_json(f.read())
+        except FileNotFoundError:
+            return None
+
+    def _write(self, path: Path, job: CampaignJobData) -> None:
+        # Write to a temp file first so readers never see a partial job
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            f.write(job.model_dump_json())
+        os.replace(tmp_path, path)
+
+    def _move(self, job_id: str, source: JobStatus, target: JobStatus) -> bool:
+        try:
+            os.rename(self._path(source, job_id), self._path(target, job_id))
+            return True
+        except FileNotFoundError:
+            return False  # Another worker got there first
+
+    def _enqueue_sync(self, job_id: str, campaign_id: str, payload: Dict[str, Any]) -> CampaignJobData:
+        job = CampaignJobData(
+            id=job_id,
+            campaign_id=campaign_id,
+            payload=payload,
+            max_attempts=self.max_attempts
+        )
+        self._write(self._path(JobStatus.QUEUED, job_id), job)
+        return job
+
+    @staticmethod
+    def _mtime(path: Path) -> Optional[datetime]:
+        try:
+            return datetime.fromtimestamp(path.stat().st_mtime)
+        except FileNotFoundError:
+            return None
+
+    def _reclaim_expired_sync(self) -> None:
+        """Move lease-expired running jobs back to the queue (or to failed)"""
+        cutoff = datetime.now() - timedelta(seconds=self.lease_seconds)
+
+        # Claims abandoned between the rename and the final write (worker crashed mid-claim)
+        for path in self._dirs[JobStatus.RUNNING].glob("*.claim"):
+            modified = self._mtime(path)
+            if modified is None or modified > cutoff:
+                continue
+            job_id = path.name.rsplit(".", 2)[0]
+            try:
+                os.rename(path, self._path(JobStatus.QUEUED, job_id))
+                logger.warning(f"♻️ Returned abandoned claim of job {job_id} to the queue")
+            except FileNotFoundError:
+                pass
+
+        for path in self._dirs[JobStatus.RUNNING].glob("*.json"):
+            job = self._read(path)
+            if not job:
+                continue
+
+            # The lease runs from the last heartbeat or the last write of the file, whichever
+            # is newer - a missing heartbeat never counts as expired
+            modified = self._mtime(path)
+            lease_start = max(filter(None, (job.heartbeat_at, modified)), default=None)
+            if lease_start is None or lease_start > cutoff:
+                continue
+
+            target = JobStatus.QUEUED if job.can_retry else JobStatus.FAILED
+            if self._move(job.id, JobStatus.RUNNING, target):
+                job.status = target
+                job.error = f"Lease expired on worker {job.worker_id}"
+                self._write(self._path(target, job.id), job)
+                logger.warning(f"♻️ Reclaimed expired job {job.id} → {target.value}")
+
+    def _claim_sync(self, worker_id: str) -> Optional[CampaignJobData]:
+        self._reclaim_expired_sync()
+
+        queued = sorted(
+            self._dirs[JobStatus.QUEUED].glob("*.json"),
+            key=lambda p: self._mtime(p) or datetime.min
+        )
+        for path in queued:
+            job_id = path.stem
+            claim_path = self._private_path(job_id)
+            try:
+                os.rename(path, claim_path)
+            except FileNotFoundError:
+                continue  # Another worker got there first
+
+            job = self._read(claim_path)
+            if not job:
+                continue
+
+            now = datetime.now()
+            job.status = JobStatus.RUNNING
+            job.worker_id = worker_id
+            job.attempts += 1
+            job.started_at = now
+            job.heartbeat_at = now
+
+            # The job becomes visible in running/ only with its new owner and lease
+            self._write(claim_path, job)
+            os.rename(claim_path, self._path(JobStatus.RUNNING, job_id))
+            return job
+
+        return None
+
+    def _private_path(self, job_id: str) -> Path:
+        """A ``running/`` path no other worker claims or reclaims until it goes stale"""
+        return self._dirs[JobStatus.RUNNING] / f"{job_id}.{uuid.uuid4().hex}.claim"
+
+    def _heartbeat_sync(self, job_id: str, worker_id: str) -> bool:
+        path = self._path(JobStatus.RUNNING, job_id)
+        job = self._read(path)
+        if not job or job.worker_id != worker_id:
+            return False
+
+        # Extend the lease by touching the file (never recreating it), so a job
+        # reclaimed in the meantime is not resurrected in running/
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _finish_sync(
+        self,
+        job_id: str,
+        worker_id: str,
+        target: JobStatus,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ) -> None:
+        running_path = self._path(JobStatus.RUNNING, job_id)
+        job = self._read(running_path)
+        if not job or job.worker_id != worker_id:
+            raise JobLeaseLost(f"Job {job_id} is no longer owned by {worker_id}")
+
+        # Take the job out of running/ first, so it cannot be reclaimed (or
+        # resurrected by this write) while it is being finished
+        private_path = self._private_path(job_id)
+        try:
+            os.rename(running_path, private_path)
+        except FileNotFoundError:
+            raise JobLeaseLost(f"Job {job_id} is no longer owned by {worker_id}")
+
+        job = self._read(private_path)
+        if not job or job.worker_id != worker_id:
+            os.rename(private_path, running_path)
+            raise JobLeaseLost(f"Job {job_id} is no longer owned by {worker_id}")
+
+        job.status = target
+        job.result = result
+        job.error = error
+        if target != JobStatus.QUEUED:
+            job.completed_at = datetime.now()
+
+        self._write(private_path, job)
+        os.rename(private_path, self._path(target, job_id))
+
+    def _get_job_sync(self, job_id: str) -> Optional[CampaignJobData]:
+        for status in JobStatus:
+            job = self._read(self._path(status, job_id))
+            if job:
+                return job
+        return None
+
+    async def enqueue(self, job_id: str, campaign_id: str, payload: Dict[str, Any]) -> CampaignJobData:
+        job = await asyncio.to_thread(self._enqueue_sync, job_id, campaign_id, payload)
+        logger.info(f"📥 Job enqueued: {job_id}")
+        return job
+
+    async def claim(self, worker_id: str) -> Optional[CampaignJobData]:
+        return await asyncio.to_thread(self._claim_sync, worker_id)
+
+    async def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        return await asyncio.to_thread(self._heartbeat_sync, job_id, worker_id)
+
+    async def complete(self, job_id: str, worker_id: str, result: Optional[Dict[str, Any]] = None) -> None:
+        await asyncio.to_thread(self._finish_sync, job_id, worker_id, JobStatus.COMPLETED, result)
+        logger.info(f"✅ Job completed: {job_id}")
+
+    async def fail(self, job_id: str, worker_id: str, error: str, retry: bool = True) -> None:
+        job = await self.get_job(job_id)
+        target = JobStatus.QUEUED if retry and job and job.can_retry else JobStatus.FAILED
+        await asyncio.to_thread(self._finish_sync, job_id, worker_id, target, None, error)
+        logger.warning(f"⚠️ Job {job_id} failed ({error}) → {target.value}")
+
+    async def get_job(self, job_id: str) -> Optional[CampaignJobData]:
+        return await asyncio.to_thread(self._get_job_sync, job_id)
+
+
+# ================================
+# POSTGRES BACKEND
+# ================================
+
+class PostgresJobQueue(JobQueue):
+    """
+    Postgres-backed queue using the ``campaign_jobs`` table.
+
+    Workers claim with ``SELECT ... FOR UPDATE SKIP LOCKED`` so any number of
+    worker processes can pull from the same table without blocking each other.
+    """
+
+    def __init__(self, db_config=None, **kwargs):
+        super().__init__(**kwargs)
+        from config.database import DatabaseConfig
+
+        self.db_config = db_config or DatabaseConfig()
+        self._tables_ready = False
+
+    async def _ensure_tables(self) -> None:
+        if not self._tables_ready:
+            await self.db_config.create_tables()
+            self._tables_ready = True
+
+    @staticmethod
+    def _to_data(record) -> CampaignJobData:
+        return CampaignJobData(
+            id=record.id,
+            campaign_id=record.campaign_id,
+            payload=record.payload or {},
+            status=JobStatus(record.status),
+            attempts=record.attempts,
+            max_attempts=record.max_attempts,
+            worker_id=record.worker_id,
+            result=record.result,
+            error=record.error,
+            enqueued_at=record.enqueued_at or datetime.now(),
+            started_at=record.started_at,
+            heartbeat_at=record.heartbeat_at,
+            completed_at=record.completed_at
+        )
+
+    async def enqueue(self, job_id: str, campaign_id: str, payload: Dict[str, Any]) -> CampaignJobData:
+        from models.database_models import CampaignJob
+        await self._ensure_tables()
+
+        async with self.db_config.AsyncSessionLocal() as session:
+            record = CampaignJob(
+                id=job_id,
+                campaign_id=campaign_id,
+                payload=payload,
+                status=JobStatus.QUEUED.value,
+                attempts=0,
+                max_attempts=self.max_attempts
+            )
+            session.add(record)
+            await session.commit()
+            await session.refresh(record)
+            logger.info(f"📥 Job enqueued: {job_id}")
+            return self._to_data(record)
+
+    async def claim(self, worker_id: str) -> Optional[CampaignJobData]:
+        from sqlalchemy import select, update, or_, and_, func
+        from models.database_models import CampaignJob
+        await self._ensure_tables()
+
+        lease_cutoff = func.now() - timedelta(seconds=self.lease_seconds)
+
+        async with self.db_config.AsyncSessionLocal() as session:
+            async with session.begin():
+                # Jobs that ran out of attempts while their lease expired are failed for good
+                await session.execute(
+                    update(CampaignJob)
+                    .where(
+                        CampaignJob.status == JobStatus.RUNNING.value,
+                        CampaignJob.heartbeat_at < lease_cutoff,
+                        CampaignJob.attempts >= CampaignJob.max_attempts
+                    )
+                    .values(
+                        status=JobStatus.FAILED.value,
+                        error="Lease expired and no attempts left",
+                        completed_at=func.now()
+                    )
+                )
+
+                result = await session.execute(
+                    select(CampaignJob)
+                    .where(or_(
+                        CampaignJob.status == JobStatus.QUEUED.value,
+                        and_(
+                            CampaignJob.status == JobStatus.RUNNING.value,
+                            CampaignJob.heartbeat_at < lease_cutoff
+                        )
+                    ))
+                    .order_by(CampaignJob.enqueued_at)
+                    .limit(1)
+                    .with_for_update(skip_locked=True)
+                )
+                record = result.scalar_one_or_none()
+                if not record:
+                    return None
+
+                if record.status == JobStatus.RUNNING.value:
+                    logger.warning(f"♻️ Reclaiming expired job {record.id} from worker {record.worker_id}")
+
+                record.status = JobStatus.RUNNING.value
+                record.worker_id = worker_id
+                record.attempts = (record.attempts or 0) + 1
+                record.started_at = func.now()
+                record.heartbeat_at = func.now()
+
+            await session.refresh(record)
+            return self._to_data(record)
+
+    async def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        from sqlalchemy import update, func
+        from models.database_models import CampaignJob
+
+        async with self.db_config.AsyncSessionLocal() as session:
+            result = await session.execute(
+                update(CampaignJob)
+                .where(
+                    CampaignJob.id == job_id,
+                    CampaignJob.worker_id == worker_id,
+                    CampaignJob.status == JobStatus.RUNNING.value
+                )
+                .values(heartbeat_at=func.now())
+            )
+            await session.commit()
+            return result.rowcount > 0
+
+    async def _finish(
+        self,
+        job_id: str,
+        worker_id: str,
+        target: JobStatus,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ) -> None:
+        from sqlalchemy import update, func
+        from models.database_models import CampaignJob
+
+        values = {"status": target.value, "result": result, "error": error}
+        if target != JobStatus.QUEUED:
+            values["completed_at"] = func.now()
+
+        async with self.db_config.AsyncSessionLocal() as session:
+            updated = await session.execute(
+                update(CampaignJob)
+                .where(
+                    CampaignJob.id == job_id,
+                    CampaignJob.worker_id == worker_id,
+                    CampaignJob.status == JobStatus.RUNNING.value
+                )
+                .values(**values)
+            )
+            await session.commit()
+            if updated.rowcount == 0:
+                raise JobLeaseLost(f"Job {job_id} is no longer owned by {worker_id}")
+
+    async def complete(self, job_id: str, worker_id: str, result: Optional[Dict[str, Any]] = None) -> None:
+        await self._finish(job_id, worker_id, JobStatus.COMPLETED, result=result)
+        logger.info(f"✅ Job completed: {job_id}")
+
+    async def fail(self, job_id: str, worker_id: str, error: str, retry: bool = True) -> None:
+        job = await self.get_job(job_id)
+        target = JobStatus.QUEUED if retry and job and job.can_retry else JobStatus.FAILED
+        await self._finish(job_id, worker_id, target, error=error)
+        logger.warning(f"⚠️ Job {job_id} failed ({error}) → {target.value}")
+
+    async def get_job(self, job_id: str) -> Optional[CampaignJobData]:
+        from models.database_models import CampaignJob
+        await self._ensure_tables()
+
+        async with self.db_config.AsyncSessionLocal() as session:
+            record = await session.get(CampaignJob, job_id)
+            return self._to_data(record) if record else None
+
+    async def close(self) -> None:
+        await self.db_config.close()
+
+
+def create_job_queue(backend: Optional[str] = None, db_config=None, **kwargs) -> JobQueue:
+    """Create the job queue configured by ``settings.job_queue_backend``"""
+    backend = (backend or settings.job_queue_backend).lower()
+
+    if backend == "postgres":
+        return PostgresJobQueue(db_config=db_config, **kwargs)
+    if backend == "local":
+        return LocalFileJobQueue(**kwargs)
+
+    raise ValueError(f"Unknown job queue backend: {backend}")
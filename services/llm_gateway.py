@@ -0,0 +1,440 @@
+# services/llm_gateway.py - ASYNC LLM GATEWAY
+"""
+Async gateway for Groq chat completions.
+
+Every LLM call from the orchestrators goes through one ``LLMGateway`` per
+process so that:
+
+- calls run on ``AsyncGroq`` and never block the event loop
+- identical prompts that are already in flight share one request
+- responses are cached by prompt hash for ``llm_cache_ttl_seconds``
+- each model has its own concurrency limit (``llm_max_concurrency_per_model``)
+
+Credential validation is a cached health probe (``check_health``) refreshed in
+the background, so constructing an orchestrator never touches the network.
+"""
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple, Type, TypeVar, Callable, Awaitable
+
+from pydantic import BaseModel, ValidationError
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+# Import async Groq client
+try:
+    from groq import AsyncGroq
+    GROQ_AVAILABLE = True
+except ImportError:
+    GROQ_AVAILABLE = False
+    logger.warning("⚠️ Groq not available - LLM gateway disabled")
+
+
+class LLMGateway:
+    """
+    🧠 ASYNC LLM GATEWAY
+
+    ``complete()`` returns the message content of a single-turn chat
+    completion. Failures propagate to the caller; they are never cached.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache_ttl_seconds: Optional[float] = None,
+        max_cache_entries: Optional[int] = None,
+        max_concurrency_per_model: Optional[int] = None
+    ):
+        api_key = api_key or settings.groq_api_key
+        self.client = AsyncGroq(api_key=api_key) if GROQ_AVAILABLE and api_key else None
+
+        self.cache_ttl_seconds = cache_ttl_seconds if cache_ttl_seconds is not None else settings.llm_cache_ttl_seconds
+        self.max_cache_entries = max_cache_entries or settings.llm_cache_max_entries
+        self.max_concurrency_per_model = max_concurrency_per_model or settings.llm_max_concurrency_per_model
+
+        self._cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.stats = {"requests": 0, "cache_hits": 0, "coalesced": 0, "api_calls": 0, "early_returns": 0, "errors": 0}
+
+        # Credential health probe
+        self.health_ttl_seconds = settings.llm_health_ttl_seconds
+        self._health: Optional[Dict[str, Any]] = None
+        self._health_checked_at = 0.0
+        self._health_task: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def available(self) -> bool:
+        """True when an API client is configured"""
+        return self.client is not None
+
+    @property
+    def ai_enabled(self) -> bool:
+        """True unless the client is missing or the last probe rejected the credentials"""
+        return self.available and self.credentials_valid is not False
+
+    @property
+    def credentials_valid(self) -> Optional[bool]:
+        """Result of the last credential probe (None until one has run)"""
+        if not self._health:
+            return None
+        return self._health["status"] != "invalid_credentials"
+
+    @staticmethod
+    def _prompt_key(model: str, prompt: str, temperature: float, max_tokens: int) -> str:
+        raw = f"{model}\x00{temperature}\x00{max_tokens}\x00{prompt}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _semaphore(self, model: str) -> asyncio.Semaphore:
+        if model not in self._semaphores:
+            self._semaphores[model] = asyncio.Semaphore(self.max_concurrency_per_model)
+        return self._semaphores[model]
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, content = entry
+        if expires_at < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return content
+
+    def _cache_put(self, key: str, content: str) -> None:
+        if self.cache_ttl_seconds <= 0:
+            return
+        self._cache[key] = (time.monotonic() + self.cache_ttl_seconds, content)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_cache_entries:
+            self._cache.popitem(last=False)
+
+    async def complete(
+        self,
+        prompt: str,
+        model: str,
+        max_tokens: int,
+        temperature: float = 0.3,
+        use_cache: bool = True
+    ) -> str:
+        """Run a single-prompt chat completion and return the message content"""
+        key = self._prompt_key(model, prompt, temperature, max_tokens)
+        return await self._run(key, lambda: self._call(prompt, model, max_tokens, temperature), use_cache)
+
+    async def complete_json(
+        self,
+        prompt: str,
+        schema: Type[SchemaT],
+        model: str,
+        max_tokens: int,
+        temperature: float = 0.3,
+        use_cache: bool = True
+    ) -> SchemaT:
+        """
+        Stream a completion and return the first JSON object in it, validated against ``schema``.
+
+        The stream is closed at the object's closing brace (or as soon as every
+        required field of the schema has arrived), so neither trailing optional
+        fields nor prose are waited for. Raises ``ValueError`` if no valid
+        object is produced.
+        """
+        key = self._prompt_key(model, f"{schema.__name__}\x00{prompt}", temperature, max_tokens)
+        return await self._run(key, lambda: self._call_json(prompt, schema, model, max_tokens, temperature), use_cache)
+
+    async def _run(self, key: str, call: Callable[[], Awaitable[Any]], use_cache: bool) -> Any:
+        """Serve from cache, join an identical in-flight request, or start a new one"""
+        if not self.client:
+            raise RuntimeError("Groq client not configured")
+
+        self.stats["requests"] += 1
+
+        if use_cache:
+            cached = self._cache_get(key)
+            if cached is not None:
+                self.stats["cache_hits"] += 1
+                return cached
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._call_and_cache(key, call))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _, key=key: self._in_flight.pop(key, None))
+        else:
+            self.stats["coalesced"] += 1
+
+        # Shield so one cancelled caller doesn't cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def _call_and_cache(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            result = await call()
+        except Exception as e:
+            self.stats["errors"] += 1
+            if _is_auth_error(e):
+                logger.error("🔑 Groq API key invalid - disabling AI features until the next health probe")
+                self._set_health("invalid_credentials", str(e))
+            raise
+
+        self._cache_put(key, result)
+        return result
+
+    async def _call(self, prompt: str, model: str, max_tokens: int, temperature: float) -> str:
+        async with self._semaphore(model):
+            self.stats["api_calls"] += 1
+            response = await self.client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+
+        return response.choices[0].message.content
+
+    async def _call_json(
+        self,
+        prompt: str,
+        schema: Type[SchemaT],
+        model: str,
+        max_tokens: int,
+        temperature: float
+    ) -> SchemaT:
+        extractor = StreamingJSONExtractor(schema)
+
+        async with self._semaphore(model):
+            self.stats["api_calls"] += 1
+            stream = await self.client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+            try:
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    result = extractor.feed(chunk.choices[0].delta.content or "")
+                    if result is not None:
+                        if not extractor.done:
+                            self.stats["early_returns"] += 1
+                        return result
+            finally:
+                await stream.close()
+
+        return extractor.finish()
+
+    # ================================
+    # CREDENTIAL HEALTH PROBE
+    # ================================
+
+    async def check_health(self, force: bool = False) -> Dict[str, Any]:
+        """Cached credential status; probes the API only when the cached result is older than the TTL"""
+        if not self.client:
+            return {"status": "not_configured", "type": "groq"}
+
+        fresh = self._health and time.monotonic() - self._health_checked_at < self.health_ttl_seconds
+        if fresh and not force:
+            return self._health
+
+        # Concurrent callers share one probe
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.create_task(self._probe())
+        return await asyncio.shield(self._health_task)
+
+    async def _probe(self) -> Dict[str, Any]:
+        """Validate the key with a model listing - no tokens are spent"""
+        try:
+            await asyncio.wait_for(self.client.models.list(), timeout=10)
+            return self._set_health("healthy")
+        except Exception as e:
+            if _is_auth_error(e):
+                logger.error("🔑 Groq API key is invalid or expired")
+                logger.error("💡 Get a new key from: https://console.groq.com/keys")
+                return self._set_health("invalid_credentials", str(e))
+            if "quota" in str(e).lower() or "limit" in str(e).lower():
+                logger.warning("📊 Groq API quota exceeded or rate limited")
+                return self._set_health("rate_limited", str(e))
+            logger.warning(f"🔧 Groq health probe failed: {e}")
+            return self._set_health("unhealthy", str(e))
+
+    def _set_health(self, status: str, error: Optional[str] = None) -> Dict[str, Any]:
+        self._health = {"status": status, "type": "groq"}
+        if error:
+            self._health["error"] = error[:100]
+        self._health_checked_at = time.monotonic()
+        return self._health
+
+    def start_health_refresh(self) -> Optional[asyncio.Task]:
+        """Probe now and then every ``health_ttl_seconds`` in the background"""
+        if self.client and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+        return self._refresh_task
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await self.check_health(force=True)
+            await asyncio.sleep(self.health_ttl_seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters for the monitoring API"""
+        return {
+            **self.stats,
+            "available": self.available,
+            "credentials": self._health["status"] if self._health else "unchecked",
+            "cached_responses": len(self._cache),
+            "in_flight": len(self._in_flight)
+        }
+
+    async def close(self) -> None:
+        """Stop the health refresh and close the underlying HTTP client"""
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+        if self.client:
+            await self.client.close()
+
+
+class StreamingJSONExtractor:
+    """
+    Incremental parser for the first top-level JSON object in streamed text.
+
+    Text before the opening brace is skipped. Each top-level member is decoded
+    as soon as its trailing comma (or the closing brace) arrives. ``feed``
+    returns the model at the closing brace, or earlier once every required
+    field of the schema is present and validates; optional fields that have
+    arrived by then are filled in, later ones keep their defaults. A member
+    that fails to decode is dropped rather than failing the whole object.
+    """
+
+    def __init__(self, schema: Type[BaseModel]):
+        self.schema = schema
+        self.required_fields = {name for name, field in schema.model_fields.items() if field.is_required()}
+        self.fields: Dict[str, Any] = {}
+        self.done = False
+
+        self._member: List[str] = []
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text: str) -> Optional[BaseModel]:
+        """Consume a chunk; returns the validated model once it is available"""
+        if self.done:
+            return None
+
+        for ch in text:
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                self._member.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+
+            if self._depth == 0:
+                # Closing brace of the object - anything after it is ignored
+                self._close_member()
+                self.done = True
+                return self.finish()
+
+            if self._depth == 1 and ch == ",":
+                self._close_member()
+                if self.required_fields.issubset(self.fields):
+                    result = self._try_validate()
+                    if result is not None:
+                        return result
+                continue
+
+            self._member.append(ch)
+
+        return None
+
+    def finish(self) -> BaseModel:
+        """Validate what has been collected once the stream has ended"""
+        self._close_member()
+        if not self.fields:
+            raise ValueError("No JSON object found in LLM response")
+        try:
+            return self.schema.model_validate(self.fields)
+        except ValidationError as e:
+            raise ValueError(f"LLM response failed {self.schema.__name__} validation: {e}") from e
+
+    def _close_member(self) -> None:
+        member = "".join(self._member).strip()
+        self._member = []
+        if not member:
+            return
+        try:
+            self.fields.update(json.loads("{" + member + "}"))
+        except json.JSONDecodeError:
+            logger.debug(f"Skipping malformed JSON member: {member[:50]}")
+
+    def _try_validate(self) -> Optional[BaseModel]:
+        try:
+            return self.schema.model_validate(self.fields)
+        except ValidationError:
+            return None
+
+
+def parse_json_items(text: str) -> List[Any]:
+    """
+    Parse the JSON array in an LLM response item by item.
+
+    Prose around the array is ignored. An item that fails to parse is skipped
+    (the caller falls back for that item only) instead of failing the batch.
+    """
+    start = text.find("[")
+    if start == -1:
+        return []
+
+    decoder = json.JSONDecoder()
+    items: List[Any] = []
+    position = start + 1
+
+    while position < len(text):
+        # Skip separators and whitespace between items
+        while position < len(text) and text[position] in " \t\r\n,":
+            position += 1
+        if position >= len(text) or text[position] == "]":
+            break
+
+        try:
+            item, position = decoder.raw_decode(text, position)
+            items.append(item)
+        except json.JSONDecodeError:
+            # Resynchronise on the next object
+            next_object = text.find("{", position + 1)
+            if next_object == -1:
+                break
+            position = next_object
+
+    return items
+
+
+def _is_auth_error(error: Exception) -> bool:
+    return "401" in str(error) or "Unauthorized" in str(error) or "invalid_api_key" in str(error)
@@ -0,0 +1,467 @@
+# services/status_poller.py - MULTIPLEXED CONVERSATION STATUS POLLER
+"""
+One poller for every in-flight conversation.
+
+Instead of a task and a sleep loop per conversation, ``ConversationStatusPoller``
+keeps a min-heap of next-poll deadlines across all tracked conversations. A
+single scheduler task pops whatever is due and hands it to a small, fixed pool
+of fetch workers, so monitoring a thousand calls costs ``workers + 1`` tasks
+and at most ``workers`` concurrent status requests.
+
+Poll spacing follows ``PollSchedule``: fast right after the call starts (to
+catch calls that never connect), backing off mid-call, and concentrated in the
+window where the call is expected to end. That window comes from
+``CallDurationStats`` - percentiles of observed call durations per ElevenLabs
+agent and creator tier - and falls back to ``expected_call_duration_seconds``
+until enough calls have been seen. A post-call webhook delivered to the
+conversation registry resolves the conversation immediately, whatever its
+next poll time.
+"""
+import math
+import heapq
+import bisect
+import asyncio
+import itertools
+import logging
+from collections import deque
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable, Iterable, Deque
+
+from config.settings import settings
+from services.conversation_events import (
+    ConversationCompletionRegistry,
+    get_conversation_registry,
+    safety_poll_interval
+)
+
+logger = logging.getLogger(__name__)
+
+StatusFetcher = Callable[[str], Awaitable[Optional[Dict[str, Any]]]]
+
+# (agent_id, creator tier) - either part may be None for the coarser fallbacks
+DurationKey = Tuple[Optional[str], Optional[str]]
+
+
+class CallDurationStats:
+    """
+    📈 OBSERVED CALL DURATIONS
+
+    Rolling sample (``status_poll_duration_samples``) of completed-call
+    durations per (agent, creator tier). ``window()`` returns the percentile
+    range where calls like this one usually end, falling back to the agent's
+    calls and then to all calls while a key has too few samples.
+    """
+
+    def __init__(
+        self,
+        max_samples: Optional[int] = None,
+        min_samples: Optional[int] = None,
+        low_percentile: Optional[float] = None,
+        high_percentile: Optional[float] = None
+    ):
+        self.max_samples = max_samples or settings.status_poll_duration_samples
+        self.min_samples = min_samples or settings.status_poll_min_duration_samples
+        self.low_percentile = low_percentile if low_percentile is not None else settings.status_poll_window_low_percentile
+        self.high_percentile = high_percentile if high_percentile is not None else settings.status_poll_window_high_percentile
+
+        self._samples: Dict[DurationKey, Deque[float]] = {}
+        self._sorted: Dict[DurationKey, List[float]] = {}
+
+    def record(self, agent_id: Optional[str], tier: Optional[str], duration_seconds: float) -> None:
+        """Add one completed call's duration"""
+        if not duration_seconds or duration_seconds <= 0:
+            return
+        for key in ((agent_id, tier), (agent_id, None), (None, None)):
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.max_samples)
+            samples.append(float(duration_seconds))
+            self._sorted.pop(key, None)
+
+    def record_call(
+        self,
+        agent_id: Optional[str],
+        tier: Optional[str],
+        conversation_data: Dict[str, Any],
+        observed_seconds: float
+    ) -> None:
+        """Record a completed call, preferring the provider's own duration over our observed one"""
+        metadata = conversation_data.get("metadata") or {}
+        self.record(agent_id, tier, metadata.get("call_duration_secs") or observed_seconds)
+
+    def seed(self, samples: Iterable[Tuple[Optional[str], Optional[str], float]]) -> int:
+        """Load historical (agent_id, tier, seconds) samples, e.g. from the negotiations table"""
+        count = 0
+        for agent_id, tier, duration_seconds in samples:
+            self.record(agent_id, tier, duration_seconds)
+            count += 1
+        return count
+
+    def window(self, agent_id: Optional[str], tier: Optional[str]) -> Optional[Tuple[float, float]]:
+        """(low, high) percentile durations for the most specific key with enough samples"""
+        for key in ((agent_id, tier), (agent_id, None), (None, None)):
+            samples = self._samples.get(key)
+            if samples and len(samples) >= self.min_samples:
+                return self._percentile(key, self.low_percentile), self._percentile(key, self.high_percentile)
+        return None
+
+    def _percentile(self, key: DurationKey, percentile: float) -> float:
+        ordered = self._sorted.get(key)
+        if ordered is None:
+            ordered = self._sorted[key] = sorted(self._samples[key])
+        return ordered[min(int(percentile * len(ordered)), len(ordered) - 1)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            f"{agent_id or '*'}/{tier or '*'}": {
+                "samples": len(samples),
+                "window": self.window(agent_id, tier) if len(samples) >= self.min_samples else None
+            }
+            for (agent_id, tier), samples in self._samples.items()
+        }
+
+
+_duration_stats: Optional[CallDurationStats] = None
+
+
+def get_call_duration_stats() -> CallDurationStats:
+    """Process-wide duration statistics shared by every poller"""
+    global _duration_stats
+    if _duration_stats is None:
+        _duration_stats = CallDurationStats()
+    return _duration_stats
+
+
+class PollSchedule:
+    """
+    ⏱️ ADAPTIVE POLL SPACING
+
+    For a call expected to end within ``(window_start, window_end)`` seconds:
+
+    - ``elapsed < early_seconds``: ``min_interval`` (failed/unanswered calls end fast)
+    - before the window: half the time left until it opens, capped at ``max_interval``
+    - inside the window: about ``window_polls`` polls spread across it
+    - beyond it (call running long): back off again towards ``max_interval``
+
+    Without a learned window, ``near_end_ratio``–``overrun_ratio`` × the
+    expected duration is used.
+    """
+
+    def __init__(
+        self,
+        min_interval: Optional[float] = None,
+        max_interval: Optional[float] = None,
+        early_seconds: Optional[float] = None,
+        expected_duration: Optional[float] = None,
+        window_polls: Optional[int] = None,
+        near_end_ratio: float = 0.8,
+        overrun_ratio: float = 1.5
+    ):
+        self.min_interval = min_interval or settings.status_poll_min_seconds
+        # With webhooks on, polling is a safety net and may back off further
+        self.max_interval = max(
+            max_interval or safety_poll_interval(settings.status_poll_max_seconds),
+            self.min_interval
+        )
+        self.early_seconds = early_seconds if early_seconds is not None else settings.status_poll_early_seconds
+        self.expected_duration = expected_duration or settings.expected_call_duration_seconds
+        self.window_polls = window_polls or settings.status_poll_window_polls
+        self.near_end_ratio = near_end_ratio
+        self.overrun_ratio = overrun_ratio
+
+    def default_window(self) -> Tuple[float, float]:
+        return self.expected_duration * self.near_end_ratio, self.expected_duration * self.overrun_ratio
+
+    def interval(self, elapsed: float, window: Optional[Tuple[float, float]] = None) -> float:
+        """Seconds until the next poll of a call that has been running ``elapsed`` seconds"""
+        window_start, window_end = window or self.default_window()
+
+        if elapsed < self.early_seconds:
+            return self.min_interval
+        if elapsed < window_start:
+            # Never sleep past the start of the window
+            return max(self.min_interval, min(self.max_interval, (window_start - elapsed) / 2))
+        if elapsed < window_end:
+            return max(self.min_interval, min(self.max_interval, (window_end - window_start) / self.window_polls))
+        return min(self.max_interval, self.min_interval + (elapsed - window_end) / 2)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (bucket upper bounds in milliseconds)"""
+
+    BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self, buckets_ms: Tuple[float, ...] = BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self.counts = [0] * (len(buckets_ms) + 1)
+        self.total_ms = 0.0
+
+    def observe(self, seconds: float) -> None:
+        milliseconds = seconds * 1000
+        self.counts[bisect.bisect_left(self.buckets_ms, milliseconds)] += 1
+        self.total_ms += milliseconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        count = sum(self.counts)
+        labels = [f"le_{bound}ms" for bound in self.buckets_ms] + ["gt_max"]
+        return {
+            "count": count,
+            "mean_ms": round(self.total_ms / count, 1) if count else None,
+            "buckets": dict(zip(labels, self.counts))
+        }
+
+
+class _Watch:
+    """One tracked conversation, shared by everyone tracking its id"""
+    __slots__ = ("conversation_id", "future", "started_at", "deadline", "window", "next_poll_at", "polls", "watchers")
+
+    def __init__(self, conversation_id: str, future: asyncio.Future, started_at: float, deadline: float, window: Optional[Tuple[float, float]]):
+        self.conversation_id = conversation_id
+        self.future = future
+        self.started_at = started_at
+        self.deadline = deadline
+        self.window = window
+        self.next_poll_at: Optional[float] = None
+        self.polls = 0
+        self.watchers = 1
+
+
+class ConversationStatusPoller:
+    """
+    🔁 MULTIPLEXED STATUS POLLER
+
+    ``track()`` returns a future that resolves with the terminal status data
+    (from a poll or the webhook), or ``None`` when the conversation's deadline
+    passes first (no deadline when ``timeout`` is None - the caller enforces
+    its own). ``is_terminal`` decides which polled statuses end tracking.
+    Tracking an id that is already tracked shares its future; every
+    ``track()`` is paired with an ``untrack()`` and the conversation is only
+    dropped when the last watcher leaves. Tasks are started lazily inside the
+    running event loop.
+    """
+
+    def __init__(
+        self,
+        fetch_status: StatusFetcher,
+        is_terminal: Callable[[Dict[str, Any]], bool],
+        workers: Optional[int] = None,
+        schedule: Optional[PollSchedule] = None,
+        registry: Optional[ConversationCompletionRegistry] = None,
+        duration_stats: Optional[CallDurationStats] = None
+    ):
+        self.fetch_status = fetch_status
+        self.is_terminal = is_terminal
+        self.workers = workers or settings.status_poll_workers
+        self.schedule = schedule or PollSchedule()
+        self.registry = registry or get_conversation_registry()
+        self.duration_stats = duration_stats or get_call_duration_stats()
+
+        self._watches: Dict[str, _Watch] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+        self._due: Optional[asyncio.Queue] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.stats = {
+            "polls": 0,
+            "poll_errors": 0,
+            "resolved_by_poll": 0,
+            "resolved_by_webhook": 0,
+            "timeouts": 0
+        }
+        self.latency = LatencyHistogram()
+
+    # ================================
+    # PUBLIC API
+    # ================================
+
+    def track(
+        self,
+        conversation_id: str,
+        timeout: Optional[float],
+        duration_key: Optional[DurationKey] = None
+    ) -> asyncio.Future:
+        """
+        Start polling a conversation; returns the future for its terminal status.
+
+        ``duration_key`` (agent_id, creator tier) picks the learned window in
+        which polls are concentrated.
+        """
+        self._ensure_started()
+
+        now = self._loop.time()
+        deadline = now + timeout if timeout is not None else math.inf
+
+        watch = self._watches.get(conversation_id)
+        if watch is not None:
+            watch.watchers += 1
+            watch.deadline = max(watch.deadline, deadline)
+            return watch.future
+
+        window = self.duration_stats.window(*duration_key) if duration_key else None
+        watch = _Watch(conversation_id, self._loop.create_future(), now, deadline, window)
+        self._watches[conversation_id] = watch
+        self._schedule(watch, now)
+
+        # A webhook (possibly already delivered) short-circuits polling
+        self.registry.watch(conversation_id).add_done_callback(
+            lambda pushed: self._on_pushed(watch, pushed)
+        )
+        return watch.future
+
+    async def wait(
+        self,
+        conversation_id: str,
+        timeout: float,
+        duration_key: Optional[DurationKey] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Terminal status data for a conversation, or None on timeout"""
+        future = self.track(conversation_id, timeout, duration_key)
+        try:
+            # Each waiter keeps its own timeout; the shared watch lives until the longest one
+            status_data = await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            status_data = None
+        finally:
+            self.untrack(conversation_id)
+
+        if status_data is None:
+            self.stats["timeouts"] += 1
+        return status_data
+
+    def untrack(self, conversation_id: str) -> None:
+        """Leave a conversation; the last watcher stops its polling (its heap entry is dropped lazily)"""
+        watch = self._watches.get(conversation_id)
+        if watch is None:
+            return
+        watch.watchers -= 1
+        if watch.watchers > 0:
+            return
+
+        del self._watches[conversation_id]
+        if not watch.future.done():
+            watch.future.cancel()
+        self.registry.release(conversation_id)
+
+    @property
+    def tracked(self) -> int:
+        """Conversations still being polled"""
+        return len([watch for watch in self._watches.values() if not watch.future.done()])
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "tracked": self.tracked,
+            "workers": self.workers,
+            "queued": self._due.qsize() if self._due else 0,
+            "poll_latency": self.latency.to_dict()
+        }
+
+    async def close(self) -> None:
+        """Cancel the scheduler and workers and drop every watch"""
+        self._drop_watches()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._heap = []
+        self._loop = None
+
+    # ================================
+    # SCHEDULING
+    # ================================
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._tasks:
+            return
+
+        # First use, or a new event loop: state from an old loop is unusable
+        self._drop_watches()
+        self._heap = []
+        self._loop = loop
+        self._due = asyncio.Queue()
+        self._wakeup = asyncio.Event()
+        self._tasks = [loop.create_task(self._scheduler())]
+        self._tasks.extend(loop.create_task(self._worker()) for _ in range(self.workers))
+        logger.info(f"🔁 Status poller started ({self.workers} workers)")
+
+    def _drop_watches(self) -> None:
+        for watch in self._watches.values():
+            if not watch.future.done() and not watch.future.get_loop().is_closed():
+                watch.future.cancel()
+            for _ in range(watch.watchers):
+                self.registry.release(watch.conversation_id)
+        self._watches.clear()
+
+    def _schedule(self, watch: _Watch, now: float) -> None:
+        interval = self.schedule.interval(now - watch.started_at, watch.window)
+        watch.next_poll_at = min(now + interval, watch.deadline)
+        heapq.heappush(self._heap, (watch.next_poll_at, next(self._sequence), watch.conversation_id))
+        if self._heap[0][0] == watch.next_poll_at:
+            self._wakeup.set()
+
+    async def _scheduler(self) -> None:
+        """Pop due conversations off the heap and queue them for the workers"""
+        while True:
+            now = self._loop.time()
+
+            while self._heap and self._heap[0][0] <= now:
+                poll_at, _, conversation_id = heapq.heappop(self._heap)
+                watch = self._watches.get(conversation_id)
+                if watch is None or watch.future.done() or watch.next_poll_at != poll_at:
+                    continue  # untracked, finished or rescheduled - stale entry
+
+                if now >= watch.deadline:
+                    self._finish(watch, None)
+                    continue
+
+                watch.next_poll_at = None  # in flight
+                self._due.put_nowait(watch)
+
+            self._wakeup.clear()
+            timeout = self._heap[0][0] - now if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _worker(self) -> None:
+        """Fetch statuses for due conversations and dispatch the results"""
+        while True:
+            watch = await self._due.get()
+            if watch.future.done():
+                continue
+
+            started = self._loop.time()
+            try:
+                status_data = await self.fetch_status(watch.conversation_id)
+            except Exception as e:
+                logger.error(f"❌ Status poll failed for {watch.conversation_id}: {e}")
+                self.stats["poll_errors"] += 1
+                status_data = None
+
+            self.latency.observe(self._loop.time() - started)
+            self.stats["polls"] += 1
+            watch.polls += 1
+
+            if watch.future.done() or self._watches.get(watch.conversation_id) is not watch:
+                continue
+
+            if status_data and self.is_terminal(status_data):
+                self.stats["resolved_by_poll"] += 1
+                self._finish(watch, status_data)
+            else:
+                self._schedule(watch, self._loop.time())
+
+    def _on_pushed(self, watch: _Watch, pushed: asyncio.Future) -> None:
+        if pushed.cancelled() or watch.future.done():
+            return
+        self.stats["resolved_by_webhook"] += 1
+        self._finish(watch, pushed.result())
+
+    def _finish(self, watch: _Watch, status_data: Optional[Dict[str, Any]]) -> None:
+        # The watch stays registered until its last watcher untracks it
+        if not watch.future.done():
+            watch.future.set_result(status_data)
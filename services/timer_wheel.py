@@ -0,0 +1,106 @@
+# services/timer_wheel.py - HASHED TIMER WHEEL
+"""
+Hashed timer wheel for large numbers of coarse deadlines.
+
+Scheduling and cancelling a timer are O(1) dict operations, and a single task
+advances the wheel once per ``tick_seconds`` and fires whatever expired in
+that slot. Thousands of per-monitor deadlines therefore cost one task instead
+of one ``asyncio`` timer (or sleeping task) each. Deadlines never fire early
+and at most one tick late, which is fine for minute-scale timeouts.
+"""
+import math
+import asyncio
+import itertools
+import logging
+from typing import Optional, Dict, List, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TimerWheel:
+    """
+    ⏲️ TIMER WHEEL
+
+    ``schedule(delay, callback)`` returns a handle for ``cancel(handle)``.
+    Callbacks are plain functions run on the wheel's task; anything slow
+    should hand off to its own task. The ticking task starts lazily with the
+    first timer and stops when the wheel is empty.
+    """
+
+    def __init__(self, tick_seconds: float = 1.0, slots: int = 512):
+        self.tick_seconds = tick_seconds
+        self.slots = slots
+
+        # slot -> {handle: (rounds remaining, callback)}
+        self._wheel: List[Dict[int, Tuple[int, Callable[[], None]]]] = [dict() for _ in range(slots)]
+        self._slot_of: Dict[int, int] = {}
+        self._handles = itertools.count(1)
+        self._cursor = 0
+        self._next_tick = 0.0  # loop time at which the slot after the cursor fires
+        self._task: Optional[asyncio.Task] = None
+
+        self.fired = 0
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def schedule(self, delay: float, callback: Callable[[], None]) -> int:
+        """Run ``callback`` after ``delay`` seconds (never before, at most one tick after)"""
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done():
+            self._next_tick = loop.time() + self.tick_seconds
+            self._task = loop.create_task(self._run())
+
+        # Count from the next tick, not the cursor - we may be most of a tick past it
+        ticks = max(math.ceil((loop.time() + delay - self._next_tick) / self.tick_seconds), 0) + 1
+        rounds, offset = divmod(ticks - 1, self.slots)
+        slot = (self._cursor + offset + 1) % self.slots
+
+        handle = next(self._handles)
+        self._wheel[slot][handle] = (rounds, callback)
+        self._slot_of[handle] = slot
+        return handle
+
+    def cancel(self, handle: Optional[int]) -> bool:
+        """Drop a timer; False if it already fired or was cancelled"""
+        slot = self._slot_of.pop(handle, None)
+        if slot is None:
+            return False
+        self._wheel[slot].pop(handle, None)
+        return True
+
+    async def close(self) -> None:
+        """Stop ticking and drop every pending timer"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for slot in self._wheel:
+            slot.clear()
+        self._slot_of.clear()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while self._slot_of:
+            await asyncio.sleep(max(self._next_tick - loop.time(), 0))
+            self._next_tick += self.tick_seconds
+            self._cursor = (self._cursor + 1) % self.slots
+            self._advance(self._wheel[self._cursor])
+
+    def _advance(self, slot: Dict[int, Tuple[int, Callable[[], None]]]) -> None:
+        expired = []
+        for handle, (rounds, callback) in list(slot.items()):
+            if rounds > 0:
+                slot[handle] = (rounds - 1, callback)
+            else:
+                del slot[handle]
+                del self._slot_of[handle]
+                expired.append(callback)
+
+        for callback in expired:
+            self.fired += 1
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"❌ Timer callback failed: {e}")
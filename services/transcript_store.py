@@ -0,0 +1,198 @@
+# services/transcript_store.py - CONTENT-ADDRESSED TRANSCRIPT BLOBS
+"""
+Call transcripts stored once, compressed, by content hash.
+
+``negotiations.call_transcript`` and ``outreach_logs.transcript`` used to hold
+the same full transcript as plain text. Transcripts now live in
+``transcript_blobs`` keyed by the SHA-256 of the text, so a transcript shared
+by a negotiation and its outreach log is stored once. Blobs are compressed with
+zstd when ``zstandard`` is installed and zlib otherwise; the codec is recorded
+per blob, so both can be read back. Rows keep only the 64-character reference
+(``call_transcript_ref`` / ``transcript_ref``) and the legacy text columns are
+deferred, so loading negotiations or outreach logs never reads transcript
+bytes.
+
+``migrate_legacy_transcripts`` (run by ``create_tables.py``) adds the
+reference columns to existing tables and moves inline transcripts into blobs.
+"""
+import zlib
+import hashlib
+import logging
+from functools import lru_cache
+from typing import Optional, Dict, Any, Iterable, Set, Tuple
+
+from sqlalchemy import select, update, bindparam, null, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.database_models import TranscriptBlob, Negotiation, OutreachLog
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CODEC_ZSTD = "zstd"
+CODEC_ZLIB = "zlib"
+
+ZSTD_LEVEL = 10
+ZLIB_LEVEL = 6
+
+
+@lru_cache(maxsize=64)
+def compress_transcript(transcript: str) -> Tuple[str, str, bytes]:
+    """``(ref, codec, data)`` for a transcript - cached, as the same text is usually stored twice in a row"""
+    raw = transcript.encode("utf-8")
+    ref = hashlib.sha256(raw).hexdigest()
+    if zstandard is not None:
+        return ref, CODEC_ZSTD, zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    return ref, CODEC_ZLIB, zlib.compress(raw, ZLIB_LEVEL)
+
+
+def decompress_transcript(codec: str, data: bytes) -> str:
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data).decode("utf-8")
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Transcript blob is zstd-compressed - install zstandard to read it")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    raise ValueError(f"Unknown transcript codec '{codec}'")
+
+
+class TranscriptStore:
+    """
+    🗜️ TRANSCRIPT STORE
+
+    ``put`` inside the caller's session, so the blob commits (or rolls back)
+    together with the rows referencing it.
+    """
+
+    async def put(self, session: AsyncSession, transcript: Optional[str]) -> Optional[str]:
+        """Store a transcript (no-op if the same text is already stored) and return its reference"""
+        if not transcript:
+            return None
+
+        ref, codec, data = compress_transcript(transcript)
+        await session.execute(
+            insert(TranscriptBlob)
+            .values(sha256=ref, codec=codec, data=data, raw_size=len(transcript.encode("utf-8")), stored_size=len(data))
+            .on_conflict_do_nothing(index_elements=[TranscriptBlob.sha256])
+        )
+        return ref
+
+    async def put_many(self, session: AsyncSession, transcripts: Iterable[Optional[str]]) -> Dict[str, str]:
+        """Store several transcripts in one statement; returns ``{transcript: ref}``"""
+        refs: Dict[str, str] = {}
+        blobs: Dict[str, Dict[str, Any]] = {}
+        for transcript in transcripts:
+            if not transcript or transcript in refs:
+                continue
+            ref, codec, data = compress_transcript(transcript)
+            refs[transcript] = ref
+            blobs[ref] = {"sha256": ref, "codec": codec, "data": data, "raw_size": len(transcript.encode("utf-8")), "stored_size": len(data)}
+
+        if blobs:
+            await session.execute(
+                insert(TranscriptBlob).values(list(blobs.values()))
+                .on_conflict_do_nothing(index_elements=[TranscriptBlob.sha256])
+            )
+        return refs
+
+    async def get(self, session: AsyncSession, ref: Optional[str]) -> Optional[str]:
+        if not ref:
+            return None
+        return (await self.get_many(session, [ref])).get(ref)
+
+    async def get_many(self, session: AsyncSession, refs: Iterable[str]) -> Dict[str, str]:
+        """Transcripts by reference, in one query"""
+        refs = {ref for ref in refs if ref}
+        if not refs:
+            return {}
+        result = await session.execute(
+            select(TranscriptBlob.sha256, TranscriptBlob.codec, TranscriptBlob.data)
+            .where(TranscriptBlob.sha256.in_(refs))
+        )
+        return {ref: decompress_transcript(codec, data) for ref, codec, data in result.all()}
+
+
+# ================================
+# MIGRATION OF INLINE TRANSCRIPTS
+# ================================
+
+_REFERENCE_COLUMNS = [
+    "ALTER TABLE negotiations ADD COLUMN IF NOT EXISTS call_transcript_ref VARCHAR(64) REFERENCES transcript_blobs (sha256)",
+    "CREATE INDEX IF NOT EXISTS ix_negotiations_call_transcript_ref ON negotiations (call_transcript_ref)",
+    "ALTER TABLE outreach_logs ADD COLUMN IF NOT EXISTS transcript_ref VARCHAR(64) REFERENCES transcript_blobs (sha256)",
+    "CREATE INDEX IF NOT EXISTS ix_outreach_logs_transcript_ref ON outreach_logs (transcript_ref)"
+]
+_reference_columns_ready: Set[str] = set()
+
+
+async def ensure_reference_columns(db_config) -> None:
+    """Add the transcript reference columns to tables created before them (once per process and database)"""
+    if db_config.async_database_url in _reference_columns_ready:
+        return
+    async with db_config.async_engine.begin() as conn:
+        for statement in _REFERENCE_COLUMNS:
+            await conn.execute(text(statement))
+    _reference_columns_ready.add(db_config.async_database_url)
+
+
+async def migrate_legacy_transcripts(db_config, batch_size: int = 500) -> Dict[str, Any]:
+    """
+    Move inline transcripts into blobs, ``batch_size`` rows per transaction.
+
+    Idempotent and resumable: only rows that still have inline text and no
+    reference are touched, and their text is cleared once referenced. Postgres
+    reuses the freed space; ``VACUUM FULL`` returns it to the OS.
+    """
+    engine = db_config.async_engine
+    await ensure_reference_columns(db_config)
+
+    stats: Dict[str, Any] = {"rows": 0, "raw_bytes": 0, "stored_bytes": 0}
+    for table, text_column, ref_column in (
+        (Negotiation.__table__, "call_transcript", "call_transcript_ref"),
+        (OutreachLog.__table__, "transcript", "transcript_ref")
+    ):
+        while True:
+            async with engine.begin() as conn:
+                rows = (await conn.execute(
+                    select(table.c.id, table.c[text_column])
+                    .where(table.c[text_column].isnot(None), table.c[ref_column].is_(None))
+                    .order_by(table.c.id)
+                    .limit(batch_size)
+                )).all()
+                if not rows:
+                    break
+
+                blobs: Dict[str, Dict[str, Any]] = {}
+                references = []
+                for row_id, transcript in rows:
+                    ref, codec, data = compress_transcript(transcript)
+                    raw_size = len(transcript.encode("utf-8"))
+                    references.append({"row_id": row_id, "ref": ref})
+                    stats["raw_bytes"] += raw_size
+                    if ref not in blobs:
+                        blobs[ref] = {"sha256": ref, "codec": codec, "data": data, "raw_size": raw_size, "stored_size": len(data)}
+                        stats["stored_bytes"] += len(data)
+
+                await conn.execute(
+                    insert(TranscriptBlob).values(list(blobs.values()))
+                    .on_conflict_do_nothing(index_elements=[TranscriptBlob.sha256])
+                )
+                await conn.execute(
+                    update(table)
+                    .where(table.c.id == bindparam("row_id"))
+                    .values({ref_column: bindparam("ref"), text_column: null()}),
+                    references
+                )
+                stats["rows"] += len(rows)
+
+            logger.info(f"🗜️ Moved {stats['rows']} inline transcripts into blobs")
+
+    if stats["raw_bytes"]:
+        stats["compression_ratio"] = round(stats["raw_bytes"] / max(stats["stored_bytes"], 1), 1)
+    logger.info(f"✅ Transcript migration done: {stats}")
+    return stats
@@ -1,11 +1,15 @@
 # services/voice.py - REAL ELEVENLABS INTEGRATION
 import asyncio
 import logging
-import requests
 from typing import Dict, Any, Optional
 from datetime import datetime
 
 from config.settings import settings
+from services.http_client import HTTPClient, get_http_client
+from services.conversation_store import ConversationStore, ConversationFetchError, get_conversation_store
+from services.status_poller import ConversationStatusPoller
+from services.circuit_breaker import get_circuit_breaker
+from models.campaign import CreatorTier
 logger = logging.getLogger(__name__)
 
 class VoiceService:
@@ -14,12 +18,25 @@ class VoiceService:
     Using your exact sample code format for outbound calls
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        http_client: Optional[HTTPClient] = None,
+        conversation_store: Optional[ConversationStore] = None
+    ):
         # ✅ Load credentials from settings
         self.api_key = settings.elevenlabs_api_key
         self.agent_id = settings.elevenlabs_agent_id
         self.phone_number_id = settings.elevenlabs_phone_number_id
-        self.base_url = "https://api.elevenlabs.io"
+        self.base_url = settings.elevenlabs_base_url
+        
+        # Pooled async transport shared with the other ElevenLabs clients
+        self.http = http_client or get_http_client(self.base_url)
+        self.conversation_store = conversation_store or get_conversation_store(self.base_url)
+        self.call_circuit = get_circuit_breaker("elevenlabs.outbound_call")
+        self.status_poller = ConversationStatusPoller(
+            self.get_conversation_status,
+            lambda status: status.get("status") in ["completed", "ended", "done", "failed"]
+        )
         
         # Check credentials and decide whether to use mock
         self.use_mock = not all([self.api_key, self.agent_id, self.phone_number_id])
@@ -57,6 +74,16 @@ class VoiceService:
         if self.use_mock:
             return await self._mock_call(creator_phone, creator_profile)
         
+        # Fail fast while the provider is down (circuit shared with EnhancedVoiceService)
+        if not self.call_circuit.allow():
+            return {
+                "status": "failed",
+                "error": "ElevenLabs API unavailable (circuit open)",
+                "circuit_open": True,
+                "retry_after": self.call_circuit.retry_after(),
+                "phone_number": creator_phone
+            }
+        
         try:
             # Format creator profile exactly like your sample
             influencer_profile = self._format_influencer_profile(creator_profile)
@@ -66,8 +93,8 @@ class VoiceService:
             logger.info(f"📞 Phone Number ID: {self.phone_number_id}")
             
             # 🎯 YOUR EXACT ELEVENLABS SAMPLE CODE (with dynamic data)
-            response = requests.post(
-                f"{self.base_url}/v1/convai/twilio/outbound-call",
+            response = await self.http.post(
+                "/v1/convai/twilio/outbound-call",
                 headers={
                     "Xi-Api-Key": self.api_key
                 },
@@ -87,6 +114,10 @@ class VoiceService:
             )
             
             logger.info(f"📡 ElevenLabs API Response: {response.status_code}")
+            if response.status_code >= 500 or response.status_code == 429:
+                self.call_circuit.record_failure()
+            else:
+                self.call_circuit.record_success()
             
             # Handle response
             if response.status_code == 200:
@@ -100,6 +131,7 @@ class VoiceService:
                     "conversation_id": result.get("conversation_id"),
                     "call_id": result.get("call_id"),
                     "phone_number": creator_phone,
+                    "creator_tier": creator_profile.get("tier") or CreatorTier.for_followers(creator_profile.get("followers", 0)).value,
                     "raw_response": result
                 }
             else:
@@ -111,8 +143,13 @@ class VoiceService:
                     "phone_number": creator_phone
                 }
                 
+        except asyncio.CancelledError:
+            self.call_circuit.release()
+            raise
+        
         except Exception as e:
             logger.error(f"❌ ElevenLabs call exception: {e}")
+            self.call_circuit.record_failure()
             return {
                 "status": "failed", 
                 "error": str(e),
@@ -127,18 +164,15 @@ class VoiceService:
             return {"status": "completed", "transcript": "Mock conversation completed"}
         
         try:
-            response = requests.get(
-                f"{self.base_url}/v1/convai/conversations/{conversation_id}",
-                headers={"Xi-Api-Key": self.api_key}
-            )
+            # Cached payload; unchanged in-progress calls cost a 304, finished ones no request
+            record = await self.conversation_store.fetch(conversation_id)
+            if record.status_changed:
+                logger.info(f"📞 Conversation status: {record.data.get('status', 'unknown')}")
+            return dict(record.data)
             
-            if response.status_code == 200:
-                result = response.json()
-                logger.info(f"📞 Conversation status: {result.get('status', 'unknown')}")
-                return result
-            else:
-                logger.error(f"❌ Status check failed: {response.status_code}")
-                return {"status": "error", "message": response.text}
+        except ConversationFetchError as e:
+            logger.error(f"❌ Status check failed: {e.status_code}")
+            return {"status": "error", "message": e.text}
                 
         except Exception as e:
             logger.error(f"❌ Status check exception: {e}")
@@ -148,30 +182,32 @@ class VoiceService:
         self, 
         conversation_id: str, 
         max_wait_seconds: int = 360,
-        poll_interval: int = 5
+        poll_interval: int = 5,
+        creator_tier: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        ⏳ Wait for conversation to complete with polling
+        ⏳ Wait for conversation to complete
+        
+        Resolved by the post-call webhook as soon as it arrives; the shared
+        status poller catches missed webhooks. ``poll_interval`` is kept for
+        compatibility - poll spacing comes from the durations observed for
+        this agent and ``creator_tier``.
         """
-        start_time = asyncio.get_event_loop().time()
+        duration_key = (self.agent_id, creator_tier)
+        started_at = asyncio.get_running_loop().time()
+        status_result = await self.status_poller.wait(conversation_id, timeout=max_wait_seconds, duration_key=duration_key)
         
-        while (asyncio.get_event_loop().time() - start_time) < max_wait_seconds:
-            status_result = await self.get_conversation_status(conversation_id)
-            
-            conversation_status = status_result.get("status", "unknown")
-            
-            # Check if conversation is complete
-            if conversation_status in ["completed", "ended", "failed"]:
-                logger.info(f"📞 Conversation completed with status: {conversation_status}")
-                return status_result
-            
-            # Wait before next poll
-            await asyncio.sleep(poll_interval)
-            logger.debug(f"📞 Conversation status: {conversation_status} - continuing to wait...")
+        if status_result is None:
+            logger.warning(f"⏰ Conversation timeout after {max_wait_seconds} seconds")
+            return {"status": "timeout", "message": "Conversation did not complete within timeout"}
+        
+        if status_result.get("status") != "failed":
+            self.status_poller.duration_stats.record_call(
+                *duration_key, status_result, asyncio.get_running_loop().time() - started_at
+            )
         
-        # Timeout
-        logger.warning(f"⏰ Conversation timeout after {max_wait_seconds} seconds")
-        return {"status": "timeout", "message": "Conversation did not complete within timeout"}
+        logger.info(f"📞 Conversation completed with status: {status_result.get('status', 'done')}")
+        return status_result
     
     def _format_influencer_profile(self, creator_profile: Dict[str, Any]) -> str:
         """
@@ -228,8 +264,8 @@ class VoiceService:
         
         try:
             # Test API key by getting account info
-            response = requests.get(
-                f"{self.base_url}/v1/user",
+            response = await self.http.get(
+                "/v1/user",
                 headers={"Xi-Api-Key": self.api_key}
             )
             
@@ -325,7 +361,8 @@ class VoiceService:
             # Wait for real conversation to complete
             result = await self.wait_for_conversation_completion(
                 conversation_id, 
-                max_wait_seconds=max_duration
+                max_wait_seconds=max_duration,
+                creator_tier=call_session.get("creator_tier")
             )
             
             return {
@@ -0,0 +1,9 @@
+# tests/conftest.py
+"""Shared test setup: project root on the path and the settings the app requires"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Settings() requires a Groq key; tests never call the API
+os.environ.setdefault("GROQ_API_KEY", "test-key")
@@ -0,0 +1,36 @@
+# tests/test_campaign_models.py
+"""Checkpointed orchestration state"""
+import pytest
+
+from models.campaign import CampaignData, CampaignOrchestrationState, OrchestrationPhase
+
+
+@pytest.fixture
+def state():
+    return CampaignOrchestrationState(
+        campaign_id="campaign-1",
+        campaign_data=CampaignData(
+            id="campaign-1",
+            product_name="Protein Powder",
+            brand_name="FitCo",
+            product_description="Plant protein",
+            target_audience="Gym goers",
+            campaign_goal="Awareness",
+            product_niche="fitness",
+            total_budget=10000
+        )
+    )
+
+
+@pytest.mark.parametrize("phase, resumes_at", [
+    ("discovery", OrchestrationPhase.NEGOTIATIONS),  # written before discovery was pipelined
+    ("negotiations", OrchestrationPhase.NEGOTIATIONS),
+    ("contracts", OrchestrationPhase.CONTRACTS),
+])
+def test_checkpoint_phase_round_trip(state, phase, resumes_at):
+    checkpoint = state.model_dump(mode="json") | {"phase": phase, "in_flight_creator_ids": ["creator-1"]}
+
+    restored = CampaignOrchestrationState.model_validate_json(CampaignOrchestrationState.model_validate(checkpoint).model_dump_json())
+
+    assert restored.phase == resumes_at
+    assert restored.in_flight_creator_ids == ["creator-1"]
@@ -0,0 +1,162 @@
+# tests/test_circuit_breaker.py
+"""Circuit breaker state transitions and hedged reads"""
+import asyncio
+
+import pytest
+
+from services import circuit_breaker
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState, hedged
+from services.enhanced_voice import EnhancedVoiceService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(circuit_breaker, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("test", failure_threshold=2, recovery_seconds=30, half_open_max_calls=1)
+
+
+class TestCircuitBreaker:
+    """Test suite for closed / open / half-open transitions."""
+
+    @pytest.mark.parametrize("outcomes,state", [
+        ([], CircuitState.CLOSED),
+        (["failure"], CircuitState.CLOSED),
+        (["failure", "failure"], CircuitState.OPEN),
+        (["failure", "success", "failure"], CircuitState.CLOSED),
+    ])
+    def test_consecutive_failures_open_the_circuit(self, breaker, outcomes, state):
+        for outcome in outcomes:
+            assert breaker.allow()
+            getattr(breaker, f"record_{outcome}")()
+        assert breaker.state == state
+
+    def _open(self, breaker):
+        breaker.record_failure()
+        breaker.record_failure()
+
+    def test_open_circuit_fails_fast_until_recovery(self, breaker, clock):
+        self._open(breaker)
+        assert not breaker.allow()
+        assert breaker.retry_after() == 30
+
+        clock.now += 30
+        assert breaker.allow()
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert not breaker.allow()  # one probe at a time
+        assert breaker.stats["rejected"] == 2
+
+    @pytest.mark.parametrize("outcome,state", [("success", CircuitState.CLOSED), ("failure", CircuitState.OPEN)])
+    def test_probe_outcome_closes_or_reopens(self, breaker, clock, outcome, state):
+        self._open(breaker)
+        clock.now += 30
+        assert breaker.allow()
+        getattr(breaker, f"record_{outcome}")()
+        assert breaker.state == state
+
+    def test_released_probe_slot_lets_next_probe_through(self, breaker, clock):
+        self._open(breaker)
+        clock.now += 30
+        assert breaker.allow()
+        breaker.release()
+        assert breaker.allow()
+
+    def test_stale_probe_slot_is_handed_over(self, breaker, clock):
+        self._open(breaker)
+        clock.now += 30
+        assert breaker.allow()  # probe that never reports back
+        clock.now += 29
+        assert not breaker.allow()
+        clock.now += 1
+        assert breaker.allow()
+
+    def test_cancelled_call_releases_probe_slot(self, breaker, clock):
+        self._open(breaker)
+        clock.now += 30
+
+        async def run():
+            task = asyncio.ensure_future(breaker.call(lambda: asyncio.sleep(10)))
+            await asyncio.sleep(0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow()
+
+    def test_call_raises_when_open(self, breaker):
+        self._open(breaker)
+
+        async def never_called():
+            raise AssertionError("called through an open circuit")
+
+        with pytest.raises(CircuitOpenError):
+            asyncio.run(breaker.call(never_called))
+
+
+def test_missing_conversation_id_is_one_failure():
+    service = EnhancedVoiceService.__new__(EnhancedVoiceService)
+    service.use_mock = False
+    service.retry_attempts = 1
+    service.retry_delay = 0
+    service.call_circuit = CircuitBreaker("outbound", failure_threshold=5, recovery_seconds=30)
+    service._generate_dynamic_variables = lambda *args: {}
+
+    async def respond(phone, dynamic_vars):
+        return {"status": "success"}
+
+    service._make_outbound_call_request = respond
+    result = asyncio.run(service.initiate_negotiation_call("+15550100", {}, {}, {}))
+
+    assert result["status"] == "failed"
+    assert service.call_circuit.stats["successes"] == 0
+    assert service.call_circuit.stats["failures"] == 1
+
+
+class TestHedged:
+    """Test suite for hedged reads."""
+
+    def _attempts(self, delays, failures=()):
+        """``fn`` whose n-th call sleeps ``delays[n]`` and raises if n is in ``failures``"""
+        calls = []
+
+        async def fn():
+            attempt = len(calls)
+            calls.append(attempt)
+            await asyncio.sleep(delays[attempt])
+            if attempt in failures:
+                raise RuntimeError(f"attempt {attempt} failed")
+            return attempt
+
+        return fn, calls
+
+    @pytest.mark.parametrize("delays,failures,hedge_delay,result,attempts", [
+        ([0.0], (), 0.05, 0, 1),          # fast: no hedge
+        ([0.3, 0.0], (), 0.05, 1, 2),     # slow first attempt: the hedge wins
+        ([0.1, 0.5], (), 0.05, 0, 2),     # hedge started, first still wins
+        ([0.1, 0.0], (1,), 0.05, 0, 2),   # failed hedge: wait for the first
+        ([0.3], (), 0, 0, 1),             # hedging disabled
+    ])
+    def test_hedged(self, delays, failures, hedge_delay, result, attempts):
+        fn, calls = self._attempts(delays, failures)
+        assert asyncio.run(hedged(fn, hedge_delay)) == result
+        assert len(calls) == attempts
+
+    def test_both_attempts_fail(self):
+        fn, calls = self._attempts([0.1, 0.0], failures=(0, 1))
+        with pytest.raises(RuntimeError):
+            asyncio.run(hedged(fn, 0.05))
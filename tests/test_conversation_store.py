@@ -0,0 +1,118 @@
+# tests/test_conversation_store.py
+"""Conversation payload cache: conditional revalidation, terminal entries and turn delivery"""
+import asyncio
+import json
+
+import pytest
+
+from services.conversation_store import ConversationFetchError, ConversationStore
+from services.http_client import HTTPResponse
+
+
+class FakeHTTPClient:
+    """Answers GETs from a queue of (status, payload, headers); records the request headers"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    async def get(self, path, headers=None, read_timeout=None):
+        self.requests.append((path, dict(headers or {})))
+        status, payload, response_headers = self.responses.pop(0)
+        return HTTPResponse(status, json.dumps(payload) if payload is not None else "", response_headers)
+
+
+def _payload(status, turns=0):
+    return {"status": status, "transcript": [{"role": "user", "message": f"turn {i}"} for i in range(turns)]}
+
+
+def _fetch(store, conversation_id="conv_1"):
+    return asyncio.run(store.fetch(conversation_id))
+
+
+class TestConversationStore:
+    """Test suite for ConversationStore."""
+
+    def test_revalidates_with_etag_and_last_modified(self):
+        http = FakeHTTPClient(
+            (200, _payload("processing"), {"ETag": '"v1"', "Last-Modified": "Sat, 17 Oct 2026 10:00:00 GMT"}),
+            (304, None, {}),
+        )
+        store = ConversationStore(http, api_key="key")
+
+        first = _fetch(store)
+        second = _fetch(store)
+
+        assert second is first
+        assert second.status_changed is False
+        assert "If-None-Match" not in http.requests[0][1]
+        assert http.requests[1][1]["If-None-Match"] == '"v1"'
+        assert http.requests[1][1]["If-Modified-Since"] == "Sat, 17 Oct 2026 10:00:00 GMT"
+        assert (store.stats["downloads"], store.stats["not_modified"]) == (1, 1)
+
+    def test_changed_status_resets_derived_values(self):
+        http = FakeHTTPClient(
+            (200, _payload("processing"), {"ETag": '"v1"'}),
+            (200, _payload("in-progress"), {"ETag": '"v2"'}),
+        )
+        store = ConversationStore(http, api_key="key")
+
+        record = _fetch(store)
+        record.normalized_status = "in_progress"
+        record = _fetch(store)
+
+        assert (record.status, record.etag, record.status_changed) == ("in-progress", '"v2"', True)
+        assert record.normalized_status is None
+
+    @pytest.mark.parametrize("status", ["done", "failed", "ended"])
+    def test_terminal_entries_are_served_from_memory(self, status):
+        http = FakeHTTPClient((200, _payload(status), {}))
+        store = ConversationStore(http, api_key="key")
+
+        _fetch(store)
+        record = _fetch(store)
+
+        assert len(http.requests) == 1
+        assert record.status_changed is False
+        assert store.stats["hits"] == 1
+
+    def test_webhook_payload_needs_no_request(self):
+        http = FakeHTTPClient()
+        store = ConversationStore(http, api_key="key")
+
+        store.put("conv_1", _payload("done", turns=2))
+
+        assert _fetch(store).data["transcript"][1]["message"] == "turn 1"
+        assert http.requests == []
+
+    @pytest.mark.parametrize("responses", [
+        [(404, {"detail": "not found"}, {})],
+        [(304, None, {})],  # nothing cached to revalidate
+    ])
+    def test_error_status_raises(self, responses):
+        store = ConversationStore(FakeHTTPClient(*responses), api_key="key")
+
+        with pytest.raises(ConversationFetchError) as error:
+            _fetch(store)
+        assert error.value.status_code == responses[0][0]
+
+    def test_entries_are_lru_bounded(self):
+        store = ConversationStore(FakeHTTPClient(), api_key="key", max_entries=2)
+        store.put("a", _payload("done"))
+        store.put("b", _payload("done"))
+        store.get("a")
+        store.put("c", _payload("done"))
+
+        assert (store.get("a") is not None, store.get("b"), store.get("c") is not None) == (True, None, True)
+
+    def test_listeners_receive_only_new_turns(self):
+        store = ConversationStore(FakeHTTPClient(), api_key="key")
+        delivered = []
+        store.add_turn_listener(lambda record, start, turns: delivered.append((record.status, start, len(turns))))
+
+        store.put("conv_1", _payload("processing", turns=2))
+        store.put("conv_1", _payload("processing", turns=2))  # nothing new
+        store.put("conv_1", _payload("processing", turns=5))
+        store.put("conv_1", _payload("done", turns=5))  # status change only
+
+        assert delivered == [("processing", 0, 2), ("processing", 2, 3), ("done", 5, 0)]
@@ -0,0 +1,144 @@
+# tests/test_conversation_webhooks.py
+"""ElevenLabs post-call webhook: signature check and event-type handling"""
+import hashlib
+import hmac
+import asyncio
+import json
+import time
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.enhanced_webhooks import enhanced_webhook_router
+from services.conversation_events import ConversationCompletionRegistry, verify_elevenlabs_signature
+from services.conversation_store import get_conversation_store
+
+SECRET = "test-webhook-secret"
+
+
+def _sign(payload: bytes, secret: str = SECRET, timestamp: int = None) -> str:
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    digest = hmac.new(secret.encode(), f"{timestamp}.".encode() + payload, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v0={digest}"
+
+
+BODY = b'{"type": "post_call_transcription", "data": {}}'
+
+
+@pytest.mark.parametrize("header,expected", [
+    (_sign(BODY), True),
+    (_sign(BODY, secret="wrong-secret"), False),
+    (_sign(BODY, timestamp=int(time.time()) - 3600), False),
+    (_sign(b'{"tampered": true}'), False),
+    ("v0=deadbeef", False),
+    ("t=abc,v0=deadbeef", False),
+    ("", False),
+    (None, False),
+])
+def test_verify_elevenlabs_signature(header, expected):
+    assert verify_elevenlabs_signature(BODY, header, secret=SECRET, tolerance_seconds=1800) is expected
+
+
+class TestConversationCompletionRegistry:
+    """Test suite for webhook futures and their bound."""
+
+    def test_live_waiters_are_never_evicted(self):
+        async def run():
+            registry = ConversationCompletionRegistry(max_entries=2)
+            watched = [registry.watch(f"live_{i}") for i in range(5)]
+            for i in range(10):
+                registry.resolve(f"early_{i}", {"status": "done"})
+
+            for i, future in enumerate(watched):
+                assert registry.resolve(f"live_{i}", {"status": "done", "i": i})
+                assert future.result()["i"] == i
+            # Only the newest unwatched results are kept
+            assert sorted(registry._futures) == ["early_8", "early_9"] + [f"live_{i}" for i in range(5)]
+
+        asyncio.run(run())
+
+    def test_result_pushed_before_waiting_is_returned(self):
+        async def run():
+            registry = ConversationCompletionRegistry()
+            registry.resolve("conv_1", {"status": "done"})
+            assert await registry.wait("conv_1", timeout=0.01) == {"status": "done"}
+            assert registry._futures == {}
+
+        asyncio.run(run())
+
+    def test_entry_kept_until_last_waiter_releases(self):
+        async def run():
+            registry = ConversationCompletionRegistry()
+            first = registry.watch("conv_1")
+            assert await registry.wait("conv_1", timeout=0.01) is None  # second waiter times out
+            assert registry.future("conv_1") is first
+
+            registry.resolve("conv_1", {"status": "done"})
+            assert first.result() == {"status": "done"}
+            registry.release("conv_1")
+            assert "conv_1" not in registry._futures
+
+        asyncio.run(run())
+
+
+class TestPostCallWebhook:
+    """Test suite for the post-call webhook endpoint."""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        monkeypatch.setattr("services.conversation_events.settings.webhook_secret", SECRET)
+        app = FastAPI()
+        app.include_router(enhanced_webhook_router)
+        return TestClient(app)
+
+    def _post(self, client, event):
+        payload = json.dumps(event).encode()
+        return client.post(
+            "/elevenlabs/post-call",
+            content=payload,
+            headers={"ElevenLabs-Signature": _sign(payload), "Content-Type": "application/json"}
+        )
+
+    @pytest.mark.parametrize("event_type,stored_status,response_status", [
+        ("post_call_transcription", "done", "received"),
+        ("call_initiation_failure", "failed", "received"),
+        ("post_call_audio", None, "ignored"),
+    ])
+    def test_event_types(self, client, event_type, stored_status, response_status):
+        conversation_id = f"conv_{uuid.uuid4().hex}"
+        response = self._post(client, {
+            "type": event_type,
+            "data": {"conversation_id": conversation_id, "transcript": []}
+        })
+
+        assert response.status_code == 200
+        assert response.json()["status"] == response_status
+        record = get_conversation_store().get(conversation_id)
+        if stored_status is None:
+            assert record is None
+        else:
+            assert record.data["status"] == stored_status
+
+    def test_audio_event_does_not_replace_transcript(self, client):
+        conversation_id = f"conv_{uuid.uuid4().hex}"
+        self._post(client, {
+            "type": "post_call_transcription",
+            "data": {"conversation_id": conversation_id, "transcript": [{"role": "user", "message": "deal"}]}
+        })
+        self._post(client, {"type": "post_call_audio", "data": {"conversation_id": conversation_id}})
+
+        assert get_conversation_store().get(conversation_id).data["transcript"]
+
+    @pytest.mark.parametrize("event", [[], "text", {"type": "post_call_transcription", "data": []}, {"data": {}}])
+    def test_malformed_payload_is_rejected(self, client, event):
+        assert self._post(client, event).status_code == 400
+
+    def test_invalid_signature_is_rejected(self, client):
+        response = client.post(
+            "/elevenlabs/post-call",
+            content=b'{"type": "post_call_transcription", "data": {"conversation_id": "x"}}',
+            headers={"ElevenLabs-Signature": "t=1,v0=00"}
+        )
+        assert response.status_code == 401
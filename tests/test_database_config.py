@@ -0,0 +1,125 @@
+# tests/test_database_config.py
+"""Process-wide async engines and one-time table creation"""
+import asyncio
+
+import pytest
+
+from config import database
+from config.database import DatabaseConfig, get_async_engine
+from config.settings import settings
+
+
+class FakeConnection:
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def run_sync(self, fn):
+        self.engine.create_all_calls += 1
+        await asyncio.sleep(0.01)  # let concurrent callers pile up on the lock
+
+
+class FakeEngine:
+    """``begin()`` context yielding a connection that counts ``create_all`` runs"""
+
+    def __init__(self):
+        self.create_all_calls = 0
+
+    def begin(self):
+        engine = self
+
+        class Begin:
+            async def __aenter__(self):
+                return FakeConnection(engine)
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Begin()
+
+
+@pytest.fixture
+def fresh_registry(monkeypatch):
+    monkeypatch.setattr(database, "_async_engines", {})
+    monkeypatch.setattr(database, "_tables_created", set())
+    monkeypatch.setattr(database, "_create_tables_lock", None)
+
+
+class TestAsyncEngines:
+    """Test suite for the engine-per-URL cache."""
+
+    def test_one_engine_per_url(self, fresh_registry):
+        first = get_async_engine("postgresql+asyncpg://u:p@db-a/app")
+
+        assert get_async_engine("postgresql+asyncpg://u:p@db-a/app") is first
+        assert get_async_engine("postgresql+asyncpg://u:p@db-b/app") is not first
+        assert len(database._async_engines) == 2
+
+    def test_engine_pool_uses_settings(self, fresh_registry):
+        engine = get_async_engine("postgresql+asyncpg://u:p@db-a/app")
+
+        assert engine.pool.size() == settings.db_pool_size
+        assert engine.pool._max_overflow == settings.db_max_overflow
+        assert engine.pool._recycle == settings.db_pool_recycle_seconds
+
+    def test_configs_share_the_engine(self, fresh_registry, monkeypatch):
+        monkeypatch.setenv("DATABASE_URL", "postgresql://u:p@db-a/app")
+
+        first, second = DatabaseConfig(), DatabaseConfig()
+
+        assert first.async_database_url == "postgresql+asyncpg://u:p@db-a/app"
+        assert first.async_engine is second.async_engine
+        assert first._engine is None  # the sync engine is only built on demand
+
+
+class TestCreateTables:
+    """Test suite for the create-tables-once lock."""
+
+    @pytest.fixture
+    def configs(self, fresh_registry, monkeypatch):
+        engines = {}
+
+        def fake_engine(url):
+            return engines.setdefault(url, FakeEngine())
+
+        monkeypatch.setattr(database, "get_async_engine", fake_engine)
+        monkeypatch.setenv("DATABASE_URL", "postgresql://u:p@db-a/app")
+        return [DatabaseConfig() for _ in range(3)]
+
+    def test_concurrent_callers_create_tables_once(self, configs):
+        async def run():
+            await asyncio.gather(*[config.create_tables() for config in configs for _ in range(3)])
+            await configs[0].create_tables()
+
+        asyncio.run(run())
+        assert configs[0].async_engine.create_all_calls == 1
+
+    def test_each_database_gets_its_tables(self, configs, monkeypatch):
+        monkeypatch.setenv("DATABASE_URL", "postgresql://u:p@db-b/app")
+        other = DatabaseConfig()
+
+        async def run():
+            await asyncio.gather(configs[0].create_tables(), other.create_tables())
+
+        asyncio.run(run())
+        assert (configs[0].async_engine.create_all_calls, other.async_engine.create_all_calls) == (1, 1)
+
+    def test_failed_creation_is_retried(self, configs):
+        engine = configs[0].async_engine
+        original_begin = engine.begin
+        attempts = []
+
+        def begin():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ConnectionError("database starting up")
+            return original_begin()
+
+        engine.begin = begin
+
+        async def run():
+            with pytest.raises(ConnectionError):
+                await configs[0].create_tables()
+            await configs[0].create_tables()
+
+        asyncio.run(run())
+        assert engine.create_all_calls == 1
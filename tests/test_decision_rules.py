@@ -0,0 +1,40 @@
+# tests/test_decision_rules.py
+"""Decision table range matching"""
+import pytest
+
+from agents.decision_rules import DecisionTable, CAMPAIGN_STRATEGY_TABLE
+
+
+@pytest.mark.parametrize("budget, tier", [
+    (100, "standard"),
+    (5000, "standard"),
+    (5000.005, "medium"),
+    (10000, "medium"),
+    (10000.005, "high"),    # the original rule was budget > 10000
+    (50000, "high"),
+])
+def test_budget_tiers_match_original_comparisons(budget, tier):
+    decision = DecisionTable("campaign_strategy", CAMPAIGN_STRATEGY_TABLE).decide({"budget": budget})
+
+    assert decision.result["budget_tier"] == tier
+
+
+@pytest.mark.parametrize("bounds, value, matches", [
+    (None, 1, True), (None, 2, False),          # default [low, high)
+    ("()", 1, False), ("()", 1.5, True), ("()", 2, False),
+    ("(]", 1, False), ("(]", 2, True),
+    ("[)", 1, True), ("[)", 2, False),
+    ("[]", 1, True), ("[]", 2, True), ("[]", 2.001, False),
+])
+def test_range_bounds(bounds, value, matches):
+    spec = (1, 2) if bounds is None else (1, 2, bounds)
+    table = DecisionTable("t", {"rows": [{"name": "row", "when": {"x": spec}, "confidence": 1.0, "result": {}}],
+                                "default": {"confidence": 0.0, "result": {}}})
+
+    assert (table.decide({"x": value}).rule == "t.row") is matches
+
+
+def test_invalid_bounds_rejected():
+    with pytest.raises(ValueError):
+        DecisionTable("t", {"rows": [{"name": "row", "when": {"x": (1, 2, "<>")}, "confidence": 1.0, "result": {}}],
+                            "default": {"confidence": 0.0, "result": {}}})
@@ -0,0 +1,81 @@
+# tests/test_discovery.py
+"""Ranking of discovered creators, streamed and in one batch"""
+import asyncio
+
+import pytest
+
+from agents.discovery import InfluencerDiscoveryAgent
+from models.campaign import CampaignData, Creator, CreatorMatch
+
+
+class FakeEmbeddings:
+    async def generate_embedding(self, text):
+        return [0.0]
+
+
+def _creator(creator_id: str) -> Creator:
+    return Creator(
+        id=creator_id, name=creator_id, platform="Instagram", followers=50000, niche="fitness",
+        typical_rate=2000, engagement_rate=4.5, average_views=20000, last_campaign_date="2024-01-01",
+        availability="good", location="US", phone_number="+15550100", languages=["en"], specialties=["fitness"]
+    )
+
+
+def _agent(scores):
+    """Discovery agent over creators ``c0..cN`` scored by ``scores`` (None = below threshold)"""
+    agent = InfluencerDiscoveryAgent.__new__(InfluencerDiscoveryAgent)
+    agent.embedding_service = FakeEmbeddings()
+    agent.creators_data = [_creator(f"c{i}") for i in range(len(scores))]
+
+    async def score(creator, campaign_data, campaign_embedding):
+        value = scores[int(creator.id[1:])]
+        if value is None:
+            return None
+        return CreatorMatch(creator=creator, similarity_score=value, estimated_rate=2000)
+
+    agent._score_creator = score
+    return agent
+
+
+@pytest.fixture
+def campaign():
+    return CampaignData(
+        id="camp_1", product_name="Protein", brand_name="Brand", product_description="Protein powder",
+        target_audience="Athletes", campaign_goal="Awareness", product_niche="fitness", total_budget=10000
+    )
+
+
+def _stream(agent, campaign, **kwargs):
+    async def collect():
+        return [
+            (match.creator.id, match.similarity_score)
+            async for match in agent.stream_matches(campaign, **kwargs)
+        ]
+    return asyncio.run(collect())
+
+
+@pytest.mark.parametrize("scores,max_results,expected", [
+    # Ranked over the whole catalogue, not the first shards
+    ([0.81, 0.82, 0.83, 0.95, 0.5], 3, ["c3", "c2", "c1"]),
+    ([0.5, None, 0.9, 0.7], 2, ["c2", "c3"]),
+    ([0.81] * 30 + [0.95], 2, ["c30", "c0"]),
+    ([None, None], 3, []),
+])
+def test_find_matches_ranks_whole_catalogue(campaign, scores, max_results, expected):
+    matches = asyncio.run(_agent(scores).find_matches(campaign, max_results=max_results))
+    assert [match.creator.id for match in matches] == expected
+
+
+@pytest.mark.parametrize("scores,max_results,expected", [
+    # Early yields fill every slot; the stronger creator in shard 2 still follows
+    ([0.81, 0.82, 0.83, 0.95, 0.5], 3, [("c2", 0.83), ("c1", 0.82), ("c0", 0.81), ("c3", 0.95)]),
+    # No early candidates: the overall best, best-first
+    ([0.5, 0.6, 0.7, 0.4, 0.65], 2, [("c2", 0.7), ("c4", 0.65)]),
+    # Early candidate in the overall top is not yielded twice
+    ([0.9, 0.6, 0.7, 0.4], 2, [("c0", 0.9), ("c2", 0.7)]),
+    # Early candidates per shard, then the rest of the top
+    ([0.85, 0.2, 0.3, 0.6, 0.88], 3, [("c0", 0.85), ("c4", 0.88), ("c3", 0.6)]),
+])
+def test_stream_matches_scores_every_shard(campaign, scores, max_results, expected):
+    agent = _agent(scores)
+    assert _stream(agent, campaign, max_results=max_results, shard_size=3, early_yield_score=0.8) == expected
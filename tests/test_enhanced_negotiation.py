@@ -0,0 +1,110 @@
+# tests/test_enhanced_negotiation.py
+"""Transcript analysis helpers of the enhanced negotiation agent"""
+import pytest
+
+from agents.enhanced_negotiation import ConversationAnalyzer, KeywordMatcher, LiveNegotiationTracker, MoneyTokenizer
+from services.conversation_store import ConversationRecord
+
+REJECT = {"role": "user", "message": "No, I have to decline"}
+NEUTRAL = {"role": "agent", "message": "Let me check with the team"}
+ACCEPT = {"role": "user", "message": "Yes, deal"}
+
+
+@pytest.mark.parametrize("text,expected", [
+    # Whole words only
+    ("I know the deal", {"acceptance": 1}),
+    ("counterpart", {}),
+    ("payment", {}),
+    ("Deals are great", {"positive": 1}),
+    # Multi-word keywords, case-insensitive
+    ("Not interested, sorry", {"rejection": 1, "negative": 1}),
+    ("How about 2k", {"negotiation": 1}),
+    ("Let's do it!", {"acceptance": 1}),
+    # Distinct keywords are counted once each
+    ("yes yes yes", {"acceptance": 1}),
+    ("I can't pass", {"rejection": 2, "negative": 1}),
+    # A keyword in several categories counts in each
+    ("Perfect", {"acceptance": 1, "positive": 1}),
+    # Symbol keywords are not bounded on their symbol side
+    ("$1500 sounds good", {"pricing": 1, "acceptance": 1}),
+    ("", {}),
+])
+def test_keyword_matcher(text, expected):
+    assert ConversationAnalyzer().keyword_matcher.match(text) == expected
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("the dealership", {"long": 1}),
+    ("a dealer", {"medium": 1}),
+    ("deal", {"short": 1}),
+    ("dealers", {}),
+])
+def test_keyword_matcher_longest_match_wins(text, expected):
+    matcher = KeywordMatcher({"short": ["deal"], "medium": ["dealer"], "long": ["dealership"]})
+    assert matcher.match(text) == expected
+
+
+@pytest.mark.parametrize("text,expected", [
+    # Currency markers
+    ("$1,500", [(1500, 1500, True)]),
+    ("1500 dollars", [(1500, 1500, True)]),
+    ("USD 2k", [(2000, 2000, True)]),
+    ("a hundred bucks", [(100, 100, True)]),
+    ("1.2m dollars", [(1200000, 1200000, True)]),
+    # Suffixes and spelled-out numbers
+    ("5k", [(5000, 5000, False)]),
+    ("3 grand", [(3000, 3000, False)]),
+    ("a grand", [(1000, 1000, False)]),
+    ("twelve hundred", [(1200, 1200, False)]),
+    ("five thousand dollars", [(5000, 5000, True)]),
+    # Ranges; a suffix on the upper bound scales both ends
+    ("$1,000-1,500", [(1000, 1500, True)]),
+    ("5 to 7k", [(5000, 7000, False)]),
+    ("$500-1500", [(500, 1500, True)]),
+    # Unmarked amounts must read as a rate at both ends
+    ("2 videos", []),
+    ("50k followers", []),
+    ("100 to 3000", []),
+    ("2,000", [(2000, 2000, False)]),
+    # Years and phone numbers are not prices
+    ("in 2024 the rate was 3000", [(3000, 3000, False)]),
+    ("2019-2020", []),
+    ("$2000", [(2000, 2000, True)]),
+    ("call me at 555-1234 about the rate", []),
+    ("call 555-123-4567", []),
+    ("(555) 123-4567, my rate is 1500", [(1500, 1500, False)]),
+    ("I'd do 1500, or a grand for the reel", [(1500, 1500, False), (1000, 1000, False)]),
+])
+def test_money_tokenizer(text, expected):
+    amounts = MoneyTokenizer().amounts(text)
+    assert [(amount["low"], amount["high"], amount["explicit"]) for amount in amounts] == expected
+    assert all(amount["amount"] == amount["high"] for amount in amounts)
+
+
+class TestLiveNegotiationTracker:
+    """Test suite for folding delivered turns into live state."""
+
+    @pytest.fixture
+    def tracker(self):
+        return LiveNegotiationTracker(ConversationAnalyzer())
+
+    @pytest.mark.parametrize("deliveries", [
+        [(0, [REJECT, NEUTRAL, ACCEPT])],
+        [(0, [REJECT]), (1, [NEUTRAL, ACCEPT])],
+        # Tracker entry created after earlier turns were delivered (lazy start, eviction)
+        [(2, [ACCEPT])],
+        [(1, [NEUTRAL]), (2, [ACCEPT])],
+        # Redelivery of turns already folded in
+        [(0, [REJECT, NEUTRAL]), (1, [NEUTRAL, ACCEPT])],
+    ])
+    def test_matches_fresh_analysis(self, tracker, deliveries):
+        transcript = [REJECT, NEUTRAL, ACCEPT]
+        record = ConversationRecord("conv_1", {"status": "processing", "transcript": transcript})
+        for start, turns in deliveries:
+            tracker.on_turns(record, start, turns)
+
+        live = tracker.get("conv_1")
+        fresh = ConversationAnalyzer().new_transcript_state().update(transcript)
+        assert live.turns_seen == 3
+        assert (live.acceptance_count, live.rejection_count) == (fresh.acceptance_count, fresh.rejection_count)
+        assert (live.acceptance_count, live.rejection_count) == (2, 2)
@@ -0,0 +1,125 @@
+# tests/test_http_client.py
+"""Pooled async HTTP client against a local aiohttp server"""
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from services import http_client
+from services.http_client import HTTPClient, close_http_clients, get_http_client
+
+
+class StubServer:
+    """Local server recording the client port of every request and how many run at once"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.peers = []
+        self.running = 0
+        self.max_running = 0
+        self.base_url = None
+        self._runner = None
+
+    async def handle(self, request):
+        self.peers.append(request.transport.get_extra_info("peername")[1])
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(float(request.query.get("delay", self.delay)))
+            body = await request.json() if request.can_read_body else None
+            return web.json_response({"method": request.method, "body": body}, headers={"ETag": '"v1"'})
+        finally:
+            self.running -= 1
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self.handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}/"
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._runner.cleanup()
+
+
+class TestHTTPClient:
+    """Test suite for the pooled client."""
+
+    def test_round_trip(self):
+        async def run():
+            async with StubServer() as server:
+                client = HTTPClient(server.base_url)
+                get = await client.get("/v1/status")
+                post = await client.post("/v1/call", json={"to": "+1"})
+                await client.close()
+                return get, post
+
+        get, post = asyncio.run(run())
+        assert (get.status_code, get.json()) == (200, {"method": "GET", "body": None})
+        assert post.json() == {"method": "POST", "body": {"to": "+1"}}
+        assert get.headers["etag"] == '"v1"'  # case-insensitive
+
+    def test_sequential_requests_reuse_one_connection(self):
+        async def run():
+            async with StubServer() as server:
+                client = HTTPClient(server.base_url)
+                for _ in range(5):
+                    await client.get("/v1/status")
+                await client.close()
+                return server.peers
+
+        peers = asyncio.run(run())
+        assert len(peers) == 5 and len(set(peers)) == 1
+
+    def test_connections_per_host_are_limited(self):
+        async def run():
+            async with StubServer(delay=0.02) as server:
+                client = HTTPClient(server.base_url, limit_per_host=2)
+                responses = await asyncio.gather(*[client.get("/v1/status") for _ in range(6)])
+                await client.close()
+                return server, responses
+
+        server, responses = asyncio.run(run())
+        assert [response.status_code for response in responses] == [200] * 6
+        assert server.max_running == 2
+        assert len(set(server.peers)) == 2
+
+    def test_read_timeout_per_request(self):
+        async def run():
+            async with StubServer() as server:
+                client = HTTPClient(server.base_url, read_timeout=5)
+                try:
+                    with pytest.raises(asyncio.TimeoutError):
+                        await client.get("/v1/slow?delay=0.5", read_timeout=0.05)
+                    return (await client.get("/v1/fast")).status_code
+                finally:
+                    await client.close()
+
+        assert asyncio.run(run()) == 200
+
+    def test_session_is_recreated_for_a_new_event_loop(self):
+        client = HTTPClient("http://127.0.0.1:1")
+
+        async def session():
+            return client._get_session()
+
+        first = asyncio.run(session())
+        second = asyncio.run(session())
+        assert first is not second
+        assert isinstance(second, aiohttp.ClientSession)
+
+
+def test_one_shared_client_per_base_url(monkeypatch):
+    monkeypatch.setattr(http_client, "_clients", {})
+
+    client = get_http_client("https://api.example.com/")
+    assert get_http_client("https://api.example.com") is client
+    assert get_http_client("https://other.example.com") is not client
+
+    asyncio.run(close_http_clients())
+    assert http_client._clients == {}
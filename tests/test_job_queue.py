@@ -0,0 +1,179 @@
+# tests/test_job_queue.py
+"""Claim / reclaim behaviour of the local file job queue"""
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.campaign import JobStatus
+from services.job_queue import JobLeaseLost, LocalFileJobQueue
+
+
+def _age(path, seconds: float) -> None:
+    """Pretend ``path`` was last written ``seconds`` ago"""
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+class TestLocalFileJobQueue:
+    """Test suite for claiming and lease expiry."""
+
+    @pytest.fixture
+    def queue(self, tmp_path):
+        return LocalFileJobQueue(queue_dir=str(tmp_path), lease_seconds=60, max_attempts=3)
+
+    @staticmethod
+    def _claim_expired(queue):
+        """Claim job-1 for worker-a and let its lease run out; returns its running path"""
+        job = queue._claim_sync("worker-a")
+        running_path = queue._path(JobStatus.RUNNING, "job-1")
+        job.heartbeat_at = datetime.now() - timedelta(seconds=120)
+        queue._write(running_path, job)
+        _age(running_path, 120)
+        return running_path
+
+    def test_claim_sets_owner_and_lease(self, queue):
+        queue._enqueue_sync("job-1", "campaign-1", {})
+
+        job = queue._claim_sync("worker-a")
+
+        assert job.worker_id == "worker-a"
+        assert job.attempts == 1
+        assert job.heartbeat_at is not None
+        stored = queue._read(queue._path(JobStatus.RUNNING, "job-1"))
+        assert stored.worker_id == "worker-a"
+        assert queue._claim_sync("worker-b") is None
+
+    def test_reclaim_during_claim_does_not_double_claim(self, queue, monkeypatch):
+        """Another process reclaiming between the rename and the lease write must not requeue the job"""
+        queue._enqueue_sync("job-1", "campaign-1", {})
+        read = queue._read
+
+        def read_and_reclaim(path):
+            job = read(path)
+            queue._reclaim_expired_sync()
+            return job
+
+        monkeypatch.setattr(queue, "_read", read_and_reclaim)
+        assert queue._claim_sync("worker-a").worker_id == "worker-a"
+        monkeypatch.setattr(queue, "_read", read)
+
+        assert list(queue._dirs[JobStatus.QUEUED].glob("*.json")) == []
+        assert queue._claim_sync("worker-b") is None
+        assert queue._read(queue._path(JobStatus.RUNNING, "job-1")).worker_id == "worker-a"
+
+    def test_retried_job_with_stale_heartbeat_is_not_reclaimed_after_claim(self, queue):
+        job = queue._enqueue_sync("job-1", "campaign-1", {})
+        job.heartbeat_at = datetime.now() - timedelta(hours=1)  # left over from the previous attempt
+        queue._write(queue._path(JobStatus.QUEUED, "job-1"), job)
+
+        queue._claim_sync("worker-a")
+        queue._reclaim_expired_sync()
+
+        assert queue._read(queue._path(JobStatus.RUNNING, "job-1")).worker_id == "worker-a"
+
+    @pytest.mark.parametrize("heartbeat_age, file_age, reclaimed", [
+        (None, 0, False),      # no heartbeat yet, freshly written
+        (None, 120, True),     # no heartbeat and untouched for longer than the lease
+        (10, 10, False),       # heartbeating
+        (120, 0, False),       # old heartbeat but the file was just written
+        (120, 120, True),      # lease expired
+    ])
+    def test_lease_expiry(self, queue, heartbeat_age, file_age, reclaimed):
+        queue._enqueue_sync("job-1", "campaign-1", {})
+        job = queue._claim_sync("worker-a")
+        running_path = queue._path(JobStatus.RUNNING, "job-1")
+        job.heartbeat_at = None if heartbeat_age is None else datetime.now() - timedelta(seconds=heartbeat_age)
+        queue._write(running_path, job)
+        _age(running_path, file_age)
+
+        queue._reclaim_expired_sync()
+
+        assert queue._path(JobStatus.QUEUED, "job-1").exists() is reclaimed
+        assert running_path.exists() is not reclaimed
+
+    def test_abandoned_claim_returns_to_queue(self, queue):
+        queue._enqueue_sync("job-1", "campaign-1", {})
+        claim_path = queue._dirs[JobStatus.RUNNING] / "job-1.deadbeef.claim"
+        os.rename(queue._path(JobStatus.QUEUED, "job-1"), claim_path)
+
+        queue._reclaim_expired_sync()
+        assert claim_path.exists()  # still within the lease
+
+        _age(claim_path, 120)
+        queue._reclaim_expired_sync()
+        assert queue._claim_sync("worker-b").worker_id == "worker-b"
+
+    def test_claim_skips_job_taken_while_sorting(self, queue, monkeypatch):
+        """A queued file renamed by another worker while the queue is sorted is skipped"""
+        queue._enqueue_sync("job-1", "campaign-1", {})
+        queue._enqueue_sync("job-2", "campaign-2", {})
+        mtime = LocalFileJobQueue._mtime
+        taken = queue._path(JobStatus.QUEUED, "job-1")
+
+        def mtime_after_other_claim(path):
+            if path == taken and path.exists():
+                os.rename(path, queue._dirs[JobStatus.RUNNING] / "job-1.other.claim")
+            return mtime(path)
+
+        monkeypatch.setattr(queue, "_mtime", mtime_after_other_claim)
+        assert queue._claim_sync("worker-a").id == "job-2"
+
+    def test_heartbeat_extends_lease(self, queue):
+        queue._enqueue_sync("job-1", "campaign-1", {})
+        running_path = self._claim_expired(queue)
+
+        assert queue._heartbeat_sync("job-1", "worker-a") is True
+        queue._reclaim_expired_sync()
+
+        assert running_path.exists()
+        assert queue._heartbeat_sync("job-1", "worker-b") is False
+
+    def test_heartbeat_after_reclaim_does_not_resurrect_job(self, queue, monkeypatch):
+        queue._enqueue_sync("job-1", "campaign-1", {})
+        running_path = self._claim_expired(queue)
+        read = queue._read
+
+        def read_then_reclaim(path):
+            job = read(path)
+            monkeypatch.setattr(queue, "_read", read)
+            queue._reclaim_expired_sync()
+            return job
+
+        monkeypatch.setattr(queue, "_read", read_then_reclaim)
+        assert queue._heartbeat_sync("job-1", "worker-a") is False
+
+        assert not running_path.exists()
+        assert queue._claim_sync("worker-b").worker_id == "worker-b"
+
+    @pytest.mark.parametrize("target", [JobStatus.COMPLETED, JobStatus.QUEUED, JobStatus.FAILED])
+    def test_finish_after_reclaim_raises_lease_lost(self, queue, monkeypatch, target):
+        queue._enqueue_sync("job-1", "campaign-1", {})
+        running_path = self._claim_expired(queue)
+        read = queue._read
+
+        def read_then_reclaim(path):
+            job = read(path)
+            monkeypatch.setattr(queue, "_read", read)
+            queue._reclaim_expired_sync()
+            return job
+
+        monkeypatch.setattr(queue, "_read", read_then_reclaim)
+        with pytest.raises(JobLeaseLost):
+            queue._finish_sync("job-1", "worker-a", target)
+
+        assert not running_path.exists()
+        assert queue._read(queue._path(JobStatus.QUEUED, "job-1")).status == JobStatus.QUEUED
+
+    @pytest.mark.parametrize("target", [JobStatus.COMPLETED, JobStatus.QUEUED, JobStatus.FAILED])
+    def test_finish_moves_job(self, queue, target):
+        queue._enqueue_sync("job-1", "campaign-1", {})
+        queue._claim_sync("worker-a")
+
+        queue._finish_sync("job-1", "worker-a", target, error="boom")
+
+        assert queue._read(queue._path(target, "job-1")).status == target
+        assert list(queue._dirs[JobStatus.RUNNING].iterdir()) == []
+        with pytest.raises(JobLeaseLost):
+            queue._finish_sync("job-1", "worker-a", target)
@@ -0,0 +1,161 @@
+# tests/test_llm_gateway.py
+"""LLM gateway: request coalescing, TTL cache and per-model concurrency"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from services import llm_gateway
+from services.llm_gateway import LLMGateway
+
+
+class FakeCompletions:
+    """``chat.completions.create`` that answers with the prompt after ``delay`` seconds"""
+
+    def __init__(self, delay=0.01, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+
+    async def create(self, model, messages, temperature, max_tokens):
+        self.calls += 1
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError("upstream error")
+            content = f"answer to {messages[0]['content']}"
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+        finally:
+            self.running -= 1
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def _gateway(completions, **kwargs):
+    gateway = LLMGateway(api_key="test-key", **kwargs)
+    gateway.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return gateway
+
+
+class TestLLMGateway:
+    """Test suite for the gateway's request sharing."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        clock = FakeClock()
+        monkeypatch.setattr(llm_gateway, "time", clock)
+        return clock
+
+    def test_identical_in_flight_prompts_share_one_call(self):
+        completions = FakeCompletions()
+        gateway = _gateway(completions, cache_ttl_seconds=0)
+
+        async def run():
+            return await asyncio.gather(*[gateway.complete("hi", "model-a", 10) for _ in range(5)])
+
+        assert asyncio.run(run()) == ["answer to hi"] * 5
+        assert completions.calls == 1
+        assert (gateway.stats["coalesced"], gateway.stats["api_calls"]) == (4, 1)
+        assert gateway.get_stats()["in_flight"] == 0
+
+    def test_cancelled_caller_does_not_cancel_shared_call(self):
+        completions = FakeCompletions(delay=0.05)
+        gateway = _gateway(completions)
+
+        async def run():
+            first = asyncio.ensure_future(gateway.complete("hi", "model-a", 10))
+            second = asyncio.ensure_future(gateway.complete("hi", "model-a", 10))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await second
+
+        assert asyncio.run(run()) == "answer to hi"
+        assert completions.calls == 1
+
+    @pytest.mark.parametrize("elapsed,calls", [(299, 1), (301, 2)])
+    def test_cache_expires_after_ttl(self, clock, elapsed, calls):
+        completions = FakeCompletions(delay=0)
+        gateway = _gateway(completions, cache_ttl_seconds=300)
+
+        async def run():
+            await gateway.complete("hi", "model-a", 10)
+            clock.now += elapsed
+            return await gateway.complete("hi", "model-a", 10)
+
+        assert asyncio.run(run()) == "answer to hi"
+        assert completions.calls == calls
+        assert gateway.stats["cache_hits"] == 2 - calls
+
+    @pytest.mark.parametrize("first,second,calls", [
+        (("hi", "model-a", 10, 0.3), ("hi", "model-a", 10, 0.3), 1),
+        (("hi", "model-a", 10, 0.3), ("hi", "model-b", 10, 0.3), 2),
+        (("hi", "model-a", 10, 0.3), ("hi", "model-a", 20, 0.3), 2),
+        (("hi", "model-a", 10, 0.3), ("hi", "model-a", 10, 0.7), 2),
+        (("hi", "model-a", 10, 0.3), ("bye", "model-a", 10, 0.3), 2),
+    ])
+    def test_cache_key_covers_model_and_parameters(self, first, second, calls):
+        completions = FakeCompletions(delay=0)
+        gateway = _gateway(completions)
+
+        async def run():
+            for prompt, model, max_tokens, temperature in (first, second):
+                await gateway.complete(prompt, model, max_tokens, temperature=temperature)
+
+        asyncio.run(run())
+        assert completions.calls == calls
+
+    def test_cache_is_bounded_lru(self):
+        completions = FakeCompletions(delay=0)
+        gateway = _gateway(completions, max_cache_entries=2)
+
+        async def run():
+            for prompt in ["a", "b", "a", "c", "a", "b"]:
+                await gateway.complete(prompt, "model-a", 10)
+
+        asyncio.run(run())
+        # "b" was the least recently used when "c" arrived
+        assert completions.calls == 4
+        assert gateway.get_stats()["cached_responses"] == 2
+
+    def test_failures_are_not_cached(self):
+        completions = FakeCompletions(delay=0, fail=True)
+        gateway = _gateway(completions)
+
+        async def run():
+            for _ in range(2):
+                with pytest.raises(RuntimeError):
+                    await gateway.complete("hi", "model-a", 10)
+
+        asyncio.run(run())
+        assert (completions.calls, gateway.stats["errors"]) == (2, 2)
+
+    def test_uncached_call_bypasses_cache(self):
+        completions = FakeCompletions(delay=0)
+        gateway = _gateway(completions)
+
+        async def run():
+            await gateway.complete("hi", "model-a", 10)
+            await gateway.complete("hi", "model-a", 10, use_cache=False)
+
+        asyncio.run(run())
+        assert completions.calls == 2
+
+    def test_concurrency_is_limited_per_model(self):
+        completions = FakeCompletions(delay=0.02)
+        gateway = _gateway(completions, cache_ttl_seconds=0, max_concurrency_per_model=2)
+
+        async def run():
+            await asyncio.gather(*[gateway.complete(f"prompt {i}", "model-a", 10) for i in range(6)])
+
+        asyncio.run(run())
+        assert (completions.calls, completions.max_running) == (6, 2)
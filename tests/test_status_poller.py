@@ -0,0 +1,159 @@
+# tests/test_status_poller.py
+"""Multiplexed status poller: scheduling, shared watches and webhook resolution"""
+import asyncio
+
+import pytest
+
+from services.conversation_events import ConversationCompletionRegistry
+from services.status_poller import CallDurationStats, ConversationStatusPoller, PollSchedule
+
+
+class FakeStatuses:
+    """Status fetcher: each id turns terminal after ``polls_until_done[id]`` polls"""
+
+    def __init__(self, polls_until_done):
+        self.polls_until_done = polls_until_done
+        self.calls = []
+
+    async def fetch(self, conversation_id):
+        self.calls.append(conversation_id)
+        done = self.calls.count(conversation_id) >= self.polls_until_done.get(conversation_id, 10 ** 6)
+        return {"conversation_id": conversation_id, "status": "done" if done else "processing"}
+
+
+def _poller(statuses, registry=None):
+    schedule = PollSchedule(min_interval=0.01, max_interval=0.01, early_seconds=10, expected_duration=60)
+    return ConversationStatusPoller(
+        statuses.fetch,
+        lambda status_data: status_data["status"] == "done",
+        workers=2,
+        schedule=schedule,
+        registry=registry or ConversationCompletionRegistry(),
+        duration_stats=CallDurationStats(min_samples=3)
+    )
+
+
+class TestConversationStatusPoller:
+    """Test suite for the poller's scheduling and watch sharing."""
+
+    def test_polls_until_terminal(self):
+        statuses = FakeStatuses({"a": 3, "b": 1})
+
+        async def run():
+            poller = _poller(statuses)
+            results = await asyncio.gather(poller.wait("a", timeout=5), poller.wait("b", timeout=5))
+            await poller.close()
+            return poller, results
+
+        poller, results = asyncio.run(run())
+        assert [result["conversation_id"] for result in results] == ["a", "b"]
+        assert statuses.calls.count("a") == 3
+        assert statuses.calls.count("b") == 1
+        assert poller.stats["resolved_by_poll"] == 2
+        assert poller.tracked == 0
+
+    def test_deadline_returns_none(self):
+        async def run():
+            poller = _poller(FakeStatuses({}))
+            result = await poller.wait("a", timeout=0.05)
+            await poller.close()
+            return poller, result
+
+        poller, result = asyncio.run(run())
+        assert result is None
+        assert poller.stats["timeouts"] == 1
+
+    def test_duplicate_track_shares_one_watch(self):
+        statuses = FakeStatuses({"a": 5})
+
+        async def run():
+            poller = _poller(statuses)
+            first = poller.track("a", timeout=5)
+            second = poller.track("a", timeout=5)
+            assert first is second
+            assert poller.tracked == 1
+            result = await first
+            poller.untrack("a")
+            assert "a" in poller._watches  # second watcher still holds it
+            poller.untrack("a")
+            await poller.close()
+            return poller, result
+
+        poller, result = asyncio.run(run())
+        assert result["status"] == "done"
+        assert poller._watches == {}
+        assert statuses.calls.count("a") == 5
+
+    def test_one_waiter_timing_out_does_not_cancel_another(self):
+        registry = ConversationCompletionRegistry()
+
+        async def run():
+            poller = _poller(FakeStatuses({}), registry)
+            patient = asyncio.ensure_future(poller.wait("a", timeout=5))
+            await asyncio.sleep(0)
+            assert await poller.wait("a", timeout=0.02) is None
+
+            assert not patient.done()
+            registry.resolve("a", {"status": "done", "via": "webhook"})
+            result = await patient
+            await poller.close()
+            return poller, result
+
+        poller, result = asyncio.run(run())
+        assert result == {"status": "done", "via": "webhook"}
+        assert poller.stats["resolved_by_webhook"] == 1
+        assert registry._futures == {}
+
+    def test_webhook_delivered_before_tracking(self):
+        registry = ConversationCompletionRegistry()
+        statuses = FakeStatuses({})
+
+        async def run():
+            registry.resolve("a", {"status": "done"})
+            poller = _poller(statuses, registry)
+            result = await poller.wait("a", timeout=5)
+            await poller.close()
+            return result
+
+        assert asyncio.run(run()) == {"status": "done"}
+        assert statuses.calls == []
+
+    def test_untrack_keeps_registry_entry_for_other_watchers(self):
+        registry = ConversationCompletionRegistry()
+
+        async def run():
+            poller = _poller(FakeStatuses({}), registry)
+            other = registry.watch("a")
+            poller.track("a", timeout=5)
+            poller.untrack("a")
+            registry.resolve("a", {"status": "done"})
+            await poller.close()
+            return other
+
+        other = asyncio.run(run())
+        assert other.result() == {"status": "done"}
+
+
+@pytest.mark.parametrize("elapsed,window,expected", [
+    (5, None, 1),          # early: fast
+    (20, None, 14),        # before the default window (48-90s): half the time left
+    (40, None, 4),         # just before the window: never sleep past its start
+    (60, None, 4.2),       # inside the window: spread over window_polls
+    (100, None, 6),        # overrun: backing off again
+    (20, (30, 40), 5),     # learned window
+    (35, (30, 40), 1),
+])
+def test_poll_schedule(elapsed, window, expected):
+    schedule = PollSchedule(min_interval=1, max_interval=30, early_seconds=10, expected_duration=60, window_polls=10)
+    assert schedule.interval(elapsed, window) == pytest.approx(expected)
+
+
+def test_call_duration_window_falls_back_to_coarser_keys():
+    stats = CallDurationStats(max_samples=100, min_samples=3, low_percentile=0.1, high_percentile=0.9)
+    assert stats.window("agent", "micro") is None
+
+    stats.seed(("agent", "macro", seconds) for seconds in (100, 110, 120))
+    assert stats.window("agent", "micro") == (100, 120)  # agent-wide
+
+    stats.seed(("agent", "micro", seconds) for seconds in range(10, 110, 10))
+    assert stats.window("agent", "micro") == (20, 100)
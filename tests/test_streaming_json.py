@@ -0,0 +1,68 @@
+# tests/test_streaming_json.py
+"""Incremental JSON extraction from streamed LLM output"""
+import json
+
+import pytest
+
+from models.campaign import AICompletionDecision, AINegotiationStrategy, AIProgressDecision
+from services.llm_gateway import StreamingJSONExtractor
+
+
+def _stream(extractor: StreamingJSONExtractor, text: str, chunk_size: int):
+    """Feed ``text`` in chunks; returns (model, characters consumed before it was returned)"""
+    for start in range(0, len(text), chunk_size):
+        result = extractor.feed(text[start:start + chunk_size])
+        if result is not None:
+            return result, start + chunk_size
+    return extractor.finish(), len(text)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 1000])
+@pytest.mark.parametrize("schema, text, expected", [
+    # Optional fields sent before the required ones are complete are kept
+    (AICompletionDecision,
+     'Sure! {"find_more": true, "satisfaction_score": 0.4, "action": "continue", "reason": "need reach"}',
+     {"action": "continue", "find_more": True, "satisfaction_score": 0.4}),
+    # Required fields complete: the object is returned without waiting for the rest
+    (AICompletionDecision,
+     '{"action": "continue", "reason": "need reach", "find_more": true, "satisfaction_score": 0.4}',
+     {"action": "continue", "find_more": False, "satisfaction_score": None}),
+    (AINegotiationStrategy,
+     '{"key_selling_points": ["reach", "fit, {not} a brace"], "approach": "premium", '
+     '"opening_offer_multiplier": 1.1, "max_offer_multiplier": 1.2}',
+     {"key_selling_points": ["reach", "fit, {not} a brace"]}),
+    # Optional fields missing entirely: the closing brace ends the object
+    (AICompletionDecision, '{"action": "complete", "reason": "done"}', {"find_more": False}),
+    # Escaped quotes and nested objects inside members
+    (AIProgressDecision,
+     '{"recommended_changes": [{"a": 1}], "confidence": 0.5, "action": "adjust_approach", "reason": "say \\"hi\\""}',
+     {"reason": 'say "hi"', "recommended_changes": [{"a": 1}]}),
+    # A malformed member is dropped, not the whole object
+    (AICompletionDecision, '{"action": "complete", "find_more": tru, "reason": "ok"}', {"find_more": False, "reason": "ok"}),
+])
+def test_extracts_full_object(schema, text, expected, chunk_size):
+    result, _ = _stream(StreamingJSONExtractor(schema), text, chunk_size)
+
+    assert isinstance(result, schema)
+    for field, value in expected.items():
+        assert getattr(result, field) == value
+
+
+def test_returns_once_required_fields_arrived():
+    payload = {"satisfaction_score": 0.9, "action": "complete", "reason": "done", "find_more": True}
+    text = json.dumps(payload) + " " + "trailing explanation " * 50
+
+    result, consumed = _stream(StreamingJSONExtractor(AICompletionDecision), text, 1)
+
+    assert (result.action, result.satisfaction_score, result.find_more) == ("complete", 0.9, False)
+    assert consumed == len(json.dumps(payload).split(', "find_more"')[0]) + 1
+
+
+@pytest.mark.parametrize("text", ["no json here", '{"action": "complete"}', '{"action": "maybe", "reason": "x"}'])
+def test_invalid_or_missing_object_raises(text):
+    extractor = StreamingJSONExtractor(AICompletionDecision)
+
+    with pytest.raises(ValueError):
+        # A complete object is validated at its closing brace, anything else when the stream ends
+        extractor.feed(text)
+        extractor.finish()
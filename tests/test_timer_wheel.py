@@ -0,0 +1,124 @@
+# tests/test_timer_wheel.py
+"""Timer wheel accuracy and the conversation monitor's capacity limit"""
+import asyncio
+
+import pytest
+
+from services.conversation_monitor import ConversationMonitor, MonitorCapacityError
+from services.timer_wheel import TimerWheel
+
+TICK = 0.05
+SLACK = 0.03  # event loop scheduling jitter
+
+
+class TestTimerWheel:
+    """Test suite for timer wheel deadlines."""
+
+    @pytest.mark.parametrize("offset,delay", [
+        (0.0, TICK),
+        (0.04, TICK),       # scheduled just before the next tick
+        (0.04, 0.01),       # shorter than a tick
+        (0.02, 3.5 * TICK),
+        (0.01, 9 * TICK),   # more rounds than slots
+    ])
+    def test_fires_never_early_and_at_most_one_tick_late(self, offset, delay):
+        async def run():
+            loop = asyncio.get_running_loop()
+            wheel = TimerWheel(tick_seconds=TICK, slots=4)
+            wheel.schedule(10, lambda: None)  # keeps the wheel ticking from here
+            await asyncio.sleep(offset)
+
+            fired = loop.create_future()
+            scheduled_at = loop.time()
+            wheel.schedule(delay, lambda: fired.set_result(loop.time()))
+            fired_at = await fired
+            await wheel.close()
+            return fired_at - scheduled_at
+
+        elapsed = asyncio.run(run())
+        assert delay - 1e-3 <= elapsed <= delay + TICK + SLACK
+
+    def test_cancelled_timer_does_not_fire(self):
+        async def run():
+            wheel = TimerWheel(tick_seconds=0.01, slots=4)
+            fired = []
+            handle = wheel.schedule(0.02, lambda: fired.append("cancelled"))
+            wheel.schedule(0.03, lambda: fired.append("kept"))
+
+            assert wheel.cancel(handle)
+            assert not wheel.cancel(handle)
+            await asyncio.sleep(0.08)
+            return wheel, fired
+
+        wheel, fired = asyncio.run(run())
+        assert fired == ["kept"]
+        assert len(wheel) == 0 and wheel.fired == 1
+
+    def test_failing_callback_does_not_stop_the_wheel(self):
+        async def run():
+            wheel = TimerWheel(tick_seconds=0.01)
+            fired = []
+            wheel.schedule(0.01, lambda: 1 / 0)
+            wheel.schedule(0.02, lambda: fired.append(True))
+            await asyncio.sleep(0.06)
+            await wheel.close()
+            return fired
+
+        assert asyncio.run(run()) == [True]
+
+
+class FakeVoiceService:
+    agent_id = "agent_1"
+
+    async def get_conversation_status(self, conversation_id):
+        return {"conversation_id": conversation_id, "status": "processing"}
+
+
+class TestConversationMonitorCapacity:
+    """Test suite for monitor admission."""
+
+    def test_rejects_beyond_max_active(self):
+        async def run():
+            monitor = ConversationMonitor(FakeVoiceService(), max_active=2)
+            monitor.admission_timeout_seconds = 0.02
+            await monitor.start_monitoring("a")
+            await monitor.start_monitoring("b")
+
+            with pytest.raises(MonitorCapacityError):
+                await monitor.start_monitoring("c")
+            metrics = monitor.get_metrics()
+            await monitor.shutdown()
+            return metrics
+
+        metrics = asyncio.run(run())
+        assert (metrics["admitted"], metrics["rejected"], metrics["active_monitors"]) == (2, 1, 2)
+        assert metrics["waiting_admission"] == 0
+
+    def test_waiting_monitor_is_admitted_when_a_slot_frees(self):
+        async def run():
+            monitor = ConversationMonitor(FakeVoiceService(), max_active=1)
+            await monitor.start_monitoring("a")
+            waiting = asyncio.ensure_future(monitor.start_monitoring("b"))
+            await asyncio.sleep(0.01)
+            assert not waiting.done() and monitor.metrics["waiting_admission"] == 1
+
+            monitor.stop_monitoring("a")
+            await waiting
+            active = list(monitor.active_monitors)
+            await monitor.shutdown()
+            return active
+
+        assert asyncio.run(run()) == ["b"]
+
+    def test_duplicate_start_takes_no_slot(self):
+        async def run():
+            monitor = ConversationMonitor(FakeVoiceService(), max_active=1)
+            monitor.admission_timeout_seconds = 0.02
+            await monitor.start_monitoring("a")
+            await monitor.start_monitoring("a")
+            metrics = monitor.get_metrics()
+            await monitor.shutdown()
+            return metrics
+
+        metrics = asyncio.run(run())
+        assert (metrics["admitted"], metrics["rejected"]) == (1, 0)
@@ -0,0 +1,111 @@
+# tests/test_transcript_store.py
+"""Content-addressed transcript blobs: codecs, references and batched writes"""
+import asyncio
+import hashlib
+import zlib
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from services import transcript_store
+from services.transcript_store import TranscriptStore, compress_transcript, decompress_transcript
+
+TRANSCRIPTS = [
+    "Agent: Hi! Creator: Hello.",
+    "Agent: Our budget is $1,200. Creator: Let's do $1,500. " * 200,
+    "Créateur: d'accord 👍 — ça marche",
+]
+
+
+@pytest.fixture
+def zlib_only(monkeypatch):
+    monkeypatch.setattr(transcript_store, "zstandard", None)
+    compress_transcript.cache_clear()
+    yield
+    compress_transcript.cache_clear()
+
+
+@pytest.mark.parametrize("transcript", TRANSCRIPTS)
+def test_zlib_round_trip(zlib_only, transcript):
+    ref, codec, data = compress_transcript(transcript)
+
+    assert codec == "zlib"
+    assert ref == hashlib.sha256(transcript.encode("utf-8")).hexdigest()
+    assert decompress_transcript(codec, data) == transcript
+
+
+@pytest.mark.parametrize("transcript", TRANSCRIPTS)
+def test_zstd_round_trip(transcript):
+    pytest.importorskip("zstandard")
+    compress_transcript.cache_clear()
+
+    ref, codec, data = compress_transcript(transcript)
+
+    assert codec == "zstd"
+    assert decompress_transcript(codec, data) == transcript
+
+
+def test_repeated_transcript_compresses_well(zlib_only):
+    _, _, data = compress_transcript(TRANSCRIPTS[1])
+    assert len(data) * 20 < len(TRANSCRIPTS[1].encode("utf-8"))
+
+
+def test_zlib_blobs_stay_readable_and_zstd_needs_the_package(zlib_only):
+    data = zlib.compress(b"old blob")
+    assert decompress_transcript("zlib", data) == "old blob"
+
+    with pytest.raises(RuntimeError):
+        decompress_transcript("zstd", b"\x28\xb5\x2f\xfd")
+    with pytest.raises(ValueError):
+        decompress_transcript("lz4", data)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    """Records executed statements; ``rows`` answers selects"""
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.executed = []
+
+    async def execute(self, statement):
+        self.executed.append(statement)
+        return FakeResult(self.rows)
+
+
+class TestTranscriptStore:
+    """Test suite for TranscriptStore."""
+
+    def test_put_many_stores_each_distinct_transcript_once(self, zlib_only):
+        session = FakeSession()
+        transcripts = [TRANSCRIPTS[0], None, TRANSCRIPTS[1], "", TRANSCRIPTS[0]]
+
+        refs = asyncio.run(TranscriptStore().put_many(session, transcripts))
+
+        assert set(refs) == {TRANSCRIPTS[0], TRANSCRIPTS[1]}
+        assert len(session.executed) == 1
+        statement = session.executed[0].compile(dialect=postgresql.dialect())
+        assert sum(1 for key in statement.params if key.startswith("sha256")) == 2
+        assert "ON CONFLICT (sha256) DO NOTHING" in str(statement)
+
+    @pytest.mark.parametrize("transcripts", [[], [None, ""]])
+    def test_put_many_without_transcripts_writes_nothing(self, transcripts):
+        session = FakeSession()
+        assert asyncio.run(TranscriptStore().put_many(session, transcripts)) == {}
+        assert session.executed == []
+
+    def test_get_many_decompresses_rows(self, zlib_only):
+        blobs = [compress_transcript(transcript) for transcript in TRANSCRIPTS]
+        session = FakeSession(rows=blobs)
+
+        found = asyncio.run(TranscriptStore().get_many(session, [ref for ref, _, _ in blobs] + [None]))
+
+        assert found == {ref: transcript for (ref, _, _), transcript in zip(blobs, TRANSCRIPTS)}
+        assert asyncio.run(TranscriptStore().get(FakeSession(), None)) is None
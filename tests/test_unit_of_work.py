@@ -0,0 +1,159 @@
+# tests/test_unit_of_work.py
+"""Staging and flushing of the database unit of work"""
+import asyncio
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from models.campaign import Creator as CampaignCreator
+from services.database import UnitOfWork
+from services.transcript_store import TranscriptStore
+
+
+class FakeSession:
+    """Records executed statements; fails the ``fail_on``-th execute"""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.executed = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def begin(self):
+        return self
+
+    async def execute(self, statement, params=None):
+        self.executed.append((str(statement.compile(dialect=postgresql.dialect())), params))
+        if self.fail_on is not None and len(self.executed) == self.fail_on:
+            raise RuntimeError("connection lost")
+
+
+class FakeDatabaseService:
+    def __init__(self):
+        self.transcript_store = TranscriptStore()
+        self.sessions = []
+        self.fail_on = None
+
+    def get_session(self):
+        session = FakeSession(self.fail_on)
+        self.sessions.append(session)
+        return session
+
+
+def _creator(creator_id, name="Creator"):
+    return CampaignCreator(
+        id=creator_id, name=name, platform="Instagram", followers=10000, niche="fitness",
+        typical_rate=1000, engagement_rate=3.5, average_views=5000, last_campaign_date="2024-01-01",
+        availability="good", location="US", phone_number="+10000000000", languages=["English"],
+        specialties=["reels"]
+    )
+
+
+def _stage(uow):
+    uow.upsert_creator(_creator("c1"))
+    uow.upsert_creator(_creator("c1", name="Renamed"))
+    uow.add_negotiation("camp_1", "c1", {"status": "success", "final_rate": 1200, "call_transcript": "hello"})
+    uow.add_contract({"id": "contract_c1", "campaign_id": "camp_1", "creator_id": "c1", "status": "draft"})
+    uow.add_payment({"contract_id": "contract_c1", "amount": 1200, "status": "pending"})
+    uow.add_outreach_log({"campaign_id": "camp_1", "creator_id": "c1", "transcript": "hello"})
+    uow.update_campaign("camp_1", {"total_cost": 1000})
+    uow.update_campaign("camp_1", {"total_cost": 1200, "influencer_count": 1})
+
+
+class TestUnitOfWork:
+    """Test suite for UnitOfWork staging and flushing."""
+
+    @pytest.fixture
+    def service(self):
+        return FakeDatabaseService()
+
+    def test_staging_collapses_repeated_writes(self, service):
+        uow = UnitOfWork(service)
+        _stage(uow)
+
+        # One creator (latest wins) and one campaign update (merged)
+        assert uow.pending == 6
+        assert uow._creators["c1"]["name"] == "Renamed"
+        assert uow._campaign_updates["camp_1"] == {"total_cost": 1200, "influencer_count": 1}
+
+    def test_flush_writes_everything_in_one_session(self, service):
+        uow = UnitOfWork(service)
+        _stage(uow)
+
+        assert asyncio.run(uow.flush()) == 6
+        assert uow.pending == 0
+        assert len(service.sessions) == 1
+
+        statements = [sql for sql, _ in service.sessions[0].executed]
+        assert statements[0].startswith("INSERT INTO creators")
+        assert "ON CONFLICT (id) DO UPDATE" in statements[0]
+        assert statements[1].startswith("INSERT INTO transcript_blobs")
+        # Re-running a flush whose commit did land never duplicates rows
+        assert "ON CONFLICT (campaign_id, creator_id) DO NOTHING" in statements[2]
+        assert "ON CONFLICT (id) DO NOTHING" in statements[3]
+        assert "ON CONFLICT (contract_id) DO NOTHING" in statements[4]
+        assert "ON CONFLICT (campaign_id, creator_id, contact_type) DO NOTHING" in statements[5]
+        assert statements[-1].startswith("UPDATE campaigns")
+        assert len(statements) == 7
+
+        # The negotiation and its outreach log share one blob
+        negotiation_rows = service.sessions[0].executed[2][1]
+        outreach_rows = service.sessions[0].executed[5][1]
+        assert "call_transcript" not in negotiation_rows[0]
+        assert negotiation_rows[0]["call_transcript_ref"] == outreach_rows[0]["transcript_ref"] is not None
+
+    def test_empty_flush_opens_no_session(self, service):
+        assert asyncio.run(UnitOfWork(service).flush()) == 0
+        assert service.sessions == []
+
+    @pytest.mark.parametrize("fail_on", [1, 3, 7])
+    def test_failed_flush_keeps_writes_for_retry(self, service, fail_on):
+        uow = UnitOfWork(service)
+        _stage(uow)
+        service.fail_on = fail_on
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(uow.flush())
+        assert uow.pending == 6
+        assert uow.flushes == 0
+
+        service.fail_on = None
+        assert asyncio.run(uow.flush()) == 6
+        assert len(service.sessions[-1].executed) == 7
+        assert uow.pending == 0
+
+    def test_writes_staged_during_failed_flush_are_kept_after_it(self, service):
+        uow = UnitOfWork(service)
+        uow.update_campaign("camp_1", {"total_cost": 1000, "status": "active"})
+        uow.add_payment({"contract_id": "contract_a", "amount": 1000})
+        service.fail_on = 1
+
+        # Newer values are staged while the older flush is in its transaction
+        original_write = uow._write
+
+        async def write_after_staging(*staged):
+            uow.update_campaign("camp_1", {"total_cost": 1500})
+            uow.add_payment({"contract_id": "contract_b", "amount": 500})
+            await original_write(*staged)
+
+        uow._write = write_after_staging
+        with pytest.raises(RuntimeError):
+            asyncio.run(uow.flush())
+
+        updates = uow._campaign_updates["camp_1"]
+        assert (updates["total_cost"], updates["status"].value) == (1500, "active")
+        assert [payment["contract_id"] for payment in uow._payments] == ["contract_a", "contract_b"]
+
+    def test_context_manager_discards_on_error(self, service):
+        async def run():
+            async with UnitOfWork(service) as uow:
+                _stage(uow)
+                raise ValueError("phase failed")
+
+        with pytest.raises(ValueError):
+            asyncio.run(run())
+        assert service.sessions == []
@@ -0,0 +1,85 @@
+# tests/test_wave_strategies.py
+"""One LLM call per wave of creators, validated item by item"""
+import asyncio
+import json
+
+import pytest
+
+from agents.decision_rules import DecisionEngine, DecisionSource
+from agents.orchestrator import CampaignOrchestrator
+from models.campaign import CampaignData, CampaignOrchestrationState, Creator, CreatorMatch
+
+
+class FakeGateway:
+    ai_enabled = True
+
+    def __init__(self, response: str):
+        self.response = response
+        self.prompts = []
+
+    async def complete(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return self.response
+
+
+def _match(creator_id: str) -> CreatorMatch:
+    creator = Creator(
+        id=creator_id, name=creator_id, platform="Instagram", followers=50000, niche="fitness",
+        typical_rate=2000, engagement_rate=4.5, average_views=20000, last_campaign_date="2024-01-01",
+        availability="good", location="US", phone_number="+15550100", languages=["en"], specialties=["fitness"]
+    )
+    return CreatorMatch(creator=creator, similarity_score=0.8, estimated_rate=2000)
+
+
+def _orchestrator(response: str) -> CampaignOrchestrator:
+    orchestrator = CampaignOrchestrator.__new__(CampaignOrchestrator)
+    orchestrator.decision_engine = DecisionEngine(min_confidence=2.0)  # rules never confident
+    orchestrator.llm_gateway = FakeGateway(response)
+    return orchestrator
+
+
+@pytest.fixture
+def state():
+    return CampaignOrchestrationState(
+        campaign_id="campaign-1",
+        campaign_data=CampaignData(
+            id="campaign-1", product_name="Protein Powder", brand_name="FitCo", product_description="Plant protein",
+            target_audience="Gym goers", campaign_goal="Awareness", product_niche="fitness", total_budget=10000
+        )
+    )
+
+
+def _strategy(creator_id: str, **overrides):
+    return {"creator_id": creator_id, "approach": "premium", "opening_offer_multiplier": 1.1,
+            "max_offer_multiplier": 1.2, "key_selling_points": ["reach"], **overrides}
+
+
+def test_first_wave_is_batched_with_zero_progress(state):
+    wave = [_match("c1"), _match("c2"), _match("c3")]
+    orchestrator = _orchestrator(json.dumps([_strategy(m.creator.id) for m in wave]))
+
+    strategies = asyncio.run(orchestrator._get_wave_negotiation_strategies(state, {}, wave, set()))
+
+    assert len(orchestrator.llm_gateway.prompts) == 1
+    assert "Previous successes: 0" in orchestrator.llm_gateway.prompts[0]
+    assert {creator_id: s["approach"] for creator_id, s in strategies.items()} == {"c1": "premium", "c2": "premium", "c3": "premium"}
+    assert all(s["decision_source"] == DecisionSource.LLM.value for s in strategies.values())
+
+
+@pytest.mark.parametrize("bad_item", [
+    {"creator_id": "c2", "approach": "premium"},              # missing multipliers
+    _strategy("c2", approach="hardball"),                     # unknown approach
+    _strategy("c2", opening_offer_multiplier=5.0),            # out of range
+    _strategy("c2", max_offer_multiplier="a lot"),            # wrong type
+    _strategy("c2", key_selling_points="reach"),              # not a list
+])
+def test_invalid_items_fall_back_individually(state, bad_item):
+    wave = [_match("c1"), _match("c2")]
+    items = [_strategy("c1"), bad_item]
+    orchestrator = _orchestrator(json.dumps(items))
+
+    strategies = asyncio.run(orchestrator._get_wave_negotiation_strategies(state, {}, wave, set()))
+
+    assert strategies["c1"]["decision_source"] == DecisionSource.LLM.value
+    assert strategies["c2"]["decision_source"] == DecisionSource.FALLBACK.value
+    assert strategies["c2"]["opening_offer_multiplier"] == 1.0
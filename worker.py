@@ -0,0 +1,197 @@
+# worker.py - CAMPAIGN JOB WORKER
+"""
+Campaign orchestration worker.
+
+Pulls campaign jobs from the durable job queue, keeps their lease alive with
+heartbeats while the orchestration runs, and records the outcome. Run as many
+worker processes as needed, independently of the web processes:
+
+    python worker.py --concurrency 4
+
+The API process also starts an embedded worker unless RUN_EMBEDDED_WORKER=false.
+"""
+import os
+import socket
+import asyncio
+import logging
+import argparse
+from typing import Callable, Optional, Set
+
+from models.campaign import CampaignJobData, CampaignOrchestrationState
+from services.job_queue import JobQueue, JobLeaseLost, create_job_queue
+from services.container import init_container, get_container, close_container
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CampaignWorker:
+    """
+    👷 CAMPAIGN JOB WORKER
+
+    Claims up to ``concurrency`` jobs at a time and runs each through the
+    enhanced orchestrator. If a heartbeat reports the lease was lost (another
+    worker reclaimed the job), the local run is cancelled.
+    """
+
+    def __init__(
+        self,
+        job_queue: Optional[JobQueue] = None,
+        orchestrator=None,
+        concurrency: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        worker_id: Optional[str] = None,
+        state_listener: Optional[Callable[[str, CampaignOrchestrationState], None]] = None
+    ):
+        self.job_queue = job_queue or get_container().job_queue
+        self.orchestrator = orchestrator
+        self.concurrency = concurrency or settings.worker_concurrency
+        self.poll_interval = poll_interval or settings.worker_poll_interval_seconds
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.state_listener = state_listener  # the orchestrator publishes later states itself
+
+        self._running = False
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._tasks: Set[asyncio.Task] = set()
+        self._loop_task: Optional[asyncio.Task] = None
+
+    def _get_orchestrator(self):
+        if self.orchestrator is None:
+            self.orchestrator = get_container().enhanced_orchestrator
+        return self.orchestrator
+
+    def start(self) -> asyncio.Task:
+        """Start the claim loop in the background"""
+        self._running = True
+        self._loop_task = asyncio.create_task(self.run())
+        return self._loop_task
+
+    async def stop(self) -> None:
+        """Stop claiming and cancel in-flight jobs (their leases expire and they are retried)"""
+        self._running = False
+
+        if self._loop_task:
+            self._loop_task.cancel()
+        for task in list(self._tasks):
+            task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._loop_task:
+            await asyncio.gather(self._loop_task, return_exceptions=True)
+
+        logger.info(f"🛑 Worker {self.worker_id} stopped")
+
+    async def run(self) -> None:
+        """Claim loop - runs until stop() is called"""
+        self._running = True
+        logger.info(f"👷 Worker {self.worker_id} started (concurrency={self.concurrency})")
+
+        while self._running:
+            await self._slots.acquire()
+            try:
+                job = await self.job_queue.claim(self.worker_id)
+            except Exception as e:
+                logger.error(f"❌ Job claim failed: {e}")
+                job = None
+
+            if not job:
+                self._slots.release()
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            task = asyncio.create_task(self._run_job(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_job(self, job: CampaignJobData) -> None:
+        """Run one job with a heartbeat alongside it"""
+        logger.info(f"🎯 Worker {self.worker_id} running job {job.id} (attempt {job.attempts}/{job.max_attempts})")
+
+        run_task = asyncio.create_task(self._orchestrate(job))
+        heartbeat_task = asyncio.create_task(self._heartbeat(job, run_task))
+
+        try:
+            state = await run_task
+
+            if state.current_stage == "failed":
+                await self.job_queue.fail(job.id, self.worker_id, "Orchestration ended in failed stage")
+            else:
+                await self.job_queue.complete(job.id, self.worker_id, state.get_progress_summary())
+
+        except asyncio.CancelledError:
+            if self._running:
+                logger.warning(f"⚠️ Job {job.id} cancelled - lease lost")
+            else:
+                raise
+
+        except JobLeaseLost as e:
+            logger.warning(f"⚠️ {e}")
+
+        except Exception as e:
+            logger.error(f"❌ Job {job.id} failed: {e}")
+            try:
+                await self.job_queue.fail(job.id, self.worker_id, str(e))
+            except JobLeaseLost:
+                pass
+
+        finally:
+            heartbeat_task.cancel()
+            run_task.cancel()
+            self._slots.release()
+
+    async def _orchestrate(self, job: CampaignJobData) -> CampaignOrchestrationState:
+        state = CampaignOrchestrationState.model_validate(job.payload)
+        if self.state_listener:
+            # Standalone workers have none - progress is read from the job record
+            self.state_listener(job.id, state)
+        return await self._get_orchestrator().orchestrate_campaign(state, job.id)
+
+    async def _heartbeat(self, job: CampaignJobData, run_task: asyncio.Task) -> None:
+        """Extend the lease until the job finishes; cancel the run if the lease is lost"""
+        while not run_task.done():
+            await asyncio.sleep(settings.job_heartbeat_seconds)
+            try:
+                if not await self.job_queue.heartbeat(job.id, self.worker_id):
+                    logger.warning(f"⚠️ Lost lease on job {job.id} - cancelling")
+                    run_task.cancel()
+                    return
+            except Exception as e:
+                # Transient backend error - keep running, the lease may still be valid
+                logger.error(f"❌ Heartbeat failed for job {job.id}: {e}")
+
+
+async def _main(args) -> None:
+    services = init_container()
+    services.llm_gateway.start_health_refresh()
+    worker = CampaignWorker(
+        job_queue=create_job_queue(args.backend, db_config=services.db_config) if args.backend else None,
+        concurrency=args.concurrency,
+        poll_interval=args.poll_interval
+    )
+    try:
+        await worker.run()
+    finally:
+        await worker.stop()
+        await close_container()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="InfluencerFlow campaign job worker")
+    parser.add_argument("--backend", choices=["local", "postgres"], help="Job queue backend (default: JOB_QUEUE_BACKEND)")
+    parser.add_argument("--concurrency", type=int, help="Jobs to run at once (default: WORKER_CONCURRENCY)")
+    parser.add_argument("--poll-interval", type=float, help="Seconds between polls when idle")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        logger.info("🛑 Worker interrupted")
+
+
+if __name__ == "__main__":
+    main()